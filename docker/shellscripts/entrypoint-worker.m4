@@ -21,6 +21,7 @@ echo "This is just a script template, not the script (yet) - pass it to 'argbash
 exit 11 #)Created by argbash-init v2.8.1
 # ARG_OPTIONAL_SINGLE([results-ttl],[],[Job results will be kept for this number of seconds],[500])
 # ARG_OPTIONAL_SINGLE([rq-worker-module],[],[Python module used to start the RQ Worker],[dioptra.rq.cli.rq])
+# ARG_OPTIONAL_SINGLE([rq-worker-class],[],[RQ Worker class to use, set to 'rq.worker.SimpleWorker' when using the warm executor],[rq.worker.Worker])
 # ARG_OPTIONAL_REPEATED([wait-for],[],[Wait on the availability of a host and TCP port before proceeding],[])
 # ARG_LEFTOVERS([Queues to watch])
 # ARG_DEFAULTS_POS
@@ -39,6 +40,7 @@ set -euo pipefail
 readonly dioptra_workdir="${DIOPTRA_WORKDIR}"
 readonly job_queues="${_arg_leftovers[*]}"
 readonly logname="Container Entry Point"
+readonly rq_worker_class="${_arg_rq_worker_class}"
 readonly rq_worker_module="${_arg_rq_worker_module}"
 readonly rq_redis_uri="${RQ_REDIS_URI-}"
 readonly rq_results_ttl="${_arg_results_ttl}"
@@ -72,6 +74,7 @@ wait_for_services() {
 #   logname
 #   rq_redis_uri
 #   rq_results_ttl
+#   rq_worker_class
 #   rq_worker_module
 # Arguments:
 #   None
@@ -82,12 +85,13 @@ wait_for_services() {
 start_rq() {
   echo "${logname}: starting rq worker"
   echo "${logname}: rq worker --url ${rq_redis_uri} --results-ttl ${rq_results_ttl} \
-  ${job_queues}"
+  --worker-class ${rq_worker_class} ${job_queues}"
 
   cd ${dioptra_workdir}
   python -m ${rq_worker_module} worker\
     --url ${rq_redis_uri}\
     --results-ttl ${rq_results_ttl}\
+    --worker-class ${rq_worker_class}\
     ${job_queues}
 }
 
@@ -24,7 +24,10 @@ exit 11 #)Created by argbash-init v2.8.1
 # ARG_OPTIONAL_SINGLE([experiment-id],[],[ID of the experiment under which to launch the run],[])
 # ARG_OPTIONAL_SINGLE([entry-point],[],[MLproject entry point to invoke],[main])
 # ARG_OPTIONAL_SINGLE([mlflow-run-module],[],[Python module used to invoke 'mlflow run'],[dioptra.rq.cli.mlflow])
+# ARG_OPTIONAL_SINGLE([plugins-sync-module],[],[Python module used to sync the plugins through the worker's plugin cache],[dioptra.rq.cli.sync_plugins])
 # ARG_OPTIONAL_SINGLE([s3-workflow],[],[S3 URI to a tarball or zip archive containing scripts and a MLproject file defining a workflow],[])
+# ARG_OPTIONAL_SINGLE([workflow-fetch-module],[],[Python module used to download and unpack the workflow through the worker's workflow cache],[dioptra.rq.cli.fetch_workflow])
+# ARG_OPTIONAL_BOOLEAN([prepare-only],[],[Sync the plugins and unpack the workflow without starting the MLFlow run],[])
 # ARG_USE_ENV([DIOPTRA_PLUGIN_DIR],[],[Directory in worker container for syncing the builtin plugins])
 # ARG_USE_ENV([DIOPTRA_PLUGINS_S3_URI],[],[S3 URI to the directory containing the builtin plugins])
 # ARG_USE_ENV([DIOPTRA_CUSTOM_PLUGINS_S3_URI],[],[S3 URI to the directory containing the custom plugins])
@@ -53,7 +56,10 @@ readonly mlflow_backend="${_arg_backend}"
 readonly mlflow_experiment_id="${_arg_experiment_id}"
 readonly mlflow_run_module="${_arg_mlflow_run_module}"
 readonly mlflow_s3_endpoint_url="${MLFLOW_S3_ENDPOINT_URL-}"
+readonly plugins_sync_module="${_arg_plugins_sync_module}"
+readonly prepare_only="${_arg_prepare_only}"
 readonly s3_workflow_uri="${_arg_s3_workflow}"
+readonly workflow_fetch_module="${_arg_workflow_fetch_module}"
 
 readonly workflow_filename="$(basename ${s3_workflow_uri} 2>/dev/null)"
 
@@ -92,84 +98,29 @@ validate_mlflow_inputs() {
 }
 
 ###########################################################################################
-# Unpack workflow archive
-#
-# Globals:
-#   workflow_filename
-# Arguments:
-#   None
-# Returns:
-#   None
-###########################################################################################
-
-unpack_workflow_archive() {
-  local filepath="$(pwd)/${workflow_filename}"
-
-  if [[ -f ${filepath} && -f /usr/local/bin/unpack-archive.sh ]]; then
-    /usr/local/bin/unpack-archive.sh ${filepath}
-  elif [[ ! -f /usr/local/bin/unpack-archive.sh ]]; then
-    echo "${logname}: ERROR - /usr/local/bin/unpack-archive.sh script missing" 1>&2
-    exit 1
-  elif [[ ! -f ${filepath} ]]; then
-    echo "${logname}: ERROR - workflow archive file missing" 1>&2
-    exit 1
-  fi
-}
-
-###########################################################################################
-# Download workflow from S3 storage
+# Download and unpack the workflow archive from S3 storage
 #
 # Globals:
 #   mlflow_s3_endpoint_url
 #   s3_workflow_uri
-#   workflow_filename
+#   workflow_fetch_module
 # Arguments:
 #   None
 # Returns:
 #   None
 ###########################################################################################
 
-download_workflow() {
+fetch_workflow() {
   local src="${s3_workflow_uri}"
-  local dest="$(pwd)/${workflow_filename}"
+  local dest="$(pwd)"
 
-  if [[ ! -z ${mlflow_s3_endpoint_url} && -f /usr/local/bin/s3-cp.sh ]]; then
-    /usr/local/bin/s3-cp.sh --endpoint-url ${mlflow_s3_endpoint_url} ${src} ${dest}
-  elif [[ -z ${mlflow_s3_endpoint_url} && -f /usr/local/bin/s3-cp.sh ]]; then
-    /usr/local/bin/s3-cp.sh ${src} ${dest}
-  elif [[ ! -f /usr/local/bin/s3-cp.sh ]]; then
-    echo "${logname}: ERROR - /usr/local/bin/s3-cp.sh script missing" 1>&2
-    exit 1
+  if [[ ! -z ${mlflow_s3_endpoint_url} ]]; then
+    python -m ${workflow_fetch_module} --endpoint-url ${mlflow_s3_endpoint_url} ${src} ${dest}
+  else
+    python -m ${workflow_fetch_module} ${src} ${dest}
   fi
 }
 
-###########################################################################################
-# Clear plugins directories
-#
-# Globals:
-#   dioptra_plugin_dir
-# Arguments:
-#   None
-# Returns:
-#   None
-###########################################################################################
-
-clear_plugins_dirs() {
-  local plugin_dirs=(
-    "${dioptra_plugin_dir}/dioptra_builtins"
-    "${dioptra_plugin_dir}/dioptra_custom"
-  )
-
-  for dir in "${plugin_dirs[@]}"; do
-    if [[ -d "${dir}" ]]; then
-      if ! rm -rf "${dir}"; then
-        echo "${logname}: ERROR - Unexpected error while clearing the plugin directories." 1>&2
-        exit 1
-      fi
-    fi
-  done
-}
-
 ###########################################################################################
 # Synchronize builtin plugins from S3 storage
 #
@@ -177,6 +128,7 @@ clear_plugins_dirs() {
 #   dioptra_plugin_dir
 #   dioptra_plugins_s3_uri
 #   mlflow_s3_endpoint_url
+#   plugins_sync_module
 # Arguments:
 #   None
 # Returns:
@@ -187,13 +139,10 @@ sync_builtin_plugins() {
   local src="${dioptra_plugins_s3_uri}"
   local dest="${dioptra_plugin_dir}/dioptra_builtins"
 
-  if [[ ! -z ${mlflow_s3_endpoint_url} && -f /usr/local/bin/s3-sync.sh ]]; then
-    /usr/local/bin/s3-sync.sh --endpoint-url ${mlflow_s3_endpoint_url} --delete ${src} ${dest}
-  elif [[ -z ${mlflow_s3_endpoint_url} && -f /usr/local/bin/s3-sync.sh ]]; then
-    /usr/local/bin/s3-sync.sh --delete ${src} ${dest}
-  elif [[ ! -f /usr/local/bin/s3-sync.sh ]]; then
-    echo "${logname}: ERROR - /usr/local/bin/s3-sync.sh script missing" 1>&2
-    exit 1
+  if [[ ! -z ${mlflow_s3_endpoint_url} ]]; then
+    python -m ${plugins_sync_module} --endpoint-url ${mlflow_s3_endpoint_url} ${src} ${dest}
+  else
+    python -m ${plugins_sync_module} ${src} ${dest}
   fi
 }
 
@@ -204,6 +153,7 @@ sync_builtin_plugins() {
 #   dioptra_plugin_dir
 #   dioptra_custom_plugins_s3_uri
 #   mlflow_s3_endpoint_url
+#   plugins_sync_module
 # Arguments:
 #   None
 # Returns:
@@ -214,13 +164,10 @@ sync_custom_plugins() {
   local src="${dioptra_custom_plugins_s3_uri}"
   local dest="${dioptra_plugin_dir}/dioptra_custom"
 
-  if [[ ! -z ${mlflow_s3_endpoint_url} && -f /usr/local/bin/s3-sync.sh ]]; then
-    /usr/local/bin/s3-sync.sh --endpoint-url ${mlflow_s3_endpoint_url} --delete ${src} ${dest}
-  elif [[ -z ${mlflow_s3_endpoint_url} && -f /usr/local/bin/s3-sync.sh ]]; then
-    /usr/local/bin/s3-sync.sh --delete ${src} ${dest}
-  elif [[ ! -f /usr/local/bin/s3-sync.sh ]]; then
-    echo "${logname}: ERROR - /usr/local/bin/s3-sync.sh script missing" 1>&2
-    exit 1
+  if [[ ! -z ${mlflow_s3_endpoint_url} ]]; then
+    python -m ${plugins_sync_module} --endpoint-url ${mlflow_s3_endpoint_url} ${src} ${dest}
+  else
+    python -m ${plugins_sync_module} ${src} ${dest}
   fi
 }
 
@@ -270,10 +217,11 @@ start_mlflow() {
 ###########################################################################################
 
 validate_mlflow_inputs
-clear_plugins_dirs
 sync_builtin_plugins
 sync_custom_plugins
-download_workflow
-unpack_workflow_archive
-start_mlflow
+fetch_workflow
+
+if [[ ${prepare_only} == off ]]; then
+  start_mlflow
+fi
 # ] <-- needed because of Argbash
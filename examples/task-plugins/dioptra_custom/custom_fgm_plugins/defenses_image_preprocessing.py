@@ -28,6 +28,7 @@ from structlog.stdlib import BoundLogger
 
 from dioptra import pyplugs
 from dioptra.sdk.exceptions import ARTDependencyError, TensorflowDependencyError
+from dioptra.sdk.utilities.batching import iter_batches, num_batches
 from dioptra.sdk.utilities.decorators import require_package
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
@@ -111,16 +112,13 @@ def create_defended_dataset(
     LOGGER.info(
         "Generate defended images",
         defense=def_type,
-        num_batches=num_images // batch_size,
+        num_batches=num_batches(num_images, batch_size),
     )
 
-    for batch_num, (x, y) in enumerate(data_flow):
-        if batch_num >= num_images // batch_size:
-            break
-
-        clean_filenames = img_filenames[
-            batch_num * batch_size : (batch_num + 1) * batch_size  # noqa: E203
-        ]
+    for batch_num, batch_slice, (x, y) in iter_batches(
+        data_flow, num_samples=num_images, batch_size=batch_size
+    ):
+        clean_filenames = img_filenames[batch_slice]
 
         LOGGER.info(
             "Generate defended image batch",
@@ -29,6 +29,7 @@ from structlog.stdlib import BoundLogger
 
 from dioptra import pyplugs
 from dioptra.sdk.exceptions import ARTDependencyError, TensorflowDependencyError
+from dioptra.sdk.utilities.batching import iter_batches, num_batches
 from dioptra.sdk.utilities.decorators import require_package
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
@@ -203,14 +204,14 @@ def create_adversarial_patch_dataset(
     LOGGER.info(
         "Generate adversarial images",
         attack="patch",
-        num_batches=num_images // batch_size,
+        num_batches=num_batches(num_images, batch_size),
     )
 
     converted_patch_list = list(patch_list)
     # Apply patch over test set.
-    for batch_num, (x, y) in enumerate(data_flow):
-        if batch_num >= num_images // batch_size:
-            break
+    for batch_num, batch_slice, (x, y) in iter_batches(
+        data_flow, num_samples=num_images, batch_size=batch_size
+    ):
         LOGGER.info(
             "Generate adversarial image batch",
             attack="patch",
@@ -224,9 +225,7 @@ def create_adversarial_patch_dataset(
         else:
             adv_batch = attack.apply_patch(x, patch_external=patch)
 
-        clean_filenames = img_filenames[
-            batch_num * batch_size : (batch_num + 1) * batch_size
-        ]
+        clean_filenames = img_filenames[batch_slice]
 
         _save_batch(
             adv_batch, adv_data_dir, y_int, clean_filenames, class_names_list, "adv"
@@ -270,14 +269,12 @@ def create_adversarial_patch_dataset(
         num_images = data_flow.n
 
         # Apply patch over test set.
-        for batch_num, (x, y) in enumerate(data_flow):
+        for batch_num, batch_slice, (x, y) in iter_batches(
+            data_flow, num_samples=num_images, batch_size=batch_size
+        ):
             y_int = np.argmax(y, axis=1)
-            if batch_num >= num_images // batch_size:
-                break
             LOGGER.info("Saving regular image batch", batch_num=batch_num)
-            clean_filenames = img_filenames[
-                batch_num * batch_size : (batch_num + 1) * batch_size
-            ]
+            clean_filenames = img_filenames[batch_slice]
             _save_batch(
                 x, adv_data_dir, y_int, clean_filenames, class_names_list, "reg"
             )
@@ -39,6 +39,7 @@ from dioptra.sdk.exceptions import (
     ARTDependencyError,
     TensorflowDependencyError,
 )
+from dioptra.sdk.utilities.batching import iter_batches, num_batches
 from dioptra.sdk.utilities.decorators import require_package
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
@@ -174,7 +175,7 @@ def create_adversarial_poison_data(
     LOGGER.info(
         "Generate poisoned images",
         attack="backdoor poisoning",
-        num_batches=num_images // batch_size,
+        num_batches=num_batches(num_images, batch_size),
     )
     target_index = int(target_class)
     backdoor_poisoner = PoisoningAttackBackdoor(add_pattern_bd)
@@ -183,10 +184,9 @@ def create_adversarial_poison_data(
     example_target[target_index] = 1
 
     # Apply backdoor poisoning over test set.
-    for batch_num, (x, y) in enumerate(data_flow):
-        if batch_num >= num_images // batch_size:
-            break
-
+    for batch_num, batch_slice, (x, y) in iter_batches(
+        data_flow, num_samples=num_images, batch_size=batch_size
+    ):
         LOGGER.info(
             "Generate poisoned image batch",
             attack="backdoor poison",
@@ -198,7 +198,7 @@ def create_adversarial_poison_data(
         # TODO: transfer update to other attacks.
         clean_filenames = [
             img_filenames[data_flow.index_array[i]]
-            for i in range(batch_num * batch_size, (batch_num + 1) * batch_size)
+            for i in range(batch_slice.start, batch_slice.stop)
         ]
 
         poisoned_x, plabels = backdoor_poisoner.poison(
@@ -233,14 +233,13 @@ def create_adversarial_poison_data(
     img_filenames = [Path(x) for x in data_flow.filenames]
     num_images = data_flow.n
 
-    for batch_num, (x, y) in enumerate(data_flow):
-        if batch_num >= num_images // batch_size:
-            break
-
+    for batch_num, batch_slice, (x, y) in iter_batches(
+        data_flow, num_samples=num_images, batch_size=batch_size
+    ):
         y_int = np.argmax(y, axis=1)
         filenames = [
             img_filenames[data_flow.index_array[i]]
-            for i in range(batch_num * batch_size, (batch_num + 1) * batch_size)
+            for i in range(batch_slice.start, batch_slice.stop)
         ]
         _save_batch(x, adv_data_dir, y_int, filenames, class_names_list, "original")
 
@@ -303,7 +302,7 @@ def create_adversarial_clean_poison_dataset(
     LOGGER.info(
         "Generate adversarial images",
         attack="clean label poisoning",
-        num_batches=num_images // batch_size,
+        num_batches=num_batches(num_images, batch_size),
     )
 
     backdoor = PoisoningAttackBackdoor(add_pattern_bd)
@@ -318,13 +317,12 @@ def create_adversarial_clean_poison_dataset(
         max_iter=max_iter,
     )
 
-    for batch_num, (x, y) in enumerate(data_flow):
-        if batch_num >= num_images // batch_size:
-            break
-
+    for batch_num, batch_slice, (x, y) in iter_batches(
+        data_flow, num_samples=num_images, batch_size=batch_size
+    ):
         clean_filenames = [
             img_filenames[data_flow.index_array[i]]
-            for i in range(batch_num * batch_size, (batch_num + 1) * batch_size)
+            for i in range(batch_slice.start, batch_slice.stop)
         ]
 
         LOGGER.info(
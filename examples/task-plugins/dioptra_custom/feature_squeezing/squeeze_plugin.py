@@ -30,6 +30,7 @@ from tensorflow.keras.preprocessing.image import ImageDataGenerator, save_img
 
 from dioptra import pyplugs
 from dioptra.sdk.exceptions import ARTDependencyError, TensorflowDependencyError
+from dioptra.sdk.utilities.batching import iter_batches
 from dioptra.sdk.utilities.decorators import require_package
 
 warnings.filterwarnings("ignore")
@@ -105,15 +106,12 @@ def feature_squeeze(
     class_names_list = sorted(data_flow.class_indices, key=data_flow.class_indices.get)
     LOGGER.info("num_images ", path=num_images)
 
-    for batch_num, (x, y) in enumerate(data_flow):
+    for batch_num, batch_slice, (x, y) in iter_batches(
+        data_flow, num_samples=num_images, batch_size=batch_size
+    ):
         LOGGER.info("batch_num ", path=batch_num)
 
-        if batch_num >= num_images // batch_size:
-            break
-
-        clean_filenames = img_filenames[
-            batch_num * batch_size : (batch_num + 1) * batch_size
-        ]
+        clean_filenames = img_filenames[batch_slice]
 
         y_int = np.argmax(y, axis=1)
 
@@ -35,6 +35,11 @@ from mlflow.projects.utils import (
 )
 
 from .dioptra_clients import DioptraDatabaseClient
+from .dioptra_forked_process import (
+    ENVVAR_FORK_ENTRY_POINT,
+    fork_python_entry_point,
+    parse_python_entry_point,
+)
 from .dioptra_tags import DIOPTRA_DEPENDS_ON, DIOPTRA_JOB_ID, DIOPTRA_QUEUE
 
 PROJECT_WORKFLOW_FILEPATH = "workflow_filepath"
@@ -110,10 +115,20 @@ def _run_entry_point(command, work_dir, experiment_id, run_id):
 
     env = os.environ.copy()
     env.update(get_run_env_vars(run_id, experiment_id))
+    python_argv = (
+        parse_python_entry_point(command)
+        if os.getenv(ENVVAR_FORK_ENTRY_POINT) and os.name != "nt"
+        else None
+    )
+
+    # Inside a warm executor process, Python entry points run in a fork of the
+    # current process to reuse the frameworks it has already imported.
+    if python_argv is not None:
+        process = fork_python_entry_point(python_argv, cwd=work_dir, env=env)
 
     # in case os name is not 'nt', we are not running on windows. It introduces
     # bash command otherwise.
-    if os.name != "nt":
+    elif os.name != "nt":
         process = subprocess.Popen(
             ["bash", "-c", command], close_fds=True, cwd=work_dir, env=env
         )
@@ -16,6 +16,7 @@
 # https://creativecommons.org/licenses/by/4.0/legalcode
 import datetime
 import os
+import threading
 from typing import Any, Dict, Optional
 
 import structlog
@@ -32,12 +33,59 @@ ENVVAR_JOB_ID = "DIOPTRA_RQ_JOB_ID"
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
+_APPS: Dict[Optional[str], Flask] = {}
+_APPS_LOCK = threading.Lock()
+
+
+def get_app(env: Optional[str] = None) -> Flask:
+    """Returns the process-wide Flask app used for database access.
+
+    The app is built lazily on first use and reused afterwards, so that every client
+    in the process shares a single SQLAlchemy engine and connection pool instead of
+    rebuilding the REST API for each query. Dependency injection is skipped because
+    the client only needs the database binding.
+
+    Args:
+        env: The configuration environment to use for the application. If `None`,
+            the value of the ``DIOPTRA_RESTAPI_ENV`` environment variable is used.
+
+    Returns:
+        The cached :py:class:`~flask.Flask` object for the environment.
+    """
+    app: Optional[Flask] = _APPS.get(env)
+
+    if app is not None:
+        return app
+
+    with _APPS_LOCK:
+        app = _APPS.get(env)
+
+        if app is None:
+            LOGGER.debug("Creating database client app", env=env)
+            app = create_app(env=env, inject_dependencies=False)
+            _APPS[env] = app
+
+    return app
+
+
+def dispose_apps() -> None:
+    """Disposes the engines of all cached database client apps and clears the cache.
+
+    Call this after forking a process so that the child does not share pooled
+    connections with its parent.
+    """
+    with _APPS_LOCK:
+        for app in _APPS.values():
+            with app.app_context():
+                db.engine.dispose()
+
+        _APPS.clear()
+
 
 class DioptraDatabaseClient(object):
     @property
     def app(self) -> Flask:
-        app: Flask = create_app(env=self.restapi_env)
-        return app
+        return get_app(env=self.restapi_env)
 
     @property
     def job_id(self) -> Optional[str]:
@@ -0,0 +1,159 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""Run Python entry points in a forked copy of the current process.
+
+When the Dioptra backend runs inside a warm executor process (see
+:py:mod:`dioptra.rq.executors`), the heavy frameworks are already imported. Forking that
+process and running the entry point script with :py:mod:`runpy` skips the interpreter
+start-up and framework imports that ``bash -c "python script.py ..."`` would repeat,
+while the fork keeps the script's module state out of the executor process.
+"""
+import os
+import re
+import runpy
+import shlex
+import signal
+import sys
+import traceback
+from typing import Dict, List, Optional
+
+ENVVAR_FORK_ENTRY_POINT = "DIOPTRA_MLFLOW_FORK_ENTRY_POINT"
+
+_PYTHON_EXECUTABLES = {"python", "python3"}
+_SHELL_METACHARACTERS = re.compile(r"[|&;<>()$`\n]")
+
+
+class ForkedProcess(object):
+    """A minimal stand-in for :py:class:`subprocess.Popen` wrapping a forked child.
+
+    Provides the subset of the :py:class:`subprocess.Popen` interface used by
+    :py:class:`~mlflow.projects.submitted_run.LocalSubmittedRun`.
+
+    Args:
+        pid: The process ID of the forked child.
+    """
+
+    def __init__(self, pid: int) -> None:
+        self.pid = pid
+        self.returncode: Optional[int] = None
+
+    def poll(self) -> Optional[int]:
+        if self.returncode is None:
+            pid, status = os.waitpid(self.pid, os.WNOHANG)
+
+            if pid != 0:
+                self.returncode = os.waitstatus_to_exitcode(status)
+
+        return self.returncode
+
+    def wait(self) -> int:
+        if self.returncode is None:
+            _, status = os.waitpid(self.pid, 0)
+            self.returncode = os.waitstatus_to_exitcode(status)
+
+        return self.returncode
+
+    def terminate(self) -> None:
+        if self.returncode is None:
+            os.kill(self.pid, signal.SIGTERM)
+
+
+def parse_python_entry_point(command: str) -> Optional[List[str]]:
+    """Splits an entry point command of the form ``python script.py [args ...]``.
+
+    Args:
+        command: The entry point command generated by MLFlow.
+
+    Returns:
+        The script path followed by its arguments, or `None` if the command is not a
+        plain Python script invocation and must be run through the shell.
+    """
+    if _SHELL_METACHARACTERS.search(command):
+        return None
+
+    try:
+        argv = shlex.split(command)
+
+    except ValueError:
+        return None
+
+    if (
+        len(argv) < 2
+        or os.path.basename(argv[0]) not in _PYTHON_EXECUTABLES
+        or not argv[1].endswith(".py")
+    ):
+        return None
+
+    return argv[1:]
+
+
+def fork_python_entry_point(
+    argv: List[str], cwd: str, env: Dict[str, str]
+) -> ForkedProcess:
+    """Runs a Python script as ``__main__`` in a forked child of the current process.
+
+    Args:
+        argv: The script path followed by its arguments.
+        cwd: The working directory of the child.
+        env: The environment variables of the child.
+
+    Returns:
+        A :py:class:`ForkedProcess` for the child.
+    """
+    sys.stdout.flush()
+    sys.stderr.flush()
+    pid = os.fork()
+
+    if pid != 0:
+        return ForkedProcess(pid)
+
+    exit_code = 1
+
+    try:
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(env)
+        script = os.path.abspath(argv[0])
+        sys.argv = [script, *argv[1:]]
+        sys.path.insert(0, os.path.dirname(script))
+        runpy.run_path(script, run_name="__main__")
+        exit_code = 0
+
+    except SystemExit as err:
+        exit_code = _get_exit_code(err)
+
+    except BaseException:
+        traceback.print_exc()
+
+    finally:
+        try:
+            sys.stdout.flush()
+            sys.stderr.flush()
+
+        finally:
+            os._exit(exit_code)
+
+
+def _get_exit_code(err: SystemExit) -> int:
+    if err.code is None:
+        return 0
+
+    if isinstance(err.code, int):
+        return err.code
+
+    print(err.code, file=sys.stderr)
+    return 1
@@ -31,7 +31,9 @@ def register_error_handlers(api: Api) -> None:
     """
     from .experiment import register_error_handlers as attach_experiment_error_handlers
     from .job import register_error_handlers as attach_job_error_handlers
+    from .pagination import ListQueryError
     from .queue import register_error_handlers as attach_job_queue_error_handlers
+    from .shared.io_file.errors import ArchiveExtractionError
     from .task_plugin import (
         register_error_handlers as attach_task_plugin_error_handlers,
     )
@@ -43,3 +45,11 @@ def register_error_handlers(api: Api) -> None:
     attach_job_queue_error_handlers(api)
     attach_task_plugin_error_handlers(api)
     attach_user_error_handlers(api)
+
+    @api.errorhandler(ListQueryError)
+    def handle_list_query_error(error):
+        return {"message": f"Bad Request - {error}"}, 400
+
+    @api.errorhandler(ArchiveExtractionError)
+    def handle_archive_extraction_error(error):
+        return {"message": f"Bad Request - {error}"}, 400
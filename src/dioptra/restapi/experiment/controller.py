@@ -28,6 +28,13 @@ from flask_restx import Namespace, Resource
 from injector import inject
 from structlog.stdlib import BoundLogger
 
+from dioptra.restapi.pagination import (
+    list_query_parameters,
+    make_page_response,
+    parse_fields,
+    parse_limit,
+    parse_timestamp,
+)
 from dioptra.restapi.utils import as_api_parser
 
 from .errors import ExperimentDoesNotExistError, ExperimentRegistrationError
@@ -61,14 +68,37 @@ class ExperimentResource(Resource):
         self._experiment_service = experiment_service
         super().__init__(*args, **kwargs)
 
+    @accepts(*list_query_parameters, api=api)
     @responds(schema=ExperimentSchema(many=True), api=api)
-    def get(self) -> List[Experiment]:
-        """Gets a list of all registered experiments."""
+    def get(self) -> Response:
+        """Gets a list of all registered experiments.
+
+        The list can be filtered by creation time. If `limit` is set, the list is
+        returned in pages and the cursor for the next page is returned in the
+        `X-Next-Cursor` header.
+        """
         log: BoundLogger = LOGGER.new(
             request_id=str(uuid.uuid4()), resource="experiment", request_type="GET"
         )  # noqa: F841
         log.info("Request received")
-        return self._experiment_service.get_all(log=log)
+        query = request.parsed_args
+        fields = parse_fields(query.get("fields"), ExperimentSchema)
+        limit = parse_limit(query.get("limit"))
+        experiments: List[Experiment] = self._experiment_service.get_all(
+            created_after=parse_timestamp(query.get("createdAfter")),
+            created_before=parse_timestamp(query.get("createdBefore")),
+            limit=limit,
+            cursor=query.get("cursor"),
+            log=log,
+        )
+        return make_page_response(
+            experiments,
+            ExperimentSchema,
+            Experiment.created_on,
+            Experiment.experiment_id,
+            limit=limit,
+            fields=fields,
+        )
 
     @api.expect(as_api_parser(api, ExperimentRegistrationSchema))
     @accepts(ExperimentRegistrationSchema, api=api)
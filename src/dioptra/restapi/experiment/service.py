@@ -23,9 +23,11 @@ from typing import List, Optional
 import structlog
 from injector import inject
 from mlflow.exceptions import RestException
+from sqlalchemy import select
 from structlog.stdlib import BoundLogger
 
 from dioptra.restapi.app import db
+from dioptra.restapi.pagination import filter_created_on, paginate
 from dioptra.restapi.shared.mlflow_tracking.service import MLFlowTrackingService
 from dioptra.restapi.utils import slugify
 
@@ -136,10 +138,30 @@ class ExperimentService(object):
         return experiment
 
     @staticmethod
-    def get_all(**kwargs) -> List[Experiment]:
+    def get_all(
+        created_after: Optional[datetime.datetime] = None,
+        created_before: Optional[datetime.datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **kwargs,
+    ) -> List[Experiment]:
         log: BoundLogger = kwargs.get("log", LOGGER.new())  # noqa: F841
 
-        return Experiment.query.filter_by(is_deleted=False).all()  # type: ignore
+        stmt = filter_created_on(
+            select(Experiment).filter_by(is_deleted=False),
+            Experiment.created_on,
+            created_after=created_after,
+            created_before=created_before,
+        )
+        stmt = paginate(
+            stmt,
+            Experiment.created_on,
+            Experiment.experiment_id,
+            limit=limit,
+            cursor=cursor,
+        )
+
+        return db.session.scalars(stmt).all()  # type: ignore
 
     @staticmethod
     def get_by_id(experiment_id: int, **kwargs) -> Optional[Experiment]:
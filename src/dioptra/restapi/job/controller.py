@@ -18,19 +18,34 @@
 from __future__ import annotations
 
 import uuid
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 import structlog
+from flask import request
+from flask.wrappers import Response
 from flask_accepts import accepts, responds
 from flask_restx import Namespace, Resource
 from injector import inject
 from structlog.stdlib import BoundLogger
 
+from dioptra.restapi.pagination import (
+    list_query_parameters,
+    make_page_response,
+    parse_fields,
+    parse_limit,
+    parse_timestamp,
+)
 from dioptra.restapi.utils import as_api_parser
 
 from .errors import JobDoesNotExistError, JobSubmissionError
-from .model import Job, JobForm, JobFormData
-from .schema import JobSchema, job_submit_form_schema
+from .model import Job, JobBatchForm, JobBatchFormData, JobForm, JobFormData
+from .schema import (
+    JobBatchSchema,
+    JobSchema,
+    job_batch_submit_form_schema,
+    job_list_query_parameters,
+    job_submit_form_schema,
+)
 from .service import JobService
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
@@ -55,14 +70,35 @@ class JobResource(Resource):
         self._job_service = job_service
         super().__init__(*args, **kwargs)
 
+    @accepts(*list_query_parameters, *job_list_query_parameters, api=api)
     @responds(schema=JobSchema(many=True), api=api)
-    def get(self) -> List[Job]:
-        """Gets a list of all submitted jobs."""
+    def get(self) -> Response:
+        """Gets a list of all submitted jobs.
+
+        The list can be filtered by status, experiment, queue, and creation time. If
+        `limit` is set, the list is returned in pages and the cursor for the next page
+        is returned in the `X-Next-Cursor` header.
+        """
         log: BoundLogger = LOGGER.new(
             request_id=str(uuid.uuid4()), resource="job", request_type="GET"
         )  # noqa: F841
         log.info("Request received")
-        return self._job_service.get_all(log=log)
+        query = request.parsed_args
+        fields = parse_fields(query.get("fields"), JobSchema)
+        limit = parse_limit(query.get("limit"))
+        jobs: List[Job] = self._job_service.get_all(
+            status=query.get("status"),
+            experiment_id=query.get("experimentId"),
+            queue_id=query.get("queueId"),
+            created_after=parse_timestamp(query.get("createdAfter")),
+            created_before=parse_timestamp(query.get("createdBefore")),
+            limit=limit,
+            cursor=query.get("cursor"),
+            log=log,
+        )
+        return make_page_response(
+            jobs, JobSchema, Job.created_on, Job.job_id, limit=limit, fields=fields
+        )
 
     @api.expect(as_api_parser(api, job_submit_form_schema))
     @accepts(job_submit_form_schema, api=api)
@@ -88,6 +124,54 @@ class JobResource(Resource):
         return self._job_service.submit(job_form_data=job_form_data, log=log)
 
 
+@api.route("/batch")
+class JobBatchResource(Resource):
+    """Lets you POST to create a batch of jobs that share the same workflow."""
+
+    @inject
+    def __init__(
+        self,
+        *args,
+        job_service: JobService,
+        **kwargs,
+    ) -> None:
+        self._job_service = job_service
+        super().__init__(*args, **kwargs)
+
+    @api.expect(as_api_parser(api, job_batch_submit_form_schema))
+    @accepts(job_batch_submit_form_schema, api=api)
+    @responds(schema=JobBatchSchema, api=api)
+    def post(self) -> Dict[str, Any]:
+        """Creates a batch of jobs via a job submission form with an attached file.
+
+        One job is submitted for each `entry_point_kwargs` value in the form. The
+        workflow is uploaded once and shared by every job in the batch.
+        """
+        log: BoundLogger = LOGGER.new(
+            request_id=str(uuid.uuid4()), resource="jobBatch", request_type="POST"
+        )  # noqa: F841
+        job_batch_form: JobBatchForm = JobBatchForm()
+
+        log.info("Request received")
+
+        if not job_batch_form.validate_on_submit():
+            log.error("Form validation failed")
+            raise JobSubmissionError
+
+        log.info("Form validation successful")
+        job_batch_form_data: JobBatchFormData = (
+            self._job_service.extract_data_from_batch_form(
+                job_batch_form=job_batch_form,
+                log=log,
+            )
+        )
+        jobs: List[Job] = self._job_service.submit_batch(
+            job_batch_form_data=job_batch_form_data, log=log
+        )
+
+        return {"job_ids": [job.job_id for job in jobs]}
+
+
 @api.route("/<string:jobId>")
 @api.param("jobId", "A string specifying a job's UUID.")
 class JobIdResource(Resource):
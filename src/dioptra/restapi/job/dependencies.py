@@ -28,6 +28,7 @@ from injector import Binder, Module, provider
 from redis import Redis
 
 from dioptra.restapi.shared.rq.service import RQService
+from dioptra.restapi.shared.s3.service import S3_CLIENT_CONFIG
 
 from .schema import JobFormSchema
 
@@ -69,7 +70,9 @@ def _bind_s3_service_configuration(binder: Binder) -> None:
     s3_endpoint_url: Optional[str] = os.getenv("MLFLOW_S3_ENDPOINT_URL")
 
     s3_session: Session = Session()
-    s3_client: BaseClient = s3_session.client("s3", endpoint_url=s3_endpoint_url)
+    s3_client: BaseClient = s3_session.client(
+        "s3", endpoint_url=s3_endpoint_url, config=S3_CLIENT_CONFIG
+    )
 
     binder.bind(Session, to=s3_session, scope=request)
     binder.bind(BaseClient, to=s3_client, scope=request)
@@ -18,16 +18,17 @@
 from __future__ import annotations
 
 import datetime
-from typing import Optional
+from typing import List, Optional
 
 from flask_wtf import FlaskForm
 from flask_wtf.file import FileAllowed, FileField, FileRequired
 from typing_extensions import TypedDict
 from werkzeug.datastructures import FileStorage
-from wtforms.fields import StringField
+from wtforms.fields import Field, StringField
 from wtforms.validators import UUID, InputRequired
 from wtforms.validators import Optional as OptionalField
 from wtforms.validators import Regexp, ValidationError
+from wtforms.widgets import TextInput
 
 from dioptra.restapi.app import db
 from dioptra.restapi.utils import slugify
@@ -72,7 +73,7 @@ class Job(db.Model):
         db.BigInteger(), db.ForeignKey("experiments.experiment_id"), index=True
     )
     queue_id = db.Column(db.BigInteger(), db.ForeignKey("queues.queue_id"), index=True)
-    created_on = db.Column(db.DateTime())
+    created_on = db.Column(db.DateTime(), index=True)
     last_modified = db.Column(db.DateTime())
     timeout = db.Column(db.Text())
     workflow_uri = db.Column(db.Text())
@@ -240,3 +241,79 @@ class JobFormData(TypedDict, total=False):
     entry_point_kwargs: Optional[str]
     depends_on: Optional[str]
     workflow: FileStorage
+
+
+class StringListField(Field):
+    """A form field that collects every value submitted under the same field name."""
+
+    widget = TextInput()
+
+    def process_formdata(self, valuelist: List[str]) -> None:
+        self.data = [value.strip() for value in valuelist]
+
+    def _value(self) -> str:
+        return ""
+
+
+class JobBatchForm(JobForm):
+    """The batch job submission form.
+
+    The batch form accepts the same fields as :py:class:`.JobForm`, except that the
+    `entry_point_kwargs` field can be repeated. A separate job is submitted for each
+    value of `entry_point_kwargs` and every job shares the same uploaded workflow.
+
+    Attributes:
+        entry_point_kwargs: The entry point parameter values to use for each job in the
+            batch. Each value is a string with the following format:
+            `-P param1=value1 -P param2=value2`. An empty value submits a job that uses
+            the default values in the MLproject file.
+    """
+
+    entry_point_kwargs = StringListField(
+        "MLproject Parameter Overrides",
+        description="The entry point parameter values to use for each job in the "
+        'batch. Each value is a string with the following format: "-P param1=value1 '
+        '-P param2=value2". An empty value submits a job that uses the default values '
+        "in the MLproject file.",
+    )
+
+    def validate_entry_point_kwargs(self, field):
+        """Validates that at least one set of entry point parameters was submitted.
+
+        Args:
+            field: The form field for `entry_point_kwargs`.
+        """
+        if not field.data:
+            raise ValidationError(
+                "Bad Request - The batch must contain at least one set of entry point "
+                "parameters."
+            )
+
+
+class JobBatchFormData(TypedDict, total=False):
+    """The data extracted from the batch job submission form.
+
+    Attributes:
+        experiment_id: An integer identifying the registered experiment.
+        experiment_name: The name of the registered experiment.
+        queue_id: An integer identifying a registered queue.
+        queue: The name of an active queue.
+        timeout: The maximum alloted time for a job before it times out and is stopped.
+        entry_point: The name of the entry point in the MLproject file to run.
+        entry_point_kwargs: The entry point parameter values to use for each job in the
+            batch, one job per list item. A `None` item means the default values in the
+            MLproject file will be used.
+        depends_on: A job UUID to set as a dependency for all jobs in the batch.
+        workflow: A tarball archive or zip file containing, at a minimum, a MLproject
+            file and its associated entry point scripts.
+    """
+
+    experiment_id: int
+    experiment_name: str
+    queue_id: int
+    queue: str
+    timeout: Optional[str]
+    entry_point: str
+    entry_point_kwargs: List[Optional[str]]
+    depends_on: Optional[str]
+    workflow: FileStorage
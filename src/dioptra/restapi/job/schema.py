@@ -17,19 +17,21 @@
 """The schemas for serializing/deserializing the job endpoint objects.
 
 .. |Job| replace:: :py:class:`~.model.Job`
+.. |JobBatchForm| replace:: :py:class:`~.model.JobBatchForm`
+.. |JobBatchFormData| replace:: :py:class:`~.model.JobBatchFormData`
 .. |JobForm| replace:: :py:class:`~.model.JobForm`
 .. |JobFormData| replace:: :py:class:`~.model.JobFormData`
 """
 from __future__ import annotations
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from marshmallow import Schema, fields, post_dump, post_load, pre_dump, validate
 from werkzeug.datastructures import FileStorage
 
 from dioptra.restapi.utils import slugify
 
-from .model import Job, JobForm, JobFormData
+from .model import Job, JobBatchForm, JobBatchFormData, JobForm, JobFormData
 
 
 class JobSchema(Schema):
@@ -227,6 +229,72 @@ class JobFormSchema(Schema):
         return self.__model__(**data)
 
 
+class JobBatchSchema(Schema):
+    """The schema for the result of a batch job submission.
+
+    Attributes:
+        jobIds: The UUIDs of the submitted jobs, in the same order as the submitted
+            entry point parameters.
+    """
+
+    jobIds = fields.List(
+        fields.String(),
+        attribute="job_ids",
+        metadata=dict(
+            description="The UUIDs of the submitted jobs, in the same order as the "
+            "submitted entry point parameters.",
+        ),
+    )
+
+
+class JobBatchFormSchema(JobFormSchema):
+    """The schema for the information stored in a submitted batch job form.
+
+    Attributes:
+        entry_point_kwargs: The entry point parameter values to use for each job in the
+            batch. Each value is a string with the following format: `-P param1=value1
+            -P param2=value2`. An empty value means the default values in the MLproject
+            file will be used.
+    """
+
+    __model__ = JobBatchFormData
+
+    entry_point_kwargs = fields.List(
+        fields.String(allow_none=True),
+        required=True,
+        metadata=dict(
+            description="The entry point parameter values to use for each job in the "
+            'batch. Each value is a string with the following format: "-P '
+            'param1=value1 -P param2=value2". An empty value means the default values '
+            "in the MLproject file will be used.",
+        ),
+    )
+
+    @pre_dump
+    def extract_data_from_form(
+        self, data: JobBatchForm, many: bool, **kwargs
+    ) -> Dict[str, Any]:
+        """Extracts data from the |JobBatchForm| for validation."""
+        entry_point_kwargs: List[str] = data.entry_point_kwargs.data or []
+
+        return {
+            "experiment_name": slugify(data.experiment_name.data),
+            "queue": slugify(data.queue.data),
+            "timeout": data.timeout.data or None,
+            "entry_point": data.entry_point.data,
+            "entry_point_kwargs": [x or None for x in entry_point_kwargs],
+            "depends_on": data.depends_on.data or None,
+            "workflow": data.workflow.data,
+        }
+
+    @post_dump
+    def serialize_object(
+        self, data: Dict[str, Any], many: bool, **kwargs
+    ) -> JobBatchFormData:
+        """Creates a |JobBatchFormData| object from the validated data."""
+        return self.__model__(**data)
+
+
 job_submit_form_schema = [
     dict(
         name="experiment_name",
@@ -284,3 +352,48 @@ job_submit_form_schema = [
         "and its associated entry point scripts.",
     ),
 ]
+
+
+job_batch_submit_form_schema = [
+    x for x in job_submit_form_schema if x["name"] != "entry_point_kwargs"
+]
+job_batch_submit_form_schema.insert(
+    4,
+    dict(
+        name="entry_point_kwargs",
+        type=str,
+        location="form",
+        required=True,
+        action="append",
+        help="The entry point parameter values to use for a job in the batch. Repeat "
+        "this field once per job. Each value is a string with the following format: "
+        '"-P param1=value1 -P param2=value2". An empty value means the default values '
+        "in the MLproject file will be used.",
+    ),
+)
+
+
+job_list_query_parameters = [
+    dict(
+        name="status",
+        type=str,
+        location="args",
+        required=False,
+        choices=("queued", "started", "deferred", "finished", "failed"),
+        help="Only return jobs with this status.",
+    ),
+    dict(
+        name="experimentId",
+        type=int,
+        location="args",
+        required=False,
+        help="Only return jobs that belong to this experiment.",
+    ),
+    dict(
+        name="queueId",
+        type=int,
+        location="args",
+        required=False,
+        help="Only return jobs that were submitted to this queue.",
+    ),
+]
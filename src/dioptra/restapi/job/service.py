@@ -18,40 +18,48 @@
 from __future__ import annotations
 
 import datetime
-import uuid
+import hashlib
 from pathlib import Path
-from typing import List, Optional
+from typing import List, Optional, Union
 
 import structlog
 from injector import inject
 from rq.job import Job as RQJob
+from sqlalchemy import select
 from structlog.stdlib import BoundLogger
+from werkzeug.datastructures import FileStorage
 from werkzeug.utils import secure_filename
 
 from dioptra.restapi.app import db
 from dioptra.restapi.experiment.service import ExperimentService
+from dioptra.restapi.pagination import filter_created_on, paginate
 from dioptra.restapi.queue.service import QueueService
 from dioptra.restapi.shared.rq.service import RQService
 from dioptra.restapi.shared.s3.service import S3Service
 
 from .errors import JobWorkflowUploadError
-from .model import Job, JobForm, JobFormData
-from .schema import JobFormSchema
+from .model import Job, JobBatchForm, JobBatchFormData, JobForm, JobFormData
+from .schema import JobBatchFormSchema, JobFormSchema
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
+WORKFLOW_BUCKET = "workflow"
+WORKFLOW_DIGEST_CHUNK_SIZE = 1024 * 1024
+
 
 class JobService(object):
     @inject
     def __init__(
         self,
         job_form_schema: JobFormSchema,
+        job_batch_form_schema: JobBatchFormSchema,
         rq_service: RQService,
         s3_service: S3Service,
         experiment_service: ExperimentService,
         queue_service: QueueService,
     ) -> None:
         self._job_form_schema = job_form_schema
+        self._job_batch_form_schema = job_batch_form_schema
         self._rq_service = rq_service
         self._s3_service = s3_service
         self._experiment_service = experiment_service
@@ -74,10 +82,38 @@ class JobService(object):
         )
 
     @staticmethod
-    def get_all(**kwargs) -> List[Job]:
+    def get_all(
+        status: Optional[str] = None,
+        experiment_id: Optional[int] = None,
+        queue_id: Optional[int] = None,
+        created_after: Optional[datetime.datetime] = None,
+        created_before: Optional[datetime.datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **kwargs,
+    ) -> List[Job]:
         log: BoundLogger = kwargs.get("log", LOGGER.new())  # noqa: F841
 
-        return Job.query.all()  # type: ignore
+        stmt = select(Job)
+
+        if status is not None:
+            stmt = stmt.where(Job.status == status)
+
+        if experiment_id is not None:
+            stmt = stmt.where(Job.experiment_id == experiment_id)
+
+        if queue_id is not None:
+            stmt = stmt.where(Job.queue_id == queue_id)
+
+        stmt = filter_created_on(
+            stmt,
+            Job.created_on,
+            created_after=created_after,
+            created_before=created_before,
+        )
+        stmt = paginate(stmt, Job.created_on, Job.job_id, limit=limit, cursor=cursor)
+
+        return db.session.scalars(stmt).all()  # type: ignore
 
     @staticmethod
     def get_by_id(job_id: str, **kwargs) -> Job:
@@ -104,6 +140,29 @@ class JobService(object):
 
         return job_form_data
 
+    def extract_data_from_batch_form(
+        self, job_batch_form: JobBatchForm, **kwargs
+    ) -> JobBatchFormData:
+        from dioptra.restapi.models import Experiment, Queue
+
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+
+        job_batch_form_data: JobBatchFormData = self._job_batch_form_schema.dump(
+            job_batch_form
+        )
+
+        experiment: Experiment = self._experiment_service.get_by_name(
+            job_batch_form_data["experiment_name"], log=log
+        )
+        queue: Queue = self._queue_service.get_unlocked_by_name(
+            job_batch_form_data["queue"], log=log
+        )
+
+        job_batch_form_data["experiment_id"] = experiment.experiment_id
+        job_batch_form_data["queue_id"] = queue.queue_id
+
+        return job_batch_form_data
+
     def submit(self, job_form_data: JobFormData, **kwargs) -> Job:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
 
@@ -141,19 +200,99 @@ class JobService(object):
 
         return new_job
 
-    def _upload_workflow(self, job_form_data: JobFormData, **kwargs) -> Optional[str]:
+    def submit_batch(
+        self, job_batch_form_data: JobBatchFormData, **kwargs
+    ) -> List[Job]:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
 
-        upload_dir = Path(uuid.uuid4().hex)
-        workflow_filename = upload_dir / secure_filename(
-            job_form_data["workflow"].filename or ""
+        workflow_uri: Optional[str] = self._upload_workflow(
+            job_batch_form_data, log=log
         )
 
+        if workflow_uri is None:
+            log.error(
+                "Failed to upload workflow to backend storage",
+                workflow_filename=secure_filename(
+                    job_batch_form_data["workflow"].filename or ""
+                ),
+            )
+            raise JobWorkflowUploadError
+
+        new_jobs: List[Job] = []
+
+        for entry_point_kwargs in job_batch_form_data["entry_point_kwargs"]:
+            job_form_data: JobFormData = {
+                "experiment_id": job_batch_form_data["experiment_id"],
+                "queue_id": job_batch_form_data["queue_id"],
+                "timeout": job_batch_form_data.get("timeout"),
+                "entry_point": job_batch_form_data["entry_point"],
+                "entry_point_kwargs": entry_point_kwargs,
+                "depends_on": job_batch_form_data.get("depends_on"),
+            }
+            new_job: Job = self.create(job_form_data, log=log)
+            new_job.workflow_uri = workflow_uri
+            new_jobs.append(new_job)
+
+        rq_jobs: List[RQJob] = self._rq_service.submit_mlflow_jobs(
+            queue=job_batch_form_data["queue"],
+            workflow_uri=workflow_uri,
+            experiment_id=job_batch_form_data["experiment_id"],
+            entry_point=job_batch_form_data["entry_point"],
+            entry_point_kwargs=job_batch_form_data["entry_point_kwargs"],
+            depends_on=job_batch_form_data.get("depends_on"),
+            timeout=job_batch_form_data.get("timeout"),
+            log=log,
+        )
+
+        for new_job, rq_job in zip(new_jobs, rq_jobs):
+            new_job.job_id = rq_job.get_id()
+
+        db.session.add_all(new_jobs)
+        db.session.commit()
+
+        log.info("Job batch submission successful", num_jobs=len(new_jobs))
+
+        return new_jobs
+
+    def _upload_workflow(
+        self, job_form_data: Union[JobFormData, JobBatchFormData], **kwargs
+    ) -> Optional[str]:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+
+        workflow: FileStorage = job_form_data["workflow"]
+        workflow_digest: str = self._compute_workflow_digest(workflow)
+        workflow_filename = Path(workflow_digest) / secure_filename(
+            workflow.filename or ""
+        )
+
+        # Workflows are stored under the digest of their contents, so resubmitting an
+        # identical archive reuses the stored copy instead of uploading it again.
+        if self._s3_service.object_exists(
+            bucket=WORKFLOW_BUCKET, key=str(workflow_filename), log=log
+        ):
+            log.info("Workflow already uploaded", workflow_digest=workflow_digest)
+            return self._s3_service.as_uri(
+                bucket=WORKFLOW_BUCKET, key=str(workflow_filename), log=log
+            )
+
         workflow_uri: Optional[str] = self._s3_service.upload(
-            fileobj=job_form_data["workflow"],
-            bucket="workflow",
+            fileobj=workflow,
+            bucket=WORKFLOW_BUCKET,
             key=str(workflow_filename),
             log=log,
         )
 
         return workflow_uri
+
+    @staticmethod
+    def _compute_workflow_digest(workflow: FileStorage) -> str:
+        digest = hashlib.sha256()
+
+        for chunk in iter(
+            lambda: workflow.stream.read(WORKFLOW_DIGEST_CHUNK_SIZE), b""
+        ):
+            digest.update(chunk)
+
+        workflow.stream.seek(0)
+
+        return digest.hexdigest()
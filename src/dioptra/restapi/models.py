@@ -22,7 +22,7 @@ from .experiment.model import (
     ExperimentRegistrationForm,
     ExperimentRegistrationFormData,
 )
-from .job.model import Job, JobForm, JobFormData
+from .job.model import Job, JobBatchForm, JobBatchFormData, JobForm, JobFormData
 from .queue.model import (
     Queue,
     QueueLock,
@@ -41,6 +41,8 @@ __all__ = [
     "ExperimentRegistrationForm",
     "ExperimentRegistrationFormData",
     "Job",
+    "JobBatchForm",
+    "JobBatchFormData",
     "JobForm",
     "JobFormData",
     "Queue",
@@ -0,0 +1,296 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""Utilities for paginating, filtering, and trimming the list endpoints.
+
+The list endpoints use keyset (cursor) pagination ordered by the creation timestamp
+and the primary key of each record. Each full page is returned with an opaque cursor
+that encodes the sort key of its last record, and the next page is fetched by
+selecting the records that sort after that key. Unlike offset pagination, the cost of
+fetching a page does not grow with the number of pages that came before it.
+
+.. |Response| replace:: :py:class:`~flask.Response`
+.. |Schema| replace:: :py:class:`~marshmallow.Schema`
+.. |Select| replace:: :py:class:`~sqlalchemy.sql.expression.Select`
+"""
+from __future__ import annotations
+
+import base64
+import binascii
+import datetime
+import json
+from typing import Any, Optional, Sequence, Tuple, Type
+
+from flask import jsonify
+from flask.wrappers import Response
+from marshmallow import Schema
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import InstrumentedAttribute
+from sqlalchemy.sql.expression import Select
+
+MAX_PAGE_LIMIT: int = 1000
+NEXT_CURSOR_HEADER: str = "X-Next-Cursor"
+
+list_query_parameters = [
+    dict(
+        name="limit",
+        type=int,
+        location="args",
+        required=False,
+        help="The maximum number of records to return. If omitted, all matching "
+        f"records are returned. Must be between 1 and {MAX_PAGE_LIMIT}.",
+    ),
+    dict(
+        name="cursor",
+        type=str,
+        location="args",
+        required=False,
+        help=f"The opaque cursor returned in the {NEXT_CURSOR_HEADER} header of the "
+        "previous page. If omitted, the first page is returned.",
+    ),
+    dict(
+        name="fields",
+        type=str,
+        location="args",
+        required=False,
+        help="A comma-separated list of the fields to include for each record. If "
+        "omitted, all fields are included.",
+    ),
+    dict(
+        name="createdAfter",
+        type=str,
+        location="args",
+        required=False,
+        help="Only return records created on or after this ISO 8601 timestamp.",
+    ),
+    dict(
+        name="createdBefore",
+        type=str,
+        location="args",
+        required=False,
+        help="Only return records created before this ISO 8601 timestamp.",
+    ),
+]
+
+
+class ListQueryError(Exception):
+    """The list endpoint query parameters are invalid."""
+
+
+def encode_cursor(created_on: datetime.datetime, record_id: Any) -> str:
+    """Encodes the sort key of a record as an opaque cursor.
+
+    Args:
+        created_on: The creation timestamp of the record.
+        record_id: The primary key of the record.
+
+    Returns:
+        A URL-safe cursor string.
+    """
+    payload = json.dumps([created_on.isoformat(), record_id]).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime.datetime, Any]:
+    """Decodes a cursor created by :py:func:`encode_cursor`.
+
+    Args:
+        cursor: The cursor string.
+
+    Returns:
+        A tuple of the creation timestamp and the primary key of the record.
+
+    Raises:
+        ListQueryError: If the cursor is malformed.
+    """
+    try:
+        created_on, record_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode("ascii"))
+        )
+        return datetime.datetime.fromisoformat(created_on), record_id
+
+    except (binascii.Error, TypeError, ValueError) as err:
+        raise ListQueryError(f"Invalid cursor: {cursor}") from err
+
+
+def parse_timestamp(timestamp: Optional[str]) -> Optional[datetime.datetime]:
+    """Parses an optional ISO 8601 timestamp query parameter.
+
+    Args:
+        timestamp: The timestamp string, or `None`.
+
+    Returns:
+        The parsed timestamp, or `None` if no timestamp was provided.
+
+    Raises:
+        ListQueryError: If the timestamp is not in ISO 8601 format.
+    """
+    if not timestamp:
+        return None
+
+    try:
+        return datetime.datetime.fromisoformat(timestamp)
+
+    except ValueError as err:
+        raise ListQueryError(f"Invalid timestamp: {timestamp}") from err
+
+
+def parse_limit(limit: Optional[int]) -> Optional[int]:
+    """Validates an optional page size query parameter.
+
+    Args:
+        limit: The requested page size, or `None`.
+
+    Returns:
+        The page size, or `None` if no page size was provided.
+
+    Raises:
+        ListQueryError: If the page size is outside of the allowed range.
+    """
+    if limit is not None and not 1 <= limit <= MAX_PAGE_LIMIT:
+        raise ListQueryError(f"The limit must be between 1 and {MAX_PAGE_LIMIT}.")
+
+    return limit
+
+
+def parse_fields(
+    fields: Optional[str], schema: Type[Schema]
+) -> Optional[Tuple[str, ...]]:
+    """Parses the `fields` query parameter into a tuple of schema field names.
+
+    Args:
+        fields: A comma-separated list of field names, or `None`.
+        schema: The |Schema| class used to serialize the records.
+
+    Returns:
+        A tuple of field names to pass to the `only` argument of the |Schema|, or
+        `None` if all fields should be serialized.
+
+    Raises:
+        ListQueryError: If a field name is not defined in the |Schema|.
+    """
+    if not fields:
+        return None
+
+    field_names = tuple(x.strip() for x in fields.split(",") if x.strip())
+    unknown_fields = sorted(set(field_names) - set(schema._declared_fields))
+
+    if unknown_fields:
+        raise ListQueryError(f"Unknown fields: {', '.join(unknown_fields)}")
+
+    return field_names
+
+
+def filter_created_on(
+    stmt: Select,
+    created_on: InstrumentedAttribute,
+    created_after: Optional[datetime.datetime] = None,
+    created_before: Optional[datetime.datetime] = None,
+) -> Select:
+    """Restricts a query to the records created within a time range.
+
+    Args:
+        stmt: The |Select| statement to filter.
+        created_on: The creation timestamp column.
+        created_after: If provided, only select records created on or after this time.
+        created_before: If provided, only select records created before this time.
+
+    Returns:
+        The filtered |Select| statement.
+    """
+    if created_after is not None:
+        stmt = stmt.where(created_on >= created_after)
+
+    if created_before is not None:
+        stmt = stmt.where(created_on < created_before)
+
+    return stmt
+
+
+def paginate(
+    stmt: Select,
+    created_on: InstrumentedAttribute,
+    record_id: InstrumentedAttribute,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+) -> Select:
+    """Orders a query by creation timestamp and primary key and selects one page.
+
+    Args:
+        stmt: The |Select| statement for the records.
+        created_on: The creation timestamp column.
+        record_id: The primary key column.
+        limit: The maximum number of records on the page. If `None`, all remaining
+            records are selected.
+        cursor: The cursor returned with the previous page. If `None`, the first page
+            is selected.
+
+    Returns:
+        The |Select| statement for the page.
+    """
+    stmt = stmt.order_by(created_on, record_id)
+
+    if cursor is not None:
+        cursor_created_on, cursor_record_id = decode_cursor(cursor)
+        stmt = stmt.where(
+            or_(
+                created_on > cursor_created_on,
+                and_(created_on == cursor_created_on, record_id > cursor_record_id),
+            )
+        )
+
+    if limit is not None:
+        stmt = stmt.limit(limit)
+
+    return stmt
+
+
+def make_page_response(
+    items: Sequence[Any],
+    schema: Type[Schema],
+    created_on: InstrumentedAttribute,
+    record_id: InstrumentedAttribute,
+    limit: Optional[int] = None,
+    fields: Optional[Tuple[str, ...]] = None,
+) -> Response:
+    """Serializes a page of records into a JSON |Response|.
+
+    Only the requested fields are serialized. If the page is full, the cursor for the
+    next page is returned in the `X-Next-Cursor` header so that the response body
+    remains a plain list of records. A page that is not full is the last page.
+
+    Args:
+        items: The records on the page.
+        schema: The |Schema| class used to serialize the records.
+        created_on: The creation timestamp column used to order the records.
+        record_id: The primary key column used to order the records.
+        limit: The page size that was requested, or `None` if all records were
+            requested.
+        fields: The names of the fields to serialize. If `None`, all fields are
+            serialized.
+
+    Returns:
+        A JSON |Response| containing the serialized records.
+    """
+    response: Response = jsonify(schema(many=True, only=fields).dump(items))
+
+    if limit is not None and items and len(items) == limit:
+        last = items[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(
+            getattr(last, created_on.key), getattr(last, record_id.key)
+        )
+
+    return response
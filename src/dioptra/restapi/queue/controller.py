@@ -28,6 +28,13 @@ from flask_restx import Namespace, Resource
 from injector import inject
 from structlog.stdlib import BoundLogger
 
+from dioptra.restapi.pagination import (
+    list_query_parameters,
+    make_page_response,
+    parse_fields,
+    parse_limit,
+    parse_timestamp,
+)
 from dioptra.restapi.utils import as_api_parser
 
 from .errors import QueueDoesNotExistError, QueueRegistrationError
@@ -53,14 +60,37 @@ class QueueResource(Resource):
         self._queue_service = queue_service
         super().__init__(*args, **kwargs)
 
+    @accepts(*list_query_parameters, api=api)
     @responds(schema=QueueSchema(many=True), api=api)
-    def get(self) -> List[Queue]:
-        """Gets a list of all registered queues."""
+    def get(self) -> Response:
+        """Gets a list of all registered queues.
+
+        The list can be filtered by creation time. If `limit` is set, the list is
+        returned in pages and the cursor for the next page is returned in the
+        `X-Next-Cursor` header.
+        """
         log: BoundLogger = LOGGER.new(
             request_id=str(uuid.uuid4()), resource="queue", request_type="GET"
         )  # noqa: F841
         log.info("Request received")
-        return self._queue_service.get_all_unlocked(log=log)
+        query = request.parsed_args
+        fields = parse_fields(query.get("fields"), QueueSchema)
+        limit = parse_limit(query.get("limit"))
+        queues: List[Queue] = self._queue_service.get_all_unlocked(
+            created_after=parse_timestamp(query.get("createdAfter")),
+            created_before=parse_timestamp(query.get("createdBefore")),
+            limit=limit,
+            cursor=query.get("cursor"),
+            log=log,
+        )
+        return make_page_response(
+            queues,
+            QueueSchema,
+            Queue.created_on,
+            Queue.queue_id,
+            limit=limit,
+            fields=fields,
+        )
 
     @api.expect(as_api_parser(api, QueueRegistrationSchema))
     @accepts(QueueRegistrationSchema, api=api)
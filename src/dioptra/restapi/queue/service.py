@@ -22,9 +22,11 @@ from typing import List, Optional
 
 import structlog
 from injector import inject
+from sqlalchemy import select
 from structlog.stdlib import BoundLogger
 
 from dioptra.restapi.app import db
+from dioptra.restapi.pagination import filter_created_on, paginate
 
 from .errors import QueueAlreadyExistsError
 from .model import Queue, QueueLock, QueueRegistrationForm, QueueRegistrationFormData
@@ -131,19 +133,36 @@ class QueueService(object):
         return Queue.query.filter_by(is_deleted=False).all()  # type: ignore
 
     @staticmethod
-    def get_all_unlocked(**kwargs) -> List[Queue]:
+    def get_all_unlocked(
+        created_after: Optional[datetime.datetime] = None,
+        created_before: Optional[datetime.datetime] = None,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        **kwargs,
+    ) -> List[Queue]:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
 
-        log.info("Get full list of unlocked queues")
+        log.info("Get full list of unlocked queues", limit=limit)
 
-        return (  # type: ignore
-            Queue.query.outerjoin(QueueLock, Queue.queue_id == QueueLock.queue_id)
-            .filter(
+        stmt = (
+            select(Queue)
+            .outerjoin(QueueLock, Queue.queue_id == QueueLock.queue_id)
+            .where(
                 QueueLock.queue_id == None,  # noqa: E711
                 Queue.is_deleted == False,  # noqa: E712
             )
-            .all()
         )
+        stmt = filter_created_on(
+            stmt,
+            Queue.created_on,
+            created_after=created_after,
+            created_before=created_before,
+        )
+        stmt = paginate(
+            stmt, Queue.created_on, Queue.queue_id, limit=limit, cursor=cursor
+        )
+
+        return db.session.scalars(stmt).all()  # type: ignore
 
     @staticmethod
     def get_all_locked(**kwargs) -> List[Queue]:
@@ -16,16 +16,23 @@
 # https://creativecommons.org/licenses/by/4.0/legalcode
 from __future__ import annotations
 
+import shutil
 import tarfile
-from pathlib import Path
+from pathlib import Path, PurePosixPath
 from tarfile import TarFile, TarInfo
-from typing import BinaryIO, List, Optional, Union
+from typing import IO, BinaryIO, Iterator, List, Optional, Set, Tuple, Union
 
 import structlog
 from structlog.stdlib import BoundLogger
 
+from .errors import ArchiveExtractionError
+
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
+ARCHIVE_COPY_CHUNK_SIZE = 1024 * 1024
+ARCHIVE_MAX_FILES = 10000
+ARCHIVE_MAX_TOTAL_SIZE = 1024 * 1024 * 1024
+
 
 class IOFileService(object):
     def safe_extract_archive(
@@ -33,68 +40,167 @@ class IOFileService(object):
         output_dir: Union[str, Path],
         archive_file_path: Optional[str] = None,
         archive_fileobj: Optional[BinaryIO] = None,
+        include_suffixes: Optional[List[str]] = None,
+        preserve_paths: bool = False,
+        strip_top_level: bool = False,
+        max_files: int = ARCHIVE_MAX_FILES,
+        max_total_size: int = ARCHIVE_MAX_TOTAL_SIZE,
         **kwargs,
     ) -> List[str]:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
         extracted_files: List[str] = []
 
+        for member_path, f_archive_file in self.iter_archive_members(
+            archive_file_path=archive_file_path,
+            archive_fileobj=archive_fileobj,
+            include_suffixes=include_suffixes,
+            preserve_paths=preserve_paths,
+            strip_top_level=strip_top_level,
+            max_files=max_files,
+            max_total_size=max_total_size,
+            log=log,
+        ):
+            file_path: Path = Path(output_dir) / member_path
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+
+            with file_path.open("wb") as f:
+                shutil.copyfileobj(f_archive_file, f, ARCHIVE_COPY_CHUNK_SIZE)
+
+            log.info("File extracted from archive", extracted_file=str(file_path))
+            extracted_files.append(str(file_path))
+
+        return extracted_files
+
+    def iter_archive_members(
+        self,
+        archive_file_path: Optional[str] = None,
+        archive_fileobj: Optional[BinaryIO] = None,
+        include_suffixes: Optional[List[str]] = None,
+        preserve_paths: bool = False,
+        strip_top_level: bool = False,
+        max_files: int = ARCHIVE_MAX_FILES,
+        max_total_size: int = ARCHIVE_MAX_TOTAL_SIZE,
+        **kwargs,
+    ) -> Iterator[Tuple[PurePosixPath, IO[bytes]]]:
+        """Stream the regular files in an archive without extracting them to disk.
+
+        Each file object reads directly from the archive and is only valid until the
+        iterator is advanced, so consumers must copy or upload it before requesting
+        the next member. Links, devices, and directories are skipped. Every member
+        header is checked before the first file is yielded, so an archive that fails
+        a check yields nothing.
+
+        Args:
+            archive_file_path: The path to the archive file. Ignored if
+                `archive_fileobj` is provided.
+            archive_fileobj: A file object containing the archive.
+            include_suffixes: If provided, only yield files with one of these suffixes.
+            preserve_paths: If `True`, yield each member's sanitized relative path,
+                otherwise yield only its filename.
+            strip_top_level: If `True` and every file is inside the same top-level
+                directory, remove that directory from the yielded paths. Only
+                applies if `preserve_paths` is `True`.
+            max_files: The maximum number of files to yield.
+            max_total_size: The maximum combined size in bytes of the files to yield.
+
+        Yields:
+            Tuples of the member's relative path and a file object for its contents.
+
+        Raises:
+            ArchiveExtractionError: If the archive exceeds `max_files` or
+                `max_total_size`, contains an unsafe path, or contains two members that
+                resolve to the same path.
+        """
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+        members: List[Tuple[PurePosixPath, TarInfo]] = []
+        total_size: int = 0
+
         with self._tarfile_open(
             archive_file_path, archive_fileobj, log=log
         ) as f_archive:
             for archive_file_info in f_archive:
-                safe_file_path: Path = self.sanitize_file_path(
-                    filepath=archive_file_info.name,
-                    path_prefix=output_dir,
-                    log=log,
-                )
+                if not archive_file_info.isfile():
+                    continue
 
-                response: Optional[str] = self.safe_extract_archive_file(
-                    file_path=safe_file_path,
-                    f_archive=f_archive,
-                    archive_file_info=archive_file_info,
-                    log=log,
+                member_path: PurePosixPath = self.sanitize_member_path(
+                    archive_file_info.name, preserve_paths=preserve_paths, log=log
                 )
 
-                if response is not None:
-                    extracted_files.append(response)
+                if (
+                    include_suffixes is not None
+                    and member_path.suffix not in include_suffixes
+                ):
+                    continue
 
-        return extracted_files
+                members.append((member_path, archive_file_info))
+                total_size += archive_file_info.size
 
-    @staticmethod
-    def safe_extract_archive_file(
-        file_path: Path,
-        f_archive: TarFile,
-        archive_file_info: TarInfo,
-        **kwargs,
-    ) -> Optional[str]:
-        log: BoundLogger = kwargs.get("log", LOGGER.new())
+                if len(members) > max_files:
+                    raise ArchiveExtractionError(
+                        f"Archive contains more than {max_files} files."
+                    )
+
+                if total_size > max_total_size:
+                    raise ArchiveExtractionError(
+                        f"Archive contents exceed {max_total_size} bytes."
+                    )
+
+            if preserve_paths and strip_top_level:
+                members = self._strip_top_level(members)
 
-        if not archive_file_info.isfile():
-            return None
+            seen_paths: Set[PurePosixPath] = set()
 
-        f_archive_file = f_archive.extractfile(archive_file_info)
+            for member_path, _ in members:
+                if member_path in seen_paths:
+                    raise ArchiveExtractionError(
+                        f"Archive contains more than one file at {member_path}."
+                    )
 
-        if f_archive_file is None:
-            return None
+                seen_paths.add(member_path)
 
-        with file_path.open("wb") as f:
-            f.write(f_archive_file.read())
+            for member_path, archive_file_info in members:
+                f_archive_file = f_archive.extractfile(archive_file_info)
 
-        log.info("File extracted from archive", extracted_file=str(file_path))
+                if f_archive_file is None:
+                    continue
 
-        return str(file_path)
+                with f_archive_file:
+                    yield member_path, f_archive_file
 
     @staticmethod
-    def sanitize_file_path(
-        filepath: Union[str, Path],
-        path_prefix: Optional[Union[str, Path]] = None,
-        **kwargs,
-    ) -> Path:
+    def _strip_top_level(
+        members: List[Tuple[PurePosixPath, TarInfo]]
+    ) -> List[Tuple[PurePosixPath, TarInfo]]:
+        top_levels: Set[str] = {
+            member_path.parts[0] if len(member_path.parts) > 1 else ""
+            for member_path, _ in members
+        }
+
+        if len(top_levels) != 1 or "" in top_levels:
+            return members
+
+        return [
+            (PurePosixPath(*member_path.parts[1:]), archive_file_info)
+            for member_path, archive_file_info in members
+        ]
+
+    @staticmethod
+    def sanitize_member_path(
+        filepath: str, preserve_paths: bool = False, **kwargs
+    ) -> PurePosixPath:
         log: BoundLogger = kwargs.get("log", LOGGER.new())  # noqa: F841
 
-        path_prefix = path_prefix or Path.cwd()
+        parts: List[str] = [
+            x for x in PurePosixPath(filepath.replace("\\", "/")).parts if x != "/"
+        ]
+
+        if not preserve_paths:
+            parts = parts[-1:]
+
+        if not parts or any(x in {".", ".."} for x in parts):
+            raise ArchiveExtractionError(f"Archive contains an unsafe path {filepath}.")
 
-        return Path(path_prefix) / Path(filepath).name
+        return PurePosixPath(*parts)
 
     @staticmethod
     def _tarfile_open(
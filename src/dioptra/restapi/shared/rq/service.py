@@ -16,7 +16,7 @@
 # https://creativecommons.org/licenses/by/4.0/legalcode
 from __future__ import annotations
 
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 import structlog
 from redis import Redis
@@ -105,3 +105,56 @@ class RQService(object):
         )
 
         return result
+
+    def submit_mlflow_jobs(
+        self,
+        queue: str,
+        workflow_uri: str,
+        experiment_id: int,
+        entry_point: str,
+        entry_point_kwargs: List[Optional[str]],
+        depends_on: Optional[str] = None,
+        timeout: Optional[str] = None,
+        **kwargs,
+    ) -> List[RQJob]:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+
+        q: RQQueue = RQQueue(queue, default_timeout="24h", connection=self._redis)
+        job_dependency: Optional[RQJob] = None
+
+        if depends_on is not None:
+            job_dependency = self.get_rq_job(depends_on, log=log)
+
+        job_datas = []
+
+        for job_entry_point_kwargs in entry_point_kwargs:
+            cmd_kwargs = {
+                "workflow_uri": workflow_uri,
+                "experiment_id": str(experiment_id),
+                "entry_point": entry_point,
+            }
+
+            if job_entry_point_kwargs is not None:
+                cmd_kwargs["entry_point_kwargs"] = job_entry_point_kwargs
+
+            job_datas.append(
+                RQQueue.prepare_data(
+                    self._run_mlflow,
+                    kwargs=cmd_kwargs,
+                    timeout=timeout,
+                    depends_on=job_dependency,
+                )
+            )
+
+        log.info(
+            "Enqueuing job batch",
+            function=self._run_mlflow,
+            num_jobs=len(job_datas),
+            timeout=timeout,
+            depends_on=job_dependency,
+        )
+
+        # enqueue_many() writes every job to Redis in a single pipeline
+        result: List[RQJob] = q.enqueue_many(job_datas)
+
+        return result
@@ -17,20 +17,92 @@
 from __future__ import annotations
 
 import os
-from pathlib import Path
-from typing import IO, Any, Dict, List, Optional, Union
-from urllib.parse import urlunparse
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path, PurePosixPath
+from typing import (
+    IO,
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+from urllib.parse import urlparse, urlunparse
 
 import structlog
+from boto3.exceptions import S3UploadFailedError
+from boto3.s3.transfer import TransferConfig
 from boto3.session import Session
 from botocore.client import BaseClient
-from botocore.exceptions import ClientError
+from botocore.config import Config
+from botocore.exceptions import BotoCoreError, ClientError
 from injector import inject
 from structlog.stdlib import BoundLogger
 from werkzeug.datastructures import FileStorage
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
+DELETE_OBJECTS_MAX_KEYS = 1000
+DELETE_OBJECTS_MAX_WORKERS = 4
+UPLOAD_MAX_WORKERS = 8
+UPLOAD_MAX_ATTEMPTS = 3
+UPLOAD_RETRY_BACKOFF = 0.5
+
+# Task plugin modules are small, so most uploads are single PUTs run concurrently by
+# UPLOAD_MAX_WORKERS threads. Multipart uploads cost at least three requests, so they
+# are reserved for files of 32 MiB or more. Those files are sent in 16 MiB parts,
+# which halves the number of part requests compared to the 8 MiB default.
+UPLOAD_TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=32 * 1024 * 1024,
+    multipart_chunksize=16 * 1024 * 1024,
+    max_concurrency=4,
+)
+
+# Each upload worker can have max_concurrency part requests in flight. The client's
+# connection pool is sized to match, so that concurrent uploads reuse connections
+# instead of discarding them when botocore's default pool of 10 is full.
+S3_CLIENT_CONFIG = Config(
+    max_pool_connections=max(
+        UPLOAD_MAX_WORKERS * UPLOAD_TRANSFER_CONFIG.max_concurrency,
+        DELETE_OBJECTS_MAX_WORKERS,
+    ),
+)
+
+
+@dataclass
+class UploadDirectoryResult(object):
+    """The outcome of uploading a directory to S3.
+
+    Attributes:
+        succeeded: The URIs of the objects that were uploaded, in directory walk
+            order.
+        failed: A mapping of the keys of the objects that could not be uploaded to the
+            error raised by the final attempt.
+    """
+
+    succeeded: List[str] = field(default_factory=list)
+    failed: Dict[str, str] = field(default_factory=dict)
+
+    @property
+    def ok(self) -> bool:
+        """`True` if every file in the directory was uploaded."""
+        return not self.failed
+
+    @property
+    def keys(self) -> List[str]:
+        """The keys of every object in the upload, whether or not it succeeded."""
+        return [urlparse(x).path.lstrip("/") for x in self.succeeded] + list(
+            self.failed
+        )
+
 
 class S3Service(object):
     @inject
@@ -38,7 +110,29 @@ class S3Service(object):
         self._session = session
         self._client = client
 
-    def delete_prefix(self, bucket: str, prefix: str, **kwargs):
+    def delete_prefix(self, bucket: str, prefix: str, **kwargs) -> List[str]:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+
+        return list(self.iter_delete_prefix(bucket=bucket, prefix=prefix, log=log))
+
+    def delete_keys(self, bucket: str, keys: Iterable[str], **kwargs) -> List[str]:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+
+        log.info("Deleting objects from S3", bucket=bucket)
+
+        return [
+            key
+            for batch in self._batched(keys, size=DELETE_OBJECTS_MAX_KEYS)
+            for key in self._delete_objects(bucket, batch, log=log)
+        ]
+
+    def iter_delete_prefix(
+        self,
+        bucket: str,
+        prefix: str,
+        max_workers: int = DELETE_OBJECTS_MAX_WORKERS,
+        **kwargs,
+    ) -> Iterator[str]:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
 
         log.info(
@@ -47,49 +141,100 @@ class S3Service(object):
             prefix=prefix,
         )
 
-        delete_objects_list: List[Dict[str, str]] = [
-            dict(Key=x)
-            for x in self.list_objects(bucket=bucket, prefix=prefix, log=log)
-        ]
+        batches: Iterator[List[str]] = self._batched(
+            self.iter_objects(bucket=bucket, prefix=prefix, log=log),
+            size=DELETE_OBJECTS_MAX_KEYS,
+        )
+        pending: Deque[Future] = deque()
+
+        # Keep at most max_workers batches in flight so that listing the next page
+        # overlaps with deleting the previous ones without buffering the whole prefix.
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch in batches:
+                pending.append(
+                    executor.submit(self._delete_objects, bucket, batch, log=log)
+                )
+
+                if len(pending) >= max_workers:
+                    yield from pending.popleft().result()
+
+            while pending:
+                yield from pending.popleft().result()
+
+    def _delete_objects(self, bucket: str, keys: List[str], **kwargs) -> List[str]:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
 
         response: Dict[str, Any] = self._client.delete_objects(
             Bucket=bucket,
-            Delete=dict(Objects=delete_objects_list),
+            Delete=dict(Objects=[dict(Key=x) for x in keys], Quiet=False),
         )
 
+        for error in response.get("Errors", []):
+            log.error(
+                "Failed to delete object from S3",
+                bucket=bucket,
+                key=error.get("Key"),
+                code=error.get("Code"),
+            )
+
         return [x["Key"] for x in response.get("Deleted", [])]
 
-    def list_directories(self, bucket: str, prefix: str, **kwargs) -> List[str]:
+    def object_exists(self, bucket: str, key: str, **kwargs) -> bool:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+
+        log.info("Checking if object exists in S3", bucket=bucket, key=key)
+
+        try:
+            self._client.head_object(Bucket=bucket, Key=key)
+
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in {"404", "NoSuchKey"}:
+                return False
+
+            log.exception("Failed to fetch object metadata", bucket=bucket, key=key)
+            raise e
+
+        return True
+
+    def iter_directories(self, bucket: str, prefix: str, **kwargs) -> Iterator[str]:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
 
         log.info("Listing directories in S3 bucket", bucket=bucket, prefix=prefix)
+        paginator = self._client.get_paginator("list_objects_v2")
 
         try:
-            response: Dict[str, Any] = self._client.list_objects_v2(
-                Bucket=bucket, Prefix=prefix, Delimiter="/"
-            )
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix, Delimiter="/"):
+                yield from self.extract_directories(
+                    response=page, prefix=prefix, log=log
+                )
 
         except ClientError as e:
             log.exception("Failed to list objects in S3", bucket=bucket, prefix=prefix)
             raise e
 
-        return self.extract_directories(response=response, prefix=prefix, log=log)
-
-    def list_objects(self, bucket: str, prefix: str, **kwargs) -> List[str]:
+    def iter_objects(self, bucket: str, prefix: str = "", **kwargs) -> Iterator[str]:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
 
-        log.info("Listing objects in S3 bucket", bucket=bucket, prefix=prefix)
+        log.info("Iterating over objects in S3 bucket", bucket=bucket, prefix=prefix)
+        paginator = self._client.get_paginator("list_objects_v2")
 
         try:
-            response: Dict[str, Any] = self._client.list_objects_v2(
-                Bucket=bucket, Prefix=prefix
-            )
+            for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+                yield from self.extract_keys(response=page, log=log)
 
         except ClientError as e:
             log.exception("Failed to list objects in S3", bucket=bucket, prefix=prefix)
             raise e
 
-        return self.extract_keys(response=response, log=log)
+    def list_directories(self, bucket: str, prefix: str, **kwargs) -> List[str]:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+
+        return list(self.iter_directories(bucket=bucket, prefix=prefix, log=log))
+
+    def list_objects(self, bucket: str, prefix: str, **kwargs) -> List[str]:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+
+        return list(self.iter_objects(bucket=bucket, prefix=prefix, log=log))
 
     def upload(
         self, fileobj: Union[IO[bytes], FileStorage], bucket: str, key: str, **kwargs
@@ -116,8 +261,10 @@ class S3Service(object):
         bucket: str,
         prefix: str,
         include_suffixes: Optional[List[str]],
+        max_workers: int = UPLOAD_MAX_WORKERS,
+        max_attempts: int = UPLOAD_MAX_ATTEMPTS,
         **kwargs,
-    ) -> Optional[List[str]]:
+    ) -> UploadDirectoryResult:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
 
         log.info(
@@ -142,29 +289,140 @@ class S3Service(object):
                 )
             )
 
-        for upload_spec in upload_spec_list:
-            try:
-                self._client.upload_file(
-                    Filename=upload_spec["source"],
-                    Bucket=bucket,
-                    Key=upload_spec["target"],
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            outcomes: List[Tuple[str, Optional[str]]] = list(
+                executor.map(
+                    lambda x: self._upload_file(
+                        source=x["source"],
+                        bucket=bucket,
+                        key=x["target"],
+                        max_attempts=max_attempts,
+                        log=log,
+                    ),
+                    upload_spec_list,
                 )
+            )
+
+        return self._as_upload_result(bucket=bucket, outcomes=outcomes, log=log)
+
+    def upload_archive_members(
+        self,
+        members: Iterable[Tuple[PurePosixPath, IO[bytes]]],
+        bucket: str,
+        prefix: str,
+        max_attempts: int = UPLOAD_MAX_ATTEMPTS,
+        **kwargs,
+    ) -> UploadDirectoryResult:
+        """Upload archive members to S3 as they are read, without staging to disk.
+
+        The members are uploaded one at a time in the order they are yielded, which
+        makes this suitable for the file objects from
+        :py:meth:`~dioptra.restapi.shared.io_file.service.IOFileService.iter_archive_members`
+        that are only readable until the next member is requested. Members that
+        cannot be rewound are not retried.
+
+        Args:
+            members: An iterable of relative paths and the file objects to upload.
+            bucket: The name of the S3 bucket.
+            prefix: The key prefix to prepend to each member's relative path.
+            max_attempts: The maximum number of times to attempt each upload.
+
+        Returns:
+            An UploadDirectoryResult listing the uploaded and failed objects.
+        """
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+
+        log.info("Uploading archive members to S3", bucket=bucket, prefix=prefix)
+
+        outcomes: List[Tuple[str, Optional[str]]] = [
+            self._upload_file(
+                source=fileobj,
+                bucket=bucket,
+                key=(PurePosixPath(prefix) / member_path).as_posix(),
+                max_attempts=max_attempts,
+                log=log,
+            )
+            for member_path, fileobj in members
+        ]
 
-            except ClientError:
-                log.exception(
+        return self._as_upload_result(bucket=bucket, outcomes=outcomes, log=log)
+
+    def _as_upload_result(
+        self, bucket: str, outcomes: List[Tuple[str, Optional[str]]], **kwargs
+    ) -> UploadDirectoryResult:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+        result = UploadDirectoryResult()
+
+        for key, error in outcomes:
+            if error is None:
+                result.succeeded.append(self.as_uri(bucket=bucket, key=key))
+
+            else:
+                result.failed[key] = error
+
+        if result.ok:
+            log.info("S3 directory upload successful", uri_list=result.succeeded)
+
+        else:
+            log.error(
+                "S3 directory upload incomplete",
+                num_succeeded=len(result.succeeded),
+                failed_keys=list(result.failed),
+            )
+
+        return result
+
+    def _upload_file(
+        self,
+        source: Union[str, IO[bytes]],
+        bucket: str,
+        key: str,
+        max_attempts: int,
+        **kwargs,
+    ) -> Tuple[str, Optional[str]]:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+        error: Optional[str] = None
+
+        if not isinstance(source, str) and not source.seekable():
+            max_attempts = 1
+
+        for attempt in range(1, max_attempts + 1):
+            try:
+                if isinstance(source, str):
+                    self._client.upload_file(
+                        Filename=source,
+                        Bucket=bucket,
+                        Key=key,
+                        Config=UPLOAD_TRANSFER_CONFIG,
+                    )
+
+                else:
+                    source.seek(0)
+                    self._client.upload_fileobj(
+                        Fileobj=source,
+                        Bucket=bucket,
+                        Key=key,
+                        Config=UPLOAD_TRANSFER_CONFIG,
+                    )
+
+                return key, None
+
+            except (BotoCoreError, ClientError, S3UploadFailedError) as e:
+                error = str(e)
+                log.warning(
                     "S3 upload file failed",
-                    filename=upload_spec["source"],
+                    filename=source if isinstance(source, str) else None,
                     bucket=bucket,
-                    key=upload_spec["target"],
+                    key=key,
+                    attempt=attempt,
+                    max_attempts=max_attempts,
+                    error=error,
                 )
-                return None
 
-        uri_list: List[str] = [
-            self.as_uri(bucket=bucket, key=x["target"]) for x in upload_spec_list
-        ]
-        log.info("S3 directory upload successful", uri_list=uri_list)
+            if attempt < max_attempts:
+                time.sleep(UPLOAD_RETRY_BACKOFF * 2 ** (attempt - 1))
 
-        return uri_list
+        return key, error
 
     @staticmethod
     def as_upload_spec(
@@ -217,6 +475,13 @@ class S3Service(object):
 
         return [x["Key"] for x in response.get("Contents", [])]
 
+    @staticmethod
+    def _batched(iterable: Iterable[str], size: int) -> Iterator[List[str]]:
+        iterator: Iterator[str] = iter(iterable)
+
+        while batch := list(islice(iterator, size)):
+            yield batch
+
     @staticmethod
     def normalize_prefix(prefix: str, **kwargs) -> str:
         log: BoundLogger = kwargs.get("log", LOGGER.new())  # noqa: F841
@@ -17,11 +17,13 @@
 """Binding configurations to shared services using dependency injection."""
 from __future__ import annotations
 
+import os
 from typing import Any, Callable, List
 
-from injector import Binder, Module, provider
+from injector import Binder, Module, provider, singleton
 
 from .schema import TaskPluginUploadFormSchema
+from .service import TaskPluginCatalogCache
 
 
 class TaskPluginUploadFormSchemaModule(Module):
@@ -32,13 +34,21 @@ class TaskPluginUploadFormSchemaModule(Module):
         return TaskPluginUploadFormSchema()
 
 
+def _bind_task_plugin_catalog_cache(binder: Binder) -> None:
+    ttl: float = float(os.getenv("DIOPTRA_TASK_PLUGIN_CATALOG_TTL", "30"))
+
+    binder.bind(
+        TaskPluginCatalogCache, to=TaskPluginCatalogCache(ttl=ttl), scope=singleton
+    )
+
+
 def bind_dependencies(binder: Binder) -> None:
     """Binds interfaces to implementations within the main application.
 
     Args:
         binder: A :py:class:`~injector.Binder` object.
     """
-    pass
+    _bind_task_plugin_catalog_cache(binder)
 
 
 def register_providers(modules: List[Callable[..., Any]]) -> None:
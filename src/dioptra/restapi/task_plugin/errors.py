@@ -32,6 +32,10 @@ class TaskPluginUploadError(Exception):
     """The task plugin upload form contains invalid parameters."""
 
 
+class TaskPluginStorageError(Exception):
+    """The service for storing the uploaded task plugin files is unavailable."""
+
+
 def register_error_handlers(api: Api) -> None:
     @api.errorhandler(TaskPluginDoesNotExistError)
     def handle_task_plugin_does_not_exist_error(error):
@@ -61,3 +65,13 @@ def register_error_handlers(api: Api) -> None:
             },
             400,
         )
+
+    @api.errorhandler(TaskPluginStorageError)
+    def handle_task_plugin_storage_error(error):
+        return (
+            {
+                "message": "Service Unavailable - Unable to store the task plugin "
+                "package after upload. Please try again later."
+            },
+            503,
+        )
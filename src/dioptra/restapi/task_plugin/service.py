@@ -17,9 +17,10 @@
 """The server-side functions that perform task plugin endpoint operations."""
 from __future__ import annotations
 
-from pathlib import Path
-from tempfile import TemporaryDirectory
-from typing import List, Optional
+import threading
+import time
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Optional, Tuple
 
 import structlog
 from injector import inject
@@ -27,14 +28,56 @@ from structlog.stdlib import BoundLogger
 from werkzeug.datastructures import FileStorage
 
 from dioptra.restapi.shared.io_file.service import IOFileService
-from dioptra.restapi.shared.s3.service import S3Service
+from dioptra.restapi.shared.s3.service import S3Service, UploadDirectoryResult
 
-from .errors import TaskPluginAlreadyExistsError
+from .errors import TaskPluginAlreadyExistsError, TaskPluginStorageError
 from .model import TaskPlugin, TaskPluginUploadForm, TaskPluginUploadFormData
 from .schema import TaskPluginUploadFormSchema
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
+TaskPluginCatalog = Dict[Tuple[str, str], TaskPlugin]
+"""A mapping of (collection, task plugin name) pairs to task plugins."""
+
+
+class TaskPluginCatalogCache(object):
+    """A thread-safe, in-process cache of task plugin catalogs keyed by bucket.
+
+    Catalogs expire after `ttl` seconds so that changes made by other processes are
+    eventually picked up, and are invalidated immediately when a task plugin is
+    uploaded or deleted in this process.
+    """
+
+    def __init__(self, ttl: float = 30.0) -> None:
+        self._ttl = ttl
+        self._catalogs: Dict[str, Tuple[float, TaskPluginCatalog]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, bucket: str) -> Optional[TaskPluginCatalog]:
+        with self._lock:
+            entry = self._catalogs.get(bucket)
+
+        if entry is None:
+            return None
+
+        created_on, catalog = entry
+
+        if time.monotonic() - created_on >= self._ttl:
+            return None
+
+        return catalog
+
+    def set(self, bucket: str, catalog: TaskPluginCatalog) -> None:
+        if self._ttl <= 0:
+            return None
+
+        with self._lock:
+            self._catalogs[bucket] = (time.monotonic(), catalog)
+
+    def invalidate(self, bucket: str) -> None:
+        with self._lock:
+            self._catalogs.pop(bucket, None)
+
 
 class TaskPluginService(object):
     @inject
@@ -43,10 +86,12 @@ class TaskPluginService(object):
         io_file_service: IOFileService,
         s3_service: S3Service,
         task_plugin_upload_form_schema: TaskPluginUploadFormSchema,
+        task_plugin_catalog_cache: TaskPluginCatalogCache,
     ) -> None:
         self._io_file_service = io_file_service
         self._s3_service = s3_service
         self._task_plugin_upload_form_schema = task_plugin_upload_form_schema
+        self._task_plugin_catalog_cache = task_plugin_catalog_cache
 
     def create(
         self,
@@ -60,28 +105,48 @@ class TaskPluginService(object):
         task_plugin_file: FileStorage = task_plugin_upload_form_data["task_plugin_file"]
         collection: str = task_plugin_upload_form_data["collection"]
 
-        self._validate_task_plugin_does_not_exist(collection, task_plugin_name, log=log)
+        self._validate_task_plugin_does_not_exist(
+            collection, task_plugin_name, bucket=bucket, log=log
+        )
 
-        with TemporaryDirectory() as tmpdir:
-            self._io_file_service.safe_extract_archive(
-                output_dir=tmpdir,
+        # The modules are streamed from the archive to S3 without a temporary
+        # directory. Their directory layout is kept, so that nested packages can be
+        # imported, but the archive's top-level directory is dropped, as the plugin
+        # is stored under its registered name.
+        prefix: PurePosixPath = PurePosixPath(collection) / task_plugin_name
+        upload_result: UploadDirectoryResult = self._s3_service.upload_archive_members(
+            members=self._io_file_service.iter_archive_members(
                 archive_fileobj=task_plugin_file,
-                log=log,
-            )
-
-            prefix: Path = Path(collection) / task_plugin_name
-            plugin_uri_list: List[str] = self._s3_service.upload_directory(
-                directory=tmpdir,
-                bucket=bucket,
-                prefix=str(prefix),
                 include_suffixes=[".py"],
+                preserve_paths=True,
+                strip_top_level=True,
                 log=log,
+            ),
+            bucket=bucket,
+            prefix=str(prefix),
+            log=log,
+        )
+
+        if not upload_result.ok:
+            # Remove the partially uploaded package so that a resubmission does not
+            # fail the "already exists" check. Only the keys of this upload are
+            # deleted, as the plugin's prefix is also a prefix of any sibling plugin
+            # whose name starts with the same characters.
+            self._s3_service.delete_keys(
+                bucket=bucket, keys=upload_result.keys, log=log
             )
+            self._task_plugin_catalog_cache.invalidate(bucket)
+            raise TaskPluginStorageError
+
+        self._task_plugin_catalog_cache.invalidate(bucket)
 
         new_task_plugin: TaskPlugin = TaskPlugin(
             task_plugin_name=task_plugin_name,
             collection=collection,
-            modules=[str(Path(x).name) for x in plugin_uri_list],
+            modules=[
+                PurePosixPath(x).relative_to(prefix).as_posix()
+                for x in upload_result.keys
+            ],
         )
 
         log.info(
@@ -98,15 +163,18 @@ class TaskPluginService(object):
     ) -> List[TaskPlugin]:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
 
-        task_plugin: Optional[TaskPlugin] = self.get_by_name_in_collection(
-            collection=collection, task_plugin_name=task_plugin_name, log=log
-        )
+        # Deletes always consult a fresh catalog, since the plugin may have been
+        # uploaded by another process after the cached catalog was built.
+        task_plugin: Optional[TaskPlugin] = self.get_catalog(
+            bucket=bucket, refresh=True, log=log
+        ).get((collection, task_plugin_name))
 
         if task_plugin is None:
             return []
 
         prefix: Path = Path(collection) / task_plugin_name
         self._s3_service.delete_prefix(bucket=bucket, prefix=str(prefix), log=log)
+        self._task_plugin_catalog_cache.invalidate(bucket)
 
         log.info(
             "TaskPlugin deleted",
@@ -139,22 +207,13 @@ class TaskPluginService(object):
 
         log.info("Get all task plugins in collection", collection=collection)
 
-        s3_directories_list: List[str] = self._s3_service.list_directories(
-            bucket=bucket,
-            prefix=self._s3_service.normalize_prefix(collection, log=log),
-            log=log,
-        )
-
-        task_plugins_collection: List[TaskPlugin] = []
-        for task_plugin_name in s3_directories_list:
-            task_plugin: Optional[TaskPlugin] = self.get_by_name_in_collection(
-                collection=collection, task_plugin_name=task_plugin_name, log=log
-            )
-
-            if task_plugin is not None:
-                task_plugins_collection.append(task_plugin)
-
-        return task_plugins_collection
+        return [
+            task_plugin
+            for (plugin_collection, _), task_plugin in self.get_catalog(
+                bucket=bucket, log=log
+            ).items()
+            if plugin_collection == collection
+        ]
 
     def get_by_name_in_collection(
         self, collection: str, task_plugin_name: str, bucket: str = "plugins", **kwargs
@@ -167,22 +226,48 @@ class TaskPluginService(object):
             task_plugin_name=task_plugin_name,
         )
 
-        prefix = Path(collection) / task_plugin_name
-        modules: List[str] = self._s3_service.list_objects(
-            bucket=bucket,
-            prefix=self._s3_service.normalize_prefix(str(prefix), log=log),
-            log=log,
+        return self.get_catalog(bucket=bucket, log=log).get(
+            (collection, task_plugin_name)
         )
 
-        if not modules:
-            return None
+    def get_catalog(
+        self, bucket: str = "plugins", refresh: bool = False, **kwargs
+    ) -> TaskPluginCatalog:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
 
-        return TaskPlugin(
-            task_plugin_name=task_plugin_name,
-            collection=collection,
-            modules=[str(Path(x).name) for x in modules],
+        catalog: Optional[TaskPluginCatalog] = (
+            None if refresh else self._task_plugin_catalog_cache.get(bucket)
         )
 
+        if catalog is not None:
+            return catalog
+
+        log.info("Building task plugin catalog", bucket=bucket)
+        catalog = {}
+
+        # A single recursive listing of the bucket replaces one listing per
+        # collection plus one listing per task plugin.
+        for key in self._s3_service.iter_objects(bucket=bucket, log=log):
+            parts: Tuple[str, ...] = PurePosixPath(key).parts
+
+            if len(parts) < 3:
+                continue
+
+            collection, task_plugin_name = parts[0], parts[1]
+            task_plugin: TaskPlugin = catalog.setdefault(
+                (collection, task_plugin_name),
+                TaskPlugin(
+                    task_plugin_name=task_plugin_name,
+                    collection=collection,
+                    modules=[],
+                ),
+            )
+            task_plugin.modules.append(PurePosixPath(*parts[2:]).as_posix())
+
+        self._task_plugin_catalog_cache.set(bucket, catalog)
+
+        return catalog
+
     def extract_data_from_form(
         self, task_plugin_upload_form: TaskPluginUploadForm, **kwargs
     ) -> TaskPluginUploadFormData:
@@ -196,13 +281,15 @@ class TaskPluginService(object):
         return data
 
     def _validate_task_plugin_does_not_exist(
-        self, collection, task_plugin_name, **kwargs
+        self, collection, task_plugin_name, bucket: str = "plugins", **kwargs
     ) -> None:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
 
-        response: Optional[TaskPlugin] = self.get_by_name_in_collection(
-            collection=collection, task_plugin_name=task_plugin_name, log=log
-        )
+        # Like deletes, the check consults a fresh catalog, so that a plugin uploaded
+        # by another process since the cached catalog was built is not overwritten.
+        response: Optional[TaskPlugin] = self.get_catalog(
+            bucket=bucket, refresh=True, log=log
+        ).get((collection, task_plugin_name))
 
         if response is not None:
             raise TaskPluginAlreadyExistsError
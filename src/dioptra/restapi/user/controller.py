@@ -20,13 +20,20 @@ from __future__ import annotations
 import uuid
 
 import structlog
-from flask import jsonify
+from flask import jsonify, request
 from flask.wrappers import Response
 from flask_accepts import accepts, responds
 from flask_restx import Namespace, Resource
 from injector import inject
 from structlog.stdlib import BoundLogger
 
+from dioptra.restapi.pagination import (
+    list_query_parameters,
+    make_page_response,
+    parse_fields,
+    parse_limit,
+    parse_timestamp,
+)
 from dioptra.restapi.utils import as_api_parser
 
 from .errors import UserDoesNotExistError, UserRegistrationError
@@ -51,14 +58,37 @@ class UserResource(Resource):
         self._user_service = user_service
         super().__init__(*args, **kwargs)
 
+    @accepts(*list_query_parameters, api=api)
     @responds(schema=UserSchema(many=True), api=api)
-    def get(self) -> list[User]:
-        """Gets a list of all registered users."""
+    def get(self) -> Response:
+        """Gets a list of all registered users.
+
+        The list can be filtered by creation time. If `limit` is set, the list is
+        returned in pages and the cursor for the next page is returned in the
+        `X-Next-Cursor` header.
+        """
         log: BoundLogger = LOGGER.new(
             request_id=str(uuid.uuid4()), resource="user", request_type="GET"
         )  # noqa: F841
         log.info("Request received")
-        return self._user_service.get_all(log=log)
+        query = request.parsed_args
+        fields = parse_fields(query.get("fields"), UserSchema)
+        limit = parse_limit(query.get("limit"))
+        users: list[User] = self._user_service.get_all(
+            created_after=parse_timestamp(query.get("createdAfter")),
+            created_before=parse_timestamp(query.get("createdBefore")),
+            limit=limit,
+            cursor=query.get("cursor"),
+            log=log,
+        )
+        return make_page_response(
+            users,
+            UserSchema,
+            User.created_on,
+            User.user_id,
+            limit=limit,
+            fields=fields,
+        )
 
     @api.expect(as_api_parser(api, UserRegistrationSchema))
     @accepts(UserRegistrationSchema, api=api)
@@ -25,6 +25,7 @@ from sqlalchemy import select
 from structlog.stdlib import BoundLogger
 
 from dioptra.restapi.app import db
+from dioptra.restapi.pagination import filter_created_on, paginate
 from dioptra.restapi.shared.password.service import PasswordService
 
 from .errors import UsernameNotAvailableError
@@ -97,10 +98,22 @@ class UserService(object):
         return [user_id]
 
     @staticmethod
-    def get_all(**kwargs) -> list[User]:
+    def get_all(
+        created_after: datetime.datetime | None = None,
+        created_before: datetime.datetime | None = None,
+        limit: int | None = None,
+        cursor: str | None = None,
+        **kwargs,
+    ) -> list[User]:
         log: BoundLogger = kwargs.get("log", LOGGER.new())
-        log.info("List all user accounts")
-        stmt = select(User).filter_by(is_deleted=False)
+        log.info("List all user accounts", limit=limit)
+        stmt = filter_created_on(
+            select(User).filter_by(is_deleted=False),
+            User.created_on,
+            created_after=created_after,
+            created_before=created_before,
+        )
+        stmt = paginate(stmt, User.created_on, User.user_id, limit=limit, cursor=cursor)
         users: list[User] = db.session.scalars(stmt).all()
 
         return users
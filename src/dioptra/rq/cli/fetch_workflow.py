@@ -0,0 +1,70 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""Download and unpack a workflow archive through the worker's workflow cache."""
+import os
+from typing import Optional
+
+import click
+
+from dioptra.rq.workflows import fetch_workflow
+from dioptra.sdk.utilities.logging import (
+    attach_stdout_stream_handler,
+    configure_structlog,
+    set_logging_level,
+)
+
+
+@click.command()
+@click.option("--endpoint-url", default=None, help="The S3 endpoint URL.")
+@click.option(
+    "--cache-dir",
+    default=None,
+    help="The workflow cache directory, defaults to a .workflow_cache directory in "
+    "DIOPTRA_WORKDIR.",
+)
+@click.option(
+    "--max-entries",
+    default=32,
+    show_default=True,
+    help="The maximum number of workflows to keep in the cache.",
+)
+@click.argument("src")
+@click.argument("dest", type=click.Path(file_okay=False))
+def main(
+    endpoint_url: Optional[str],
+    cache_dir: Optional[str],
+    max_entries: int,
+    src: str,
+    dest: str,
+) -> None:
+    """Place the workflow archive at the S3 URI SRC and its contents in DEST."""
+    fetch_workflow(
+        workflow_uri=src,
+        dest=dest,
+        endpoint_url=endpoint_url,
+        cache_dir=cache_dir,
+        max_entries=max_entries,
+    )
+
+
+if __name__ == "__main__":
+    attach_stdout_stream_handler(
+        True if os.getenv("DIOPTRA_RQ_WORKER_LOG_AS_JSON") else False,
+    )
+    set_logging_level(os.getenv("DIOPTRA_RQ_WORKER_LOG_LEVEL", default="INFO"))
+    configure_structlog()
+    main()
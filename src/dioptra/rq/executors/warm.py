@@ -0,0 +1,261 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""A warm executor that runs jobs in a pool of pre-imported Python processes.
+
+Spawning ``run-mlflow-job.sh`` for every job starts a new interpreter that imports
+MLFlow, and the entry point then imports TensorFlow and ART again. For short jobs this
+cold start can cost more than the work itself. The warm executor keeps a pool of
+long-lived processes that import the heavy frameworks once and then run one job at a
+time, restoring the working directory, environment variables, :py:data:`sys.path` and
+:py:data:`sys.argv` after each job. Every process is replaced after a fixed number of
+jobs to bound memory leaks.
+
+The warm executor is enabled by setting the ``DIOPTRA_RQ_WARM_EXECUTOR`` environment
+variable. Because the default RQ worker forks a new work horse for every job, which
+would discard the pool, the worker must be started with
+``--worker-class rq.worker.SimpleWorker``. The pool is configured with the following
+environment variables,
+
+- ``DIOPTRA_RQ_WARM_EXECUTOR_PROCESSES``: The number of pool processes, defaults to 1.
+- ``DIOPTRA_RQ_WARM_EXECUTOR_MAX_JOBS``: The number of jobs a pool process runs before
+  it is replaced, defaults to 20.
+- ``DIOPTRA_RQ_WARM_EXECUTOR_PRELOAD``: A comma-separated list of modules to import in
+  each pool process, for example ``mlflow,tensorflow,art``.
+"""
+from __future__ import annotations
+
+import importlib
+import multiprocessing
+import os
+import sys
+import threading
+from multiprocessing.pool import Pool
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, TypeVar
+
+import structlog
+from structlog.stdlib import BoundLogger
+
+ENVVAR_WARM_EXECUTOR = "DIOPTRA_RQ_WARM_EXECUTOR"
+ENVVAR_WARM_EXECUTOR_MAX_JOBS = "DIOPTRA_RQ_WARM_EXECUTOR_MAX_JOBS"
+ENVVAR_WARM_EXECUTOR_PRELOAD = "DIOPTRA_RQ_WARM_EXECUTOR_PRELOAD"
+ENVVAR_WARM_EXECUTOR_PROCESSES = "DIOPTRA_RQ_WARM_EXECUTOR_PROCESSES"
+
+DEFAULT_MAX_JOBS_PER_PROCESS = 20
+DEFAULT_PRELOAD_MODULES = ["mlflow", "dioptra.mlflow_plugins.dioptra_backend"]
+
+LOGGER: BoundLogger = structlog.stdlib.get_logger()
+
+T = TypeVar("T")
+
+_WARM_EXECUTOR: Optional[WarmExecutor] = None
+_WARM_EXECUTOR_LOCK = threading.Lock()
+
+
+class WarmExecutor(object):
+    """Runs callables in a recycled pool of pre-imported Python processes.
+
+    Args:
+        processes: The number of processes in the pool.
+        max_jobs_per_process: The number of jobs a process runs before it is replaced
+            with a fresh one. If `None`, processes are never replaced.
+        preload_modules: The modules to import when a process starts.
+    """
+
+    def __init__(
+        self,
+        processes: int = 1,
+        max_jobs_per_process: Optional[int] = DEFAULT_MAX_JOBS_PER_PROCESS,
+        preload_modules: Optional[List[str]] = None,
+    ) -> None:
+        self._processes = processes
+        self._max_jobs_per_process = max_jobs_per_process
+        self._preload_modules = (
+            list(preload_modules)
+            if preload_modules is not None
+            else list(DEFAULT_PRELOAD_MODULES)
+        )
+        self._pool: Optional[Pool] = None
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        func: Callable[..., T],
+        cwd: str,
+        env: Dict[str, str],
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> T:
+        """Runs a callable in a pool process with an isolated working directory and
+        environment.
+
+        Args:
+            func: A module-level callable to run. It must be importable by the pool
+                processes.
+            cwd: The working directory to use while the callable runs.
+            env: The environment variables to use while the callable runs.
+            kwargs: Keyword arguments to pass to the callable.
+
+        Returns:
+            The return value of the callable.
+        """
+        result = self._get_pool().apply_async(
+            _run_isolated, (func, cwd, env, kwargs or {})
+        )
+
+        try:
+            return result.get()
+
+        except BaseException:
+            # The job failed, timed out or was interrupted, so the process that ran it
+            # may still be busy or in an unknown state. Start over with a fresh pool.
+            LOGGER.warning("Warm executor job did not complete, restarting the pool")
+            self.terminate()
+            raise
+
+    def close(self) -> None:
+        """Waits for the pending jobs to finish and shuts down the pool."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+    def terminate(self) -> None:
+        """Stops the pool processes immediately."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.terminate()
+                self._pool.join()
+                self._pool = None
+
+    def _get_pool(self) -> Pool:
+        with self._lock:
+            if self._pool is None:
+                LOGGER.info(
+                    "Starting warm executor pool",
+                    processes=self._processes,
+                    max_jobs_per_process=self._max_jobs_per_process,
+                    preload_modules=self._preload_modules,
+                )
+                self._pool = multiprocessing.get_context("spawn").Pool(
+                    processes=self._processes,
+                    initializer=_initialize_process,
+                    initargs=(self._preload_modules,),
+                    maxtasksperchild=self._max_jobs_per_process,
+                )
+
+            return self._pool
+
+
+def warm_executor_enabled() -> bool:
+    """Returns `True` if the warm executor is enabled for the worker."""
+    return True if os.getenv(ENVVAR_WARM_EXECUTOR) else False
+
+
+def get_warm_executor() -> WarmExecutor:
+    """Returns the worker's warm executor, configuring it from the environment on first
+    use.
+    """
+    global _WARM_EXECUTOR
+
+    with _WARM_EXECUTOR_LOCK:
+        if _WARM_EXECUTOR is None:
+            preload_modules: Optional[List[str]] = None
+
+            if os.getenv(ENVVAR_WARM_EXECUTOR_PRELOAD) is not None:
+                preload_modules = [
+                    x.strip()
+                    for x in os.getenv(ENVVAR_WARM_EXECUTOR_PRELOAD, "").split(",")
+                    if x.strip()
+                ]
+
+            _WARM_EXECUTOR = WarmExecutor(
+                processes=int(os.getenv(ENVVAR_WARM_EXECUTOR_PROCESSES, 1)),
+                max_jobs_per_process=int(
+                    os.getenv(
+                        ENVVAR_WARM_EXECUTOR_MAX_JOBS, DEFAULT_MAX_JOBS_PER_PROCESS
+                    )
+                ),
+                preload_modules=preload_modules,
+            )
+
+        return _WARM_EXECUTOR
+
+
+def shutdown_warm_executor() -> None:
+    """Shuts down the worker's warm executor if it was started."""
+    global _WARM_EXECUTOR
+
+    with _WARM_EXECUTOR_LOCK:
+        if _WARM_EXECUTOR is not None:
+            _WARM_EXECUTOR.close()
+            _WARM_EXECUTOR = None
+
+
+def _initialize_process(preload_modules: List[str]) -> None:
+    from dioptra.sdk.utilities.logging import (
+        attach_stdout_stream_handler,
+        configure_structlog,
+        set_logging_level,
+    )
+
+    attach_stdout_stream_handler(
+        True if os.getenv("DIOPTRA_MLFLOW_RUN_LOG_AS_JSON") else False,
+    )
+    set_logging_level(os.getenv("DIOPTRA_MLFLOW_RUN_LOG_LEVEL", default="INFO"))
+    configure_structlog()
+
+    for module in preload_modules:
+        try:
+            importlib.import_module(module)
+
+        except ImportError:
+            LOGGER.warning("Unable to preload module in warm executor", module=module)
+
+
+def _run_isolated(
+    func: Callable[..., T], cwd: str, env: Dict[str, str], kwargs: Dict[str, Any]
+) -> T:
+    saved_cwd = os.getcwd()
+    saved_env = os.environ.copy()
+    saved_sys_path = sys.path.copy()
+    saved_sys_argv = sys.argv.copy()
+    saved_modules = set(sys.modules)
+
+    try:
+        os.chdir(cwd)
+        os.environ.clear()
+        os.environ.update(env)
+        return func(**kwargs)
+
+    finally:
+        os.chdir(saved_cwd)
+        os.environ.clear()
+        os.environ.update(saved_env)
+        sys.path = saved_sys_path
+        sys.argv = saved_sys_argv
+        _unload_modules_in_dir(
+            names=set(sys.modules) - saved_modules, directory=Path(cwd).resolve()
+        )
+
+
+def _unload_modules_in_dir(names: Set[str], directory: Path) -> None:
+    for name in names:
+        filepath = getattr(sys.modules.get(name), "__file__", None)
+
+        if filepath is not None and directory in Path(filepath).resolve().parents:
+            del sys.modules[name]
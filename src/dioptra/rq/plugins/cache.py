@@ -0,0 +1,369 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""A content-addressed cache for syncing task plugins from S3 storage to a worker.
+
+Each sync lists the plugin prefix once and builds a manifest of the object keys and
+ETags. The digest of that manifest names an immutable version directory in the
+cache. If that version already exists, nothing is downloaded. Otherwise, only the
+objects whose ETags are not yet in the cache's blob store are downloaded, and the
+version directory is assembled from hard links to the blobs. The plugin directory
+itself is a symbolic link to the active version and is swapped atomically, so that
+concurrent jobs on the same host only ever see a complete set of plugins.
+
+The cache directory has the following layout::
+
+    <cache_dir>/
+        blobs/<sha256 of ETag and size>
+        locks/<name>.lock
+        versions/<name>/<manifest digest>/...
+
+Syncs of different plugin collections share the blob store. Building a version holds
+a shared lock on the blob store from the first download until the last link, and
+removing unused blobs holds an exclusive lock, so a blob is never removed between its
+download and its link into a version.
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import boto3
+import structlog
+from botocore.client import BaseClient
+from structlog.stdlib import BoundLogger
+
+DEFAULT_CACHE_DIRNAME = ".plugin_cache"
+DEFAULT_MAX_VERSIONS = 3
+BLOBS_LOCK_NAME = ".blobs"
+
+LOGGER: BoundLogger = structlog.stdlib.get_logger()
+
+Manifest = Dict[str, Dict[str, Any]]
+
+
+class PluginCache(object):
+    """A worker-local, content-addressed cache of task plugin collections.
+
+    Args:
+        cache_dir: The cache directory. It must be on the same filesystem as the
+            plugin directories that are synced through it.
+        client: A boto3 S3 client.
+        max_versions: The number of versions to keep for each plugin collection,
+            including the active one. The version that was active before a sync is
+            always kept until the next sync, as running jobs may still import from
+            it.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        client: BaseClient,
+        max_versions: int = DEFAULT_MAX_VERSIONS,
+    ) -> None:
+        self._cache_dir = Path(cache_dir)
+        self._client = client
+        self._max_versions = max(max_versions, 1)
+
+    @property
+    def blobs_dir(self) -> Path:
+        return self._cache_dir / "blobs"
+
+    @property
+    def locks_dir(self) -> Path:
+        return self._cache_dir / "locks"
+
+    @property
+    def versions_dir(self) -> Path:
+        return self._cache_dir / "versions"
+
+    def sync(self, s3_uri: str, dest: Union[str, Path], **kwargs) -> Path:
+        """Syncs a plugin collection in S3 storage to a local directory.
+
+        Args:
+            s3_uri: The S3 URI of the directory containing the plugin collection.
+            dest: The local plugin directory. It is replaced with a symbolic link to
+                the synced version.
+
+        Returns:
+            The path to the version directory that ``dest`` points to.
+        """
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+        dest = Path(dest)
+        bucket, prefix = _parse_s3_uri(s3_uri)
+
+        with self._lock(dest.name):
+            previous_version_dir = _get_active_version_dir(dest)
+            manifest = self.fetch_manifest(bucket=bucket, prefix=prefix, log=log)
+            version_dir = self.versions_dir / dest.name / _get_manifest_digest(manifest)
+
+            if version_dir.is_dir():
+                log.info("Plugins unchanged, using cached version", s3_uri=s3_uri)
+
+            else:
+                self._build_version(
+                    bucket=bucket, manifest=manifest, version_dir=version_dir, log=log
+                )
+
+            self._activate(version_dir=version_dir, dest=dest)
+            self._prune(
+                name=dest.name,
+                active_version_dir=version_dir,
+                previous_version_dir=previous_version_dir,
+            )
+
+        log.info(
+            "Plugins synced", s3_uri=s3_uri, dest=str(dest), version=version_dir.name
+        )
+
+        return version_dir
+
+    def fetch_manifest(self, bucket: str, prefix: str, **kwargs) -> Manifest:
+        """Lists a plugin collection and maps each relative path to its key and ETag.
+
+        Args:
+            bucket: The S3 bucket containing the plugin collection.
+            prefix: The key prefix of the plugin collection.
+
+        Returns:
+            The manifest of the plugin collection.
+        """
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+
+        log.debug("Fetching plugin manifest", bucket=bucket, prefix=prefix)
+        manifest: Manifest = {}
+        paginator = self._client.get_paginator("list_objects_v2")
+
+        for page in paginator.paginate(Bucket=bucket, Prefix=prefix):
+            for obj in page.get("Contents", []):
+                relpath = obj["Key"][len(prefix) :].lstrip("/")
+
+                if not relpath or relpath.endswith("/"):
+                    continue
+
+                manifest[relpath] = {
+                    "key": obj["Key"],
+                    "etag": obj["ETag"].strip('"'),
+                    "size": obj["Size"],
+                }
+
+        return manifest
+
+    def _build_version(
+        self, bucket: str, manifest: Manifest, version_dir: Path, **kwargs
+    ) -> None:
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+        staging_dir = version_dir.with_name(f".{version_dir.name}.{uuid.uuid4().hex}")
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+
+        try:
+            with self._lock(BLOBS_LOCK_NAME, shared=True):
+                num_downloaded = self._link_blobs(
+                    bucket=bucket, manifest=manifest, staging_dir=staging_dir
+                )
+
+            staging_dir.mkdir(parents=True, exist_ok=True)
+            os.rename(staging_dir, version_dir)
+
+        finally:
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+        log.info(
+            "Built new plugins version",
+            version=version_dir.name,
+            num_files=len(manifest),
+            num_downloaded=num_downloaded,
+        )
+
+    def _link_blobs(self, bucket: str, manifest: Manifest, staging_dir: Path) -> int:
+        num_downloaded = 0
+
+        for relpath, entry in manifest.items():
+            blob = self.blobs_dir / _get_blob_name(entry)
+
+            if not blob.exists():
+                self._download_blob(bucket=bucket, key=entry["key"], blob=blob)
+                num_downloaded += 1
+
+            target = staging_dir / relpath
+            target.parent.mkdir(parents=True, exist_ok=True)
+            _link_or_copy(blob, target)
+
+        return num_downloaded
+
+    def _download_blob(self, bucket: str, key: str, blob: Path) -> None:
+        staging_blob = blob.with_name(f".{blob.name}.{uuid.uuid4().hex}")
+
+        try:
+            self._client.download_file(
+                Bucket=bucket, Key=key, Filename=str(staging_blob)
+            )
+            os.replace(staging_blob, blob)
+
+        finally:
+            if staging_blob.exists():
+                staging_blob.unlink()
+
+    @staticmethod
+    def _activate(version_dir: Path, dest: Path) -> None:
+        if dest.is_symlink() and Path(os.readlink(dest)) == version_dir.resolve():
+            return None
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        staging_link = dest.with_name(f".{dest.name}.{uuid.uuid4().hex}")
+        os.symlink(version_dir.resolve(), staging_link, target_is_directory=True)
+
+        # Plugin directories created before the cache was introduced are regular
+        # directories and cannot be atomically replaced by a link.
+        if dest.is_dir() and not dest.is_symlink():
+            shutil.rmtree(dest)
+
+        os.replace(staging_link, dest)
+
+    def _prune(
+        self,
+        name: str,
+        active_version_dir: Path,
+        previous_version_dir: Optional[Path] = None,
+    ) -> None:
+        kept_version_dirs = {active_version_dir.resolve()}
+
+        if previous_version_dir is not None:
+            kept_version_dirs.add(previous_version_dir.resolve())
+
+        version_dirs = sorted(
+            (
+                x
+                for x in (self.versions_dir / name).iterdir()
+                if x.is_dir() and not x.name.startswith(".")
+            ),
+            key=lambda x: x.stat().st_mtime,
+            reverse=True,
+        )
+        stale_version_dirs = [
+            x for x in version_dirs if x.resolve() not in kept_version_dirs
+        ][max(self._max_versions - len(kept_version_dirs), 0) :]
+
+        if not stale_version_dirs:
+            return None
+
+        for version_dir in stale_version_dirs:
+            shutil.rmtree(version_dir, ignore_errors=True)
+
+        # Blobs that are no longer linked into any version only have one link left.
+        with self._lock(BLOBS_LOCK_NAME):
+            for blob in self.blobs_dir.iterdir():
+                if blob.stat().st_nlink == 1:
+                    blob.unlink()
+
+    @contextmanager
+    def _lock(self, name: str, shared: bool = False) -> Iterator[None]:
+        self.locks_dir.mkdir(parents=True, exist_ok=True)
+
+        with (self.locks_dir / f"{name}.lock").open("w") as f:
+            fcntl.flock(f, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+
+            try:
+                yield
+
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def sync_plugins(
+    s3_uri: str,
+    dest: Union[str, Path],
+    endpoint_url: Optional[str] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+    max_versions: int = DEFAULT_MAX_VERSIONS,
+) -> Path:
+    """Syncs a plugin collection in S3 storage to a local directory using the cache.
+
+    Args:
+        s3_uri: The S3 URI of the directory containing the plugin collection.
+        dest: The local plugin directory.
+        endpoint_url: The S3 endpoint URL. If `None`, the ``MLFLOW_S3_ENDPOINT_URL``
+            environment variable is used.
+        cache_dir: The cache directory. If `None`, a ``.plugin_cache`` directory next
+            to ``dest`` is used.
+        max_versions: The number of versions to keep for the plugin collection.
+
+    Returns:
+        The path to the version directory that ``dest`` points to.
+    """
+    client: BaseClient = boto3.client(
+        "s3", endpoint_url=endpoint_url or os.getenv("MLFLOW_S3_ENDPOINT_URL")
+    )
+    cache = PluginCache(
+        cache_dir=cache_dir or Path(dest).parent / DEFAULT_CACHE_DIRNAME,
+        client=client,
+        max_versions=max_versions,
+    )
+
+    return cache.sync(s3_uri=s3_uri, dest=dest)
+
+
+def _parse_s3_uri(s3_uri: str) -> Tuple[str, str]:
+    parsed = urlparse(s3_uri)
+
+    if parsed.scheme != "s3" or not parsed.netloc:
+        raise ValueError(f"Invalid S3 URI: {s3_uri!r}")
+
+    prefix = parsed.path.lstrip("/")
+
+    if prefix and not prefix.endswith("/"):
+        prefix = f"{prefix}/"
+
+    return parsed.netloc, prefix
+
+
+def _get_active_version_dir(dest: Path) -> Optional[Path]:
+    if not dest.is_symlink():
+        return None
+
+    return Path(os.readlink(dest))
+
+
+def _get_manifest_digest(manifest: Manifest) -> str:
+    contents = [
+        [relpath, entry["etag"], entry["size"]]
+        for relpath, entry in sorted(manifest.items())
+    ]
+
+    return hashlib.sha256(json.dumps(contents).encode("utf-8")).hexdigest()
+
+
+def _get_blob_name(entry: Dict[str, Any]) -> str:
+    return hashlib.sha256(
+        f"{entry['etag']}:{entry['size']}".encode("utf-8")
+    ).hexdigest()
+
+
+def _link_or_copy(src: Path, dest: Path) -> None:
+    try:
+        os.link(src, dest)
+
+    except OSError:
+        shutil.copy2(src, dest)
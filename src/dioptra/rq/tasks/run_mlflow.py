@@ -14,9 +14,12 @@
 #
 # ACCESS THE FULL CC BY 4.0 LICENSE HERE:
 # https://creativecommons.org/licenses/by/4.0/legalcode
+import json
 import os
+import posixpath
 import shlex
 import subprocess
+from pathlib import Path
 from subprocess import CompletedProcess
 from tempfile import TemporaryDirectory
 from typing import List, Optional
@@ -26,6 +29,8 @@ from rq.job import Job as RQJob
 from rq.job import get_current_job
 from structlog.stdlib import BoundLogger
 
+from dioptra.rq.executors import get_warm_executor, warm_executor_enabled
+
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
 
@@ -60,8 +65,25 @@ def run_mlflow_task(
         cmd.extend(shlex.split(entry_point_kwargs))
 
     with TemporaryDirectory(dir=os.getenv("DIOPTRA_WORKDIR")) as tmpdir:
-        log.info("Executing MLFlow job", cmd=" ".join(cmd))
-        p = subprocess.run(args=cmd, cwd=tmpdir, env=env)
+        if warm_executor_enabled():
+            log.info("Executing MLFlow job in warm executor", cmd=" ".join(cmd))
+            returncode: int = get_warm_executor().run(
+                run_mlflow_job_in_process,
+                cwd=tmpdir,
+                env=env,
+                kwargs=dict(
+                    cmd=cmd,
+                    workflow_uri=workflow_uri,
+                    entry_point=entry_point,
+                    experiment_id=experiment_id,
+                    entry_point_kwargs=entry_point_kwargs,
+                ),
+            )
+            p = CompletedProcess(args=cmd, returncode=returncode)
+
+        else:
+            log.info("Executing MLFlow job", cmd=" ".join(cmd))
+            p = subprocess.run(args=cmd, cwd=tmpdir, env=env)
 
     if p.returncode > 0:
         log.warning(
@@ -69,3 +91,70 @@ def run_mlflow_task(
         )
 
     return p
+
+
+def run_mlflow_job_in_process(
+    cmd: List[str],
+    workflow_uri: str,
+    entry_point: str,
+    experiment_id: str,
+    entry_point_kwargs: Optional[str] = None,
+) -> int:
+    """Runs a MLFlow job within the current process of a warm executor.
+
+    The ``run-mlflow-job.sh`` script is used to sync the plugins and unpack the
+    workflow, after which ``mlflow run`` is invoked in-process with the Dioptra
+    backend. The backend then runs Python entry points in a fork of this process so
+    that the frameworks imported by the executor are reused.
+
+    Args:
+        cmd: The ``run-mlflow-job.sh`` command for the job.
+        workflow_uri: The S3 URI of the workflow archive.
+        entry_point: The name of the entry point in the MLproject file to run.
+        experiment_id: The ID of the experiment under which to launch the run.
+        entry_point_kwargs: The entry point parameter values for the job.
+
+    Returns:
+        The exit code of the job.
+    """
+    from mlflow.cli import cli as mlflow_cli
+
+    from dioptra.mlflow_plugins.dioptra_forked_process import ENVVAR_FORK_ENTRY_POINT
+
+    log: BoundLogger = LOGGER.new(rq_job_id=os.getenv("DIOPTRA_RQ_JOB_ID"))
+    p = subprocess.run(args=[cmd[0], "--prepare-only", *cmd[1:]])
+
+    if p.returncode > 0:
+        return p.returncode
+
+    mlproject_files = sorted(Path.cwd().rglob("MLproject"))
+
+    if not mlproject_files:
+        log.error("Missing MLproject file")
+        return 1
+
+    workflow_filepath = Path.cwd() / posixpath.basename(workflow_uri)
+    args: List[str] = [
+        "run",
+        "--no-conda",
+        "--backend",
+        "dioptra",
+        "--backend-config",
+        json.dumps({"workflow_filepath": str(workflow_filepath)}),
+        "--experiment-id",
+        experiment_id,
+        "-e",
+        entry_point,
+        *shlex.split(entry_point_kwargs or ""),
+        str(mlproject_files[0].parent),
+    ]
+    os.environ[ENVVAR_FORK_ENTRY_POINT] = "1"
+
+    try:
+        mlflow_cli.main(args=args, prog_name="mlflow", standalone_mode=False)
+
+    except Exception:
+        log.exception("MLFlow job failed")
+        return 1
+
+    return 0
@@ -0,0 +1,278 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""A worker-local cache of unpacked workflow archives.
+
+The REST API stores each workflow archive under the SHA-256 digest of its contents,
+i.e. ``s3://workflow/<digest>/<filename>``, so the digest identifies an immutable
+archive. The cache keeps the downloaded archive and its unpacked contents for the
+most recently used digests. A job that resubmits a cached workflow copies the entry
+into its working directory instead of downloading and unpacking the archive again.
+Workflows stored under any other kind of prefix are fetched without caching.
+
+The cache directory has the following layout::
+
+    <cache_dir>/
+        cache.lock
+        <digest>/archive
+        <digest>/unpacked/...
+
+An entry holds the archive under a fixed name, as the same contents may be stored
+under different filenames, and the archive is copied to the filename of each fetch.
+"""
+from __future__ import annotations
+
+import fcntl
+import os
+import posixpath
+import re
+import shutil
+import tarfile
+import uuid
+import zipfile
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+import boto3
+import structlog
+from botocore.client import BaseClient
+from structlog.stdlib import BoundLogger
+
+DEFAULT_CACHE_DIRNAME = ".workflow_cache"
+DEFAULT_MAX_ENTRIES = 32
+
+LOGGER: BoundLogger = structlog.stdlib.get_logger()
+
+_DIGEST_REGEX = re.compile(r"^[0-9a-f]{64}$")
+_TAR_SUFFIXES = (".tar", ".tar.bz2", ".tar.gz", ".tar.xz", ".tgz")
+
+
+class WorkflowCache(object):
+    """A bounded, least-recently-used cache of unpacked workflow archives.
+
+    Args:
+        cache_dir: The cache directory.
+        client: A boto3 S3 client.
+        max_entries: The maximum number of workflows to keep in the cache.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        client: BaseClient,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self._cache_dir = Path(cache_dir)
+        self._client = client
+        self._max_entries = max(max_entries, 1)
+
+    def fetch(self, workflow_uri: str, dest: Union[str, Path], **kwargs) -> Path:
+        """Places a workflow archive and its unpacked contents in a directory.
+
+        Args:
+            workflow_uri: The S3 URI of the workflow archive.
+            dest: The directory to place the workflow in, usually the job's working
+                directory.
+
+        Returns:
+            The path to the workflow archive in ``dest``.
+        """
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+        dest = Path(dest)
+        bucket, key, digest = _parse_workflow_uri(workflow_uri)
+        filename = posixpath.basename(key)
+        dest.mkdir(parents=True, exist_ok=True)
+
+        if digest is None:
+            log.info("Workflow not content-addressed, skipping cache", uri=workflow_uri)
+            self._client.download_file(
+                Bucket=bucket, Key=key, Filename=str(dest / filename)
+            )
+            unpack_workflow_archive(dest / filename, dest)
+            return dest / filename
+
+        with self._lock():
+            entry_dir = self._cache_dir / digest
+
+            if (entry_dir / "archive").is_file():
+                log.info("Workflow cache hit", digest=digest)
+                os.utime(entry_dir)
+
+            else:
+                log.info("Workflow cache miss", digest=digest)
+
+                # Replace entries left in an older layout.
+                if entry_dir.exists():
+                    shutil.rmtree(entry_dir)
+
+                self._add_entry(
+                    bucket=bucket, key=key, filename=filename, entry_dir=entry_dir
+                )
+                self._evict()
+
+            shutil.copy2(entry_dir / "archive", dest / filename)
+            shutil.copytree(entry_dir / "unpacked", dest, dirs_exist_ok=True)
+
+        return dest / filename
+
+    def _add_entry(self, bucket: str, key: str, filename: str, entry_dir: Path) -> None:
+        staging_dir = entry_dir.with_name(f".{entry_dir.name}.{uuid.uuid4().hex}")
+
+        try:
+            (staging_dir / "unpacked").mkdir(parents=True)
+            (staging_dir / "download").mkdir()
+
+            # The archive format is detected from the filename, so the archive is
+            # only renamed after it is unpacked.
+            archive_filepath = staging_dir / "download" / filename
+            self._client.download_file(
+                Bucket=bucket, Key=key, Filename=str(archive_filepath)
+            )
+            unpack_workflow_archive(archive_filepath, staging_dir / "unpacked")
+            os.rename(archive_filepath, staging_dir / "archive")
+            (staging_dir / "download").rmdir()
+            os.rename(staging_dir, entry_dir)
+
+        finally:
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _evict(self) -> None:
+        entry_dirs = sorted(
+            (
+                x
+                for x in self._cache_dir.iterdir()
+                if x.is_dir() and _DIGEST_REGEX.match(x.name)
+            ),
+            key=lambda x: x.stat().st_mtime,
+            reverse=True,
+        )
+
+        for entry_dir in entry_dirs[self._max_entries :]:
+            shutil.rmtree(entry_dir, ignore_errors=True)
+
+    @contextmanager
+    def _lock(self) -> Iterator[None]:
+        self._cache_dir.mkdir(parents=True, exist_ok=True)
+
+        with (self._cache_dir / "cache.lock").open("w") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+
+            try:
+                yield
+
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def fetch_workflow(
+    workflow_uri: str,
+    dest: Union[str, Path],
+    endpoint_url: Optional[str] = None,
+    cache_dir: Optional[Union[str, Path]] = None,
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+) -> Path:
+    """Places a workflow archive and its unpacked contents in a directory using the
+    cache.
+
+    Args:
+        workflow_uri: The S3 URI of the workflow archive.
+        dest: The directory to place the workflow in.
+        endpoint_url: The S3 endpoint URL. If `None`, the ``MLFLOW_S3_ENDPOINT_URL``
+            environment variable is used.
+        cache_dir: The cache directory. If `None`, a ``.workflow_cache`` directory in
+            ``DIOPTRA_WORKDIR`` (or the parent of ``dest``) is used.
+        max_entries: The maximum number of workflows to keep in the cache.
+
+    Returns:
+        The path to the workflow archive in ``dest``.
+    """
+    client: BaseClient = boto3.client(
+        "s3", endpoint_url=endpoint_url or os.getenv("MLFLOW_S3_ENDPOINT_URL")
+    )
+    cache = WorkflowCache(
+        cache_dir=cache_dir
+        or Path(os.getenv("DIOPTRA_WORKDIR") or Path(dest).resolve().parent)
+        / DEFAULT_CACHE_DIRNAME,
+        client=client,
+        max_entries=max_entries,
+    )
+
+    return cache.fetch(workflow_uri=workflow_uri, dest=dest)
+
+
+def unpack_workflow_archive(
+    archive_filepath: Union[str, Path], dest: Union[str, Path]
+) -> None:
+    """Unpacks a tarball or zip workflow archive into a directory.
+
+    Args:
+        archive_filepath: The path to the archive.
+        dest: The directory to unpack the archive into.
+
+    Raises:
+        ValueError: If the archive format is not supported or a member would be
+            extracted outside of ``dest``.
+    """
+    archive_filepath = Path(archive_filepath)
+    dest = Path(dest).resolve()
+
+    if archive_filepath.name.endswith(_TAR_SUFFIXES):
+        with tarfile.open(archive_filepath) as f:
+            for member in f.getmembers():
+                _validate_member_path(dest, member.name)
+
+                if member.issym() or member.islnk():
+                    _validate_member_path(
+                        dest,
+                        posixpath.join(posixpath.dirname(member.name), member.linkname),
+                    )
+
+            f.extractall(dest)
+
+    elif archive_filepath.suffix == ".zip":
+        with zipfile.ZipFile(archive_filepath) as f:
+            for name in f.namelist():
+                _validate_member_path(dest, name)
+
+            f.extractall(dest)
+
+    else:
+        raise ValueError(
+            f"Unsupported workflow archive format: {archive_filepath.name}"
+        )
+
+
+def _parse_workflow_uri(workflow_uri: str) -> Tuple[str, str, Optional[str]]:
+    parsed = urlparse(workflow_uri)
+
+    if parsed.scheme != "s3" or not parsed.netloc:
+        raise ValueError(f"Invalid S3 URI: {workflow_uri!r}")
+
+    key = parsed.path.lstrip("/")
+    parts = key.split("/")
+    digest = parts[0] if len(parts) == 2 and _DIGEST_REGEX.match(parts[0]) else None
+
+    return parsed.netloc, key, digest
+
+
+def _validate_member_path(dest: Path, name: str) -> None:
+    target = (dest / name).resolve()
+
+    if target != dest and dest not in target.parents:
+        raise ValueError(f"Archive member outside of destination: {name}")
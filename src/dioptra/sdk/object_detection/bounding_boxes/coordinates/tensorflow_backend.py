@@ -16,8 +16,6 @@
 # https://creativecommons.org/licenses/by/4.0/legalcode
 from __future__ import annotations
 
-from typing import cast
-
 import numpy as np
 import numpy.typing as npt
 import structlog
@@ -75,13 +73,24 @@ class TensorflowBoundingBoxCoordinates(BoundingBoxCoordinates):
         bboxes_cell_ij: Tensor,
         bboxes_labels: Tensor,
     ) -> tuple[Tensor, Tensor, Tensor]:
-        return cast(
-            tuple[Tensor, Tensor, Tensor],
-            tf.numpy_function(
-                self._apply_constraint_one_object_per_cell,
-                [bboxes_cell_xywh, bboxes_cell_ij, bboxes_labels],
-                [tf.float32, tf.int32, tf.int32],
-            ),
+        # Keep the first box in each cell, with the cells sorted by row and then by
+        # column. The column index can equal the number of columns, so the cell ids
+        # leave room for it.
+        cell_ids = (
+            bboxes_cell_ij[..., 0] * (self.cell_ncol + 1) + bboxes_cell_ij[..., 1]
+        )
+        unique_cell_ids, cell_indices = tf.unique(cell_ids)
+        first_indices = tf.math.unsorted_segment_min(
+            tf.range(tf.shape(cell_ids)[0]),
+            cell_indices,
+            num_segments=tf.shape(unique_cell_ids)[0],
+        )
+        pruning_indices = tf.gather(first_indices, tf.argsort(unique_cell_ids))
+
+        return (
+            tf.gather(bboxes_cell_xywh, pruning_indices),
+            tf.gather(bboxes_cell_ij, pruning_indices),
+            tf.gather(bboxes_labels, pruning_indices),
         )
 
     @tf.function(
@@ -287,24 +296,6 @@ class TensorflowBoundingBoxCoordinates(BoundingBoxCoordinates):
 
         return bboxes_corner
 
-    def _apply_constraint_one_object_per_cell(
-        self,
-        bboxes_cell_xywh: npt.NDArray,
-        bboxes_cell_ij: npt.NDArray,
-        bboxes_labels: npt.NDArray,
-    ) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
-        pruned_bboxes_cell_ij, pruning_indices = np.unique(
-            bboxes_cell_ij, return_index=True, axis=0
-        )
-        pruned_bboxes_cell_xywh = bboxes_cell_xywh[pruning_indices]
-        pruned_bboxes_labels = bboxes_labels[pruning_indices]
-
-        return (
-            pruned_bboxes_cell_xywh.astype("float32"),
-            pruned_bboxes_cell_ij.astype("int32"),
-            pruned_bboxes_labels.astype("int32"),
-        )
-
     def _find_no_obj_cell_ij(
         self, bboxes_cell_ij: npt.NDArray, i_range: npt.NDArray, j_range: npt.NDArray
     ) -> npt.NDArray:
@@ -376,16 +367,6 @@ class TensorflowBoundingBoxesBatchedGrid(BoundingBoxesBatchedGrid):
     def embed(
         self, bboxes_corner: Tensor, bboxes_labels: Tensor, n_classes: Tensor
     ) -> tuple[Tensor, Tensor, Tensor, Tensor]:
-        (
-            bboxes_cell_xywh_grid,
-            bboxes_labels_grid,
-            bboxes_object_mask,
-            bboxes_no_object_mask,
-        ) = tf.py_function(
-            self._gen_embed_tensors,
-            [n_classes],
-            [tf.float32, tf.float32, tf.float32, tf.float32],
-        )
         bboxes_cell_xywh, bboxes_cell_ij = self._bbox_coord.from_corner_to_cell_xywh(
             bboxes_corner=bboxes_corner
         )
@@ -394,22 +375,31 @@ class TensorflowBoundingBoxesBatchedGrid(BoundingBoxesBatchedGrid):
             bboxes_cell_ij=bboxes_cell_ij,
             bboxes_labels=bboxes_labels,
         )
+        num_objects = tf.shape(ij)[0]
+        object_ones = tf.ones([num_objects], dtype=tf.float32)
 
-        return cast(
-            tuple[Tensor, Tensor, Tensor, Tensor],
-            tf.numpy_function(
-                self._embed,
-                [
-                    xywh,
-                    ij,
-                    labels,
-                    bboxes_cell_xywh_grid,
-                    bboxes_labels_grid,
-                    bboxes_object_mask,
-                    bboxes_no_object_mask,
-                ],
-                [tf.float32, tf.float32, tf.float32, tf.float32],
-            ),
+        bboxes_cell_xywh_grid = tf.tensor_scatter_nd_update(
+            tf.zeros([self.cell_nrow, self.cell_ncol, 4], dtype=tf.float32),
+            indices=ij,
+            updates=xywh,
+        )
+        bboxes_labels_grid = tf.tensor_scatter_nd_update(
+            tf.zeros(tf.stack([self.cell_nrow, self.cell_ncol, n_classes]), tf.float32),
+            indices=tf.concat([ij, tf.expand_dims(labels, axis=-1)], axis=-1),
+            updates=object_ones,
+        )
+        bboxes_object_mask = tf.tensor_scatter_nd_update(
+            tf.zeros([self.cell_nrow, self.cell_ncol], dtype=tf.float32),
+            indices=ij,
+            updates=object_ones,
+        )
+        bboxes_no_object_mask = 1.0 - bboxes_object_mask
+
+        return (
+            tf.expand_dims(bboxes_cell_xywh_grid, axis=-2),
+            bboxes_labels_grid,
+            bboxes_object_mask,
+            bboxes_no_object_mask,
         )
 
     @tf.function(
@@ -520,60 +510,6 @@ class TensorflowBoundingBoxesBatchedGrid(BoundingBoxesBatchedGrid):
 
         return bboxes_corner
 
-    def _embed(
-        self,
-        xywh: npt.NDArray,
-        ij: npt.NDArray,
-        labels: npt.NDArray,
-        bboxes_cell_xywh_grid: npt.NDArray,
-        bboxes_labels_grid: npt.NDArray,
-        bboxes_object_mask: npt.NDArray,
-        bboxes_no_object_mask: npt.NDArray,
-    ) -> tuple[npt.NDArray, npt.NDArray, npt.NDArray, npt.NDArray]:
-        grid_i = np.transpose(ij)[0]
-        grid_j = np.transpose(ij)[1]
-
-        bboxes_cell_xywh_grid[grid_i, grid_j] = xywh
-        bboxes_labels_grid[grid_i, grid_j, labels] = 1.0
-        bboxes_object_mask[grid_i, grid_j] = 1.0
-        bboxes_no_object_mask[grid_i, grid_j] = 0.0
-
-        bboxes_cell_xywh_grid = np.expand_dims(bboxes_cell_xywh_grid, axis=-2)
-
-        return (
-            bboxes_cell_xywh_grid,
-            bboxes_labels_grid,
-            bboxes_object_mask,
-            bboxes_no_object_mask,
-        )
-
-    def _gen_embed_tensors(
-        self, n_classes: Tensor
-    ) -> tuple[Tensor, Tensor, Tensor, Tensor]:
-        bboxes_cell_xywh_grid = tf.zeros(
-            shape=(self.cell_nrow, self.cell_ncol, 4),
-            dtype=tf.float32,
-        )
-        bboxes_labels_grid = tf.zeros(
-            shape=(self.cell_nrow, self.cell_ncol, n_classes),
-            dtype=tf.float32,
-        )
-        bboxes_object_mask = tf.zeros(
-            shape=(self.cell_nrow, self.cell_ncol),
-            dtype=tf.float32,
-        )
-        bboxes_no_object_mask = tf.ones(
-            shape=(self.cell_nrow, self.cell_ncol),
-            dtype=tf.float32,
-        )
-
-        return (
-            bboxes_cell_xywh_grid,
-            bboxes_labels_grid,
-            bboxes_object_mask,
-            bboxes_no_object_mask,
-        )
-
     @staticmethod
     def _generate_wh_grid_indices(grid_shape: tuple[int, int]) -> Tensor:
         w_grid_indices = tf.tile(
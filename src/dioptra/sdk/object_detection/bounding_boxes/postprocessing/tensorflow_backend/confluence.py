@@ -80,6 +80,7 @@ class TensorflowBoundingBoxesYOLOV1Confluence(BoundingBoxesYOLOV1PostProcessing)
         gaussian: bool = False,
         sigma: float = 0.5,
         force_prediction: bool = False,
+        use_numpy_function: bool = True,
     ) -> None:
         """
         Args:
@@ -89,6 +90,10 @@ class TensorflowBoundingBoxesYOLOV1Confluence(BoundingBoxesYOLOV1PostProcessing)
                 box confidence scores (setting to False results in suppression of
                 suboptimal boxes)
             sigma: used in gaussian decaying. A smaller value causes harsher decaying.
+            use_numpy_function: if True (the default), run the numpy implementation
+                :py:meth:`confluence` through :py:func:`tf.numpy_function`. If False,
+                run the TensorFlow implementation :py:meth:`confluence_graph`, which
+                keeps the boxes on the device but is opt-in.
 
         Returns:
             A dictionary mapping class identity to final retained boxes (and
@@ -102,6 +107,7 @@ class TensorflowBoundingBoxesYOLOV1Confluence(BoundingBoxesYOLOV1PostProcessing)
         self._gaussian = gaussian
         self._sigma = sigma
         self._force_prediction = force_prediction
+        self._use_numpy_function = use_numpy_function
 
     @classmethod
     def on_grid_shape(
@@ -114,6 +120,7 @@ class TensorflowBoundingBoxesYOLOV1Confluence(BoundingBoxesYOLOV1PostProcessing)
         gaussian: bool = False,
         sigma: float = 0.5,
         force_prediction: bool = False,
+        use_numpy_function: bool = True,
     ) -> TensorflowBoundingBoxesYOLOV1Confluence:
         return cls(
             bounding_boxes_batched_grid=(
@@ -126,6 +133,7 @@ class TensorflowBoundingBoxesYOLOV1Confluence(BoundingBoxesYOLOV1PostProcessing)
             gaussian=gaussian,
             sigma=sigma,
             force_prediction=force_prediction,
+            use_numpy_function=use_numpy_function,
         )
 
     @tf.function(
@@ -161,11 +169,25 @@ class TensorflowBoundingBoxesYOLOV1Confluence(BoundingBoxesYOLOV1PostProcessing)
             tf.reshape(top_scores.indices, shape=(batch_size, num_boxes)), tf.int32
         )
 
-        final_boxes, final_scores, final_labels, final_detections = tf.numpy_function(
-            self.confluence,
-            [boxes, scores, labels],
-            [tf.float32, tf.float32, tf.int32, tf.int32],
-        )
+        if self._use_numpy_function:
+            (
+                final_boxes,
+                final_scores,
+                final_labels,
+                final_detections,
+            ) = tf.numpy_function(
+                self.confluence,
+                [boxes, scores, labels],
+                [tf.float32, tf.float32, tf.int32, tf.int32],
+            )
+
+        else:
+            (
+                final_boxes,
+                final_scores,
+                final_labels,
+                final_detections,
+            ) = self.confluence_graph(boxes=boxes, scores=scores, labels=labels)
 
         return (
             tf.gather(final_boxes, indices=[1, 0, 3, 2], axis=-1),
@@ -196,162 +218,31 @@ class TensorflowBoundingBoxesYOLOV1Confluence(BoundingBoxesYOLOV1PostProcessing)
         retained_labels = []
 
         for batch_idx in range(batch_size):
-            class_mapping: dict[int, list[npt.NDArray]] = self.assign_boxes_to_classes(
-                boxes[batch_idx], labels[batch_idx], scores[batch_idx]
+            # Compare in float64, as the scalar comparison in assign_boxes_to_classes
+            # does, so the same boxes pass the threshold.
+            dets = np.concatenate(
+                (
+                    boxes[batch_idx].astype("float64"),
+                    scores[batch_idx].astype("float64")[:, None],
+                ),
+                axis=1,
             )
+            above_threshold = dets[:, 4] >= self._pre_algorithm_threshold
+            dets = dets[above_threshold]
+            dets_labels = labels[batch_idx][above_threshold]
+
+            # Visit the classes in order of first appearance, like a defaultdict.
+            unique_labels, first_indices = np.unique(dets_labels, return_index=True)
             output = {}
 
-            for each_class in class_mapping:
-                dets = np.array(class_mapping[each_class])
-                retain = []
-
-                while dets.size > 0:
-                    confluence_scores: list[npt.NDArray] = []
-                    proximities = []
-
-                    while len(confluence_scores) < np.size(dets, 0):
-                        current_box = len(confluence_scores)
-                        x1 = dets[current_box, 0]
-                        y1 = dets[current_box, 1]
-                        x2 = dets[current_box, 2]
-                        y2 = dets[current_box, 3]
-                        confidence_score = dets[current_box, 4]
-
-                        xx1 = dets[np.arange(len(dets)) != current_box, 0]
-                        yy1 = dets[np.arange(len(dets)) != current_box, 1]
-                        xx2 = dets[np.arange(len(dets)) != current_box, 2]
-                        yy2 = dets[np.arange(len(dets)) != current_box, 3]
-                        cconf = dets[np.arange(len(dets)) != current_box, 4]
-
-                        min_x: npt.NDArray = np.minimum(x1, xx1)
-                        min_y: npt.NDArray = np.minimum(y1, yy1)
-                        max_x: npt.NDArray = np.maximum(x2, xx2)
-                        max_y: npt.NDArray = np.maximum(y2, yy2)
-
-                        x1, y1, x2, y2 = self.normalise_coordinates(
-                            x1,
-                            y1,
-                            x2,
-                            y2,
-                            min_x,
-                            max_x,
-                            min_y,
-                            max_y,
-                        )
-                        xx1, yy1, xx2, yy2 = self.normalise_coordinates(
-                            xx1,
-                            yy1,
-                            xx2,
-                            yy2,
-                            min_x,
-                            max_x,
-                            min_y,
-                            max_y,
-                        )
-
-                        hd_x1, hd_x2, vd_y1, vd_y2 = (
-                            abs(x1 - xx1),
-                            abs(x2 - xx2),
-                            abs(y1 - yy1),
-                            abs(y2 - yy2),
-                        )
-                        proximity = hd_x1 + hd_x2 + vd_y1 + vd_y2
-                        all_proximities = np.ones_like(proximity)
-                        cconf_scores = np.zeros_like(cconf)
-
-                        all_proximities[
-                            proximity <= self._confluence_threshold
-                        ] = proximity[proximity <= self._confluence_threshold]
-                        cconf_scores[proximity <= self._confluence_threshold] = cconf[
-                            proximity <= self._confluence_threshold
-                        ]
-
-                        if cconf_scores.size > 0:
-                            confluence_score = np.amax(cconf_scores)
-
-                        else:
-                            confluence_score = confidence_score
-
-                        if all_proximities.size > 0:
-                            proximity = (
-                                sum(all_proximities) / all_proximities.size
-                            ) * (1 - confidence_score)
-
-                        else:
-                            proximity = sum(all_proximities) * (1 - confidence_score)
-
-                        confluence_scores.append(confluence_score)
-                        proximities.append(proximity)
-
-                    conf = np.array(confluence_scores)
-                    prox = np.array(proximities)
-
-                    dets_temp = np.concatenate((dets, prox[:, None]), axis=1)
-                    dets_temp = np.concatenate((dets_temp, conf[:, None]), axis=1)
-                    min_idx = np.argmin(dets_temp[:, 5], axis=0)
-                    dets[[0, min_idx], :] = dets[[min_idx, 0], :]
-                    dets_temp[[0, min_idx], :] = dets_temp[[min_idx, 0], :]
-                    dets[0, 4] = dets_temp[0, 6]
-                    retain.append(dets[0, :])
-
-                    x1, y1, x2, y2 = dets[0, 0], dets[0, 1], dets[0, 2], dets[0, 3]
-                    min_x = np.minimum(x1, dets[1:, 0])
-                    min_y = np.minimum(y1, dets[1:, 1])
-                    max_x = np.maximum(x2, dets[1:, 2])
-                    max_y = np.maximum(y2, dets[1:, 3])
-
-                    x1, y1, x2, y2 = self.normalise_coordinates(
-                        x1,
-                        y1,
-                        x2,
-                        y2,
-                        min_x,
-                        max_x,
-                        min_y,
-                        max_y,
-                    )
-                    xx1, yy1, xx2, yy2 = self.normalise_coordinates(
-                        dets[1:, 0],
-                        dets[1:, 1],
-                        dets[1:, 2],
-                        dets[1:, 3],
-                        min_x,
-                        max_x,
-                        min_y,
-                        max_y,
-                    )
-                    md_x1, md_x2, md_y1, md_y2 = (
-                        abs(x1 - xx1),
-                        abs(x2 - xx2),
-                        abs(y1 - yy1),
-                        abs(y2 - yy2),
-                    )
-                    manhattan_distance = md_x1 + md_x2 + md_y1 + md_y2
-                    weights = np.ones_like(manhattan_distance)
-
-                    if self._gaussian:
-                        gaussian_weights = np.exp(
-                            -((1 - manhattan_distance) * (1 - manhattan_distance))
-                            / self._sigma
-                        )
-                        weights[
-                            manhattan_distance <= self._confluence_threshold
-                        ] = gaussian_weights[
-                            manhattan_distance <= self._confluence_threshold
-                        ]
-
-                    else:
-                        weights[
-                            manhattan_distance <= self._confluence_threshold
-                        ] = manhattan_distance[
-                            manhattan_distance <= self._confluence_threshold
-                        ]
-
-                    dets[1:, 4] *= weights
-                    to_reprocess = np.where(dets[1:, 4] >= self._score_threshold)[0]
-                    dets = dets[to_reprocess + 1, :]
-
-                output[each_class] = retain
+            for each_class in unique_labels[np.argsort(first_indices)].tolist():
+                output[each_class] = _confluence_single_class(
+                    dets=dets[dets_labels == each_class],
+                    confluence_threshold=self._confluence_threshold,
+                    score_threshold=self._score_threshold,
+                    gaussian=self._gaussian,
+                    sigma=self._sigma,
+                )
 
             batch_boxes, batch_scores, batch_labels = self.from_mapping_to_arrays(
                 output
@@ -368,6 +259,201 @@ class TensorflowBoundingBoxesYOLOV1Confluence(BoundingBoxesYOLOV1PostProcessing)
             batch_size=batch_size,
         )
 
+    @tf.function(
+        input_signature=[
+            tf.TensorSpec(None, tf.float32),
+            tf.TensorSpec(None, tf.float32),
+            tf.TensorSpec(None, tf.int32),
+        ]
+    )
+    def confluence_graph(
+        self, boxes: Tensor, scores: Tensor, labels: Tensor
+    ) -> tuple[Tensor, Tensor, Tensor, Tensor]:
+        """Runs Confluence on a batch of boxes with TensorFlow operations only.
+
+        This is the graph-compatible counterpart of :py:meth:`confluence`, so that the
+        post-processing can be traced into a :py:func:`tf.function` without copying the
+        boxes to the host. The images are processed one at a time with
+        :py:func:`tf.map_fn`, and the classes of an image are processed together, each
+        iteration selecting one box from every class that still has boxes left.
+
+        The retained boxes are returned in the same order and with the same padding as
+        :py:meth:`pad_retained_arrays`, and the minimum detection score and forced
+        prediction are applied as in :py:meth:`from_mapping_to_arrays`. The
+        proximities are summed in a different order, so the confluence scores can
+        differ from :py:meth:`confluence` by floating point rounding.
+
+        Args:
+            boxes: A tensor of shape `(batch_size, num_boxes, 4)` with the rows
+                `(x1, y1, x2, y2)`.
+            scores: A tensor of shape `(batch_size, num_boxes)` with the class
+                confidence scores.
+            labels: A tensor of shape `(batch_size, num_boxes)` with the class
+                identifiers.
+
+        Returns:
+            A tuple with the padded boxes, scores, and labels of the retained
+            detections, and the number of detections in each image.
+        """
+        image_boxes, image_scores, image_labels, image_counts = tf.map_fn(
+            self._confluence_image,
+            (boxes, scores, labels),
+            fn_output_signature=(
+                tf.TensorSpec([None, 4], tf.float32),
+                tf.TensorSpec([None], tf.float32),
+                tf.TensorSpec([None], tf.int32),
+                tf.TensorSpec([], tf.int32),
+            ),
+        )
+
+        # An image without detections is padded with a single row of zeros, which
+        # pad_retained_arrays counts as one detection.
+        num_detections = tf.maximum(image_counts, 1)
+        max_detections = tf.reduce_max(num_detections)
+
+        return (
+            image_boxes[:, :max_detections],
+            image_scores[:, :max_detections],
+            image_labels[:, :max_detections],
+            num_detections,
+        )
+
+    def _confluence_image(
+        self, inputs: tuple[Tensor, Tensor, Tensor]
+    ) -> tuple[Tensor, Tensor, Tensor, Tensor]:
+        boxes, scores, labels = inputs
+        num_boxes = tf.shape(scores)[0]
+        indices = tf.range(num_boxes)
+
+        # Compare in float64, as the numpy implementation does, so the same boxes pass
+        # the thresholds.
+        current_scores = tf.cast(scores, tf.float64)
+        valid = current_scores >= self._pre_algorithm_threshold
+        proximities = _tf_pairwise_proximities(tf.cast(boxes, tf.float64))
+        same_class = (
+            (labels[:, None] == labels[None, :]) & valid[:, None] & valid[None, :]
+        )
+        confluent = (
+            (proximities <= self._confluence_threshold)
+            & same_class
+            & (indices[:, None] != indices[None, :])
+        )
+        infinity = tf.constant(np.inf, dtype=tf.float64)
+
+        # Each box has a rank, and the front box of a class takes the rank of the
+        # selected box, mirroring the swap in the numpy implementation so that ties
+        # are broken the same way.
+        def select_boxes(active, current_scores, ranks, selected_steps, outputs, step):
+            pair_active = same_class & active[:, None] & active[None, :]
+            others = pair_active & (indices[:, None] != indices[None, :])
+            within = confluent & others
+            num_others = tf.reduce_sum(tf.cast(others, tf.float64), axis=1)
+            all_proximities = tf.where(others, tf.where(within, proximities, 1.0), 0.0)
+            proximity = tf.where(
+                num_others > 0,
+                tf.reduce_sum(all_proximities, axis=1) / tf.maximum(num_others, 1.0),
+                0.0,
+            ) * (1 - current_scores)
+            confluence_scores = tf.where(
+                num_others > 0,
+                tf.reduce_max(tf.where(within, current_scores[None, :], 0.0), axis=1),
+                current_scores,
+            )
+
+            class_min = tf.reduce_min(
+                tf.where(pair_active, proximity[None, :], infinity), axis=1
+            )
+            is_min = active & (proximity == class_min)
+            min_rank = tf.reduce_min(
+                tf.where(pair_active & is_min[None, :], ranks[None, :], num_boxes),
+                axis=1,
+            )
+            selected = is_min & (ranks == min_rank)
+            selected_steps = tf.where(selected, step, selected_steps)
+            outputs = tf.where(selected, confluence_scores, outputs)
+
+            front_rank = tf.reduce_min(
+                tf.where(pair_active, ranks[None, :], num_boxes), axis=1
+            )
+            selected_rank = tf.reduce_min(
+                tf.where(pair_active & selected[None, :], ranks[None, :], num_boxes),
+                axis=1,
+            )
+            ranks = tf.where(active & (ranks == front_rank), selected_rank, ranks)
+
+            # Each column holds at most one selected box, so the sum reads the
+            # proximity to the selected box of the same class.
+            selected_pairs = pair_active & selected[:, None]
+            manhattan_distance = tf.reduce_sum(
+                tf.where(selected_pairs, proximities, 0.0), axis=0
+            )
+            is_confluent = tf.reduce_any(selected_pairs & confluent, axis=0)
+
+            if self._gaussian:
+                weights = tf.where(
+                    is_confluent,
+                    tf.exp(
+                        -((1 - manhattan_distance) * (1 - manhattan_distance))
+                        / self._sigma
+                    ),
+                    1.0,
+                )
+
+            else:
+                weights = tf.where(is_confluent, manhattan_distance, 1.0)
+
+            remaining = active & ~selected
+            current_scores = tf.where(
+                remaining, current_scores * weights, current_scores
+            )
+            active = remaining & (current_scores >= self._score_threshold)
+
+            return active, current_scores, ranks, selected_steps, outputs, step + 1
+
+        _, _, _, selected_steps, outputs, _ = tf.while_loop(
+            lambda active, *_: tf.reduce_any(active),
+            select_boxes,
+            loop_vars=(
+                valid,
+                current_scores,
+                indices,
+                tf.fill([num_boxes], -1),
+                tf.zeros([num_boxes], dtype=tf.float64),
+                tf.constant(0),
+            ),
+        )
+
+        # Order the retained boxes by class, in order of first appearance, and then in
+        # the order they were selected.
+        retained = selected_steps >= 0
+        first_indices = tf.reduce_min(
+            tf.where(same_class, indices[None, :], num_boxes), axis=1
+        )
+        order_keys = tf.cast(first_indices, tf.int64) * tf.cast(
+            num_boxes, tf.int64
+        ) + tf.cast(selected_steps, tf.int64)
+        max_key = tf.cast(num_boxes, tf.int64) * tf.cast(num_boxes, tf.int64)
+
+        final_scores = tf.cast(outputs, tf.float32)
+        keep = retained & (final_scores >= self._min_detection_score)
+
+        if self._force_prediction:
+            best_score = tf.reduce_max(tf.where(retained, final_scores, -np.inf))
+            is_best = retained & (final_scores == best_score)
+            best_key = tf.reduce_min(tf.where(is_best, order_keys, max_key))
+            keep = keep | (~tf.reduce_any(keep) & is_best & (order_keys == best_key))
+
+        order = tf.argsort(tf.where(keep, order_keys, max_key), stable=True)
+        num_kept = tf.reduce_sum(tf.cast(keep, tf.int32))
+        is_kept = indices < num_kept
+
+        return (
+            tf.where(is_kept[:, None], tf.gather(boxes, order), 0.0),
+            tf.where(is_kept, tf.gather(final_scores, order), 0.0),
+            tf.where(is_kept, tf.gather(labels, order), 0),
+            num_kept,
+        )
+
     def assign_boxes_to_classes(
         self, bounding_boxes: npt.NDArray, classes: npt.NDArray, scores: npt.NDArray
     ) -> dict[int, list[npt.NDArray]]:
@@ -567,3 +653,156 @@ class TensorflowBoundingBoxesYOLOV1Confluence(BoundingBoxesYOLOV1PostProcessing)
         )
 
         return tf.expand_dims(bboxes_conf, axis=-1) * bboxes_labels
+
+
+def _confluence_single_class(
+    dets: npt.NDArray,
+    confluence_threshold: float,
+    score_threshold: float,
+    gaussian: bool,
+    sigma: float,
+) -> list[npt.NDArray]:
+    """Runs Confluence on the detections of a single class.
+
+    The proximity of every pair of boxes depends only on their coordinates, which never
+    change, so the proximity matrix is computed once. Each iteration then scores the
+    remaining boxes by reading a submatrix of it instead of recomputing the
+    proximities box by box.
+
+    The remaining boxes are kept in the same order as the reference implementation,
+    which swaps the selected box to the front, and the proximities are summed
+    sequentially in that order, so the selected boxes and scores are identical to it.
+
+    Args:
+        dets: An array of shape `(n_boxes, 5)` with the rows `(x1, y1, x2, y2, score)`.
+        confluence_threshold: The proximity below which two boxes are confluent.
+        score_threshold: The score below which a box is discarded.
+        gaussian: If `True`, decay the scores of confluent boxes with a Gaussian
+            instead of multiplying them by their proximity.
+        sigma: The width of the Gaussian decay.
+
+    Returns:
+        The retained boxes as rows `(x1, y1, x2, y2, confluence score)`, in the order
+        they were selected.
+    """
+    proximities: npt.NDArray = _pairwise_proximities(dets)
+    confluent: npt.NDArray = proximities <= confluence_threshold
+    scores: npt.NDArray = dets[:, 4].copy()
+    order: npt.NDArray = np.arange(dets.shape[0])
+    retain: list[npt.NDArray] = []
+
+    while order.size > 0:
+        current_scores: npt.NDArray = scores[order]
+
+        if order.size > 1:
+            order_confluent = confluent[np.ix_(order, order)]
+            np.fill_diagonal(order_confluent, False)
+            all_proximities = np.where(
+                order_confluent, proximities[np.ix_(order, order)], 1.0
+            )
+            np.fill_diagonal(all_proximities, 0.0)
+            # cumsum adds left to right, matching the reference's builtin sum().
+            proximity = (
+                np.cumsum(all_proximities, axis=1)[:, -1] / (order.size - 1)
+            ) * (1 - current_scores)
+            confluence_scores = np.where(
+                order_confluent, current_scores[None, :], 0.0
+            ).max(axis=1)
+
+        else:
+            proximity = np.zeros(1)
+            confluence_scores = current_scores
+
+        min_idx = int(np.argmin(proximity))
+        selected = order[min_idx]
+        retain.append(np.append(dets[selected, :4], confluence_scores[min_idx]))
+
+        order[[0, min_idx]] = order[[min_idx, 0]]
+        order = order[1:]
+        manhattan_distance = proximities[selected, order]
+        is_confluent = confluent[selected, order]
+
+        if gaussian:
+            weights = np.where(
+                is_confluent,
+                np.exp(-((1 - manhattan_distance) * (1 - manhattan_distance)) / sigma),
+                1.0,
+            )
+
+        else:
+            weights = np.where(is_confluent, manhattan_distance, 1.0)
+
+        scores[order] *= weights
+        order = order[scores[order] >= score_threshold]
+
+    return retain
+
+
+def _pairwise_proximities(dets: npt.NDArray) -> npt.NDArray:
+    """Computes the Confluence proximity between every pair of boxes.
+
+    Each pair of boxes is normalised to the box enclosing both, and the proximity is
+    the Manhattan distance between their normalised corners. The operations match
+    :py:meth:`TensorflowBoundingBoxesYOLOV1Confluence.normalise_coordinates`, so the
+    values are identical to computing them one pair at a time.
+
+    Args:
+        dets: An array of shape `(n_boxes, 5)` with the rows `(x1, y1, x2, y2, score)`.
+
+    Returns:
+        A symmetric array of shape `(n_boxes, n_boxes)`.
+    """
+    x1, y1, x2, y2 = (dets[:, i] for i in range(4))
+    min_x = np.minimum(x1[:, None], x1[None, :])
+    min_y = np.minimum(y1[:, None], y1[None, :])
+    max_x = np.maximum(x2[:, None], x2[None, :])
+    max_y = np.maximum(y2[:, None], y2[None, :])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        width = max_x - min_x
+        height = max_y - min_y
+        proximities = np.abs(
+            (x1[:, None] - min_x) / width - (x1[None, :] - min_x) / width
+        )
+        proximities += np.abs(
+            (x2[:, None] - min_x) / width - (x2[None, :] - min_x) / width
+        )
+        proximities += np.abs(
+            (y1[:, None] - min_y) / height - (y1[None, :] - min_y) / height
+        )
+        proximities += np.abs(
+            (y2[:, None] - min_y) / height - (y2[None, :] - min_y) / height
+        )
+
+    return proximities
+
+
+def _tf_pairwise_proximities(boxes: Tensor) -> Tensor:
+    """Computes the Confluence proximity between every pair of boxes.
+
+    The TensorFlow counterpart of :py:func:`_pairwise_proximities`.
+
+    Args:
+        boxes: A tensor of shape `(n_boxes, 4)` with the rows `(x1, y1, x2, y2)`.
+
+    Returns:
+        A symmetric tensor of shape `(n_boxes, n_boxes)`.
+    """
+    x1, y1, x2, y2 = tf.unstack(boxes, num=4, axis=1)
+    min_x = tf.minimum(x1[:, None], x1[None, :])
+    min_y = tf.minimum(y1[:, None], y1[None, :])
+    max_x = tf.maximum(x2[:, None], x2[None, :])
+    max_y = tf.maximum(y2[:, None], y2[None, :])
+    width = max_x - min_x
+    height = max_y - min_y
+
+    proximities = tf.abs((x1[:, None] - min_x) / width - (x1[None, :] - min_x) / width)
+    proximities += tf.abs((x2[:, None] - min_x) / width - (x2[None, :] - min_x) / width)
+    proximities += tf.abs(
+        (y1[:, None] - min_y) / height - (y1[None, :] - min_y) / height
+    )
+    proximities += tf.abs(
+        (y2[:, None] - min_y) / height - (y2[None, :] - min_y) / height
+    )
+
+    return proximities
@@ -14,6 +14,8 @@
 #
 # ACCESS THE FULL CC BY 4.0 LICENSE HERE:
 # https://creativecommons.org/licenses/by/4.0/legalcode
+from dioptra.sdk.utilities.annotations import AnnotationIndex
+
 from .annotation_data import AnnotationData
 from .encodings import AnnotationEncoding, NumpyAnnotationEncoding
 from .pascal_voc import PascalVOCAnnotationData
@@ -21,6 +23,7 @@ from .pascal_voc import PascalVOCAnnotationData
 __all__ = [
     "AnnotationData",
     "AnnotationEncoding",
+    "AnnotationIndex",
     "NumpyAnnotationEncoding",
     "PascalVOCAnnotationData",
 ]
@@ -32,6 +32,10 @@ class AnnotationData(metaclass=ABCMeta):
     def get(self, y) -> Tuple[BoxesType, LabelsType]:
         raise NotImplementedError
 
+    @abstractmethod
+    def build_index(self, filepaths, index_filepath, max_workers=None):
+        raise NotImplementedError
+
     @abstractmethod
     def read_file(self, filepath) -> Tuple[List[List[float]], List[int]]:
         raise NotImplementedError
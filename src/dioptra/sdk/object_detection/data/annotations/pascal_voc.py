@@ -16,13 +16,16 @@
 # https://creativecommons.org/licenses/by/4.0/legalcode
 from __future__ import annotations
 
+import functools
+import os
 from pathlib import Path
-from typing import Dict, Iterable, List, Tuple, Union, cast
-from xml.etree import ElementTree
+from typing import Dict, Iterable, Optional, Tuple, Union
 
 import structlog
 from structlog.stdlib import BoundLogger
 
+from dioptra.sdk.utilities.annotations import AnnotationIndex, read_pascal_voc_file
+
 from .annotation_data import AnnotationData
 from .encodings import AnnotationEncoding, BoxesType, LabelsType
 
@@ -34,16 +37,48 @@ class PascalVOCAnnotationData(AnnotationData):
         self,
         labels: Iterable[str],
         encoding: AnnotationEncoding,
+        index: Optional[AnnotationIndex] = None,
     ) -> None:
         self._labels = {x: idx for idx, x in enumerate(labels)}
         self._encoding = encoding
+        self._index = index
+
+    @property
+    def index(self) -> Optional[AnnotationIndex]:
+        return self._index
 
     @property
     def labels(self) -> Dict[str, int]:
         return self._labels
 
+    def build_index(
+        self,
+        filepaths: Iterable[Union[Path, str]],
+        index_filepath: Union[Path, str],
+        max_workers: Optional[int] = None,
+    ) -> AnnotationIndex:
+        # The workers receive the module-level parser rather than this object, so
+        # that they do not import TensorFlow through this package.
+        self._index = AnnotationIndex.build(
+            parse_file=functools.partial(read_pascal_voc_file, labels=self._labels),
+            label_names=list(self._labels),
+            filepaths=filepaths,
+            index_filepath=index_filepath,
+            max_workers=max_workers,
+        )
+
+        return self._index
+
     def get(self, y: Union[Path, bytes, str]) -> Tuple[BoxesType, LabelsType]:
-        boxes, classes = self.read_file(filepath=y)
+        filepath = y.decode() if isinstance(y, bytes) else os.fspath(y)
+        entry = self._index.lookup(filepath) if self._index is not None else None
+
+        if entry is None:
+            boxes, classes = self.read_file(filepath=filepath)
+
+        else:
+            boxes, classes = entry[0].tolist(), entry[1].tolist()
+
         encoded_boxes, encoded_classes = self._encoding.encode(boxes, classes)
 
         return encoded_boxes, encoded_classes
@@ -51,44 +86,4 @@ class PascalVOCAnnotationData(AnnotationData):
     def read_file(
         self, filepath: Union[Path, bytes, str]
     ) -> Tuple[list[list[float]], list[int]]:
-        # Load and parse the file
-        filepath = filepath.decode() if isinstance(filepath, bytes) else str(filepath)
-        tree: ElementTree.ElementTree = ElementTree.parse(filepath)
-
-        # Get the root of the document
-        root = tree.getroot()
-        boxes: List[List[float]] = list()
-        classes: List[int] = list()
-
-        # Get width and height of an image
-        width_element: ElementTree.Element | None = root.find(".//size/width")
-        height_element: ElementTree.Element | None = root.find(".//size/height")
-        width: int = (
-            int(cast(str, width_element.text)) if width_element is not None else -1
-        )
-        height: int = (
-            int(cast(str, height_element.text)) if height_element is not None else -1
-        )
-
-        # Extract each bounding box
-        for box in root.findall(".//object"):
-            class_name_element: ElementTree.Element | None = box.find("name")
-            class_name: str = (
-                cast(str, class_name_element.text)
-                if class_name_element is not None
-                else ""
-            )
-            class_id = self._labels[class_name]
-            xmin_element: ElementTree.Element | None = box.find("bndbox/xmin")
-            ymin_element: ElementTree.Element | None = box.find("bndbox/ymin")
-            xmax_element: ElementTree.Element | None = box.find("bndbox/xmax")
-            ymax_element: ElementTree.Element | None = box.find("bndbox/ymax")
-            xmin = int(cast(str, xmin_element.text)) if xmin_element is not None else -1
-            ymin = int(cast(str, ymin_element.text)) if ymin_element is not None else -1
-            xmax = int(cast(str, xmax_element.text)) if xmax_element is not None else -1
-            ymax = int(cast(str, ymax_element.text)) if ymax_element is not None else -1
-            coordinates = [xmin / width, ymin / height, xmax / width, ymax / height]
-            boxes.append(coordinates)
-            classes.append(class_id)
-
-        return boxes, classes
+        return read_pascal_voc_file(filepath, labels=self._labels)
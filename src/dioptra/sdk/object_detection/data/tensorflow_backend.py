@@ -17,7 +17,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Callable, Iterable, List, Optional, Sequence, Tuple, cast
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple, Union, cast
 
 import structlog
 from structlog.stdlib import BoundLogger
@@ -72,6 +72,11 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
         images_dirname: str = "images",
         annotations_dirname: str = "annotations",
         seed: Optional[int] = None,
+        num_parallel_calls: Optional[int] = tf.data.AUTOTUNE,
+        deterministic: Optional[bool] = None,
+        annotation_index_filepath: Optional[Path] = None,
+        cache: Union[bool, Path] = False,
+        snapshot_directory: Optional[Path] = None,
     ) -> None:
         self._annotation_data = annotation_data
         self._bounding_boxes_batched_grid = bounding_boxes_batched_grid
@@ -89,6 +94,12 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
         self._images_dirname = images_dirname
         self._annotations_dirname = annotations_dirname
         self._seed = seed
+        self._num_parallel_calls = num_parallel_calls
+        self._deterministic = deterministic
+        self._annotation_index_filepath = annotation_index_filepath
+        self._annotation_index_built = False
+        self._cache = cache
+        self._snapshot_directory = snapshot_directory
 
         self._training_annotations_filepaths: list[str] | None = None
         self._training_images_filepaths: list[str] | None = None
@@ -114,6 +125,11 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
         annotations_dirname: str = "annotations",
         augmentations_seed: Optional[int] = None,
         shuffle_seed: Optional[int] = None,
+        num_parallel_calls: Optional[int] = tf.data.AUTOTUNE,
+        deterministic: Optional[bool] = None,
+        annotation_index_filepath: Path | str | None = None,
+        cache: bool | Path | str = False,
+        snapshot_directory: Path | str | None = None,
     ) -> TensorflowObjectDetectionData:
         annotation_data_registry: dict[
             str, Callable[[], PascalVOCAnnotationData]
@@ -162,6 +178,11 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
             Path(validation_directory) if validation_directory else None
         )
         testing_directory = Path(testing_directory) if testing_directory else None
+        annotation_index_filepath = (
+            Path(annotation_index_filepath) if annotation_index_filepath else None
+        )
+        cache = cache if isinstance(cache, bool) else Path(cache)
+        snapshot_directory = Path(snapshot_directory) if snapshot_directory else None
 
         return TensorflowObjectDetectionData(
             annotation_data=annotation_data_object,
@@ -180,6 +201,11 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
             images_dirname=images_dirname,
             annotations_dirname=annotations_dirname,
             seed=shuffle_seed,
+            num_parallel_calls=num_parallel_calls,
+            deterministic=deterministic,
+            annotation_index_filepath=annotation_index_filepath,
+            cache=cache,
+            snapshot_directory=snapshot_directory,
         )
 
     @property
@@ -199,18 +225,49 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
         if self.training_images_directory is None:
             return None
 
+        self._build_annotation_index()
         dataset = self.create_dataset(
             self.training_images_filepaths, self.training_annotations_filepaths
         )
-        dataset = self.shuffle(
-            dataset,
-            batch_size=self._batch_size,
-            seed=self._seed,
-            skip=not self._shuffle_training_data,
-        )
-        dataset = self.map_apply(
-            dataset, map_fn=self.load_xy_data_factory(training=True)
-        )
+
+        if self._cache or self._snapshot_directory is not None:
+            # Store the decoded images and parsed boxes before the random
+            # augmentation, and shuffle the stored elements, so that only the
+            # augmentation and embedding run on every epoch.
+            dataset = self.map_apply(
+                dataset,
+                map_fn=self.load_xy_annotations,
+                num_parallel_calls=self._num_parallel_calls,
+                deterministic=self._deterministic,
+            )
+            dataset = self.cache_apply(dataset, name="training")
+            dataset = self.shuffle(
+                dataset,
+                batch_size=self._batch_size,
+                seed=self._seed,
+                skip=not self._shuffle_training_data,
+            )
+            dataset = self.map_apply(
+                dataset,
+                map_fn=self.embed_xy_data_factory(training=True),
+                num_parallel_calls=self._num_parallel_calls,
+                deterministic=self._deterministic,
+            )
+
+        else:
+            dataset = self.shuffle(
+                dataset,
+                batch_size=self._batch_size,
+                seed=self._seed,
+                skip=not self._shuffle_training_data,
+            )
+            dataset = self.map_apply(
+                dataset,
+                map_fn=self.load_xy_data_factory(training=True),
+                num_parallel_calls=self._num_parallel_calls,
+                deterministic=self._deterministic,
+            )
+
         dataset = self.batch(dataset, batch_size=self._batch_size)
         dataset = self.map_apply(dataset, map_fn=self._pack_y_elements)
         dataset = self.prefetch(dataset)
@@ -222,10 +279,17 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
         if self.validation_images_directory is None:
             return None
 
+        self._build_annotation_index()
         dataset = self.create_dataset(
             self.validation_images_filepaths, self.validation_annotations_filepaths
         )
-        dataset = self.map_apply(dataset, map_fn=self.load_xy_data_factory())
+        dataset = self.map_apply(
+            dataset,
+            map_fn=self.load_xy_data_factory(),
+            num_parallel_calls=self._num_parallel_calls,
+            deterministic=self._deterministic,
+        )
+        dataset = self.cache_apply(dataset, name="validation")
         dataset = self.batch(dataset, batch_size=self._batch_size)
         dataset = self.map_apply(dataset, map_fn=self._pack_y_elements)
         dataset = self.prefetch(dataset)
@@ -237,10 +301,17 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
         if self.testing_images_directory is None:
             return None
 
+        self._build_annotation_index()
         dataset = self.create_dataset(
             self.testing_images_filepaths, self.testing_annotations_filepaths
         )
-        dataset = self.map_apply(dataset, map_fn=self.load_xy_data_factory())
+        dataset = self.map_apply(
+            dataset,
+            map_fn=self.load_xy_data_factory(),
+            num_parallel_calls=self._num_parallel_calls,
+            deterministic=self._deterministic,
+        )
+        dataset = self.cache_apply(dataset, name="testing")
         dataset = self.batch(dataset, batch_size=self._batch_size)
         dataset = self.map_apply(dataset, map_fn=self._pack_y_elements)
         dataset = self.prefetch(dataset)
@@ -420,6 +491,44 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
             tf.numpy_function(self._annotation_data.get, [y], [tf.float32, tf.int32]),
         )
 
+    @tf.function(
+        input_signature=[
+            tf.TensorSpec(None, tf.string),
+            tf.TensorSpec(None, tf.string),
+        ]
+    )
+    def load_xy_annotations(
+        self, x: Tensor, y: Tensor
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        image = self.load_image(x)
+        bboxes, labels = self.load_annotations(y)
+
+        return image, bboxes, labels
+
+    def embed_xy_data_factory(
+        self, training: bool = False
+    ) -> Callable[
+        [Tensor, Tensor, Tensor], tuple[Tensor, Tensor, Tensor, Tensor, Tensor]
+    ]:
+        @tf.function(
+            input_signature=[
+                tf.TensorSpec(None, tf.float32),
+                tf.TensorSpec(None, tf.float32),
+                tf.TensorSpec(None, tf.int32),
+            ]
+        )
+        def embed_xy_data(
+            image: Tensor, bboxes: Tensor, labels: Tensor
+        ) -> tuple[Tensor, Tensor, Tensor, Tensor, Tensor]:
+            return self._embed_xy_data(image, bboxes, labels, training=training)
+
+        return cast(
+            Callable[
+                [Tensor, Tensor, Tensor], tuple[Tensor, Tensor, Tensor, Tensor, Tensor]
+            ],
+            embed_xy_data,
+        )
+
     def load_xy_data_factory(
         self, training: bool = False
     ) -> Callable[[Tensor, Tensor], tuple[Tensor, Tensor, Tensor, Tensor, Tensor]]:
@@ -432,26 +541,42 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
         def load_xy_data(
             x: Tensor, y: Tensor
         ) -> tuple[Tensor, Tensor, Tensor, Tensor, Tensor]:
-            return cast(
-                tuple[Tensor, Tensor, Tensor, Tensor, Tensor],
-                tf.py_function(
-                    self._load_xy_data,
-                    [x, y, training],
-                    [tf.float32, tf.float32, tf.float32, tf.float32, tf.float32],
-                ),
-            )
+            return self._load_xy_data(x, y, training=training)
 
         return cast(
             Callable[[Tensor, Tensor], tuple[Tensor, Tensor, Tensor, Tensor, Tensor]],
             load_xy_data,
         )
 
+    def _build_annotation_index(self) -> None:
+        # Parse the annotations of every split once, so that later epochs look them
+        # up instead of parsing the XML files again.
+        if self._annotation_index_filepath is None or self._annotation_index_built:
+            return
+
+        self._annotation_data.build_index(
+            filepaths=[
+                *(self.training_annotations_filepaths or []),
+                *(self.validation_annotations_filepaths or []),
+                *(self.testing_annotations_filepaths or []),
+            ],
+            index_filepath=self._annotation_index_filepath,
+        )
+        self._annotation_index_built = True
+
     def _load_xy_data(
         self, x: Tensor, y: Tensor, training: bool = False
     ) -> Tuple[Tensor, Tensor, Tensor, Tensor, Tensor]:
-        image = self.load_image(x)
-        bboxes, labels = self.load_annotations(y)
+        # The image is decoded and resized and the boxes are embedded in the grid with
+        # graph operations. Only parsing the annotations and augmenting the data run
+        # in Python, on the threads of the parallel map.
+        image, bboxes, labels = self.load_xy_annotations(x, y)
+
+        return self._embed_xy_data(image, bboxes, labels, training=training)
 
+    def _embed_xy_data(
+        self, image: Tensor, bboxes: Tensor, labels: Tensor, training: bool = False
+    ) -> Tuple[Tensor, Tensor, Tensor, Tensor, Tensor]:
         if training:
             image, bboxes, labels = self.augment_data(
                 image=image, bboxes=bboxes, labels=labels
@@ -499,6 +624,24 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
             ),
         )
 
+    def cache_apply(self, dataset: Dataset, name: str) -> Dataset:
+        # A snapshot is written on the first pass and read back by later passes and
+        # runs, while the cache keeps the elements in memory, or in files prefixed
+        # with the dataset name. Neither notices changes to the source files, so
+        # delete the stored files after changing the data.
+        if self._snapshot_directory is not None:
+            dataset = dataset.snapshot(str(self._snapshot_directory / name))
+
+        if self._cache is True:
+            dataset = dataset.cache()
+
+        elif self._cache:
+            cache_directory = Path(self._cache)
+            cache_directory.mkdir(parents=True, exist_ok=True)
+            dataset = dataset.cache(str(cache_directory / name))
+
+        return dataset
+
     @staticmethod
     def batch(dataset: Dataset, batch_size: Optional[int] = None) -> Dataset:
         if batch_size is None:
@@ -521,8 +664,12 @@ class TensorflowObjectDetectionData(ObjectDetectionData):
         map_fn: Callable[
             [Tensor, Tensor], Tuple[Tensor, Tensor, Tensor, Tensor, Tensor]
         ],
+        num_parallel_calls: Optional[int] = None,
+        deterministic: Optional[bool] = None,
     ) -> Dataset:
-        return dataset.map(map_fn)
+        return dataset.map(
+            map_fn, num_parallel_calls=num_parallel_calls, deterministic=deterministic
+        )
 
     @staticmethod
     def prefetch(dataset: Dataset) -> Dataset:
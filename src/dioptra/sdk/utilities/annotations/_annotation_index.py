@@ -0,0 +1,329 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import structlog
+from structlog.stdlib import BoundLogger
+
+LOGGER: BoundLogger = structlog.stdlib.get_logger()
+
+ANNOTATION_INDEX_VERSION = 1
+ANNOTATION_INDEX_MAX_WORKERS = 4
+
+ParseFile = Callable[[str], Tuple[List[List[float]], List[int]]]
+"""A picklable function that parses the boxes and labels of an annotation file."""
+
+
+class AnnotationIndex(object):
+    """Pre-parsed annotations stored in a single columnar file.
+
+    The boxes and labels of every annotation file are concatenated into one float32
+    array of shape `(n_objects, 4)` and one int32 array of shape `(n_objects,)`, and
+    the objects of the i-th file are the rows between `offsets[i]` and
+    `offsets[i + 1]`. Looking up a file is a dictionary lookup followed by a slice.
+
+    Each file is recorded with its size and modification time, so that
+    :py:meth:`build` only parses the files that were added or changed since the index
+    was last written.
+
+    Args:
+        filepaths: The annotation filepaths, in index order.
+        sizes: The size of each file in bytes.
+        mtimes: The modification time of each file in nanoseconds.
+        offsets: An array of shape `(n_files + 1,)` with the position of the first
+            object of each file.
+        boxes: The boxes of all files, concatenated.
+        labels: The labels of all files, concatenated.
+        label_names: The label names, ordered by label id, that were used to encode
+            the labels.
+    """
+
+    def __init__(
+        self,
+        filepaths: Sequence[str],
+        sizes: npt.NDArray,
+        mtimes: npt.NDArray,
+        offsets: npt.NDArray,
+        boxes: npt.NDArray,
+        labels: npt.NDArray,
+        label_names: Sequence[str],
+    ) -> None:
+        self._filepaths = list(filepaths)
+        self._positions: Dict[str, int] = {
+            filepath: position for position, filepath in enumerate(self._filepaths)
+        }
+        self._sizes = np.asarray(sizes, dtype=np.int64)
+        self._mtimes = np.asarray(mtimes, dtype=np.int64)
+        self._offsets = np.asarray(offsets, dtype=np.int64)
+        self._boxes = np.asarray(boxes, dtype=np.float32).reshape(-1, 4)
+        self._labels = np.asarray(labels, dtype=np.int32)
+        self._label_names = list(label_names)
+
+    def __contains__(self, filepath: object) -> bool:
+        return filepath in self._positions
+
+    def __len__(self) -> int:
+        return len(self._filepaths)
+
+    @property
+    def filepaths(self) -> List[str]:
+        return self._filepaths
+
+    @property
+    def label_names(self) -> List[str]:
+        return self._label_names
+
+    def lookup(
+        self, filepath: os.PathLike | str
+    ) -> Optional[Tuple[npt.NDArray, npt.NDArray]]:
+        """Returns the boxes and labels of an annotation file.
+
+        Args:
+            filepath: The annotation filepath, as it was given to :py:meth:`build`.
+
+        Returns:
+            A `(boxes, labels)` tuple of read-only views, or `None` if the file is not
+            in the index.
+        """
+        position = self._positions.get(os.fspath(filepath))
+
+        if position is None:
+            return None
+
+        start, stop = self._offsets[position], self._offsets[position + 1]
+
+        return self._boxes[start:stop], self._labels[start:stop]
+
+    @classmethod
+    def build(
+        cls,
+        parse_file: ParseFile,
+        label_names: Sequence[str],
+        filepaths: Iterable[os.PathLike | str],
+        index_filepath: os.PathLike | str,
+        max_workers: Optional[int] = None,
+    ) -> AnnotationIndex:
+        """Parses annotation files into an index and saves it.
+
+        If an index already exists at `index_filepath` and was built with the same
+        labels, the files whose size and modification time are unchanged are copied
+        from it, and only the other files are parsed. The files are parsed with
+        `parse_file` in a pool of worker processes.
+
+        Args:
+            parse_file: The function used to parse each file, such as
+                :py:func:`read_pascal_voc_file` with its labels bound by
+                :py:func:`functools.partial`. It is sent to the worker processes, so
+                it must be picklable, and it should not live in a module that
+                imports TensorFlow.
+            label_names: The label names, ordered by label id, that `parse_file`
+                uses to encode the labels.
+            filepaths: The annotation files to index.
+            index_filepath: The file to save the index to.
+            max_workers: The number of worker processes. If `None`, the number of
+                processors is used, up to `ANNOTATION_INDEX_MAX_WORKERS`. If `1`, the
+                files are parsed in this process.
+
+        Returns:
+            The index of the annotation files.
+        """
+        index_filepath = Path(index_filepath)
+        filepaths = [os.fspath(x) for x in filepaths]
+        label_names = list(label_names)
+        previous = cls._load_if_compatible(index_filepath, label_names=label_names)
+
+        stats = [os.stat(x) for x in filepaths]
+        boxes_per_file: List[npt.NDArray] = []
+        labels_per_file: List[npt.NDArray] = []
+        stale: List[int] = []
+
+        for position, (filepath, stat) in enumerate(zip(filepaths, stats)):
+            entry = (
+                previous._lookup_unchanged(filepath, stat)
+                if previous is not None
+                else None
+            )
+
+            if entry is None:
+                stale.append(position)
+                entry = _to_arrays([], [])
+
+            boxes_per_file.append(entry[0])
+            labels_per_file.append(entry[1])
+
+        parsed = _read_annotation_files(
+            parse_file, [filepaths[x] for x in stale], max_workers
+        )
+
+        for position, (boxes, labels) in zip(stale, parsed):
+            boxes_per_file[position], labels_per_file[position] = _to_arrays(
+                boxes, labels
+            )
+
+        counts = [len(x) for x in labels_per_file]
+        index = cls(
+            filepaths=filepaths,
+            sizes=np.array([x.st_size for x in stats], dtype=np.int64),
+            mtimes=np.array([x.st_mtime_ns for x in stats], dtype=np.int64),
+            offsets=np.concatenate(([0], np.cumsum(counts, dtype=np.int64))),
+            boxes=np.concatenate([_to_arrays([], [])[0]] + boxes_per_file),
+            labels=np.concatenate([_to_arrays([], [])[1]] + labels_per_file),
+            label_names=label_names,
+        )
+        index.save(index_filepath)
+        LOGGER.info(
+            "Annotation index built",
+            index_filepath=str(index_filepath),
+            num_files=len(filepaths),
+            num_parsed=len(stale),
+        )
+
+        return index
+
+    @classmethod
+    def load(cls, index_filepath: os.PathLike | str) -> AnnotationIndex:
+        """Loads an index saved with :py:meth:`save`.
+
+        Args:
+            index_filepath: The file the index was saved to.
+
+        Returns:
+            The loaded index.
+        """
+        with np.load(index_filepath, allow_pickle=False) as arrays:
+            if int(arrays["version"]) != ANNOTATION_INDEX_VERSION:
+                raise ValueError(
+                    f"Unsupported annotation index version {int(arrays['version'])}."
+                )
+
+            return cls(
+                filepaths=arrays["filepaths"].tolist(),
+                sizes=arrays["sizes"],
+                mtimes=arrays["mtimes"],
+                offsets=arrays["offsets"],
+                boxes=arrays["boxes"],
+                labels=arrays["labels"],
+                label_names=arrays["label_names"].tolist(),
+            )
+
+    def save(self, index_filepath: os.PathLike | str) -> None:
+        """Saves the index as an uncompressed `.npz` file.
+
+        The file is written next to `index_filepath` and renamed into place, so that
+        readers never see a partially written index.
+
+        Args:
+            index_filepath: The file to save the index to.
+        """
+        index_filepath = Path(index_filepath)
+        index_filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp_filepath = index_filepath.with_name(
+            f".{index_filepath.name}.{os.getpid()}.tmp"
+        )
+
+        with tmp_filepath.open("wb") as f:
+            np.savez(
+                f,
+                version=np.array(ANNOTATION_INDEX_VERSION),
+                filepaths=np.array(self._filepaths, dtype=str),
+                sizes=self._sizes,
+                mtimes=self._mtimes,
+                offsets=self._offsets,
+                boxes=self._boxes,
+                labels=self._labels,
+                label_names=np.array(self._label_names, dtype=str),
+            )
+
+        os.replace(tmp_filepath, index_filepath)
+
+    @classmethod
+    def _load_if_compatible(
+        cls, index_filepath: Path, label_names: List[str]
+    ) -> Optional[AnnotationIndex]:
+        if not index_filepath.exists():
+            return None
+
+        try:
+            index = cls.load(index_filepath)
+
+        except Exception as err:
+            LOGGER.warning(
+                "Ignoring unreadable annotation index",
+                index_filepath=str(index_filepath),
+                error=str(err),
+            )
+            return None
+
+        if index.label_names != label_names:
+            return None
+
+        return index
+
+    def _lookup_unchanged(
+        self, filepath: str, stat: os.stat_result
+    ) -> Optional[Tuple[npt.NDArray, npt.NDArray]]:
+        position = self._positions.get(filepath)
+
+        if (
+            position is None
+            or self._sizes[position] != stat.st_size
+            or self._mtimes[position] != stat.st_mtime_ns
+        ):
+            return None
+
+        return self.lookup(filepath)
+
+
+def _read_annotation_files(
+    parse_file: ParseFile,
+    filepaths: List[str],
+    max_workers: Optional[int],
+) -> List[Tuple[List[List[float]], List[int]]]:
+    if not filepaths:
+        return []
+
+    if max_workers == 1:
+        return [parse_file(x) for x in filepaths]
+
+    # Parsing XML holds the GIL, so the files are parsed in separate processes. The
+    # processes are spawned rather than forked, as forking a process that has
+    # started TensorFlow threads is unsafe. Each spawned process re-imports the main
+    # module, so the default number of processes is capped.
+    max_workers = max_workers or min(os.cpu_count() or 1, ANNOTATION_INDEX_MAX_WORKERS)
+    chunksize = max(1, len(filepaths) // (4 * max_workers))
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        return list(executor.map(parse_file, filepaths, chunksize=chunksize))
+
+
+def _to_arrays(
+    boxes: Sequence[Sequence[float]], labels: Sequence[int]
+) -> Tuple[npt.NDArray, npt.NDArray]:
+    return (
+        np.asarray(boxes, dtype=np.float32).reshape(-1, 4),
+        np.asarray(labels, dtype=np.int32),
+    )
@@ -0,0 +1,57 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from itertools import islice
+from typing import Iterable, Iterator, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def num_batches(num_samples: int, batch_size: int) -> int:
+    """Returns the number of batches needed to cover every sample.
+
+    The final batch holds the remaining ``num_samples % batch_size`` samples when the
+    number of samples is not a multiple of the batch size.
+    """
+    if batch_size < 1:
+        raise ValueError(f"batch_size must be a positive integer, got {batch_size}.")
+
+    return -(-num_samples // batch_size)
+
+
+def iter_batches(
+    batches: Iterable[T], num_samples: int, batch_size: int
+) -> Iterator[Tuple[int, slice, T]]:
+    """Iterates over one pass of a batched dataset, including a ragged final batch.
+
+    Data iterators such as the Keras ``DirectoryIterator`` cycle through the dataset
+    forever, so callers have to decide when to stop. Stopping after
+    ``num_samples // batch_size`` batches silently drops the final partial batch.
+
+    Args:
+        batches: An iterable that yields the batches of the dataset in order.
+        num_samples: The number of samples in the dataset.
+        batch_size: The number of samples in every batch except the last.
+
+    Yields:
+        Tuples of the batch number, a :py:class:`slice` selecting the batch's samples
+        from a per-sample list such as the image filenames, and the batch itself.
+    """
+    for batch_num, batch in enumerate(
+        islice(batches, num_batches(num_samples, batch_size))
+    ):
+        start: int = batch_num * batch_size
+        yield batch_num, slice(start, min(start + batch_size, num_samples)), batch
@@ -0,0 +1,127 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import math
+from typing import List, Optional
+
+import numpy as np
+
+
+class KLLSketch(object):
+    """A mergeable quantile sketch for streams of floating point values.
+
+    Implements the KLL sketch of Karnin, Lang, and Liberty, "Optimal Quantile
+    Approximation in Streams," 2016. Values are stored in a hierarchy of compactors.
+    A full compactor sorts its values and promotes every other value to the next
+    level, where each value counts twice as much. The memory used grows only
+    logarithmically with the number of values, and the rank error is about
+    ``1.65 / k`` with high probability.
+
+    Args:
+        k: The capacity of the top compactor, which controls the accuracy.
+        seed: The seed for the random compaction offsets.
+    """
+
+    def __init__(self, k: int = 200, seed: Optional[int] = None) -> None:
+        self._k = k
+        self._rng = np.random.default_rng(seed)
+        self._compactors: List[np.ndarray] = [np.empty(0, dtype=np.float64)]
+        self.count: int = 0
+
+    def update(self, values) -> None:
+        """Adds values to the sketch.
+
+        Args:
+            values: A scalar or array of values to add.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        self.count += values.size
+        self._compactors[0] = np.concatenate([self._compactors[0], values])
+        self._compress()
+
+    def merge(self, other: KLLSketch) -> None:
+        """Adds the contents of another sketch to this one.
+
+        Args:
+            other: The sketch to merge into this one.
+        """
+        while len(self._compactors) < len(other._compactors):
+            self._compactors.append(np.empty(0, dtype=np.float64))
+
+        for level, items in enumerate(other._compactors):
+            self._compactors[level] = np.concatenate([self._compactors[level], items])
+
+        self.count += other.count
+        self._compress()
+
+    def quantile(self, q: float) -> float:
+        """Estimates a quantile of the values added to the sketch.
+
+        Args:
+            q: The quantile to estimate, between 0 and 1.
+
+        Returns:
+            The estimated quantile, or NaN if the sketch is empty.
+        """
+        values = np.concatenate(self._compactors)
+
+        if values.size == 0:
+            return math.nan
+
+        weights = np.concatenate(
+            [np.full(x.size, 2**level) for level, x in enumerate(self._compactors)]
+        )
+        order = np.argsort(values, kind="stable")
+        values, weights = values[order], weights[order]
+        cumulative_weights = np.cumsum(weights)
+        rank = q * cumulative_weights[-1]
+        index = int(np.searchsorted(cumulative_weights, rank, side="left"))
+
+        return float(values[min(index, values.size - 1)])
+
+    @property
+    def num_retained(self) -> int:
+        """The number of values currently stored by the sketch."""
+        return sum(x.size for x in self._compactors)
+
+    def _capacity(self, level: int) -> int:
+        depth = len(self._compactors) - level - 1
+        return max(2, int(math.ceil(self._k * (2.0 / 3.0) ** depth)))
+
+    def _compress(self) -> None:
+        level = 0
+
+        while level < len(self._compactors):
+            items = self._compactors[level]
+
+            if items.size >= self._capacity(level):
+                if level + 1 == len(self._compactors):
+                    self._compactors.append(np.empty(0, dtype=np.float64))
+
+                items = np.sort(items)
+
+                # An odd value out stays at this level so that no weight is lost.
+                kept = items[-1:] if items.size % 2 else items[:0]
+                paired = items[: items.size - kept.size]
+                offset = int(self._rng.integers(2))
+                self._compactors[level + 1] = np.concatenate(
+                    [self._compactors[level + 1], paired[offset::2]]
+                )
+                self._compactors[level] = kept
+
+            level += 1
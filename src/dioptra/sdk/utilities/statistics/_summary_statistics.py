@@ -0,0 +1,204 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ._kll_sketch import KLLSketch
+
+SUMMARY_STATISTICS_MODES = ("auto", "exact", "sketch")
+
+
+class SummaryStatistics(object):
+    """Accumulates summary statistics for a stream of values in bounded memory.
+
+    The mean and standard deviation are updated with Welford's algorithm, extended to
+    whole batches with the parallel update of Chan et al., alongside the running
+    minimum and maximum. The median and interquartile range come from the retained
+    values in exact mode, or from a :py:class:`KLLSketch` in sketch mode. In auto mode
+    the values are retained until more than `exact_max_count` have been added, after
+    which they are moved into a sketch.
+
+    Args:
+        mode: One of `"auto"`, `"exact"`, or `"sketch"`. The default is `"auto"`.
+        exact_max_count: The number of values retained in auto mode before switching
+            to a sketch. The default is `100000`.
+        sketch_k: The accuracy parameter of the quantile sketch. The default is `200`.
+        seed: The seed for the quantile sketch. The default is `None`.
+    """
+
+    def __init__(
+        self,
+        mode: str = "auto",
+        exact_max_count: int = 100000,
+        sketch_k: int = 200,
+        seed: Optional[int] = None,
+    ) -> None:
+        if mode not in SUMMARY_STATISTICS_MODES:
+            raise ValueError(
+                f"mode must be one of {SUMMARY_STATISTICS_MODES}, got {mode!r}."
+            )
+
+        self.mode = mode
+        self.count: int = 0
+        self.mean: float = math.nan
+        self.min: float = math.nan
+        self.max: float = math.nan
+        self._m2: float = 0.0
+        self._exact_max_count = exact_max_count
+        self._sketch_k = sketch_k
+        self._seed = seed
+        self._values: Optional[List[np.ndarray]] = [] if mode != "sketch" else None
+        self._sketch: Optional[KLLSketch] = (
+            KLLSketch(k=sketch_k, seed=seed) if mode == "sketch" else None
+        )
+
+    def update(self, values) -> None:
+        """Adds a batch of values.
+
+        Args:
+            values: A scalar or array of values to add.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+
+        if values.size == 0:
+            return
+
+        self._update_moments(
+            count=values.size,
+            mean=float(values.mean()),
+            m2=float(np.square(values - values.mean()).sum()),
+            min_=float(values.min()),
+            max_=float(values.max()),
+        )
+
+        if self._values is not None:
+            self._values.append(values)
+            self._maybe_switch_to_sketch()
+
+        else:
+            self._get_sketch().update(values)
+
+    def merge(self, other: SummaryStatistics) -> None:
+        """Adds the values accumulated by another instance.
+
+        Args:
+            other: The summary statistics to merge into this one.
+        """
+        if other.count == 0:
+            return
+
+        self._update_moments(
+            count=other.count,
+            mean=other.mean,
+            m2=other._m2,
+            min_=other.min,
+            max_=other.max,
+        )
+
+        if other._values is not None and self._values is not None:
+            self._values.extend(other._values)
+            self._maybe_switch_to_sketch()
+            return
+
+        if other._values is not None:
+            self._get_sketch().update(np.concatenate(other._values))
+            return
+
+        if self._values is not None:
+            self._move_values_to_sketch()
+
+        self._get_sketch().merge(other._get_sketch())
+
+    @property
+    def is_exact(self) -> bool:
+        """`True` if the quantiles are computed from every value."""
+        return self._values is not None
+
+    @property
+    def stdev(self) -> float:
+        """The population standard deviation."""
+        return math.sqrt(self._m2 / self.count) if self.count else math.nan
+
+    def quantile(self, q: float) -> float:
+        """Returns a quantile, which is exact unless the values are in a sketch.
+
+        Args:
+            q: The quantile to return, between 0 and 1.
+
+        Returns:
+            The quantile, or NaN if no values have been added.
+        """
+        if self.count == 0:
+            return math.nan
+
+        if self._values is not None:
+            return float(np.quantile(np.concatenate(self._values), q))
+
+        return self._get_sketch().quantile(q)
+
+    def summary(self) -> Dict[str, float]:
+        """Returns the mean, median, standard deviation, IQR, minimum, and maximum.
+
+        Returns:
+            A dictionary with the keys `mean`, `median`, `stdev`, `iqr`, `min`, and
+            `max`.
+        """
+        return {
+            "mean": self.mean,
+            "median": self.quantile(0.5),
+            "stdev": self.stdev,
+            "iqr": self.quantile(0.75) - self.quantile(0.25),
+            "min": self.min,
+            "max": self.max,
+        }
+
+    def _update_moments(
+        self, count: int, mean: float, m2: float, min_: float, max_: float
+    ) -> None:
+        if self.count == 0:
+            self.count, self.mean, self._m2 = count, mean, m2
+            self.min, self.max = min_, max_
+            return
+
+        total: int = self.count + count
+        delta: float = mean - self.mean
+        self.mean += delta * count / total
+        self._m2 += m2 + delta**2 * self.count * count / total
+        self.count = total
+        self.min = min(self.min, min_)
+        self.max = max(self.max, max_)
+
+    def _maybe_switch_to_sketch(self) -> None:
+        if self.mode == "auto" and self.count > self._exact_max_count:
+            self._move_values_to_sketch()
+
+    def _move_values_to_sketch(self) -> None:
+        values: List[np.ndarray] = self._values or []
+        self._values = None
+
+        if values:
+            self._get_sketch().update(np.concatenate(values))
+
+    def _get_sketch(self) -> KLLSketch:
+        if self._sketch is None:
+            self._sketch = KLLSketch(k=self._sketch_k, seed=self._seed)
+
+        return self._sketch
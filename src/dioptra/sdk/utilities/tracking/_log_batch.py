@@ -0,0 +1,304 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import mlflow
+import structlog
+from mlflow.entities import Metric, Param, RunTag
+from mlflow.tracking import MlflowClient
+from structlog.stdlib import BoundLogger
+
+LOGGER: BoundLogger = structlog.stdlib.get_logger()
+
+# Request limits enforced by the MLFlow Tracking server for a single log-batch call.
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_TAGS_PER_BATCH = 100
+MAX_ENTITIES_PER_BATCH = 1000
+
+
+def iter_log_batches(
+    metrics: Sequence[Metric],
+    params: Sequence[Param],
+    tags: Sequence[RunTag],
+) -> Iterator[Tuple[List[Metric], List[Param], List[RunTag]]]:
+    """Splits metrics, parameters, and tags into batches within the server limits.
+
+    Each batch holds at most :py:data:`MAX_PARAMS_TAGS_PER_BATCH` parameters and tags
+    combined, at most :py:data:`MAX_METRICS_PER_BATCH` metrics, and at most
+    :py:data:`MAX_ENTITIES_PER_BATCH` entities in total.
+
+    Args:
+        metrics: The metrics to log.
+        params: The parameters to log.
+        tags: The tags to log.
+
+    Yields:
+        A `(metrics, params, tags)` tuple for each batch.
+    """
+    metrics_start = params_start = tags_start = 0
+
+    while (
+        metrics_start < len(metrics)
+        or params_start < len(params)
+        or tags_start < len(tags)
+    ):
+        batch_params = list(
+            params[params_start : params_start + MAX_PARAMS_TAGS_PER_BATCH]
+        )
+        params_start += len(batch_params)
+
+        num_tags = MAX_PARAMS_TAGS_PER_BATCH - len(batch_params)
+        batch_tags = list(tags[tags_start : tags_start + num_tags])
+        tags_start += len(batch_tags)
+
+        num_metrics = min(
+            MAX_METRICS_PER_BATCH,
+            MAX_ENTITIES_PER_BATCH - len(batch_params) - len(batch_tags),
+        )
+        batch_metrics = list(metrics[metrics_start : metrics_start + num_metrics])
+        metrics_start += len(batch_metrics)
+
+        yield batch_metrics, batch_params, batch_tags
+
+
+def log_batch(
+    metrics: Optional[Dict[str, float]] = None,
+    params: Optional[Dict[str, Any]] = None,
+    tags: Optional[Dict[str, Any]] = None,
+    step: Optional[int] = None,
+    run_id: Optional[str] = None,
+    client: Optional[MlflowClient] = None,
+) -> None:
+    """Logs metrics, parameters, and tags to the MLFlow Tracking service in bulk.
+
+    The entities are sent with :py:meth:`mlflow.tracking.MlflowClient.log_batch`,
+    split into as few requests as the server limits allow, instead of making one
+    request per entity.
+
+    Args:
+        metrics: A dictionary mapping metric names to metric values.
+        params: A dictionary mapping parameter names to parameter values. The values
+            are converted to strings.
+        tags: A dictionary mapping tag names to tag values. The values are converted
+            to strings.
+        step: The step at which to log the metrics. The default is `0`.
+        run_id: The run to log to. If `None`, the active run is used, and a new run
+            is started if there is no active run.
+        client: The MLFlow client to use. If `None`, a new client is created.
+    """
+    timestamp = _current_time_millis()
+    metric_entities = [
+        Metric(key, value, timestamp, step or 0)
+        for key, value in (metrics or {}).items()
+    ]
+    param_entities = [Param(key, str(value)) for key, value in (params or {}).items()]
+    tag_entities = [RunTag(key, str(value)) for key, value in (tags or {}).items()]
+
+    _send_batches(
+        client=client or MlflowClient(),
+        run_id=_resolve_run_id(run_id),
+        metrics=metric_entities,
+        params=param_entities,
+        tags=tag_entities,
+    )
+
+
+class MetricsBuffer(object):
+    """Buffers metrics and logs them to the MLFlow Tracking service in the background.
+
+    Logging a metric only appends it to the buffer, so that training loops can record
+    per-step metrics without waiting on the tracking server. A background thread sends
+    the buffered metrics with :py:func:`log_batch` semantics every `flush_interval`
+    seconds, or sooner once `max_pending` metrics are waiting. Each metric keeps the
+    timestamp of the call that logged it. Metrics that fail to send are kept in the
+    buffer and retried on the next flush.
+
+    The buffer should be closed when it is no longer needed, which flushes the
+    remaining metrics and raises any error from that final flush. It can also be used as
+    a context manager.
+
+    Args:
+        run_id: The run to log to. If `None`, the active run is used, and a new run
+            is started if there is no active run.
+        client: The MLFlow client to use. If `None`, a new client is created.
+        flush_interval: The maximum number of seconds a metric waits in the buffer.
+            The default is `5.0`.
+        max_pending: The number of buffered metrics that triggers an early flush. The
+            default is :py:data:`MAX_METRICS_PER_BATCH`.
+
+    Example:
+        >>> with MetricsBuffer() as buffer:
+        ...     for step, loss in enumerate(losses):
+        ...         buffer.log_metric("loss", loss, step=step)
+    """
+
+    def __init__(
+        self,
+        run_id: Optional[str] = None,
+        client: Optional[MlflowClient] = None,
+        flush_interval: float = 5.0,
+        max_pending: int = MAX_METRICS_PER_BATCH,
+    ) -> None:
+        self._run_id = _resolve_run_id(run_id)
+        self._client = client or MlflowClient()
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._pending: List[Metric] = []
+        self._closed = False
+        self._condition = threading.Condition()
+        self._send_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="mlflow-metrics-buffer", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self) -> MetricsBuffer:
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    @property
+    def num_pending(self) -> int:
+        """The number of metrics waiting to be sent."""
+        with self._condition:
+            return len(self._pending)
+
+    def log_metric(self, key: str, value: float, step: Optional[int] = None) -> None:
+        """Adds a metric to the buffer.
+
+        Args:
+            key: The metric name.
+            value: The metric value.
+            step: The step at which to log the metric. The default is `0`.
+        """
+        self.log_metrics({key: value}, step=step)
+
+    def log_metrics(
+        self, metrics: Dict[str, float], step: Optional[int] = None
+    ) -> None:
+        """Adds several metrics logged at the same step to the buffer.
+
+        Args:
+            metrics: A dictionary mapping metric names to metric values.
+            step: The step at which to log the metrics. The default is `0`.
+        """
+        timestamp = _current_time_millis()
+
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("Cannot log metrics to a closed MetricsBuffer.")
+
+            self._pending.extend(
+                Metric(key, value, timestamp, step or 0)
+                for key, value in metrics.items()
+            )
+
+            if len(self._pending) >= self._max_pending:
+                self._condition.notify()
+
+    def flush(self) -> None:
+        """Sends all buffered metrics and waits until they have been logged."""
+        with self._send_lock:
+            with self._condition:
+                metrics, self._pending = self._pending, []
+
+            try:
+                _send_batches(
+                    client=self._client,
+                    run_id=self._run_id,
+                    metrics=metrics,
+                    params=[],
+                    tags=[],
+                )
+
+            except Exception:
+                with self._condition:
+                    self._pending[:0] = metrics
+
+                raise
+
+    def close(self) -> None:
+        """Stops the background thread and flushes the remaining metrics."""
+        with self._condition:
+            if self._closed:
+                return
+
+            self._closed = True
+            self._condition.notify()
+
+        self._thread.join()
+        self.flush()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: self._closed or len(self._pending) >= self._max_pending,
+                    timeout=self._flush_interval,
+                )
+
+                if self._closed:
+                    return
+
+            try:
+                self.flush()
+
+            except Exception as err:
+                LOGGER.warning(
+                    "Failed to log buffered metrics, will retry",
+                    run_id=self._run_id,
+                    error=str(err),
+                )
+
+                # Wait out the interval so a full buffer does not retry in a busy loop.
+                with self._condition:
+                    self._condition.wait_for(
+                        lambda: self._closed, timeout=self._flush_interval
+                    )
+
+
+def _send_batches(
+    client: MlflowClient,
+    run_id: str,
+    metrics: Sequence[Metric],
+    params: Sequence[Param],
+    tags: Sequence[RunTag],
+) -> None:
+    for batch_metrics, batch_params, batch_tags in iter_log_batches(
+        metrics, params, tags
+    ):
+        client.log_batch(
+            run_id=run_id, metrics=batch_metrics, params=batch_params, tags=batch_tags
+        )
+
+
+def _resolve_run_id(run_id: Optional[str]) -> str:
+    if run_id is not None:
+        return run_id
+
+    run = mlflow.active_run() or mlflow.start_run()
+
+    return run.info.run_id
+
+
+def _current_time_millis() -> int:
+    return int(time.time() * 1000)
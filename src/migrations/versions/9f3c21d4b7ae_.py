@@ -0,0 +1,26 @@
+"""Add an index on the job creation timestamp
+
+Revision ID: 9f3c21d4b7ae
+Revises: 018130a0bf6c
+Create Date: 2026-10-17 09:12:41.207314
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9f3c21d4b7ae"
+down_revision = "018130a0bf6c"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.create_index(
+            batch_op.f("ix_jobs_created_on"), ["created_on"], unique=False
+        )
+
+
+def downgrade():
+    with op.batch_alter_table("jobs", schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f("ix_jobs_created_on"))
@@ -37,22 +37,46 @@ References:
 
 from __future__ import annotations
 
+import gzip
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Callable, Dict, List, Optional, Tuple, Union
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
-import mlflow
 import numpy as np
 import pandas as pd
-import scipy.stats
 import structlog
 from structlog.stdlib import BoundLogger
 
 from dioptra import pyplugs
 from dioptra.sdk.exceptions import ARTDependencyError, TensorflowDependencyError
+from dioptra.sdk.utilities.batching import iter_batches, num_batches
 from dioptra.sdk.utilities.decorators import require_package
+from dioptra.sdk.utilities.statistics import SummaryStatistics
+from dioptra.sdk.utilities.tracking import log_batch
+
+from ..metrics.distance import DISTANCE_METRICS_REGISTRY, compute_distance_metrics
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
+T = TypeVar("T")
+
 try:
     from art.attacks.evasion import FastGradientMethod
     from art.estimators.classification import KerasClassifier
@@ -65,7 +89,12 @@ except ImportError:  # pragma: nocover
 
 
 try:
-    from tensorflow.keras.preprocessing.image import ImageDataGenerator, save_img
+    import tensorflow as tf
+    from tensorflow.keras.preprocessing.image import (
+        DirectoryIterator,
+        ImageDataGenerator,
+        save_img,
+    )
 
 except ImportError:  # pragma: nocover
     LOGGER.warn(
@@ -90,6 +119,12 @@ def create_adversarial_fgm_dataset(
     eps_step: float = 0.1,
     minimal: bool = False,
     norm: Union[int, float, str] = np.inf,
+    prefetch_batches: int = 2,
+    max_workers: int = 4,
+    summary_statistics_mode: str = "auto",
+    distance_metrics_file: Optional[Union[str, Path]] = None,
+    keep_distance_metrics: bool = True,
+    dataset: Optional[Union[DirectoryIterator, tf.data.Dataset]] = None,
 ) -> pd.DataFrame:
     """Generates an adversarial dataset using the Fast Gradient Method attack.
 
@@ -98,6 +133,13 @@ def create_adversarial_fgm_dataset(
     `distance_metrics_list` are used to quantify the size of the perturbation applied to
     each image.
 
+    The work is pipelined so that the attack is not left waiting on other stages.
+    Clean batches are decoded ahead of time in a background thread. The adversarial
+    images are encoded and written by a thread pool, and the distance metrics are
+    computed in a separate worker thread. Every stage uses a bounded queue, so no
+    more than `prefetch_batches` decoded batches and `max_workers` generated batches
+    are held in memory at any time.
+
     Args:
         data_dir: The directory containing the clean test images.
         adv_data_dir: The directory to use when saving the generated adversarial images.
@@ -115,7 +157,8 @@ def create_adversarial_fgm_dataset(
             rescaling is applied, otherwise multiply the data by the value provided
             (after applying all other transformations). The default is `1.0 / 255`.
         batch_size: The size of the batch on which adversarial samples are generated.
-            The default is `32`.
+            If the number of images is not a multiple of `batch_size`, the final batch
+            holds the remaining images. The default is `32`.
         label_mode: Determines how the label arrays for the dataset will be returned.
             The available choices are: `"categorical"`, `"binary"`, `"sparse"`,
             `"input"`, `None`. For information on the meaning of each choice, see
@@ -127,6 +170,29 @@ def create_adversarial_fgm_dataset(
             step size and `eps` for the maximum perturbation. The default is `False`.
         norm: The norm of the adversarial perturbation. Can be `"inf"`,
             :py:data:`numpy.inf`, `1`, or `2`. The default is :py:data:`numpy.inf`.
+        prefetch_batches: The number of clean image batches to decode ahead of the
+            attack. The default is `2`.
+        max_workers: The number of threads used to encode and save the adversarial
+            images, which is also the maximum number of generated batches waiting to
+            be saved. The default is `4`.
+        summary_statistics_mode: How the median and interquartile range of each
+            distance metric are computed. `"exact"` retains every value, `"sketch"`
+            estimates them with a fixed-size quantile sketch, and `"auto"` retains
+            values until there are too many and then switches to a sketch. The mean,
+            standard deviation, minimum, and maximum are always exact. The default is
+            `"auto"`.
+        distance_metrics_file: If provided, the per-image distance metrics table is
+            appended to this CSV file one batch at a time. The file is gzip-compressed
+            if its name ends in `.gz`. The default is `None`.
+        keep_distance_metrics: If `False`, the per-image distance metrics table is not
+            held in memory and an empty table is returned. The default is `True`.
+        dataset: An unshuffled dataset of the clean images to use instead of reading
+            `data_dir`, such as a :py:class:`~tf.data.Dataset` created by the
+            `create_image_tf_dataset` plugin or a |directory_iterator| created with
+            `shuffle=False`. It must yield `(images, labels)` batches of one-hot encoded
+            labels and have the `n`, `filenames`, and `batch_size` attributes of a
+            |directory_iterator|. If `None`, the images in `data_dir` are loaded with
+            |flow_from_directory|. The default is `None`.
 
     Returns:
         A :py:class:`~pandas.DataFrame` containing the full distribution of the
@@ -137,6 +203,8 @@ def create_adversarial_fgm_dataset(
 
     .. |flow_from_directory| replace:: :py:meth:`tf.keras.preprocessing.image\\
        .ImageDataGenerator.flow_from_directory`
+    .. |directory_iterator| replace:: :py:class:`~tf.keras.preprocessing.image\\
+       .DirectoryIterator`
     """
     distance_metrics_list = distance_metrics_list or []
     color_mode: str = "color" if image_size[2] == 3 else "grayscale"
@@ -152,60 +220,85 @@ def create_adversarial_fgm_dataset(
         norm=norm,
     )
 
-    data_generator: ImageDataGenerator = ImageDataGenerator(rescale=rescale)
+    if dataset is None:
+        data_generator: ImageDataGenerator = ImageDataGenerator(rescale=rescale)
+        dataset = data_generator.flow_from_directory(
+            directory=data_dir,
+            target_size=target_size,
+            color_mode=color_mode,
+            class_mode=label_mode,
+            batch_size=batch_size,
+            shuffle=False,
+        )
 
-    data_flow = data_generator.flow_from_directory(
-        directory=data_dir,
-        target_size=target_size,
-        color_mode=color_mode,
-        class_mode=label_mode,
-        batch_size=batch_size,
-        shuffle=False,
+    batch_size = dataset.batch_size
+    data_flow = (
+        dataset.as_numpy_iterator()
+        if hasattr(dataset, "as_numpy_iterator")
+        else dataset
     )
-    num_images = data_flow.n
-    img_filenames = [Path(x) for x in data_flow.filenames]
+    num_images = dataset.n
+    img_filenames = [Path(x) for x in dataset.filenames]
 
-    distance_metrics_: Dict[str, List[List[float]]] = {"image": [], "label": []}
-    for metric_name, _ in distance_metrics_list:
-        distance_metrics_[metric_name] = []
+    distance_metrics_ = _DistanceMetricsRecorder(
+        metric_names=[metric_name for metric_name, _ in distance_metrics_list],
+        summary_statistics_mode=summary_statistics_mode,
+        keep_table=keep_distance_metrics,
+    )
 
     LOGGER.info(
         "Generate adversarial images",
         attack="fgm",
-        num_batches=num_images // batch_size,
+        num_batches=num_batches(num_images, batch_size),
     )
 
-    for batch_num, (x, y) in enumerate(data_flow):
-        if batch_num >= num_images // batch_size:
-            break
-
-        clean_filenames = img_filenames[
-            batch_num * batch_size : (batch_num + 1) * batch_size  # noqa: E203
-        ]
-
-        LOGGER.info(
-            "Generate adversarial image batch",
-            attack="fgm",
-            batch_num=batch_num,
-        )
-
-        y_int = np.argmax(y, axis=1)
-        adv_batch = attack.generate(x=x)
-
-        _save_adv_batch(adv_batch, adv_data_dir, y_int, clean_filenames)
-
-        _evaluate_distance_metrics(
-            clean_filenames=clean_filenames,
-            distance_metrics_=distance_metrics_,
-            clean_batch=x,
-            adv_batch=adv_batch,
-            distance_metrics_list=distance_metrics_list,
-        )
+    with distance_metrics_.open(distance_metrics_file), ThreadPoolExecutor(
+        max_workers=max_workers
+    ) as save_executor, ThreadPoolExecutor(max_workers=1) as metrics_executor:
+        pending_batches: Deque[List[Future]] = deque()
+
+        for batch_num, batch_slice, (x, y) in _prefetch(
+            iter_batches(data_flow, num_samples=num_images, batch_size=batch_size),
+            maxsize=prefetch_batches,
+        ):
+            clean_filenames = img_filenames[batch_slice]
+
+            LOGGER.info(
+                "Generate adversarial image batch",
+                attack="fgm",
+                batch_num=batch_num,
+            )
+
+            y_int = np.argmax(y, axis=1)
+            adv_batch = attack.generate(x=x)
+
+            batch_futures: List[Future] = _save_adv_batch(
+                adv_batch, adv_data_dir, y_int, clean_filenames, executor=save_executor
+            )
+            # A single worker evaluates the batches in order, so the rows of the
+            # distance metrics table stay aligned with the image filenames.
+            batch_futures.append(
+                metrics_executor.submit(
+                    _evaluate_distance_metrics,
+                    clean_filenames=clean_filenames,
+                    distance_metrics_=distance_metrics_,
+                    clean_batch=x,
+                    adv_batch=adv_batch,
+                    distance_metrics_list=distance_metrics_list,
+                )
+            )
+            pending_batches.append(batch_futures)
+
+            while len(pending_batches) >= max_workers:
+                _wait_for_all(pending_batches.popleft())
+
+        while pending_batches:
+            _wait_for_all(pending_batches.popleft())
 
     LOGGER.info("Adversarial image generation complete", attack="fgm")
-    _log_distance_metrics(distance_metrics_)
+    _log_distance_metrics(distance_metrics_.summaries)
 
-    return pd.DataFrame(distance_metrics_)
+    return distance_metrics_.table()
 
 
 def _init_fgm(
@@ -227,15 +320,23 @@ def _init_fgm(
     return attack
 
 
-def _save_adv_batch(adv_batch, adv_data_dir, y, clean_filenames) -> None:
-    """Saves a batch of adversarial images to disk.
+def _save_adv_batch(
+    adv_batch, adv_data_dir, y, clean_filenames, executor: Executor
+) -> List[Future]:
+    """Submits a batch of adversarial images to be saved to disk.
 
     Args:
         adv_batch: A generated batch of adversarial images.
         adv_data_dir: The directory to use when saving the generated adversarial images.
         y: An array containing the target labels of the original images.
         clean_filenames: A list containing the filenames of the original images.
+        executor: The executor used to encode and write the images.
+
+    Returns:
+        A list of futures, one for each image that was submitted.
     """
+    futures: List[Future] = []
+
     for batch_image_num, adv_image in enumerate(adv_batch):
         adv_image_path = (
             adv_data_dir
@@ -244,9 +345,89 @@ def _save_adv_batch(adv_batch, adv_data_dir, y, clean_filenames) -> None:
         )
 
         if not adv_image_path.parent.exists():
-            adv_image_path.parent.mkdir(parents=True)
+            adv_image_path.parent.mkdir(parents=True, exist_ok=True)
+
+        futures.append(executor.submit(save_img, path=str(adv_image_path), x=adv_image))
+
+    return futures
+
+
+def _prefetch(iterable: Iterable[T], maxsize: int) -> Iterator[T]:
+    """Iterates over an iterable in a background thread.
+
+    Args:
+        iterable: The iterable to consume in the background.
+        maxsize: The maximum number of items to read ahead of the consumer.
+
+    Yields:
+        The items of `iterable`, in order. An exception raised while iterating is
+        re-raised in the consumer.
+    """
+    buffer: queue.Queue = queue.Queue(maxsize=max(1, maxsize))
+    stopped = threading.Event()
+    producer = threading.Thread(
+        target=_produce, args=(iterable, buffer, stopped), daemon=True
+    )
+    producer.start()
+
+    try:
+        while True:
+            item = buffer.get()
+
+            if item is _PREFETCH_DONE:
+                return
+
+            if isinstance(item, _PrefetchError):
+                raise item.error
+
+            yield item
 
-        save_img(path=str(adv_image_path), x=adv_image)
+    finally:
+        stopped.set()
+
+        # Unblock the producer if the consumer stopped before the iterable was
+        # exhausted.
+        while producer.is_alive():
+            try:
+                buffer.get_nowait()
+
+            except queue.Empty:
+                producer.join(timeout=0.1)
+
+
+class _PrefetchError(object):
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+_PREFETCH_DONE = object()
+
+
+def _produce(
+    iterable: Iterable[Any], buffer: queue.Queue, stopped: threading.Event
+) -> None:
+    try:
+        for item in iterable:
+            if stopped.is_set():
+                return
+
+            buffer.put(item)
+
+    except Exception as err:
+        buffer.put(_PrefetchError(err))
+        return
+
+    buffer.put(_PREFETCH_DONE)
+
+
+def _wait_for_all(futures: List[Future]) -> None:
+    """Waits for a list of futures and re-raises the first exception encountered.
+
+    Args:
+        futures: The futures to wait for.
+    """
+    for future in futures:
+        future.result()
 
 
 def _evaluate_distance_metrics(
@@ -256,8 +437,9 @@ def _evaluate_distance_metrics(
 
     Args:
         clean_filenames: A list containing the filenames of the original images.
-        distance_metrics_: A dictionary used to record the values of the distance
-            metrics computed for the clean/adversarial image pairs.
+        distance_metrics_: A :py:class:`_DistanceMetricsRecorder` used to record the
+            values of the distance metrics computed for the clean/adversarial image
+            pairs.
         clean_batch: The clean images used to generate the adversarial images in
             `adv_batch`.
         adv_batch: A generated batch of adversarial images.
@@ -265,18 +447,36 @@ def _evaluate_distance_metrics(
             adversarial image.
     """
     LOGGER.debug("evaluate image perturbations using distance metrics")
-    distance_metrics_["image"].extend([x.name for x in clean_filenames])
-    distance_metrics_["label"].extend([x.parent for x in clean_filenames])
+    batch_metrics: Dict[str, Any] = {
+        "image": [x.name for x in clean_filenames],
+        "label": [x.parent for x in clean_filenames],
+    }
+    # Registry metrics are calculated together in one pass over the batch.
+    registry_names: Dict[str, str] = {
+        metric_name: func
+        for metric_name, metric in distance_metrics_list
+        for func, registry_metric in DISTANCE_METRICS_REGISTRY.items()
+        if metric is registry_metric
+    }
+    registry_metrics: Dict[str, np.ndarray] = compute_distance_metrics(
+        clean_batch, adv_batch, names=registry_names.values()
+    )
+
     for metric_name, metric in distance_metrics_list:
-        distance_metrics_[metric_name].extend(metric(clean_batch, adv_batch))
+        batch_metrics[metric_name] = (
+            registry_metrics[registry_names[metric_name]]
+            if metric_name in registry_names
+            else metric(clean_batch, adv_batch)
+        )
 
+    distance_metrics_.record(pd.DataFrame(batch_metrics))
 
-def _log_distance_metrics(distance_metrics_: Dict[str, List[List[float]]]) -> None:
+
+def _log_distance_metrics(summaries: Dict[str, SummaryStatistics]) -> None:
     """Logs the distance metrics summary statistics to the MLFlow Tracking service.
 
-    The following summary statistics are calculated and logged to the MLFlow Tracking
-    service for each of the distributions recorded in the `distance_metrics_`
-    dictionary:
+    The following summary statistics are logged to the MLFlow Tracking service for each
+    of the distance metrics:
 
     - mean
     - median
@@ -286,20 +486,95 @@ def _log_distance_metrics(distance_metrics_: Dict[str, List[List[float]]]) -> No
     - maximum
 
     Args:
-        distance_metrics_: A dictionary used to record the values of the distance
-            metrics computed for the clean/adversarial image pairs.
+        summaries: A dictionary mapping the name of each distance metric to the
+            summary statistics accumulated for the clean/adversarial image pairs.
     """
-    distance_metrics_ = distance_metrics_.copy()
-    del distance_metrics_["image"]
-    del distance_metrics_["label"]
-    for metric_name, metric_values_list in distance_metrics_.items():
-        metric_values = np.array(metric_values_list)
-        mlflow.log_metric(key=f"{metric_name}_mean", value=metric_values.mean())
-        mlflow.log_metric(key=f"{metric_name}_median", value=np.median(metric_values))
-        mlflow.log_metric(key=f"{metric_name}_stdev", value=metric_values.std())
-        mlflow.log_metric(
-            key=f"{metric_name}_iqr", value=scipy.stats.iqr(metric_values)
+    log_batch(
+        metrics={
+            f"{metric_name}_{statistic}": value
+            for metric_name, summary in summaries.items()
+            for statistic, value in summary.summary().items()
+        }
+    )
+
+    for metric_name, summary in summaries.items():
+        LOGGER.info(
+            "logged distance-based metric",
+            metric_name=metric_name,
+            exact=summary.is_exact,
         )
-        mlflow.log_metric(key=f"{metric_name}_min", value=metric_values.min())
-        mlflow.log_metric(key=f"{metric_name}_max", value=metric_values.max())
-        LOGGER.info("logged distance-based metric", metric_name=metric_name)
+
+
+class _DistanceMetricsRecorder(object):
+    """Records the distance metrics for each batch of clean/adversarial image pairs.
+
+    Summary statistics are accumulated for every metric, so that their memory use does
+    not grow with the size of the dataset. The per-image table can additionally be
+    kept in memory, appended to a CSV file, or both.
+
+    Args:
+        metric_names: The names of the distance metrics.
+        summary_statistics_mode: The mode of the
+            :py:class:`~dioptra.sdk.utilities.statistics.SummaryStatistics` for each
+            metric.
+        keep_table: If `True`, keep the per-image table in memory.
+    """
+
+    def __init__(
+        self, metric_names: List[str], summary_statistics_mode: str, keep_table: bool
+    ) -> None:
+        self.summaries: Dict[str, SummaryStatistics] = {
+            metric_name: SummaryStatistics(mode=summary_statistics_mode)
+            for metric_name in metric_names
+        }
+        self._columns: List[str] = ["image", "label", *metric_names]
+        self._keep_table = keep_table
+        self._tables: List[pd.DataFrame] = []
+        self._file: Optional[IO[str]] = None
+
+    @contextmanager
+    def open(self, filepath: Optional[Union[str, Path]]) -> Iterator[None]:
+        """Appends each recorded batch to a CSV file while the context is active.
+
+        Args:
+            filepath: The CSV file to write. If `None`, nothing is written.
+        """
+        if filepath is None:
+            yield
+            return
+
+        filepath = Path(filepath)
+        opener = gzip.open if filepath.suffix == ".gz" else open
+
+        with opener(filepath, "wt", newline="") as f:
+            pd.DataFrame(columns=self._columns).to_csv(f, index=False)
+            self._file = f
+
+            try:
+                yield
+
+            finally:
+                self._file = None
+
+    def record(self, batch_table: pd.DataFrame) -> None:
+        """Records the distance metrics for a batch.
+
+        Args:
+            batch_table: A table with one row per image and the columns `image`,
+                `label`, and one column per distance metric.
+        """
+        for metric_name, summary in self.summaries.items():
+            summary.update(batch_table[metric_name].to_numpy())
+
+        if self._file is not None:
+            batch_table.to_csv(self._file, header=False, index=False)
+
+        if self._keep_table:
+            self._tables.append(batch_table)
+
+    def table(self) -> pd.DataFrame:
+        """Returns the per-image table, which is empty if it was not kept."""
+        if not self._tables:
+            return pd.DataFrame(columns=self._columns)
+
+        return pd.concat(self._tables, ignore_index=True)
@@ -0,0 +1,361 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""A task plugin module for preprocessed, memory-mapped image dataset snapshots.
+
+A snapshot stores an image directory after decoding, resizing, and rescaling, so that
+later jobs can read the pixels straight from a memory-mapped `.npy` file instead of
+decoding the same image files again. Snapshots are stored under a key derived from a
+fingerprint of the source directory and the preprocessing parameters, so a job reuses
+an existing snapshot whenever both match.
+
+.. |flow_from_directory| replace:: :py:meth:`tensorflow.keras.preprocessing.image\\
+   .ImageDataGenerator.flow_from_directory`
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import structlog
+from structlog.stdlib import BoundLogger
+
+from dioptra import pyplugs
+from dioptra.sdk.exceptions import TensorflowDependencyError
+from dioptra.sdk.utilities.batching import num_batches
+from dioptra.sdk.utilities.decorators import require_package
+
+from .tensorflow import _list_image_files
+
+LOGGER: BoundLogger = structlog.stdlib.get_logger()
+
+try:
+    from tensorflow.keras.preprocessing.image import img_to_array, load_img
+
+except ImportError:  # pragma: nocover
+    LOGGER.warn(
+        "Unable to import one or more optional packages, functionality may be reduced",
+        package="tensorflow",
+    )
+
+SNAPSHOT_FORMAT_VERSION = 1
+SNAPSHOT_IMAGES_FILENAME = "images.npy"
+SNAPSHOT_LABELS_FILENAME = "labels.npy"
+SNAPSHOT_INDEX_FILENAME = "index.json"
+
+
+@pyplugs.register
+@require_package("tensorflow", exc_type=TensorflowDependencyError)
+def create_dataset_snapshot(
+    data_dir: Union[str, Path],
+    snapshot_root: Union[str, Path],
+    image_size: Tuple[int, int, int],
+    rescale: Optional[float] = 1.0 / 255,
+    subset: Optional[str] = None,
+    validation_split: Optional[float] = None,
+    interpolation: str = "nearest",
+    max_workers: int = 4,
+) -> Path:
+    """Converts an image directory into a memory-mapped snapshot, or reuses one.
+
+    The images are listed, split, labeled, and preprocessed in the same way as
+    |flow_from_directory|, and stored as a single `float32` array of shape
+    `(n_images, height, width, channels)` in a `.npy` file alongside the class index
+    of each image and a JSON index of the filenames and class names.
+
+    The snapshot is stored in a subdirectory of `snapshot_root` named after a hash of
+    the preprocessing parameters and a fingerprint of the source directory, built from
+    the relative path, size, and modification time of every image file. If that
+    subdirectory exists, the snapshot is reused. Otherwise it is written to a temporary
+    directory and renamed into place once complete, so concurrent jobs never read a
+    partial snapshot.
+
+    Args:
+        data_dir: The directory containing the image dataset, with one subdirectory per
+            class.
+        snapshot_root: The directory where snapshots are stored.
+        image_size: A tuple of integers `(height, width, channels)` used to preprocess
+            the images so that they all have the same dimensions and number of color
+            channels. `channels=3` means RGB color images, `channels=4` means RGBA
+            images, and `channels=1` means grayscale images.
+        rescale: The rescaling factor for the pixel vectors. If `None` or `0`, no
+            rescaling is applied. The default is `1.0 / 255`.
+        subset: The subset of data (`"training"` or `"validation"`) to store. If
+            `None`, all images are stored. The default is `None`.
+        validation_split: The fraction of each class set aside for validation. The
+            default is `None`.
+        interpolation: The interpolation method used to resize the images. The default
+            is `"nearest"`, matching |flow_from_directory|.
+        max_workers: The number of threads used to decode the images. The default is
+            `4`.
+
+    Returns:
+        The path to the snapshot directory, which can be passed to
+        :py:func:`load_dataset_snapshot`.
+    """
+    color_mode: str = (
+        "rgb" if image_size[2] == 3 else "rgba" if image_size[2] == 4 else "grayscale"
+    )
+    target_size: Tuple[int, int] = (image_size[0], image_size[1])
+
+    def load_image(filepath: str) -> np.ndarray:
+        image = load_img(
+            filepath,
+            color_mode=color_mode,
+            target_size=target_size,
+            interpolation=interpolation,
+        )
+        return img_to_array(image, dtype="float32")
+
+    return _create_snapshot(
+        data_dir=data_dir,
+        snapshot_root=snapshot_root,
+        image_size=image_size,
+        rescale=rescale,
+        subset=subset,
+        validation_split=validation_split,
+        load_image=load_image,
+        params={"interpolation": interpolation},
+        max_workers=max_workers,
+    )
+
+
+@pyplugs.register
+def load_dataset_snapshot(
+    snapshot_dir: Union[str, Path],
+    batch_size: int = 32,
+    label_mode: Optional[str] = "categorical",
+    shuffle: bool = False,
+    seed: Optional[int] = None,
+) -> DatasetSnapshot:
+    """Loads a snapshot created by :py:func:`create_dataset_snapshot`.
+
+    Args:
+        snapshot_dir: The snapshot directory.
+        batch_size: The number of images in each batch. The default is `32`.
+        label_mode: Determines how the labels are returned, as in
+            |flow_from_directory|. `"categorical"` yields one-hot encoded labels,
+            `"binary"` and `"sparse"` yield the class indices as floats, `"input"`
+            yields the images as the labels, and `None` yields the images alone. The
+            default is `"categorical"`.
+        shuffle: If `True`, each pass over the snapshot visits the images in a new
+            random order. The default is `False`.
+        seed: Sets the random seed used for shuffling. The default is `None`.
+
+    Returns:
+        A :py:class:`DatasetSnapshot` object.
+    """
+    return DatasetSnapshot(
+        snapshot_dir=snapshot_dir,
+        batch_size=batch_size,
+        label_mode=label_mode,
+        shuffle=shuffle,
+        seed=seed,
+    )
+
+
+class DatasetSnapshot(object):
+    """Batches of images read from a memory-mapped snapshot.
+
+    The images are opened with :py:func:`numpy.load` in read-only memory-mapped mode.
+    Without shuffling, every batch of images is a view of the memory-mapped file, so
+    reading a batch copies nothing and only touches the pages that are used. With
+    shuffling, each batch gathers its images in index order, which copies the batch.
+
+    Iterating over the object makes one pass over the snapshot. It also supports
+    `len()` and indexing by batch number, and it carries the `class_indices`,
+    `classes`, `filenames`, `n`, `samples`, `num_classes`, and `batch_size` attributes
+    of a :py:class:`~tensorflow.keras.preprocessing.image.DirectoryIterator`, so it
+    can be passed to the plugins that accept one.
+
+    Args:
+        snapshot_dir: The snapshot directory.
+        batch_size: The number of images in each batch.
+        label_mode: `"categorical"`, `"binary"`, `"sparse"`, `"input"`, or `None`.
+        shuffle: If `True`, each pass visits the images in a new random order.
+        seed: Sets the random seed used for shuffling.
+    """
+
+    def __init__(
+        self,
+        snapshot_dir: Union[str, Path],
+        batch_size: int = 32,
+        label_mode: Optional[str] = "categorical",
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+    ) -> None:
+        if label_mode not in {"categorical", "binary", "sparse", "input", None}:
+            raise ValueError(
+                'label_mode must be one of "categorical", "binary", "sparse", '
+                f'"input", or None, got {label_mode!r}.'
+            )
+
+        self.snapshot_dir = Path(snapshot_dir)
+        index: Dict[str, Any] = json.loads(
+            (self.snapshot_dir / SNAPSHOT_INDEX_FILENAME).read_text()
+        )
+        self.images: np.ndarray = np.load(
+            self.snapshot_dir / SNAPSHOT_IMAGES_FILENAME, mmap_mode="r"
+        )
+        self.labels: np.ndarray = np.load(self.snapshot_dir / SNAPSHOT_LABELS_FILENAME)
+        self.class_indices: Dict[str, int] = index["class_indices"]
+        self.filenames: List[str] = index["filenames"]
+        self.classes: np.ndarray = self.labels
+        self.n: int = len(self.filenames)
+        self.samples: int = self.n
+        self.num_classes: int = len(self.class_indices)
+        self.batch_size = batch_size
+        self.label_mode = label_mode
+        self.shuffle = shuffle
+        self._rng = np.random.default_rng(seed)
+        self._index_array: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return num_batches(self.n, self.batch_size)
+
+    def __getitem__(self, batch_num: int):
+        if not 0 <= batch_num < len(self):
+            raise IndexError(f"Batch {batch_num} is out of range.")
+
+        rows: Union[slice, np.ndarray] = slice(
+            batch_num * self.batch_size, min((batch_num + 1) * self.batch_size, self.n)
+        )
+
+        if self._index_array is not None:
+            rows = np.sort(self._index_array[rows])
+
+        return self._format_batch(self.images[rows], self.labels[rows])
+
+    def __iter__(self) -> Iterator[Any]:
+        self.on_epoch_end()
+
+        for batch_num in range(len(self)):
+            yield self[batch_num]
+
+    def on_epoch_end(self) -> None:
+        """Draws a new image order for the next pass when shuffling is enabled."""
+        if self.shuffle:
+            self._index_array = self._rng.permutation(self.n)
+
+    def _format_batch(self, images: np.ndarray, labels: np.ndarray):
+        if self.label_mode is None:
+            return images
+
+        if self.label_mode == "input":
+            return images, images
+
+        if self.label_mode == "categorical":
+            return images, np.eye(self.num_classes, dtype=np.float32)[labels]
+
+        return images, labels.astype(np.float32)
+
+
+def _create_snapshot(
+    data_dir: Union[str, Path],
+    snapshot_root: Union[str, Path],
+    image_size: Tuple[int, int, int],
+    rescale: Optional[float],
+    subset: Optional[str],
+    validation_split: Optional[float],
+    load_image: Callable[[str], np.ndarray],
+    params: Dict[str, Any],
+    max_workers: int,
+) -> Path:
+    filenames, classes, class_indices = _list_image_files(
+        data_dir=data_dir, subset=subset, validation_split=validation_split
+    )
+    snapshot_params: Dict[str, Any] = {
+        "version": SNAPSHOT_FORMAT_VERSION,
+        "image_size": list(image_size),
+        "rescale": rescale,
+        "subset": subset,
+        "validation_split": validation_split,
+        **params,
+    }
+    key: str = _snapshot_key(data_dir, filenames, snapshot_params)
+    snapshot_dir: Path = Path(snapshot_root) / key
+
+    if (snapshot_dir / SNAPSHOT_INDEX_FILENAME).exists():
+        LOGGER.info("Reusing dataset snapshot", snapshot_dir=str(snapshot_dir))
+        return snapshot_dir
+
+    tmp_dir: Path = Path(snapshot_root) / f".{key}.{uuid.uuid4().hex}.tmp"
+    tmp_dir.mkdir(parents=True)
+
+    try:
+        images: np.memmap = np.lib.format.open_memmap(
+            tmp_dir / SNAPSHOT_IMAGES_FILENAME,
+            mode="w+",
+            dtype=np.float32,
+            shape=(len(filenames), *image_size),
+        )
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            filepaths = (os.path.join(data_dir, x) for x in filenames)
+
+            for index, image in enumerate(executor.map(load_image, filepaths)):
+                images[index] = image * rescale if rescale else image
+
+        images.flush()
+        del images
+        np.save(tmp_dir / SNAPSHOT_LABELS_FILENAME, np.asarray(classes, dtype=np.int32))
+        (tmp_dir / SNAPSHOT_INDEX_FILENAME).write_text(
+            json.dumps(
+                {
+                    "class_indices": class_indices,
+                    "filenames": filenames,
+                    "params": snapshot_params,
+                    "source": str(data_dir),
+                }
+            )
+        )
+        os.rename(tmp_dir, snapshot_dir)
+
+    except OSError:
+        # Another job finished the same snapshot first, so keep that one.
+        if not (snapshot_dir / SNAPSHOT_INDEX_FILENAME).exists():
+            raise
+
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    LOGGER.info(
+        "Created dataset snapshot",
+        snapshot_dir=str(snapshot_dir),
+        num_images=len(filenames),
+    )
+
+    return snapshot_dir
+
+
+def _snapshot_key(
+    data_dir: Union[str, Path], filenames: List[str], params: Dict[str, Any]
+) -> str:
+    digest = hashlib.sha256(json.dumps(params, sort_keys=True).encode())
+
+    for filename in filenames:
+        stat: os.stat_result = os.stat(os.path.join(data_dir, filename))
+        digest.update(f"{filename}\0{stat.st_size}\0{stat.st_mtime_ns}\n".encode())
+
+    return digest.hexdigest()[:32]
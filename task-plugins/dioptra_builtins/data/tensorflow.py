@@ -20,11 +20,14 @@
    .ImageDataGenerator.flow_from_directory`
 .. |directory_iterator| replace:: :py:class:`~tensorflow.keras.preprocessing.image\\
    .DirectoryIterator`
+.. |tf_dataset| replace:: :py:class:`tf.data.Dataset`
 """
 
 from __future__ import annotations
 
-from typing import Optional, Tuple
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
 
 import structlog
 from structlog.stdlib import BoundLogger
@@ -36,6 +39,7 @@ from dioptra.sdk.utilities.decorators import require_package
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
 try:
+    import tensorflow as tf
     from tensorflow.keras.preprocessing.image import (
         DirectoryIterator,
         ImageDataGenerator,
@@ -114,15 +118,251 @@ def create_image_dataset(
     )
 
 
+IMAGE_FILE_EXTENSIONS: Tuple[str, ...] = (".bmp", ".jpeg", ".jpg", ".png")
+
+
 @pyplugs.register
 @require_package("tensorflow", exc_type=TensorflowDependencyError)
-def get_n_classes_from_directory_iterator(ds: DirectoryIterator) -> int:
+def create_image_tf_dataset(
+    data_dir: str,
+    subset: Optional[str],
+    image_size: Tuple[int, int, int],
+    seed: int,
+    rescale: float = 1.0 / 255,
+    validation_split: Optional[float] = 0.2,
+    batch_size: int = 32,
+    label_mode: Optional[str] = "categorical",
+    shuffle: bool = True,
+    cache: Union[bool, str] = False,
+    shuffle_buffer_size: Optional[int] = None,
+    interpolation: str = "nearest",
+) -> tf.data.Dataset:
+    """Creates a |tf_dataset| pipeline for batches of image data from a directory.
+
+    This is a drop-in alternative to :py:func:`create_image_dataset`. The images are
+    listed, split, and labeled exactly as |flow_from_directory| does, but they are
+    decoded and resized by TensorFlow ops running in parallel with
+    `num_parallel_calls=tf.data.AUTOTUNE`, optionally cached, and prefetched while the
+    model consumes the previous batch. Batches are ordered by filename when `shuffle`
+    is `False`.
+
+    The returned dataset carries the same metadata as a |directory_iterator| in the
+    attributes `class_indices`, `classes`, `filenames`, `filepaths`, `n`, `samples`,
+    `num_classes`, and `batch_size`, so it can be passed to
+    :py:func:`get_n_classes_from_directory_iterator` and to the plugins that accept a
+    |directory_iterator|.
+
+    Args:
+        data_dir: The directory containing the image dataset, with one subdirectory per
+            class.
+        subset: The subset of data (`"training"` or `"validation"`) to use if
+            `validation_split` is not `None`. If `None`, all images are used.
+        image_size: A tuple of integers `(height, width, channels)` used to preprocess
+            the images so that they all have the same dimensions and number of color
+            channels. `channels=3` means RGB color images, `channels=4` means RGBA
+            images, and `channels=1` means grayscale images.
+        seed: Sets the random seed used for shuffling.
+        rescale: The rescaling factor for the pixel vectors. If `None` or `0`, no
+            rescaling is applied, otherwise multiply the data by the value provided.
+            The default is `1.0 / 255`.
+        validation_split: The fraction of the data to set aside for validation. As with
+            |flow_from_directory|, the first fraction of each class's sorted files is
+            the validation subset and the remainder is the training subset. The
+            default is `0.2`.
+        batch_size: The number of images in each batch. The final batch holds the
+            remaining images. The default is `32`.
+        label_mode: Determines how the labels are returned. `"categorical"` yields
+            one-hot encoded labels, `"binary"` and `"sparse"` yield the class indices
+            as floats, `"input"` yields the images as the labels, and `None` yields
+            the images alone. The default is `"categorical"`.
+        shuffle: If `True`, the images are reshuffled every epoch. The default is
+            `True`.
+        cache: If `True`, the decoded images are cached in memory after the first
+            epoch. If a path, they are cached in files with that prefix, which can be
+            reused across runs. If `False`, nothing is cached. The default is `False`.
+        shuffle_buffer_size: The size of the shuffle buffer. If `None`, the whole
+            dataset is shuffled. Without a cache the filenames are shuffled before
+            decoding, while with a cache the decoded images are shuffled, so a smaller
+            buffer bounds the memory use. The default is `None`.
+        interpolation: The interpolation method used to resize the images. The default
+            is `"nearest"`, matching |flow_from_directory|.
+
+    Returns:
+        A |tf_dataset| of image batches, or of `(images, labels)` batches.
+
+    See Also:
+        - :py:func:`create_image_dataset`
+        - :py:func:`tf.keras.utils.image_dataset_from_directory`
+    """
+    if label_mode not in {"categorical", "binary", "sparse", "input", None}:
+        raise ValueError(
+            'label_mode must be one of "categorical", "binary", "sparse", "input", '
+            f"or None, got {label_mode!r}."
+        )
+
+    filenames, classes, class_indices = _list_image_files(
+        data_dir=data_dir, subset=subset, validation_split=validation_split
+    )
+    filepaths: List[str] = [os.path.join(data_dir, x) for x in filenames]
+    num_classes: int = len(class_indices)
+    dataset: tf.data.Dataset = tf.data.Dataset.from_tensor_slices((filepaths, classes))
+
+    if shuffle and not cache:
+        dataset = dataset.shuffle(
+            buffer_size=shuffle_buffer_size or max(len(filepaths), 1),
+            seed=seed,
+            reshuffle_each_iteration=True,
+        )
+
+    dataset = dataset.map(
+        lambda filepath, label: (
+            _load_image(filepath, image_size, rescale, interpolation),
+            label,
+        ),
+        num_parallel_calls=tf.data.AUTOTUNE,
+    )
+
+    if cache:
+        dataset = dataset.cache("" if cache is True else str(cache))
+
+        if shuffle:
+            dataset = dataset.shuffle(
+                buffer_size=shuffle_buffer_size or max(len(filepaths), 1),
+                seed=seed,
+                reshuffle_each_iteration=True,
+            )
+
+    dataset = dataset.batch(batch_size).map(
+        lambda images, labels: _format_labels(images, labels, label_mode, num_classes),
+        num_parallel_calls=tf.data.AUTOTUNE,
+    )
+    dataset = dataset.prefetch(tf.data.AUTOTUNE)
+
+    # Mirror the DirectoryIterator attributes, the same way that
+    # image_dataset_from_directory attaches class_names to its dataset.
+    dataset.class_indices = class_indices
+    dataset.classes = classes
+    dataset.filenames = filenames
+    dataset.filepaths = filepaths
+    dataset.n = dataset.samples = len(filenames)
+    dataset.num_classes = num_classes
+    dataset.batch_size = batch_size
+
+    LOGGER.info(
+        "Created tf.data image dataset",
+        data_dir=data_dir,
+        subset=subset,
+        num_images=len(filenames),
+        num_classes=num_classes,
+    )
+
+    return dataset
+
+
+@pyplugs.register
+@require_package("tensorflow", exc_type=TensorflowDependencyError)
+def get_n_classes_from_directory_iterator(
+    ds: Union[DirectoryIterator, tf.data.Dataset]
+) -> int:
     """Returns the number of unique labels found by the |directory_iterator|.
 
     Args:
-        ds: A |directory_iterator| object.
+        ds: A |directory_iterator| object, or a |tf_dataset| created by
+            :py:func:`create_image_tf_dataset`.
 
     Returns:
         The number of unique labels in the dataset.
     """
     return len(ds.class_indices)
+
+
+def _list_image_files(
+    data_dir: Union[str, Path],
+    subset: Optional[str],
+    validation_split: Optional[float],
+) -> Tuple[List[str], List[int], Dict[str, int]]:
+    """Lists the image files in a directory in the same way as |flow_from_directory|.
+
+    The classes are the sorted names of the subdirectories of `data_dir`. The files of
+    each class are found by walking its subdirectory in sorted order, and the subset
+    takes the first (`"validation"`) or remaining (`"training"`) `validation_split`
+    fraction of them.
+
+    Args:
+        data_dir: The directory containing one subdirectory per class.
+        subset: `"training"`, `"validation"`, or `None` for all files.
+        validation_split: The fraction of each class set aside for validation.
+
+    Returns:
+        A tuple of the filenames relative to `data_dir`, the class index of each
+        file, and the dictionary mapping class names to class indices.
+    """
+    if subset not in {"training", "validation", None}:
+        raise ValueError(
+            f'subset must be "training", "validation", or None, got {subset!r}.'
+        )
+
+    class_names: List[str] = sorted(
+        entry.name for entry in os.scandir(data_dir) if entry.is_dir()
+    )
+    class_indices: Dict[str, int] = {name: i for i, name in enumerate(class_names)}
+    filenames: List[str] = []
+    classes: List[int] = []
+
+    for class_name, class_index in class_indices.items():
+        class_dir: str = os.path.join(data_dir, class_name)
+        class_files: List[str] = [
+            os.path.relpath(os.path.join(root, name), data_dir)
+            for root, _, files in sorted(os.walk(class_dir), key=lambda x: x[0])
+            for name in sorted(files)
+            if name.lower().endswith(IMAGE_FILE_EXTENSIONS)
+        ]
+        num_validation: int = int((validation_split or 0.0) * len(class_files))
+
+        if subset == "validation":
+            class_files = class_files[:num_validation]
+
+        elif subset == "training":
+            class_files = class_files[num_validation:]
+
+        filenames.extend(class_files)
+        classes.extend([class_index] * len(class_files))
+
+    return filenames, classes, class_indices
+
+
+def _load_image(
+    filepath: tf.Tensor,
+    image_size: Tuple[int, int, int],
+    rescale: Optional[float],
+    interpolation: str,
+) -> tf.Tensor:
+    image: tf.Tensor = tf.io.decode_image(
+        tf.io.read_file(filepath), channels=image_size[2], expand_animations=False
+    )
+    image.set_shape((None, None, image_size[2]))
+    image = tf.image.resize(image, image_size[:2], method=interpolation)
+    image = tf.cast(image, tf.float32)
+
+    if rescale:
+        image = image * rescale
+
+    return image
+
+
+def _format_labels(
+    images: tf.Tensor,
+    labels: tf.Tensor,
+    label_mode: Optional[str],
+    num_classes: int,
+):
+    if label_mode is None:
+        return images
+
+    if label_mode == "input":
+        return images, images
+
+    if label_mode == "categorical":
+        return images, tf.one_hot(labels, num_classes, dtype=tf.float32)
+
+    return images, tf.cast(labels, tf.float32)
@@ -23,12 +23,10 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import structlog
-from scipy.stats import wasserstein_distance
-from sklearn.metrics.pairwise import paired_distances
 from structlog.stdlib import BoundLogger
 
 from dioptra import pyplugs
@@ -37,6 +35,8 @@ from .exceptions import UnknownDistanceMetricError
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
+WASSERSTEIN_CHUNK_ELEMENTS = 2**24
+
 
 @pyplugs.register
 def get_distance_metric_list(
@@ -64,6 +64,11 @@ def get_distance_metric_list(
         A list of tuples with two elements. The first element of each tuple is the label
         from the `name` key of `request`, and the second element is the callable metric
         function.
+
+    Notes:
+        The returned callables are the registry functions themselves, so consumers
+        that apply several of them to the same batch can pass their registry names
+        to :py:func:`compute_distance_metrics` and calculate them in a single pass.
     """
     distance_metrics_list: List[Tuple[str, Callable[..., np.ndarray]]] = []
 
@@ -123,6 +128,66 @@ def get_distance_metric(func: str) -> Callable[..., np.ndarray]:
     return metric_callable
 
 
+def compute_distance_metrics(
+    y_true,
+    y_pred,
+    names: Iterable[str],
+    chunk_size: Optional[int] = None,
+) -> Dict[str, np.ndarray]:
+    """Calculates several distance metrics between a batch of two matrices at once.
+
+    The batches are flattened once and cast to float32. The difference
+    `y_true - y_pred` is computed once, and every requested norm and similarity is
+    derived from the same intermediate values. This replaces one full pass over the
+    batch per metric.
+
+    Args:
+        y_true: A batch of matrices containing the original or target values.
+        y_pred: A batch of matrices containing the perturbed or predicted values.
+        names: The registry names of the metrics to calculate. See
+            :py:func:`get_distance_metric` for the available names.
+        chunk_size: If provided, process the batch `chunk_size` samples at a time so
+            that the temporary arrays never exceed `chunk_size` samples. If `None`,
+            the whole batch is processed at once. The default is `None`.
+
+    Returns:
+        A dictionary mapping each requested name to a :py:class:`numpy.ndarray`
+        containing a batch of metric values.
+
+    Raises:
+        UnknownDistanceMetricError: If one of the names is not in the registry.
+    """
+    names = list(dict.fromkeys(names))
+
+    for name in names:
+        if name not in DISTANCE_METRICS_REGISTRY:
+            raise UnknownDistanceMetricError(
+                f"Could not find any distance metric named {name!r} in the metrics "
+                "plugin collection. Check spelling and try again."
+            )
+
+    y_true_flat: np.ndarray = _flatten_batch(np.asarray(y_true))
+    y_pred_flat: np.ndarray = _flatten_batch(np.asarray(y_pred))
+    num_samples: int = y_true_flat.shape[0]
+    step: int = chunk_size or max(num_samples, 1)
+    metrics: Dict[str, np.ndarray] = {
+        name: np.empty(num_samples, dtype=np.float64) for name in names
+    }
+
+    for start in range(0, num_samples, step):
+        rows = slice(start, start + step)
+        chunk_metrics: Dict[str, np.ndarray] = _compute_distance_metrics_chunk(
+            y_true=y_true_flat[rows].astype(np.float32, copy=False),
+            y_pred=y_pred_flat[rows].astype(np.float32, copy=False),
+            names=names,
+        )
+
+        for name, values in chunk_metrics.items():
+            metrics[name][rows] = values
+
+    return metrics
+
+
 def l_inf_norm(y_true, y_pred) -> np.ndarray:
     """Calculates the |Linf| norm between a batch of two matrices.
 
@@ -225,6 +290,8 @@ def paired_wasserstein_distances(y_true, y_pred, **kwargs) -> np.ndarray:
     Args:
         y_true: A batch of matrices containing the original or target values.
         y_pred: A batch of matrices containing the perturbed or predicted values.
+        **kwargs: Optional `u_weights` and `v_weights` arrays, see
+            :py:func:`batched_wasserstein_distances`.
 
     Returns:
         A :py:class:`numpy.ndarray` containing a batch of Wasserstein distances.
@@ -232,16 +299,189 @@ def paired_wasserstein_distances(y_true, y_pred, **kwargs) -> np.ndarray:
     See Also:
         - :py:func:`scipy.stats.wasserstein_distance`
     """
+    metric: np.ndarray = batched_wasserstein_distances(
+        u_values=_flatten_batch(np.asarray(y_true)),
+        v_values=_flatten_batch(np.asarray(y_pred)),
+        **kwargs,
+    )
+    return metric
 
-    def wrapped_metric(X, Y):
-        return wasserstein_distance(u_values=X, v_values=Y, **kwargs)
 
-    metric: np.ndarray = paired_distances(
-        X=_flatten_batch(y_true), Y=_flatten_batch(y_pred), metric=wrapped_metric
-    )
+def batched_wasserstein_distances(
+    u_values: np.ndarray,
+    v_values: np.ndarray,
+    u_weights: Optional[np.ndarray] = None,
+    v_weights: Optional[np.ndarray] = None,
+    chunk_size: Optional[int] = None,
+) -> np.ndarray:
+    """Calculates the 1-D Wasserstein distance between each pair of rows of two arrays.
+
+    Each row is treated as an empirical distribution, and the result matches calling
+    :py:func:`scipy.stats.wasserstein_distance` on every pair of rows. For unweighted
+    rows of equal length, the distance is the mean absolute difference of the
+    sorted values, which needs a single sort along the rows. In every other case, the
+    two rows are merged and the distance is integrated from the difference of their
+    cumulative distribution functions, still without a Python-level loop over
+    the rows.
+
+    Args:
+        u_values: A two-dimensional array with one distribution per row.
+        v_values: A two-dimensional array with one distribution per row and the same
+            number of rows as `u_values`.
+        u_weights: Optional non-negative weights for `u_values`, either one weight per
+            column shared by every row or one weight per element. If `None`, every
+            value has the same weight. The default is `None`.
+        v_weights: Optional non-negative weights for `v_values`, in the same form as
+            `u_weights`. The default is `None`.
+        chunk_size: The number of rows to process at a time. If `None`, it is chosen
+            so that the temporary arrays for each chunk stay within
+            `WASSERSTEIN_CHUNK_ELEMENTS` elements. The default is `None`.
+
+    Returns:
+        A :py:class:`numpy.ndarray` containing a batch of Wasserstein distances.
+
+    See Also:
+        - :py:func:`scipy.stats.wasserstein_distance`
+    """
+    num_samples: int = u_values.shape[0]
+    num_elements: int = u_values.shape[1] + v_values.shape[1]
+    step: int = chunk_size or max(1, WASSERSTEIN_CHUNK_ELEMENTS // max(num_elements, 1))
+    dtype = np.result_type(u_values.dtype, v_values.dtype, np.float32)
+    metric: np.ndarray = np.empty(num_samples, dtype=np.float64)
+
+    for start in range(0, num_samples, step):
+        rows = slice(start, start + step)
+        u_chunk = u_values[rows].astype(dtype, copy=False)
+        v_chunk = v_values[rows].astype(dtype, copy=False)
+
+        if u_weights is None and v_weights is None and u_chunk.shape == v_chunk.shape:
+            metric[rows] = np.abs(
+                np.sort(u_chunk, axis=1) - np.sort(v_chunk, axis=1)
+            ).mean(axis=1)
+
+        else:
+            metric[rows] = _weighted_wasserstein_distances(
+                u_values=u_chunk,
+                v_values=v_chunk,
+                u_weights=_chunk_weights(u_weights, u_chunk.shape, rows),
+                v_weights=_chunk_weights(v_weights, v_chunk.shape, rows),
+            )
+
     return metric
 
 
+def _compute_distance_metrics_chunk(
+    y_true: np.ndarray, y_pred: np.ndarray, names: List[str]
+) -> Dict[str, np.ndarray]:
+    """Calculates distance metrics for a chunk of flattened float32 matrices.
+
+    Args:
+        y_true: A batch of flattened matrices containing the original or target values.
+        y_pred: A batch of flattened matrices containing the perturbed or predicted
+            values.
+        names: The registry names of the metrics to calculate.
+
+    Returns:
+        A dictionary mapping each name to a :py:class:`numpy.ndarray` containing a
+        batch of metric values.
+    """
+    requested = set(names)
+    results: Dict[str, np.ndarray] = {}
+
+    if requested & _DIFFERENCE_METRICS:
+        y_diff: np.ndarray = y_true - y_pred
+
+        if requested & {"l_2_norm", "paired_euclidean_distances"}:
+            l_2: np.ndarray = np.sqrt(np.einsum("ij,ij->i", y_diff, y_diff))
+            results["l_2_norm"] = results["paired_euclidean_distances"] = l_2
+
+        # The absolute value is taken in place, so the squared norm above must be
+        # computed first.
+        np.abs(y_diff, out=y_diff)
+
+        if requested & {"l_1_norm", "paired_manhattan_distances"}:
+            l_1: np.ndarray = y_diff.sum(axis=1)
+            results["l_1_norm"] = results["paired_manhattan_distances"] = l_1
+
+        if "l_inf_norm" in requested:
+            results["l_inf_norm"] = y_diff.max(axis=1)
+
+    if "paired_cosine_similarities" in requested:
+        dot_product: np.ndarray = np.einsum("ij,ij->i", y_true, y_pred)
+        y_true_l_2: np.ndarray = np.sqrt(np.einsum("ij,ij->i", y_true, y_true))
+        y_pred_l_2: np.ndarray = np.sqrt(np.einsum("ij,ij->i", y_pred, y_pred))
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            results["paired_cosine_similarities"] = dot_product / (
+                y_true_l_2 * y_pred_l_2
+            )
+
+    if "paired_wasserstein_distances" in requested:
+        results["paired_wasserstein_distances"] = batched_wasserstein_distances(
+            u_values=y_true, v_values=y_pred
+        )
+
+    return {name: results[name] for name in names}
+
+
+def _weighted_wasserstein_distances(
+    u_values: np.ndarray,
+    v_values: np.ndarray,
+    u_weights: np.ndarray,
+    v_weights: np.ndarray,
+) -> np.ndarray:
+    """Calculates row-wise Wasserstein distances from the difference of the CDFs.
+
+    Args:
+        u_values: A two-dimensional array with one distribution per row.
+        v_values: A two-dimensional array with one distribution per row.
+        u_weights: The weights of `u_values`, with the same shape.
+        v_weights: The weights of `v_values`, with the same shape.
+
+    Returns:
+        A :py:class:`numpy.ndarray` containing a batch of Wasserstein distances.
+    """
+    u_weights = u_weights / u_weights.sum(axis=1, keepdims=True)
+    v_weights = v_weights / v_weights.sum(axis=1, keepdims=True)
+
+    # Merging both samples with the v weights negated makes the running sum of the
+    # weights equal to CDF_u - CDF_v between consecutive merged values.
+    values: np.ndarray = np.concatenate([u_values, v_values], axis=1)
+    weights: np.ndarray = np.concatenate([u_weights, -v_weights], axis=1)
+    order: np.ndarray = np.argsort(values, axis=1, kind="stable")
+    values = np.take_along_axis(values, order, axis=1)
+    cdf_difference: np.ndarray = np.cumsum(
+        np.take_along_axis(weights, order, axis=1), axis=1
+    )[:, :-1]
+
+    return np.sum(np.abs(cdf_difference) * np.diff(values, axis=1), axis=1)
+
+
+def _chunk_weights(
+    weights: Optional[np.ndarray], shape: Tuple[int, int], rows: slice
+) -> np.ndarray:
+    """Selects or broadcasts the weights for a chunk of rows.
+
+    Args:
+        weights: One weight per column, one weight per element, or `None` for equal
+            weights.
+        shape: The shape of the chunk of values.
+        rows: The rows of the chunk.
+
+    Returns:
+        A :py:class:`numpy.ndarray` of weights with the given shape.
+    """
+    if weights is None:
+        return np.ones(shape, dtype=np.float64)
+
+    weights = np.asarray(weights, dtype=np.float64)
+
+    if weights.ndim == 1:
+        return np.broadcast_to(weights, shape)
+
+    return weights[rows]
+
+
 def _flatten_batch(X: np.ndarray) -> np.ndarray:
     """Flattens each of the matrices in a batch into a one-dimensional array.
 
@@ -305,3 +545,11 @@ DISTANCE_METRICS_REGISTRY: Dict[str, Callable[..., Any]] = dict(
     paired_manhattan_distances=paired_manhattan_distances,
     paired_wasserstein_distances=paired_wasserstein_distances,
 )
+
+_DIFFERENCE_METRICS = {
+    "l_inf_norm",
+    "l_1_norm",
+    "l_2_norm",
+    "paired_euclidean_distances",
+    "paired_manhattan_distances",
+}
@@ -18,7 +18,8 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, List, Optional, Tuple
+import functools
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 import numpy as np
 import structlog
@@ -125,6 +126,171 @@ def get_performance_metric(func: str) -> Callable[..., float]:
     return metric_callable
 
 
+@pyplugs.register
+def compute_performance_metrics(
+    y_true,
+    y_pred,
+    names: Iterable[str],
+    average: str = "binary",
+    pos_label: Any = 1,
+    sample_weight=None,
+    confusion_matrix: Optional[ConfusionMatrix] = None,
+) -> Dict[str, float]:
+    """Calculates several count-based performance metrics from one confusion matrix.
+
+    The labels are scanned once to build a confusion matrix, and every requested
+    metric is derived from its counts. This replaces one validation and pass over the
+    labels per metric. Passing the same `confusion_matrix` for every batch of
+    predictions accumulates the counts, so that predictions can be streamed instead of
+    concatenated into a single array.
+
+    The following metrics can be derived from a confusion matrix,
+
+    - `accuracy`
+    - `categorical_accuracy`
+    - `mcc`
+    - `f1`
+    - `precision`
+    - `recall`
+
+    Args:
+        y_true: A 1d array-like containing the ground truth labels, or a 2d array-like
+            of one-hot encoded labels or class scores, which are reduced with
+            :py:func:`numpy.argmax`.
+        y_pred: The predicted labels, in the same formats as `y_true`.
+        names: The registry names of the metrics to calculate.
+        average: The averaging used by `f1`, `precision`, and `recall`. Must be one of
+            `"binary"`, `"micro"`, `"macro"`, or `"weighted"`, as in
+            :py:func:`sklearn.metrics.f1_score`. The default is `"binary"`.
+        pos_label: The class to report when `average` is `"binary"`. The default is
+            `1`.
+        sample_weight: An optional 1d array-like of sample weights.
+        confusion_matrix: An optional :py:class:`ConfusionMatrix` holding the counts
+            of earlier batches. It is updated in place with this batch. If `None`, the
+            metrics are calculated for this batch alone.
+
+    Returns:
+        A dictionary mapping each requested name to the metric value.
+
+    Raises:
+        UnknownPerformanceMetricError: If one of the names cannot be derived from a
+            confusion matrix.
+    """
+    names = list(dict.fromkeys(names))
+
+    for name in names:
+        if name not in CONFUSION_MATRIX_METRICS:
+            raise UnknownPerformanceMetricError(
+                f"The performance metric {name!r} cannot be derived from a confusion "
+                f"matrix. Choose from {sorted(CONFUSION_MATRIX_METRICS)}."
+            )
+
+    confusion_matrix = confusion_matrix or ConfusionMatrix()
+    confusion_matrix.update(y_true, y_pred, sample_weight=sample_weight)
+
+    return confusion_matrix.compute(names, average=average, pos_label=pos_label)
+
+
+class ConfusionMatrix(object):
+    """Accumulates a multiclass confusion matrix across batches of predictions.
+
+    The rows of the matrix are indexed by the true labels and the columns by the
+    predicted labels. The labels are discovered as batches are added, and the matrix
+    grows when a batch introduces a new label.
+
+    Attributes:
+        labels: The sorted labels seen so far.
+        matrix: The (weighted) counts, with shape `(n_labels, n_labels)`.
+    """
+
+    def __init__(self) -> None:
+        self.labels: np.ndarray = np.empty(0)
+        self.matrix: np.ndarray = np.zeros((0, 0), dtype=np.float64)
+
+    def update(self, y_true, y_pred, sample_weight=None) -> None:
+        """Adds a batch of predictions to the counts.
+
+        Args:
+            y_true: A 1d array-like containing the ground truth labels, or a 2d
+                array-like of one-hot encoded labels or class scores.
+            y_pred: The predicted labels, in the same formats as `y_true`.
+            sample_weight: An optional 1d array-like of sample weights.
+        """
+        y_true = _as_label_array(y_true)
+        y_pred = _as_label_array(y_pred)
+
+        if y_true.shape != y_pred.shape:
+            raise ValueError(
+                "y_true and y_pred must contain the same number of samples, got "
+                f"{y_true.shape[0]} and {y_pred.shape[0]}."
+            )
+
+        if y_true.size == 0:
+            return
+
+        self._add_labels(np.union1d(y_true, y_pred))
+        num_labels: int = self.labels.size
+        true_index: np.ndarray = np.searchsorted(self.labels, y_true)
+        pred_index: np.ndarray = np.searchsorted(self.labels, y_pred)
+        counts: np.ndarray = np.bincount(
+            true_index * num_labels + pred_index,
+            weights=None if sample_weight is None else np.ravel(sample_weight),
+            minlength=num_labels * num_labels,
+        )
+        self.matrix += counts.reshape(num_labels, num_labels)
+
+    def merge(self, other: ConfusionMatrix) -> None:
+        """Adds the counts accumulated by another instance.
+
+        Args:
+            other: The confusion matrix to merge into this one.
+        """
+        if other.labels.size == 0:
+            return
+
+        self._add_labels(other.labels)
+        index: np.ndarray = np.searchsorted(self.labels, other.labels)
+        self.matrix[np.ix_(index, index)] += other.matrix
+
+    def compute(
+        self,
+        names: Iterable[str],
+        average: str = "binary",
+        pos_label: Any = 1,
+    ) -> Dict[str, float]:
+        """Calculates performance metrics from the accumulated counts.
+
+        Args:
+            names: The registry names of the metrics to calculate. See
+                :py:func:`compute_performance_metrics` for the available names.
+            average: The averaging used by `f1`, `precision`, and `recall`. The
+                default is `"binary"`.
+            pos_label: The class to report when `average` is `"binary"`. The default
+                is `1`.
+
+        Returns:
+            A dictionary mapping each requested name to the metric value.
+        """
+        return {
+            name: float(
+                CONFUSION_MATRIX_METRICS[name](
+                    self.matrix, self.labels, average=average, pos_label=pos_label
+                )
+            )
+            for name in names
+        }
+
+    def _add_labels(self, labels: np.ndarray) -> None:
+        if self.labels.size > 0 and np.isin(labels, self.labels).all():
+            return
+
+        new_labels: np.ndarray = np.union1d(self.labels, labels)
+        index: np.ndarray = np.searchsorted(new_labels, self.labels)
+        matrix: np.ndarray = np.zeros((new_labels.size, new_labels.size))
+        matrix[np.ix_(index, index)] = self.matrix
+        self.labels, self.matrix = new_labels, matrix
+
+
 def accuracy(y_true, y_pred, **kwargs) -> float:
     """Calculates the accuracy score.
 
@@ -278,3 +444,115 @@ PERFORMANCE_METRICS_REGISTRY: Dict[str, Callable[..., Any]] = dict(
     precision=precision,
     recall=recall,
 )
+
+
+def _as_label_array(y) -> np.ndarray:
+    y = np.asarray(y)
+
+    if y.ndim > 1:
+        return np.argmax(y, axis=-1)
+
+    return y
+
+
+def _confusion_matrix_accuracy(matrix: np.ndarray, labels: np.ndarray, **kwargs):
+    total: float = matrix.sum()
+
+    return np.trace(matrix) / total if total > 0 else 0.0
+
+
+def _confusion_matrix_mcc(matrix: np.ndarray, labels: np.ndarray, **kwargs):
+    t_sum: np.ndarray = matrix.sum(axis=1)
+    p_sum: np.ndarray = matrix.sum(axis=0)
+    n_correct: float = np.trace(matrix)
+    n_samples: float = p_sum.sum()
+    cov_ytyp: float = n_correct * n_samples - np.dot(t_sum, p_sum)
+    cov_ypyp: float = n_samples**2 - np.dot(p_sum, p_sum)
+    cov_ytyt: float = n_samples**2 - np.dot(t_sum, t_sum)
+
+    if cov_ypyp * cov_ytyt == 0:
+        return 0.0
+
+    return cov_ytyp / np.sqrt(cov_ytyt * cov_ypyp)
+
+
+def _confusion_matrix_prf(
+    matrix: np.ndarray,
+    labels: np.ndarray,
+    numerator: str,
+    average: str,
+    pos_label: Any,
+) -> float:
+    true_positives: np.ndarray = np.diag(matrix)
+    true_sum: np.ndarray = matrix.sum(axis=1)
+    pred_sum: np.ndarray = matrix.sum(axis=0)
+
+    if average == "binary":
+        if labels.size > 2:
+            raise ValueError(
+                "Target is multiclass but average='binary'. Please choose another "
+                "average setting, one of ['micro', 'macro', 'weighted']."
+            )
+
+        if pos_label not in labels:
+            if labels.size == 2:
+                raise ValueError(
+                    f"pos_label={pos_label!r} is not a valid label. It should be one "
+                    f"of {labels.tolist()}."
+                )
+
+            return 0.0
+
+        index: np.ndarray = np.searchsorted(labels, [pos_label])
+        true_positives, true_sum, pred_sum = (
+            true_positives[index],
+            true_sum[index],
+            pred_sum[index],
+        )
+
+    elif average == "micro":
+        true_positives, true_sum, pred_sum = (
+            true_positives.sum(keepdims=True),
+            true_sum.sum(keepdims=True),
+            pred_sum.sum(keepdims=True),
+        )
+
+    elif average not in {"macro", "weighted"}:
+        raise ValueError(
+            "average must be one of ['binary', 'micro', 'macro', 'weighted'], got "
+            f"{average!r}."
+        )
+
+    precision_: np.ndarray = _safe_divide(true_positives, pred_sum)
+    recall_: np.ndarray = _safe_divide(true_positives, true_sum)
+    scores: np.ndarray = {
+        "precision": precision_,
+        "recall": recall_,
+        "f1": _safe_divide(2 * precision_ * recall_, precision_ + recall_),
+    }[numerator]
+
+    if average == "weighted":
+        return (
+            float(np.dot(scores, true_sum) / true_sum.sum()) if true_sum.any() else 0.0
+        )
+
+    return float(scores.mean()) if scores.size > 0 else 0.0
+
+
+def _safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros_like(numerator, dtype=np.float64),
+        where=denominator != 0,
+    )
+
+
+CONFUSION_MATRIX_METRICS: Dict[str, Callable[..., float]] = dict(
+    accuracy=_confusion_matrix_accuracy,
+    categorical_accuracy=_confusion_matrix_accuracy,
+    mcc=_confusion_matrix_mcc,
+    f1=functools.partial(_confusion_matrix_prf, numerator="f1"),
+    precision=functools.partial(_confusion_matrix_prf, numerator="precision"),
+    recall=functools.partial(_confusion_matrix_prf, numerator="recall"),
+)
@@ -59,7 +59,10 @@ except ImportError:  # pragma: nocover
 @require_package("art", exc_type=ARTDependencyError)
 @require_package("tensorflow", exc_type=TensorflowDependencyError)
 def load_wrapped_tensorflow_keras_classifier(
-    name: str, version: int, classifier_kwargs: Optional[Dict[str, Any]] = None
+    name: str,
+    version: int,
+    classifier_kwargs: Optional[Dict[str, Any]] = None,
+    cache_dir: Optional[str] = None,
 ) -> KerasClassifier:
     """Loads and wraps a registered Keras classifier for compatibility with the |ART|.
 
@@ -68,6 +71,9 @@ def load_wrapped_tensorflow_keras_classifier(
         version: The version number of the registered model in the MLFlow registry.
         classifier_kwargs: A dictionary mapping argument names to values which will
             be passed to the KerasClassifier constructor.
+        cache_dir: The model cache directory, passed to
+            :py:func:`.mlflow.load_tensorflow_keras_classifier`. The default is `None`.
+
     Returns:
         A trained :py:class:`~art.estimators.classification.KerasClassifier` object.
 
@@ -77,7 +83,7 @@ def load_wrapped_tensorflow_keras_classifier(
     """
     classifier_kwargs = classifier_kwargs or {}
     keras_classifier: Sequential = load_tensorflow_keras_classifier(
-        name=name, version=version
+        name=name, version=version, cache_dir=cache_dir
     )
     wrapped_keras_classifier: KerasClassifier = KerasClassifier(
         model=keras_classifier, **classifier_kwargs
@@ -0,0 +1,295 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""A worker-local disk cache of models downloaded from the MLFlow model registry.
+
+Registered model versions are immutable, so a model downloaded once can be reused by
+every later job on the same host. Each `(name, version)` pair is stored in its own
+entry directory. A download is written to a staging directory and renamed into place,
+and the entry's `entry.json` file is written last, so an entry is complete once that
+file exists. The modification time of `entry.json` records when the entry was last
+used, and the least recently used entries are evicted once the cache grows past its
+size limit.
+
+Concurrent jobs coordinate through file locks. Downloading an entry takes an exclusive
+lock on it, reading an entry takes a shared lock, and eviction skips any entry that is
+locked, so an entry is never removed while a job is loading it.
+
+The cache directory has the following layout::
+
+    <cache_dir>/
+        entries/<key>/entry.json
+        entries/<key>/model/...
+        locks/<key>.lock
+        locks/cache.lock
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import structlog
+from mlflow.store.artifact.models_artifact_repo import ModelsArtifactRepository
+from structlog.stdlib import BoundLogger
+
+ENVVAR_MODEL_CACHE_DIR = "DIOPTRA_MODEL_CACHE_DIR"
+ENVVAR_MODEL_CACHE_MAX_BYTES = "DIOPTRA_MODEL_CACHE_MAX_BYTES"
+
+DEFAULT_MAX_BYTES = 10 * 1024**3
+
+LOGGER: BoundLogger = structlog.stdlib.get_logger()
+
+_MODEL_CACHES: Dict[Tuple[Path, int], ModelCache] = {}
+_MODEL_CACHES_LOCK = threading.Lock()
+
+
+@dataclass
+class ModelCacheStats(object):
+    """Counters for the model cache activity of the current process.
+
+    Attributes:
+        hits: The number of loads served from the cache.
+        misses: The number of loads that downloaded the model.
+        evictions: The number of entries evicted from the cache.
+        bytes_downloaded: The number of bytes downloaded on misses.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    bytes_downloaded: int = 0
+
+
+class ModelCache(object):
+    """A size-bounded LRU disk cache of registered model versions.
+
+    Args:
+        cache_dir: The cache directory.
+        max_bytes: The maximum total size of the cached models. The most recently used
+            entry is kept even if it alone is larger.
+        download: A function that downloads the model at a registry URI into a local
+            directory. The default downloads the artifacts of a `models:/` URI.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        download: Optional[Callable[[str, Path], None]] = None,
+    ) -> None:
+        self._cache_dir = Path(cache_dir)
+        self._max_bytes = max_bytes
+        self._download = download or _download_registered_model
+        self.stats = ModelCacheStats()
+
+    @property
+    def entries_dir(self) -> Path:
+        return self._cache_dir / "entries"
+
+    @property
+    def locks_dir(self) -> Path:
+        return self._cache_dir / "locks"
+
+    @contextmanager
+    def open(self, name: str, version: Union[int, str], **kwargs) -> Iterator[Path]:
+        """Yields the local directory of a registered model version.
+
+        The model is downloaded if it is not in the cache. The entry cannot be evicted
+        until the context exits, after which the cache is trimmed to its size limit.
+
+        Args:
+            name: The name of the registered model.
+            version: The version number of the registered model.
+
+        Yields:
+            The local directory containing the model.
+        """
+        log: BoundLogger = kwargs.get("log", LOGGER.new())
+        uri: str = f"models:/{name}/{version}"
+        key: str = _get_entry_key(name, version)
+        entry_dir: Path = self.entries_dir / key
+        downloaded = False
+
+        while True:
+            with self._lock(key, fcntl.LOCK_SH):
+                if (entry_dir / "entry.json").exists():
+                    os.utime(entry_dir / "entry.json")
+
+                    if downloaded:
+                        self.stats.misses += 1
+
+                    else:
+                        self.stats.hits += 1
+
+                    log.info(
+                        "Model cache hit" if not downloaded else "Model cache miss",
+                        uri=uri,
+                        **asdict(self.stats),
+                    )
+
+                    yield entry_dir / "model"
+                    break
+
+            with self._lock(key, fcntl.LOCK_EX):
+                if not (entry_dir / "entry.json").exists():
+                    self._build_entry(
+                        uri=uri,
+                        entry_dir=entry_dir,
+                        metadata={"name": name, "version": str(version)},
+                    )
+                    downloaded = True
+
+        self.evict(keep=key)
+
+    def evict(self, keep: Optional[str] = None) -> None:
+        """Evicts the least recently used entries until the cache fits its size limit.
+
+        Entries that are locked by another job are skipped.
+
+        Args:
+            keep: The key of an entry that must not be evicted.
+        """
+        with self._lock("cache", fcntl.LOCK_EX):
+            entries: List[Tuple[float, int, str]] = []
+
+            for entry_file in self.entries_dir.glob("*/entry.json"):
+                try:
+                    entries.append(
+                        (
+                            entry_file.stat().st_mtime,
+                            json.loads(entry_file.read_text())["size"],
+                            entry_file.parent.name,
+                        )
+                    )
+
+                except (OSError, ValueError, KeyError):
+                    continue
+
+            total_bytes: int = sum(size for _, size, _ in entries)
+
+            for _, size, key in sorted(entries):
+                if total_bytes <= self._max_bytes:
+                    break
+
+                if key != keep and self._try_remove_entry(key):
+                    total_bytes -= size
+                    self.stats.evictions += 1
+                    LOGGER.info("Evicted model from cache", key=key, size=size)
+
+    def _build_entry(self, uri: str, entry_dir: Path, metadata: Dict[str, str]) -> None:
+        staging_dir = entry_dir.with_name(f".{entry_dir.name}.{uuid.uuid4().hex}")
+        staging_dir.mkdir(parents=True)
+
+        try:
+            self._download(uri, staging_dir / "model")
+            size: int = sum(
+                x.stat().st_size for x in staging_dir.rglob("*") if x.is_file()
+            )
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.rename(staging_dir, entry_dir)
+            (entry_dir / "entry.json").write_text(
+                json.dumps({**metadata, "size": size})
+            )
+            self.stats.bytes_downloaded += size
+
+        finally:
+            if staging_dir.exists():
+                shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def _try_remove_entry(self, key: str) -> bool:
+        with (self.locks_dir / f"{key}.lock").open("w") as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+
+            except BlockingIOError:
+                return False
+
+            try:
+                # Remove the marker first, so a partially removed entry is incomplete.
+                (self.entries_dir / key / "entry.json").unlink(missing_ok=True)
+                shutil.rmtree(self.entries_dir / key, ignore_errors=True)
+
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+        return True
+
+    @contextmanager
+    def _lock(self, name: str, operation: int) -> Iterator[None]:
+        self.locks_dir.mkdir(parents=True, exist_ok=True)
+
+        with (self.locks_dir / f"{name}.lock").open("w") as f:
+            fcntl.flock(f, operation)
+
+            try:
+                yield
+
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def get_model_cache(
+    cache_dir: Optional[Union[str, Path]] = None, max_bytes: Optional[int] = None
+) -> Optional[ModelCache]:
+    """Returns the process-wide model cache for a cache directory.
+
+    Args:
+        cache_dir: The cache directory. If `None`, the ``DIOPTRA_MODEL_CACHE_DIR``
+            environment variable is used.
+        max_bytes: The maximum total size of the cached models. If `None`, the
+            ``DIOPTRA_MODEL_CACHE_MAX_BYTES`` environment variable is used, which
+            defaults to 10 GiB.
+
+    Returns:
+        The :py:class:`ModelCache`, or `None` if no cache directory is configured.
+    """
+    cache_dir = cache_dir or os.getenv(ENVVAR_MODEL_CACHE_DIR)
+
+    if not cache_dir:
+        return None
+
+    max_bytes = max_bytes or int(
+        os.getenv(ENVVAR_MODEL_CACHE_MAX_BYTES, DEFAULT_MAX_BYTES)
+    )
+    cache_key: Tuple[Path, int] = (Path(cache_dir).resolve(), max_bytes)
+
+    with _MODEL_CACHES_LOCK:
+        if cache_key not in _MODEL_CACHES:
+            _MODEL_CACHES[cache_key] = ModelCache(
+                cache_dir=cache_key[0], max_bytes=max_bytes
+            )
+
+        return _MODEL_CACHES[cache_key]
+
+
+def _download_registered_model(uri: str, dest: Path) -> None:
+    dest.mkdir(parents=True, exist_ok=True)
+    ModelsArtifactRepository(uri).download_artifacts(
+        artifact_path="", dst_path=str(dest)
+    )
+
+
+def _get_entry_key(name: str, version: Union[int, str]) -> str:
+    return hashlib.sha256(f"{name}\0{version}".encode("utf-8")).hexdigest()[:32]
@@ -31,6 +31,8 @@ from dioptra import pyplugs
 from dioptra.sdk.exceptions import TensorflowDependencyError
 from dioptra.sdk.utilities.decorators import require_package
 
+from .cache import ModelCache, get_model_cache
+
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
 try:
@@ -104,17 +106,36 @@ def get_experiment_name(active_run: MlflowRun) -> str:
 
 @pyplugs.register
 @require_package("tensorflow", exc_type=TensorflowDependencyError)
-def load_tensorflow_keras_classifier(name: str, version: int) -> Sequential:
+def load_tensorflow_keras_classifier(
+    name: str, version: int, cache_dir: Optional[str] = None
+) -> Sequential:
     """Loads a registered Keras classifier.
 
+    Registered model versions are immutable, so when a model cache is configured the
+    model is downloaded once per host and later jobs load it from the local disk. The
+    cache evicts the least recently used models once it grows past the size set by the
+    ``DIOPTRA_MODEL_CACHE_MAX_BYTES`` environment variable. See
+    :py:mod:`.cache` for details.
+
     Args:
         name: The name of the registered model in the MLFlow model registry.
         version: The version number of the registered model in the MLFlow registry.
+        cache_dir: The model cache directory. If `None`, the
+            ``DIOPTRA_MODEL_CACHE_DIR`` environment variable is used, and the model is
+            loaded straight from the registry if neither is set.
 
     Returns:
         A trained :py:class:`tf.keras.Sequential` object.
     """
     uri: str = f"models:/{name}/{version}"
-    LOGGER.info("Load Keras classifier from model registry", uri=uri)
+    model_cache: Optional[ModelCache] = get_model_cache(cache_dir=cache_dir)
+
+    if model_cache is None:
+        LOGGER.info("Load Keras classifier from model registry", uri=uri)
+        return load_tf_keras_model(model_uri=uri)
 
-    return load_tf_keras_model(model_uri=uri)
+    with model_cache.open(name=name, version=version) as model_dir:
+        LOGGER.info(
+            "Load Keras classifier from model cache", uri=uri, model_dir=str(model_dir)
+        )
+        return load_tf_keras_model(model_uri=str(model_dir))
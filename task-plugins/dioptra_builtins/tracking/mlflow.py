@@ -18,7 +18,7 @@
 
 from __future__ import annotations
 
-from typing import Dict
+from typing import Dict, Optional
 
 import mlflow
 import structlog
@@ -27,6 +27,7 @@ from structlog.stdlib import BoundLogger
 from dioptra import pyplugs
 from dioptra.sdk.exceptions import TensorflowDependencyError
 from dioptra.sdk.utilities.decorators import require_package
+from dioptra.sdk.utilities.tracking import log_batch
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
@@ -41,18 +42,23 @@ except ImportError:  # pragma: nocover
 
 
 @pyplugs.register
-def log_metrics(metrics: Dict[str, float]) -> None:
+def log_metrics(metrics: Dict[str, float], step: Optional[int] = None) -> None:
     """Logs metrics to the MLFlow Tracking service for the current run.
 
+    The metrics are sent in as few requests as the tracking server limits allow.
+
     Args:
         metrics: A dictionary with the metrics to be logged. The keys are the metric
             names and the values are the metric values.
+        step: The step at which to log the metrics. The default is `None`, which logs
+            the metrics at step zero.
 
     See Also:
-        - :py:func:`mlflow.log_metric`
+        - :py:func:`dioptra.sdk.utilities.tracking.log_batch`
     """
+    log_batch(metrics=metrics, step=step)
+
     for metric_name, metric_value in metrics.items():
-        mlflow.log_metric(key=metric_name, value=metric_value)
         LOGGER.info(
             "Log metric to MLFlow Tracking server",
             metric_name=metric_name,
@@ -64,17 +70,19 @@ def log_metrics(metrics: Dict[str, float]) -> None:
 def log_parameters(parameters: Dict[str, float]) -> None:
     """Logs parameters to the MLFlow Tracking service for the current run.
 
-    Parameters can only be set once per run.
+    Parameters can only be set once per run. The parameters are sent in as few requests
+    as the tracking server limits allow.
 
     Args:
         parameters: A dictionary with the parameters to be logged. The keys are the
             parameter names and the values are the parameter values.
 
     See Also:
-        - :py:func:`mlflow.log_param`
+        - :py:func:`dioptra.sdk.utilities.tracking.log_batch`
     """
+    log_batch(params=parameters)
+
     for parameter_name, parameter_value in parameters.items():
-        mlflow.log_param(key=parameter_name, value=parameter_value)
         LOGGER.info(
             "Log parameter to MLFlow Tracking server",
             parameter_name=parameter_name,
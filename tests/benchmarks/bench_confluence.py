@@ -0,0 +1,322 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""Benchmark the Confluence bounding box post-processing.
+
+Random YOLO predictions are post-processed with the previous Confluence loop, which
+recomputed the proximities of every remaining box to every other box in Python on
+each iteration, and with the vectorized
+:py:meth:`~dioptra.sdk.object_detection.bounding_boxes.postprocessing\\
+.TensorflowBoundingBoxesYOLOV1Confluence.confluence`, which computes the pairwise
+proximity matrix of each class once, and with the TensorFlow
+:py:meth:`~dioptra.sdk.object_detection.bounding_boxes.postprocessing\\
+.TensorflowBoundingBoxesYOLOV1Confluence.confluence_graph` that runs inside the
+post-processing graph. Grids from 7x7 cells with 2 boxes each up to 19x19 cells with 5
+boxes each are timed, with linear and Gaussian score decay. The seconds per batch of
+each are reported, along with whether the vectorized outputs are identical to the
+previous ones and whether the graph outputs match them up to rounding.
+
+Requires TensorFlow. Run from the repository root::
+
+    python tests/benchmarks/bench_confluence.py --batch-size 8 --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import tensorflow as tf
+
+from dioptra.sdk.object_detection.bounding_boxes.postprocessing import (
+    TensorflowBoundingBoxesYOLOV1Confluence,
+)
+
+GRIDS = [(7, 2), (13, 2), (13, 5), (19, 5)]
+NUM_CLASSES = 20
+
+
+def previous_confluence(
+    postprocessor: TensorflowBoundingBoxesYOLOV1Confluence,
+    boxes: npt.NDArray,
+    scores: npt.NDArray,
+    labels: npt.NDArray,
+):
+    """The per-box Confluence loop that the vectorized implementation replaced."""
+    batch_size = boxes.shape[0]
+    retained_boxes = []
+    retained_scores = []
+    retained_labels = []
+
+    for batch_idx in range(batch_size):
+        class_mapping: dict[
+            int, list[npt.NDArray]
+        ] = postprocessor.assign_boxes_to_classes(
+            boxes[batch_idx], labels[batch_idx], scores[batch_idx]
+        )
+        output = {}
+
+        for each_class in class_mapping:
+            dets = np.array(class_mapping[each_class])
+            retain = []
+
+            while dets.size > 0:
+                confluence_scores: list[npt.NDArray] = []
+                proximities = []
+
+                while len(confluence_scores) < np.size(dets, 0):
+                    current_box = len(confluence_scores)
+                    x1 = dets[current_box, 0]
+                    y1 = dets[current_box, 1]
+                    x2 = dets[current_box, 2]
+                    y2 = dets[current_box, 3]
+                    confidence_score = dets[current_box, 4]
+
+                    xx1 = dets[np.arange(len(dets)) != current_box, 0]
+                    yy1 = dets[np.arange(len(dets)) != current_box, 1]
+                    xx2 = dets[np.arange(len(dets)) != current_box, 2]
+                    yy2 = dets[np.arange(len(dets)) != current_box, 3]
+                    cconf = dets[np.arange(len(dets)) != current_box, 4]
+
+                    min_x: npt.NDArray = np.minimum(x1, xx1)
+                    min_y: npt.NDArray = np.minimum(y1, yy1)
+                    max_x: npt.NDArray = np.maximum(x2, xx2)
+                    max_y: npt.NDArray = np.maximum(y2, yy2)
+
+                    x1, y1, x2, y2 = postprocessor.normalise_coordinates(
+                        x1,
+                        y1,
+                        x2,
+                        y2,
+                        min_x,
+                        max_x,
+                        min_y,
+                        max_y,
+                    )
+                    xx1, yy1, xx2, yy2 = postprocessor.normalise_coordinates(
+                        xx1,
+                        yy1,
+                        xx2,
+                        yy2,
+                        min_x,
+                        max_x,
+                        min_y,
+                        max_y,
+                    )
+
+                    hd_x1, hd_x2, vd_y1, vd_y2 = (
+                        abs(x1 - xx1),
+                        abs(x2 - xx2),
+                        abs(y1 - yy1),
+                        abs(y2 - yy2),
+                    )
+                    proximity = hd_x1 + hd_x2 + vd_y1 + vd_y2
+                    all_proximities = np.ones_like(proximity)
+                    cconf_scores = np.zeros_like(cconf)
+
+                    all_proximities[
+                        proximity <= postprocessor._confluence_threshold
+                    ] = proximity[proximity <= postprocessor._confluence_threshold]
+                    cconf_scores[
+                        proximity <= postprocessor._confluence_threshold
+                    ] = cconf[proximity <= postprocessor._confluence_threshold]
+
+                    if cconf_scores.size > 0:
+                        confluence_score = np.amax(cconf_scores)
+
+                    else:
+                        confluence_score = confidence_score
+
+                    if all_proximities.size > 0:
+                        proximity = (sum(all_proximities) / all_proximities.size) * (
+                            1 - confidence_score
+                        )
+
+                    else:
+                        proximity = sum(all_proximities) * (1 - confidence_score)
+
+                    confluence_scores.append(confluence_score)
+                    proximities.append(proximity)
+
+                conf = np.array(confluence_scores)
+                prox = np.array(proximities)
+
+                dets_temp = np.concatenate((dets, prox[:, None]), axis=1)
+                dets_temp = np.concatenate((dets_temp, conf[:, None]), axis=1)
+                min_idx = np.argmin(dets_temp[:, 5], axis=0)
+                dets[[0, min_idx], :] = dets[[min_idx, 0], :]
+                dets_temp[[0, min_idx], :] = dets_temp[[min_idx, 0], :]
+                dets[0, 4] = dets_temp[0, 6]
+                retain.append(dets[0, :])
+
+                x1, y1, x2, y2 = dets[0, 0], dets[0, 1], dets[0, 2], dets[0, 3]
+                min_x = np.minimum(x1, dets[1:, 0])
+                min_y = np.minimum(y1, dets[1:, 1])
+                max_x = np.maximum(x2, dets[1:, 2])
+                max_y = np.maximum(y2, dets[1:, 3])
+
+                x1, y1, x2, y2 = postprocessor.normalise_coordinates(
+                    x1,
+                    y1,
+                    x2,
+                    y2,
+                    min_x,
+                    max_x,
+                    min_y,
+                    max_y,
+                )
+                xx1, yy1, xx2, yy2 = postprocessor.normalise_coordinates(
+                    dets[1:, 0],
+                    dets[1:, 1],
+                    dets[1:, 2],
+                    dets[1:, 3],
+                    min_x,
+                    max_x,
+                    min_y,
+                    max_y,
+                )
+                md_x1, md_x2, md_y1, md_y2 = (
+                    abs(x1 - xx1),
+                    abs(x2 - xx2),
+                    abs(y1 - yy1),
+                    abs(y2 - yy2),
+                )
+                manhattan_distance = md_x1 + md_x2 + md_y1 + md_y2
+                weights = np.ones_like(manhattan_distance)
+
+                if postprocessor._gaussian:
+                    gaussian_weights = np.exp(
+                        -((1 - manhattan_distance) * (1 - manhattan_distance))
+                        / postprocessor._sigma
+                    )
+                    weights[
+                        manhattan_distance <= postprocessor._confluence_threshold
+                    ] = gaussian_weights[
+                        manhattan_distance <= postprocessor._confluence_threshold
+                    ]
+
+                else:
+                    weights[
+                        manhattan_distance <= postprocessor._confluence_threshold
+                    ] = manhattan_distance[
+                        manhattan_distance <= postprocessor._confluence_threshold
+                    ]
+
+                dets[1:, 4] *= weights
+                to_reprocess = np.where(dets[1:, 4] >= postprocessor._score_threshold)[
+                    0
+                ]
+                dets = dets[to_reprocess + 1, :]
+
+            output[each_class] = retain
+
+        batch_boxes, batch_scores, batch_labels = postprocessor.from_mapping_to_arrays(
+            output
+        )
+
+        retained_boxes.append(batch_boxes)
+        retained_scores.append(batch_scores)
+        retained_labels.append(batch_labels)
+
+    return postprocessor.pad_retained_arrays(
+        boxes=retained_boxes,
+        scores=retained_scores,
+        labels=retained_labels,
+        batch_size=batch_size,
+    )
+
+
+def random_predictions(
+    rng: np.random.Generator, batch_size: int, grid_size: int, n_boxes: int
+) -> Tuple[npt.NDArray, npt.NDArray, npt.NDArray]:
+    num_boxes = grid_size * grid_size * n_boxes
+    xy = rng.random((batch_size, num_boxes, 2))
+    wh = rng.random((batch_size, num_boxes, 2)) * 0.3
+    boxes = np.concatenate((xy, xy + wh), axis=-1).astype("float32")
+    scores = rng.beta(0.5, 2.0, (batch_size, num_boxes)).astype("float32")
+    labels = rng.integers(0, NUM_CLASSES, (batch_size, num_boxes)).astype("int32")
+
+    return boxes, scores, labels
+
+
+def time_confluence(
+    confluence: Callable[..., tuple], boxes, scores, labels, repeat: int
+) -> Tuple[float, tuple]:
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        result = confluence(boxes, scores, labels)
+
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the Confluence bounding box post-processing."
+    )
+    parser.add_argument("--batch-size", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+
+    for grid_size, n_boxes in GRIDS:
+        boxes, scores, labels = random_predictions(
+            rng, args.batch_size, grid_size, n_boxes
+        )
+
+        for gaussian in (False, True):
+            postprocessor = TensorflowBoundingBoxesYOLOV1Confluence.on_grid_shape(
+                grid_shape=(grid_size, grid_size), gaussian=gaussian
+            )
+            before, expected = time_confluence(
+                lambda *x: previous_confluence(postprocessor, *x),
+                boxes,
+                scores,
+                labels,
+                args.repeat,
+            )
+            after, result = time_confluence(
+                postprocessor.confluence, boxes, scores, labels, args.repeat
+            )
+            identical = all(np.array_equal(x, y) for x, y in zip(expected, result))
+
+            # Trace the graph once before timing it.
+            graph_inputs = (
+                tf.constant(boxes),
+                tf.constant(scores),
+                tf.constant(labels),
+            )
+            postprocessor.confluence_graph(*graph_inputs)
+            graph, graph_result = time_confluence(
+                postprocessor.confluence_graph, *graph_inputs, args.repeat
+            )
+            close = all(
+                x.shape == y.shape and np.allclose(x, y.numpy(), atol=1e-6)
+                for x, y in zip(expected, graph_result)
+            )
+            print(
+                f"{grid_size}x{grid_size}x{n_boxes} gaussian={gaussian}: "
+                f"previous {before:.3f} s, vectorized {after:.3f} s, "
+                f"graph {graph:.3f} s, speedup {before / after:.1f}x, "
+                f"identical {identical}, graph close {close}"
+            )
+
+
+if __name__ == "__main__":
+    main()
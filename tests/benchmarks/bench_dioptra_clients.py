@@ -0,0 +1,158 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""Benchmark the database overhead of a single job in the Dioptra MLFlow backend.
+
+The :py:class:`~dioptra.mlflow_plugins.dioptra_backend.DioptraProjectBackend` queries
+the Dioptra database through a fresh
+:py:class:`~dioptra.mlflow_plugins.dioptra_clients.DioptraDatabaseClient` for each
+status update. This script replays the calls made during one job against a temporary
+SQLite database, first building a new Flask app for every call (the previous
+behavior), then using the process-wide cached app, and reports the per-job time of
+each.
+
+Run from the repository root::
+
+    python tests/benchmarks/bench_dioptra_clients.py --jobs 20
+"""
+from __future__ import annotations
+
+import argparse
+import datetime
+import os
+import tempfile
+import time
+import uuid
+from pathlib import Path
+from typing import List
+
+
+def seed_jobs(n_jobs: int) -> List[str]:
+    from dioptra.mlflow_plugins.dioptra_clients import get_app
+    from dioptra.restapi.app import db
+    from dioptra.restapi.job.model import job_statuses
+    from dioptra.restapi.models import Experiment, Job, Queue
+
+    timestamp = datetime.datetime.now()
+    job_ids = [str(uuid.uuid4()) for _ in range(n_jobs)]
+
+    with get_app(env="test").app_context():
+        db.create_all()
+        db.session.execute(
+            job_statuses.insert(),
+            [
+                {"status": status}
+                for status in ["queued", "started", "deferred", "finished", "failed"]
+            ],
+        )
+        db.session.add(
+            Experiment(
+                experiment_id=1,
+                name="bench",
+                created_on=timestamp,
+                last_modified=timestamp,
+            )
+        )
+        db.session.add(
+            Queue(
+                queue_id=1,
+                name="tensorflow_cpu",
+                created_on=timestamp,
+                last_modified=timestamp,
+            )
+        )
+
+        for job_id in job_ids:
+            db.session.add(
+                Job(
+                    job_id=job_id,
+                    experiment_id=1,
+                    queue_id=1,
+                    created_on=timestamp,
+                    last_modified=timestamp,
+                    workflow_uri="s3://workflow/workflows.tar.gz",
+                    entry_point="main",
+                )
+            )
+
+        db.session.commit()
+
+    return job_ids
+
+
+def time_jobs(job_ids: List[str]) -> float:
+    from dioptra.mlflow_plugins.dioptra_clients import (
+        ENVVAR_JOB_ID,
+        DioptraDatabaseClient,
+    )
+
+    start = time.perf_counter()
+
+    for job_id in job_ids:
+        os.environ[ENVVAR_JOB_ID] = job_id
+        DioptraDatabaseClient().set_mlflow_run_id_in_db(run_id=uuid.uuid4().hex)
+        DioptraDatabaseClient().get_active_job()
+        DioptraDatabaseClient().update_active_job_status(status="started")
+        DioptraDatabaseClient().update_active_job_status(status="finished")
+
+    return (time.perf_counter() - start) / len(job_ids)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the per-job Dioptra database overhead."
+    )
+    parser.add_argument("--jobs", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        # The configuration classes read the database URI at import time.
+        os.environ["DIOPTRA_RESTAPI_ENV"] = "test"
+        os.environ[
+            "DIOPTRA_RESTAPI_TEST_DATABASE_URI"
+        ] = f"sqlite:///{Path(tmpdir) / 'bench.db'}"
+
+        from dioptra.mlflow_plugins.dioptra_clients import (
+            DioptraDatabaseClient,
+            dispose_apps,
+        )
+        from dioptra.restapi import create_app
+
+        job_ids = seed_jobs(args.jobs)
+
+        # Previous behavior: every client call builds a new app.
+        cached_app = DioptraDatabaseClient.app
+        DioptraDatabaseClient.app = property(  # type: ignore[assignment]
+            lambda self: create_app(env=self.restapi_env)
+        )
+
+        try:
+            before = time_jobs(job_ids)
+
+        finally:
+            DioptraDatabaseClient.app = cached_app  # type: ignore[assignment]
+
+        after = time_jobs(job_ids)
+        dispose_apps()
+
+    print(f"jobs: {args.jobs}")
+    print(f"per-job DB overhead, new app per call: {before * 1000:.1f} ms")
+    print(f"per-job DB overhead, cached app:       {after * 1000:.1f} ms")
+    print(f"speedup: {before / after:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
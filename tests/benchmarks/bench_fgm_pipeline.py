@@ -0,0 +1,178 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""Benchmark the throughput of adversarial FGM dataset generation.
+
+A directory of random PNG images is attacked with a small convolutional classifier,
+first with a serial loop that decodes, attacks, saves, and scores one batch at a time
+(the previous behavior of the task plugin), then with the pipelined
+:py:func:`~dioptra_builtins.attacks.fgm.create_adversarial_fgm_dataset`. The images
+per second of each are reported.
+
+Requires TensorFlow and the Adversarial Robustness Toolbox. Run from the repository
+root::
+
+    python tests/benchmarks/bench_fgm_pipeline.py --images 2048 --batch-size 64
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Tuple
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "task-plugins"))
+
+IMAGE_SIZE: Tuple[int, int, int] = (128, 128, 3)
+
+
+def seed_images(data_dir: Path, n_images: int) -> None:
+    from tensorflow.keras.preprocessing.image import save_img
+
+    rng = np.random.default_rng(0)
+
+    for index in range(n_images):
+        class_dir = data_dir / f"class_{index % 2}"
+        class_dir.mkdir(parents=True, exist_ok=True)
+        save_img(
+            path=str(class_dir / f"{index:06d}.png"),
+            x=rng.integers(0, 256, size=IMAGE_SIZE, dtype=np.uint8),
+        )
+
+
+def make_classifier():
+    import tensorflow as tf
+    from art.estimators.classification import KerasClassifier
+
+    model = tf.keras.Sequential(
+        [
+            tf.keras.layers.Conv2D(
+                8, 3, strides=2, activation="relu", input_shape=IMAGE_SIZE
+            ),
+            tf.keras.layers.GlobalAveragePooling2D(),
+            tf.keras.layers.Dense(2, activation="softmax"),
+        ]
+    )
+    model.compile(loss="categorical_crossentropy", optimizer="sgd")
+
+    return KerasClassifier(model=model, clip_values=(0.0, 1.0))
+
+
+def run_serial(data_dir, adv_data_dir, classifier, batch_size, metrics) -> int:
+    from dioptra_builtins.attacks import fgm
+    from tensorflow.keras.preprocessing.image import ImageDataGenerator, save_img
+
+    attack = fgm._init_fgm(keras_classifier=classifier, batch_size=batch_size)
+    data_flow = ImageDataGenerator(rescale=1.0 / 255).flow_from_directory(
+        directory=str(data_dir),
+        target_size=IMAGE_SIZE[:2],
+        batch_size=batch_size,
+        shuffle=False,
+    )
+    filenames = [Path(x) for x in data_flow.filenames]
+    num_batches = data_flow.n // batch_size
+
+    for batch_num, (x, y) in enumerate(data_flow):
+        if batch_num >= num_batches:
+            break
+
+        clean_filenames = filenames[
+            batch_num * batch_size : (batch_num + 1) * batch_size  # noqa: E203
+        ]
+        y_int = np.argmax(y, axis=1)
+        adv_batch = attack.generate(x=x)
+
+        for index, adv_image in enumerate(adv_batch):
+            path = (
+                adv_data_dir / f"{y_int[index]}" / f"adv_{clean_filenames[index].name}"
+            )
+            path.parent.mkdir(parents=True, exist_ok=True)
+            save_img(path=str(path), x=adv_image)
+
+        for _, metric in metrics:
+            metric(x, adv_batch)
+
+    return num_batches * batch_size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark adversarial FGM dataset generation."
+    )
+    parser.add_argument("--images", type=int, default=1024)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--max-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    try:
+        import art  # noqa: F401
+        import mlflow
+        import tensorflow  # noqa: F401
+        from dioptra_builtins.attacks.fgm import create_adversarial_fgm_dataset
+        from dioptra_builtins.metrics.distance import get_distance_metric_list
+
+    except ImportError as err:
+        raise SystemExit(f"This benchmark requires TensorFlow and ART: {err}") from err
+
+    metrics = get_distance_metric_list(
+        [
+            {"name": "l_2_norm", "func": "l_2_norm"},
+            {"name": "l_inf_norm", "func": "l_inf_norm"},
+        ]
+    )
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        tmp_path = Path(tmpdir)
+        mlflow.set_tracking_uri((tmp_path / "mlruns").as_uri())
+        data_dir = tmp_path / "data"
+        seed_images(data_dir, args.images)
+        classifier = make_classifier()
+
+        start = time.perf_counter()
+        n_serial = run_serial(
+            data_dir, tmp_path / "adv_serial", classifier, args.batch_size, metrics
+        )
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+
+        with mlflow.start_run():
+            distances = create_adversarial_fgm_dataset(
+                data_dir=str(data_dir),
+                adv_data_dir=tmp_path / "adv_pipelined",
+                keras_classifier=classifier,
+                image_size=IMAGE_SIZE,
+                distance_metrics_list=metrics,
+                batch_size=args.batch_size,
+                max_workers=args.max_workers,
+            )
+
+        pipelined = time.perf_counter() - start
+
+    print(
+        f"images: {args.images}, batch size: {args.batch_size}, cpus: {os.cpu_count()}"
+    )
+    print(f"serial:    {n_serial / serial:.1f} images/s")
+    print(f"pipelined: {len(distances) / pipelined:.1f} images/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""Benchmark listing and deleting a large prefix with the REST API S3 service.
+
+A prefix holding more keys than a single ``list_objects_v2`` or ``delete_objects``
+call accepts is created in an in-memory S3 stand-in provided by moto. The prefix is
+then deleted twice, once with a single list call followed by a single delete call
+(the previous behavior, which silently leaves everything past the first 1000 keys)
+and once with :py:meth:`~dioptra.restapi.shared.s3.service.S3Service.delete_prefix`.
+A paginated delete with a single worker is also timed for comparison. The number
+of keys left behind and the elapsed time of each are reported.
+
+Because moto answers instantly, ``--latency`` adds an artificial round-trip delay to
+every S3 call so that the effect of issuing the batch deletes concurrently is
+visible.
+
+Requires moto, which is not a Dioptra dependency. Run from the repository root::
+
+    pip install "moto[s3]"
+    python tests/benchmarks/bench_s3_service.py --keys 5000 --latency 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import time
+from typing import Any, Callable, Dict, List
+
+BUCKET = "plugins"
+PREFIX = "dioptra_custom/big_plugin/"
+
+
+def with_latency(func: Callable[..., Any], latency: float) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        time.sleep(latency)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def seed_prefix(client, n_keys: int) -> None:
+    for index in range(n_keys):
+        client.put_object(Bucket=BUCKET, Key=f"{PREFIX}{index:06d}.py", Body=b"")
+
+
+def count_keys(client) -> int:
+    paginator = client.get_paginator("list_objects_v2")
+
+    return sum(
+        page.get("KeyCount", 0)
+        for page in paginator.paginate(Bucket=BUCKET, Prefix=PREFIX)
+    )
+
+
+def delete_prefix_single_call(client) -> List[str]:
+    response: Dict[str, Any] = client.list_objects_v2(Bucket=BUCKET, Prefix=PREFIX)
+    response = client.delete_objects(
+        Bucket=BUCKET,
+        Delete=dict(Objects=[dict(Key=x["Key"]) for x in response["Contents"]]),
+    )
+
+    return [x["Key"] for x in response.get("Deleted", [])]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark deleting a large S3 prefix."
+    )
+    parser.add_argument("--keys", type=int, default=5000)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds of artificial latency added to each S3 call.",
+    )
+    args = parser.parse_args()
+
+    try:
+        from moto import mock_aws
+
+    except ImportError as err:
+        raise SystemExit(f"This benchmark requires moto: {err}") from err
+
+    import boto3
+
+    from dioptra.restapi.shared.s3.service import S3Service
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+    with mock_aws():
+        session = boto3.session.Session(region_name="us-east-1")
+        client = session.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+
+        for name in ("list_objects_v2", "delete_objects"):
+            setattr(client, name, with_latency(getattr(client, name), args.latency))
+
+        seed_prefix(client, args.keys)
+        start = time.perf_counter()
+        deleted_before = delete_prefix_single_call(client)
+        before = time.perf_counter() - start
+        remaining_before = count_keys(client)
+
+        service = S3Service(session=session, client=client)
+        seed_prefix(client, args.keys)
+        start = time.perf_counter()
+        deleted_serial = list(
+            service.iter_delete_prefix(bucket=BUCKET, prefix=PREFIX, max_workers=1)
+        )
+        serial = time.perf_counter() - start
+
+        seed_prefix(client, args.keys)
+        start = time.perf_counter()
+        deleted_after = service.delete_prefix(bucket=BUCKET, prefix=PREFIX)
+        after = time.perf_counter() - start
+        remaining_after = count_keys(client)
+
+    print(f"keys: {args.keys}, latency per call: {args.latency * 1000:.0f} ms")
+    print(
+        f"single list/delete call: deleted {len(deleted_before)}, "
+        f"left {remaining_before}, {before:.2f} s"
+    )
+    print(f"paginated, 1 worker:     deleted {len(deleted_serial)}, {serial:.2f} s")
+    print(
+        f"S3Service.delete_prefix: deleted {len(deleted_after)}, "
+        f"left {remaining_after}, {after:.2f} s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""Benchmark uploading a directory with the REST API S3 service.
+
+A temporary directory of small Python files is uploaded to an in-memory S3 stand-in
+provided by moto, once with a single upload worker (equivalent to the previous
+serial loop) and once with the default bounded thread pool of
+:py:meth:`~dioptra.restapi.shared.s3.service.S3Service.upload_directory`. The number
+of uploaded objects and the elapsed time of each are reported.
+
+Because moto answers instantly, ``--latency`` adds an artificial round-trip delay to
+every upload so that the effect of the concurrent uploads is visible.
+
+Requires moto, which is not a Dioptra dependency. Run from the repository root::
+
+    pip install "moto[s3]"
+    python tests/benchmarks/bench_s3_upload_directory.py --files 200 --latency 0.05
+"""
+from __future__ import annotations
+
+import argparse
+import functools
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+BUCKET = "plugins"
+PREFIX = "dioptra_custom/big_plugin"
+
+
+def with_latency(func: Callable[..., Any], latency: float) -> Callable[..., Any]:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        time.sleep(latency)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def seed_directory(directory: Path, n_files: int, size: int) -> None:
+    for index in range(n_files):
+        subdir = directory / f"module_{index % 10:02d}"
+        subdir.mkdir(exist_ok=True)
+        (subdir / f"{index:06d}.py").write_bytes(b"#" * size)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark uploading a directory.")
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument(
+        "--size", type=int, default=4096, help="Size of each file in bytes."
+    )
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.0,
+        help="Seconds of artificial latency added to each upload.",
+    )
+    args = parser.parse_args()
+
+    try:
+        from moto import mock_aws
+
+    except ImportError as err:
+        raise SystemExit(f"This benchmark requires moto: {err}") from err
+
+    import boto3
+
+    from dioptra.restapi.shared.s3.service import UPLOAD_MAX_WORKERS, S3Service
+
+    os.environ.setdefault("AWS_ACCESS_KEY_ID", "testing")
+    os.environ.setdefault("AWS_SECRET_ACCESS_KEY", "testing")
+
+    with mock_aws(), tempfile.TemporaryDirectory() as tmpdir:
+        session = boto3.session.Session(region_name="us-east-1")
+        client = session.client("s3")
+        client.create_bucket(Bucket=BUCKET)
+        client.upload_file = with_latency(client.upload_file, args.latency)
+        seed_directory(Path(tmpdir), args.files, args.size)
+        service = S3Service(session=session, client=client)
+        timings = {}
+
+        for max_workers in (1, UPLOAD_MAX_WORKERS):
+            start = time.perf_counter()
+            result = service.upload_directory(
+                directory=tmpdir,
+                bucket=BUCKET,
+                prefix=PREFIX,
+                include_suffixes=[".py"],
+                max_workers=max_workers,
+            )
+            timings[max_workers] = (
+                len(result.succeeded),
+                len(result.failed),
+                time.perf_counter() - start,
+            )
+
+    print(f"files: {args.files}, latency per upload: {args.latency * 1000:.0f} ms")
+
+    for max_workers, (succeeded, failed, elapsed) in timings.items():
+        print(
+            f"{max_workers} worker(s): uploaded {succeeded}, failed {failed}, "
+            f"{elapsed:.2f} s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+"""Benchmark the paired Wasserstein distance metric.
+
+A batch of clean and perturbed images is compared with the previous implementation,
+which passed every image pair through :py:func:`sklearn.metrics.pairwise.paired_distances`
+with a callback into :py:func:`scipy.stats.wasserstein_distance`, and with the
+vectorized
+:py:func:`~dioptra_builtins.metrics.distance.paired_wasserstein_distances`. Batches the
+size of MNIST and ImageNet images are timed. The seconds per batch of each are
+reported, along with the largest absolute difference between the two results.
+
+Run from the repository root::
+
+    python tests/benchmarks/bench_wasserstein.py --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Tuple
+
+import numpy as np
+from scipy.stats import wasserstein_distance
+from sklearn.metrics.pairwise import paired_distances
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2] / "task-plugins"))
+
+BATCHES = {
+    "mnist": (64, 28, 28, 1),
+    "imagenet": (16, 224, 224, 3),
+}
+
+
+def previous_paired_wasserstein_distances(y_true, y_pred) -> np.ndarray:
+    return paired_distances(
+        X=y_true.reshape((y_true.shape[0], -1)),
+        Y=y_pred.reshape((y_pred.shape[0], -1)),
+        metric=lambda X, Y: wasserstein_distance(u_values=X, v_values=Y),
+    )
+
+
+def time_metric(
+    metric: Callable[..., np.ndarray], y_true, y_pred, repeat: int
+) -> Tuple[float, np.ndarray]:
+    start = time.perf_counter()
+
+    for _ in range(repeat):
+        result = metric(y_true, y_pred)
+
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Benchmark the paired Wasserstein distance metric."
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    from dioptra_builtins.metrics.distance import paired_wasserstein_distances
+
+    rng = np.random.default_rng(0)
+
+    for name, shape in BATCHES.items():
+        y_true = rng.random(shape, dtype=np.float32)
+        y_pred = np.clip(
+            y_true + rng.normal(0, 0.05, shape).astype(np.float32), 0.0, 1.0
+        )
+        before, expected = time_metric(
+            previous_paired_wasserstein_distances, y_true, y_pred, args.repeat
+        )
+        after, result = time_metric(
+            paired_wasserstein_distances, y_true, y_pred, args.repeat
+        )
+        print(
+            f"{name} {shape}: previous {before:.3f} s, vectorized {after:.3f} s, "
+            f"speedup {before / after:.1f}x, "
+            f"max abs diff {np.max(np.abs(expected - result)):.2e}"
+        )
+
+
+if __name__ == "__main__":
+    main()
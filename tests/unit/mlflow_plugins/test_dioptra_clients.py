@@ -0,0 +1,64 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+from flask import Flask
+
+from dioptra.mlflow_plugins import dioptra_clients
+from dioptra.mlflow_plugins.dioptra_clients import (
+    DioptraDatabaseClient,
+    dispose_apps,
+    get_app,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_app_cache():
+    dispose_apps()
+    yield
+    dispose_apps()
+
+
+def test_get_app_is_cached(monkeypatch: MonkeyPatch) -> None:
+    calls = []
+    create_app = dioptra_clients.create_app
+
+    def mockcreateapp(*args, **kwargs) -> Flask:
+        calls.append(kwargs)
+        return create_app(*args, **kwargs)
+
+    monkeypatch.setattr(dioptra_clients, "create_app", mockcreateapp)
+
+    app = get_app(env="test")
+
+    assert get_app(env="test") is app
+    assert calls == [{"env": "test", "inject_dependencies": False}]
+
+
+def test_clients_share_app(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setenv("DIOPTRA_RESTAPI_ENV", "test")
+
+    assert DioptraDatabaseClient().app is DioptraDatabaseClient().app
+
+
+def test_dispose_apps_clears_cache() -> None:
+    app = get_app(env="test")
+    dispose_apps()
+
+    assert get_app(env="test") is not app
@@ -0,0 +1,72 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import List, Optional
+
+import pytest
+
+from dioptra.mlflow_plugins.dioptra_forked_process import (
+    fork_python_entry_point,
+    parse_python_entry_point,
+)
+
+
+@pytest.mark.parametrize(
+    "command, expected",
+    [
+        ("python src/fgm.py --eps 0.1", ["src/fgm.py", "--eps", "0.1"]),
+        ("python3 train.py --name 'a b'", ["train.py", "--name", "a b"]),
+        ("python -m module", None),
+        ("python src/fgm.py && rm -rf data", None),
+        ("python src/fgm.py > out.log", None),
+        ("bash run.sh", None),
+    ],
+)
+def test_parse_python_entry_point(command: str, expected: Optional[List[str]]) -> None:
+    assert parse_python_entry_point(command) == expected
+
+
+@pytest.mark.parametrize(
+    "body, returncode",
+    [
+        ("pass", 0),
+        ("import sys; sys.exit(3)", 3),
+        ("raise RuntimeError('boom')", 1),
+    ],
+)
+def test_fork_python_entry_point(tmp_path: Path, body: str, returncode: int) -> None:
+    script = tmp_path / "script.py"
+    script.write_text(
+        "import os, sys\n"
+        "with open('out.txt', 'w') as f:\n"
+        "    f.write(' '.join([os.environ['DIOPTRA_TEST_VAR'], *sys.argv[1:]]))\n"
+        f"{body}\n"
+    )
+
+    process = fork_python_entry_point(
+        [str(script), "--eps", "0.1"],
+        cwd=str(tmp_path),
+        env={"DIOPTRA_TEST_VAR": "testing"},
+    )
+
+    assert process.wait() == returncode
+    assert process.poll() == returncode
+    assert (tmp_path / "out.txt").read_text() == "testing --eps 0.1"
+    assert "DIOPTRA_TEST_VAR" not in os.environ
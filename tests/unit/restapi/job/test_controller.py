@@ -58,6 +58,18 @@ def job_form_request(workflow_tar_gz: BinaryIO) -> Dict[str, Any]:
     }
 
 
+@pytest.fixture
+def job_batch_form_request(workflow_tar_gz: BinaryIO) -> Dict[str, Any]:
+    return {
+        "experiment_name": "mnist",
+        "queue": "tensorflow_cpu",
+        "timeout": "12h",
+        "entry_point": "fgm",
+        "entry_point_kwargs": ["-P eps=0.1", "-P eps=0.2", ""],
+        "workflow": (workflow_tar_gz, "workflows.tar.gz"),
+    }
+
+
 def test_job_resource_get(app: Flask, monkeypatch: MonkeyPatch) -> None:
     def mockgetall(self, *args, **kwargs) -> List[Job]:
         LOGGER.info("Mocking JobService.get_all()")
@@ -103,6 +115,66 @@ def test_job_resource_get(app: Flask, monkeypatch: MonkeyPatch) -> None:
         assert response == expected
 
 
+def test_job_resource_get_paginated(
+    app: Flask, db: SQLAlchemy, experiment: Experiment
+) -> None:
+    created_on = datetime.datetime(2020, 8, 17, 18, 46, 28, 717559)
+    job_ids: List[str] = [str(uuid.UUID(int=x)) for x in range(5)]
+    db.session.add(experiment)
+
+    for index, job_id in enumerate(job_ids):
+        db.session.add(
+            Job(
+                job_id=job_id,
+                experiment_id=1,
+                queue_id=1 + index % 2,
+                created_on=created_on + datetime.timedelta(minutes=index // 2),
+                last_modified=created_on,
+                workflow_uri="s3://workflow/workflows.tar.gz",
+                entry_point="main",
+                status="finished" if index < 3 else "queued",
+            )
+        )
+
+    db.session.commit()
+
+    with app.test_client() as client:
+        pages: List[List[Dict[str, Any]]] = []
+        query: Dict[str, Any] = {"limit": 2, "fields": "jobId"}
+
+        while True:
+            response = client.get(f"/api/{JOB_BASE_ROUTE}/", query_string=query)
+            pages.append(response.get_json())
+
+            if "X-Next-Cursor" not in response.headers:
+                break
+
+            query["cursor"] = response.headers["X-Next-Cursor"]
+
+        filtered: List[Dict[str, Any]] = client.get(
+            f"/api/{JOB_BASE_ROUTE}/",
+            query_string={
+                "queueId": 1,
+                "status": "finished",
+                "createdAfter": "2020-08-17T18:47:00",
+                "fields": "jobId,status",
+            },
+        ).get_json()
+        bad_cursor_status: int = client.get(
+            f"/api/{JOB_BASE_ROUTE}/", query_string={"limit": 2, "cursor": "bad"}
+        ).status_code
+        bad_fields_status: int = client.get(
+            f"/api/{JOB_BASE_ROUTE}/", query_string={"fields": "password"}
+        ).status_code
+
+    assert [len(page) for page in pages] == [2, 2, 1]
+    assert [job["jobId"] for page in pages for job in page] == job_ids
+    assert all(set(job) == {"jobId"} for page in pages for job in page)
+    assert filtered == [{"jobId": job_ids[2], "status": "finished"}]
+    assert bad_cursor_status == 400
+    assert bad_fields_status == 400
+
+
 @freeze_time("2020-08-17T18:46:28.717559")
 def test_job_resource_post(
     app: Flask,
@@ -176,6 +248,52 @@ def test_job_resource_post(
         assert response == expected
 
 
+def test_job_batch_resource_post(
+    app: Flask,
+    db: SQLAlchemy,
+    experiment: Experiment,
+    job_batch_form_request: Dict[str, Any],
+    monkeypatch: MonkeyPatch,
+) -> None:
+    job_ids: List[str] = [
+        "4520511d-678b-4966-953e-af2d0edcea32",
+        "0c30644b-df51-4a8b-b745-9db07ce57f72",
+        "6d0c7a5e-2b4e-4a44-8a43-2c1d1e5d7f0b",
+    ]
+    submitted: List[Dict[str, Any]] = []
+
+    def mocksubmitbatch(self, job_batch_form_data, *args, **kwargs) -> List[Job]:
+        LOGGER.info("Mocking JobService.submit_batch()")
+        submitted.append(job_batch_form_data)
+        return [
+            Job(job_id=job_id, entry_point_kwargs=entry_point_kwargs)
+            for job_id, entry_point_kwargs in zip(
+                job_ids, job_batch_form_data["entry_point_kwargs"]
+            )
+        ]
+
+    monkeypatch.setattr(JobService, "submit_batch", mocksubmitbatch)
+
+    db.session.add(experiment)
+    db.session.commit()
+
+    with app.test_client() as client:
+        response: Dict[str, Any] = client.post(
+            f"/api/{JOB_BASE_ROUTE}/batch",
+            content_type="multipart/form-data",
+            data=job_batch_form_request,
+            follow_redirects=True,
+        ).get_json()
+        LOGGER.info("Response received", response=response)
+
+    assert response == {"jobIds": job_ids}
+    assert len(submitted) == 1
+    assert submitted[0]["experiment_id"] == 1
+    assert submitted[0]["queue_id"] == 1
+    assert submitted[0]["entry_point"] == "fgm"
+    assert submitted[0]["entry_point_kwargs"] == ["-P eps=0.1", "-P eps=0.2", None]
+
+
 def test_job_id_resource_get(
     app: Flask,
     monkeypatch: MonkeyPatch,
@@ -0,0 +1,47 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from botocore.client import BaseClient
+
+from dioptra.restapi.job.dependencies import _bind_s3_service_configuration
+from dioptra.restapi.shared.s3.service import (
+    UPLOAD_MAX_WORKERS,
+    UPLOAD_TRANSFER_CONFIG,
+)
+
+
+class RecordingBinder(object):
+    def __init__(self) -> None:
+        self.bindings: Dict[Any, Any] = {}
+
+    def bind(self, interface, to, scope=None) -> None:
+        self.bindings[interface] = to
+
+
+def test_s3_client_pool_fits_concurrent_uploads(monkeypatch) -> None:
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "us-east-1")
+    binder = RecordingBinder()
+
+    _bind_s3_service_configuration(binder)
+
+    s3_client: BaseClient = binder.bindings[BaseClient]
+    assert s3_client.meta.config.max_pool_connections >= (
+        UPLOAD_MAX_WORKERS * UPLOAD_TRANSFER_CONFIG.max_concurrency
+    )
@@ -30,7 +30,7 @@ from structlog.stdlib import BoundLogger
 from werkzeug.datastructures import FileStorage
 
 from dioptra.restapi.job.service import JobService
-from dioptra.restapi.models import Job, JobFormData
+from dioptra.restapi.models import Job, JobBatchFormData, JobFormData
 from dioptra.restapi.shared.rq.service import RQService
 from dioptra.restapi.shared.s3.service import S3Service
 
@@ -75,6 +75,23 @@ def job_form_data(app: Flask, workflow_tar_gz: BinaryIO) -> JobFormData:
     )
 
 
+@pytest.fixture
+def job_batch_form_data(app: Flask, workflow_tar_gz: BinaryIO) -> JobBatchFormData:
+    return JobBatchFormData(
+        experiment_name="mnist",
+        experiment_id=1,
+        queue_id=1,
+        queue="tensorflow_cpu",
+        timeout="12h",
+        entry_point="fgm",
+        entry_point_kwargs=["-P eps=0.1", "-P eps=0.2", None],
+        depends_on=None,
+        workflow=FileStorage(
+            stream=workflow_tar_gz, filename="workflows.tar.gz", name="workflow"
+        ),
+    )
+
+
 @pytest.fixture
 def job_service(dependency_injector) -> JobService:
     return dependency_injector.get(JobService)
@@ -132,6 +149,40 @@ def test_get_all(db: SQLAlchemy, job_service: JobService):
     assert new_job1 in results and new_job2 in results
 
 
+@freeze_time("2020-08-17T18:46:28.717559")
+def test_get_all_filtered(db: SQLAlchemy, job_service: JobService):
+    timestamp: datetime.datetime = datetime.datetime.now()
+
+    for index, (queue_id, status) in enumerate(
+        [(1, "finished"), (2, "finished"), (1, "queued"), (1, "finished")]
+    ):
+        db.session.add(
+            Job(
+                job_id=f"00000000-0000-0000-0000-00000000000{index}",
+                experiment_id=1,
+                queue_id=queue_id,
+                created_on=timestamp + datetime.timedelta(hours=index),
+                last_modified=timestamp,
+                workflow_uri="s3://workflow/workflows.tar.gz",
+                entry_point="main",
+                status=status,
+            )
+        )
+
+    db.session.commit()
+
+    finished: List[Job] = job_service.get_all(queue_id=1, status="finished")
+    recent: List[Job] = job_service.get_all(
+        created_after=timestamp + datetime.timedelta(hours=1),
+        created_before=timestamp + datetime.timedelta(hours=3),
+    )
+    first_page: List[Job] = job_service.get_all(limit=3)
+
+    assert [job.job_id[-1] for job in finished] == ["0", "3"]
+    assert [job.job_id[-1] for job in recent] == ["1", "2"]
+    assert [job.job_id[-1] for job in first_page] == ["0", "1", "2"]
+
+
 @freeze_time("2020-08-17T18:46:28.717559")
 def test_submit(
     db: SQLAlchemy,
@@ -154,7 +205,14 @@ def test_submit(
         )
         return "s3://workflow/3db4050001b145a4ae1864e7d1bc7e9a/workflows.tar.gz"
 
+    def mockobjectexists(self, bucket: str, key: str, *args, **kwargs) -> bool:
+        LOGGER.info(
+            "Mocking S3Service.object_exists() function", bucket=bucket, key=key
+        )
+        return False
+
     monkeypatch.setattr(RQService, "submit_mlflow_job", mocksubmit)
+    monkeypatch.setattr(S3Service, "object_exists", mockobjectexists)
     monkeypatch.setattr(S3Service, "upload", mockupload)
 
     job_service.submit(job_form_data=job_form_data)
@@ -178,3 +236,101 @@ def test_submit(
     assert results[0].entry_point_kwargs == "-P var1=testing"
     assert results[0].depends_on is None
     assert results[0].status == "queued"
+
+
+@freeze_time("2020-08-17T18:46:28.717559")
+def test_submit_reuses_uploaded_workflow(
+    db: SQLAlchemy,
+    job_service: JobService,
+    job_form_data: JobFormData,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    import hashlib
+
+    uploads: List[str] = []
+    workflow_digest = hashlib.sha256(
+        job_form_data["workflow"].stream.read()
+    ).hexdigest()
+    job_form_data["workflow"].stream.seek(0)
+
+    def mocksubmit(*args, **kwargs) -> MockRQJob:
+        LOGGER.info("Mocking RQService.submit_mlflow_job()")
+        return MockRQJob(id="4520511d-678b-4966-953e-af2d0edcea32")
+
+    def mockupload(
+        self, fileobj: BinaryIO, bucket: str, key: str, *args, **kwargs
+    ) -> Optional[str]:
+        LOGGER.info("Mocking S3Service.upload() function", bucket=bucket, key=key)
+        uploads.append(key)
+        return S3Service.as_uri(bucket=bucket, key=key)
+
+    def mockobjectexists(self, bucket: str, key: str, *args, **kwargs) -> bool:
+        LOGGER.info(
+            "Mocking S3Service.object_exists() function", bucket=bucket, key=key
+        )
+        return True
+
+    monkeypatch.setattr(RQService, "submit_mlflow_job", mocksubmit)
+    monkeypatch.setattr(S3Service, "object_exists", mockobjectexists)
+    monkeypatch.setattr(S3Service, "upload", mockupload)
+
+    job_service.submit(job_form_data=job_form_data)
+    results: List[Job] = Job.query.all()
+
+    assert uploads == []
+    assert len(results) == 1
+    assert (
+        results[0].workflow_uri == f"s3://workflow/{workflow_digest}/workflows.tar.gz"
+    )
+
+
+@freeze_time("2020-08-17T18:46:28.717559")
+def test_submit_batch(
+    db: SQLAlchemy,
+    job_service: JobService,
+    job_batch_form_data: JobBatchFormData,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    job_ids: List[str] = [
+        "4520511d-678b-4966-953e-af2d0edcea32",
+        "0c30644b-df51-4a8b-b745-9db07ce57f72",
+        "6d0c7a5e-2b4e-4a44-8a43-2c1d1e5d7f0b",
+    ]
+    uploads: List[str] = []
+    enqueued: List[List[Optional[str]]] = []
+
+    def mocksubmitmany(self, entry_point_kwargs, *args, **kwargs) -> List[MockRQJob]:
+        LOGGER.info("Mocking RQService.submit_mlflow_jobs()")
+        enqueued.append(entry_point_kwargs)
+        return [MockRQJob(id=job_id) for job_id in job_ids]
+
+    def mockupload(
+        self, fileobj: BinaryIO, bucket: str, key: str, *args, **kwargs
+    ) -> Optional[str]:
+        LOGGER.info("Mocking S3Service.upload() function", bucket=bucket, key=key)
+        uploads.append(key)
+        return f"s3://{bucket}/{key}"
+
+    def mockobjectexists(self, bucket: str, key: str, *args, **kwargs) -> bool:
+        return False
+
+    monkeypatch.setattr(RQService, "submit_mlflow_jobs", mocksubmitmany)
+    monkeypatch.setattr(S3Service, "object_exists", mockobjectexists)
+    monkeypatch.setattr(S3Service, "upload", mockupload)
+
+    jobs: List[Job] = job_service.submit_batch(job_batch_form_data=job_batch_form_data)
+    results: List[Job] = Job.query.order_by(Job.entry_point_kwargs).all()
+
+    assert len(uploads) == 1
+    assert enqueued == [["-P eps=0.1", "-P eps=0.2", None]]
+    assert [job.job_id for job in jobs] == job_ids
+    assert len(results) == 3
+    assert {job.entry_point_kwargs for job in results} == {
+        "-P eps=0.1",
+        "-P eps=0.2",
+        None,
+    }
+    assert all(job.workflow_uri == f"s3://workflow/{uploads[0]}" for job in results)
+    assert all(job.entry_point == "fgm" for job in results)
+    assert all(job.timeout == "12h" for job in results)
+    assert all(job.status == "queued" for job in results)
@@ -14,18 +14,34 @@
 #
 # ACCESS THE FULL CC BY 4.0 LICENSE HERE:
 # https://creativecommons.org/licenses/by/4.0/legalcode
-from pathlib import Path
-from typing import BinaryIO, List
+import io
+import tarfile
+from pathlib import Path, PurePosixPath
+from typing import BinaryIO, Dict, List, Set
 
 import pytest
 import structlog
 from structlog.stdlib import BoundLogger
 
+from dioptra.restapi.shared.io_file.errors import ArchiveExtractionError
 from dioptra.restapi.shared.io_file.service import IOFileService
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
 
+def make_archive(members: Dict[str, bytes]) -> BinaryIO:
+    archive_fileobj: BinaryIO = io.BytesIO()
+
+    with tarfile.open(fileobj=archive_fileobj, mode="w:gz") as f:
+        for name, data in members.items():
+            tarinfo = tarfile.TarInfo(name=name)
+            tarinfo.size = len(data)
+            f.addfile(tarinfo=tarinfo, fileobj=io.BytesIO(data))
+
+    archive_fileobj.seek(0)
+    return archive_fileobj
+
+
 @pytest.fixture
 def io_file_service(dependency_injector) -> IOFileService:
     return dependency_injector.get(IOFileService)
@@ -51,17 +67,104 @@ def test_safe_extract_archive(
     assert set(extracted_files) == set(expected_extracted_files)
 
 
-def test_sanitize_file_path(io_file_service: IOFileService) -> None:
-    clean_file_path1: Path = io_file_service.sanitize_file_path(
-        filepath="dir/subdir/testfile.txt", path_prefix="/tmp"
+def test_safe_extract_archive_preserve_paths(
+    io_file_service: IOFileService,
+    tmp_path: Path,
+) -> None:
+    archive_fileobj: BinaryIO = make_archive(
+        {
+            "pkg/__init__.py": b"# init",
+            "pkg/sub/__init__.py": b"# sub init",
+            "pkg/README.md": b"# readme",
+        }
+    )
+
+    extracted_files: List[str] = io_file_service.safe_extract_archive(
+        output_dir=tmp_path,
+        archive_fileobj=archive_fileobj,
+        include_suffixes=[".py"],
+        preserve_paths=True,
     )
-    clean_file_path2: Path = io_file_service.sanitize_file_path(
-        filepath="dir/subdir/testfile.txt"
+
+    assert set(extracted_files) == {
+        str(tmp_path / "pkg" / "__init__.py"),
+        str(tmp_path / "pkg" / "sub" / "__init__.py"),
+    }
+    assert (tmp_path / "pkg" / "sub" / "__init__.py").read_bytes() == b"# sub init"
+
+
+def test_safe_extract_archive_rejects_colliding_names(
+    io_file_service: IOFileService,
+    tmp_path: Path,
+) -> None:
+    archive_fileobj: BinaryIO = make_archive(
+        {"pkg/__init__.py": b"# init", "pkg/sub/__init__.py": b"# sub init"}
     )
-    clean_file_path3: Path = io_file_service.sanitize_file_path(
-        filepath="../testfile.txt", path_prefix="/tmp"
+
+    with pytest.raises(ArchiveExtractionError):
+        io_file_service.safe_extract_archive(
+            output_dir=tmp_path, archive_fileobj=archive_fileobj
+        )
+
+
+@pytest.mark.parametrize(
+    "members, expected_paths",
+    [
+        (
+            {"pkg/__init__.py": b"", "pkg/sub/__init__.py": b""},
+            {"__init__.py", "sub/__init__.py"},
+        ),
+        (
+            {"pkg/__init__.py": b"", "other/__init__.py": b""},
+            {"pkg/__init__.py", "other/__init__.py"},
+        ),
+        ({"pkg/__init__.py": b"", "setup.py": b""}, {"pkg/__init__.py", "setup.py"}),
+    ],
+)
+def test_iter_archive_members_strip_top_level(
+    io_file_service: IOFileService,
+    members: Dict[str, bytes],
+    expected_paths: Set[str],
+) -> None:
+    paths: Set[str] = {
+        path.as_posix()
+        for path, _ in io_file_service.iter_archive_members(
+            archive_fileobj=make_archive(members),
+            preserve_paths=True,
+            strip_top_level=True,
+        )
+    }
+
+    assert paths == expected_paths
+
+
+@pytest.mark.parametrize(
+    "members, limits",
+    [
+        ({"a.py": b"", "b.py": b"", "c.py": b""}, dict(max_files=2)),
+        ({"a.py": b"0" * 6, "b.py": b"0" * 6}, dict(max_total_size=10)),
+        ({"pkg/../../escape.py": b""}, dict(preserve_paths=True)),
+    ],
+)
+def test_iter_archive_members_enforces_limits(
+    io_file_service: IOFileService,
+    members: Dict[str, bytes],
+    limits: Dict[str, int],
+) -> None:
+    with pytest.raises(ArchiveExtractionError):
+        for _, fileobj in io_file_service.iter_archive_members(
+            archive_fileobj=make_archive(members), **limits
+        ):
+            fileobj.read()
+
+
+def test_sanitize_member_path(io_file_service: IOFileService) -> None:
+    assert io_file_service.sanitize_member_path(
+        "/dir/./subdir//testfile.txt", preserve_paths=True
+    ) == PurePosixPath("dir/subdir/testfile.txt")
+    assert io_file_service.sanitize_member_path("../testfile.txt") == PurePosixPath(
+        "testfile.txt"
     )
 
-    assert clean_file_path1 == Path("/tmp") / "testfile.txt"
-    assert clean_file_path2 == Path.cwd() / "testfile.txt"
-    assert clean_file_path3 == Path("/tmp") / "testfile.txt"
+    with pytest.raises(ArchiveExtractionError):
+        io_file_service.sanitize_member_path("dir/..", preserve_paths=True)
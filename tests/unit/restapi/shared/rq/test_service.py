@@ -18,7 +18,7 @@ from __future__ import annotations
 
 import datetime
 import uuid
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 import pytest
 import structlog
@@ -112,6 +112,26 @@ class MockRQQueue(object):
             depends_on=depends_on,
         )
 
+    @staticmethod
+    def prepare_data(*args, **kwargs) -> Dict[str, Any]:
+        LOGGER.info(
+            "Mocking rq.Queue.prepare_data() function", args=args, kwargs=kwargs
+        )
+        return kwargs
+
+    def enqueue_many(self, job_datas: List[Dict[str, Any]]) -> List[MockRQJob]:
+        LOGGER.info("Mocking rq.Queue.enqueue_many() function", job_datas=job_datas)
+        return [
+            MockRQJob(
+                id=str(uuid.uuid4()),
+                queue=self.name,
+                timeout=job_data.get("timeout"),
+                cmd_kwargs=job_data.get("kwargs"),
+                depends_on=job_data.get("depends_on"),
+            )
+            for job_data in job_datas
+        ]
+
 
 @pytest.fixture
 def rq_service(dependency_injector, monkeypatch: MonkeyPatch) -> RQService:
@@ -213,3 +233,28 @@ def test_submit_dependent_mlflow_jobs(rq_service: RQService):
     }
     assert isinstance(rq_fgm_job.dependency, MockRQJob)
     assert rq_fgm_job.dependency.get_id() == train_job_id
+
+
+@freeze_time("2020-08-17T18:46:28.717559")
+def test_submit_mlflow_jobs(rq_service: RQService):
+    rq_jobs = rq_service.submit_mlflow_jobs(
+        queue="tensorflow_cpu",
+        timeout="12h",
+        workflow_uri="s3://workflow/workflows.tar.gz",
+        experiment_id=1,
+        entry_point="fgm",
+        entry_point_kwargs=["-P eps=0.1", None, "-P eps=0.3"],
+        depends_on=None,
+    )
+
+    assert len(rq_jobs) == 3
+    assert len({rq_job.get_id() for rq_job in rq_jobs}) == 3
+    assert all(rq_job.queue == "tensorflow_cpu" for rq_job in rq_jobs)
+    assert all(rq_job.timeout == "12h" for rq_job in rq_jobs)
+    assert all(rq_job.dependency is None for rq_job in rq_jobs)
+    assert [rq_job.cmd_kwargs.get("entry_point_kwargs") for rq_job in rq_jobs] == [
+        "-P eps=0.1",
+        None,
+        "-P eps=0.3",
+    ]
+    assert "entry_point_kwargs" not in rq_jobs[1].cmd_kwargs
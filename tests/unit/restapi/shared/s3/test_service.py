@@ -15,17 +15,20 @@
 # ACCESS THE FULL CC BY 4.0 LICENSE HERE:
 # https://creativecommons.org/licenses/by/4.0/legalcode
 import datetime
-from pathlib import Path
+import io
+import threading
+from pathlib import Path, PurePosixPath
 from typing import Any, BinaryIO, Dict, List
 
 import pytest
 import structlog
 from _pytest.monkeypatch import MonkeyPatch
+from botocore.exceptions import ClientError
 from botocore.stub import Stubber
 from dateutil.tz.tz import tzlocal, tzutc
 from structlog.stdlib import BoundLogger
 
-from dioptra.restapi.shared.s3.service import S3Service
+from dioptra.restapi.shared.s3.service import S3Service, UploadDirectoryResult
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
@@ -323,15 +326,61 @@ def test_upload_directory(
 
     with monkeypatch.context() as m:
         m.setattr(s3_service._client, "upload_file", mockuploadfile)
-        service_response: List[str] = s3_service.upload_directory(
+        service_response: UploadDirectoryResult = s3_service.upload_directory(
             directory=task_plugins_dir,
             bucket="plugins",
             prefix="dioptra_custom",
             include_suffixes=[".py"],
         )
 
-    assert set(service_response) == set(uri_list)
-    assert data_json_uri not in set(service_response)
+    assert service_response.ok
+    assert set(service_response.succeeded) == set(uri_list)
+    assert data_json_uri not in set(service_response.succeeded)
+
+
+def test_upload_directory_retries_and_reports_failures(
+    s3_service: S3Service,
+    task_plugins_dir: Path,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    attempts: Dict[str, int] = {}
+    lock = threading.Lock()
+    flaky_key: str = "dioptra_custom/models/__init__.py"
+    broken_key: str = "dioptra_custom/models/keras.py"
+
+    def mockuploadfile(*args, **kwargs) -> None:
+        key: str = kwargs["Key"]
+
+        with lock:
+            attempts[key] = attempts.get(key, 0) + 1
+            num_attempts: int = attempts[key]
+
+        if key == broken_key or (key == flaky_key and num_attempts == 1):
+            raise ClientError(
+                {"Error": {"Code": "SlowDown", "Message": "Reduce your request rate."}},
+                "PutObject",
+            )
+
+    with monkeypatch.context() as m:
+        m.setattr(s3_service._client, "upload_file", mockuploadfile)
+        m.setattr("dioptra.restapi.shared.s3.service.UPLOAD_RETRY_BACKOFF", 0)
+        service_response: UploadDirectoryResult = s3_service.upload_directory(
+            directory=task_plugins_dir,
+            bucket="plugins",
+            prefix="dioptra_custom",
+            include_suffixes=[".py"],
+            max_attempts=3,
+        )
+
+    assert not service_response.ok
+    assert list(service_response.failed) == [broken_key]
+    assert "SlowDown" in service_response.failed[broken_key]
+    assert attempts[broken_key] == 3
+    assert attempts[flaky_key] == 2
+    assert S3Service.as_uri(bucket="plugins", key=flaky_key) in set(
+        service_response.succeeded
+    )
+    assert len(service_response.succeeded) == len(attempts) - 1
 
 
 def test_delete_prefix(
@@ -372,6 +421,33 @@ def test_delete_prefix(
     assert set(service_response) == set(expected_response)
 
 
+def test_object_exists(s3_service: S3Service) -> None:
+    bucket = "workflow"
+    key = "3db4050001b145a4ae1864e7d1bc7e9a/workflows.tar.gz"
+    expected_params = {"Bucket": bucket, "Key": key}
+
+    with Stubber(s3_service._client) as stubber:
+        stubber.add_response("head_object", {"ContentLength": 4}, expected_params)
+        stubber.add_client_error(
+            "head_object",
+            service_error_code="404",
+            http_status_code=404,
+            expected_params=expected_params,
+        )
+        stubber.add_client_error(
+            "head_object",
+            service_error_code="403",
+            http_status_code=403,
+            expected_params=expected_params,
+        )
+
+        assert s3_service.object_exists(bucket=bucket, key=key) is True
+        assert s3_service.object_exists(bucket=bucket, key=key) is False
+
+        with pytest.raises(ClientError):
+            s3_service.object_exists(bucket=bucket, key=key)
+
+
 def test_normalize_prefix(s3_service: S3Service) -> None:
     assert s3_service.normalize_prefix(prefix="/") == "/"
     assert (
@@ -384,3 +460,100 @@ def test_normalize_prefix(s3_service: S3Service) -> None:
     assert (
         s3_service.normalize_prefix(prefix="dioptra_builtins//") == "dioptra_builtins/"
     )
+
+
+def test_list_objects_follows_pagination(s3_service: S3Service) -> None:
+    keys: List[str] = [f"dioptra_custom/big/{x:04d}.py" for x in range(1500)]
+
+    with Stubber(s3_service._client) as stubber:
+        stubber.add_response(
+            "list_objects_v2",
+            {
+                "IsTruncated": True,
+                "Contents": [{"Key": x} for x in keys[:1000]],
+                "NextContinuationToken": "page-2",
+            },
+            {"Bucket": "plugins", "Prefix": "dioptra_custom/big/"},
+        )
+        stubber.add_response(
+            "list_objects_v2",
+            {"IsTruncated": False, "Contents": [{"Key": x} for x in keys[1000:]]},
+            {
+                "Bucket": "plugins",
+                "Prefix": "dioptra_custom/big/",
+                "ContinuationToken": "page-2",
+            },
+        )
+        service_response: List[str] = s3_service.list_objects(
+            bucket="plugins", prefix="dioptra_custom/big/"
+        )
+        stubber.assert_no_pending_responses()
+
+    assert service_response == keys
+
+
+def test_delete_prefix_in_batches(
+    s3_service: S3Service, monkeypatch: MonkeyPatch
+) -> None:
+    keys: List[str] = [f"dioptra_custom/big/{x:04d}.py" for x in range(2500)]
+    batch_sizes: List[int] = []
+
+    def mockiterobjects(*args, **kwargs):
+        yield from keys
+
+    def mockdeleteobjects(*args, **kwargs) -> Dict[str, Any]:
+        objects: List[Dict[str, str]] = kwargs["Delete"]["Objects"]
+        batch_sizes.append(len(objects))
+
+        return dict(
+            Deleted=[x for x in objects if not x["Key"].endswith("0999.py")],
+            Errors=[
+                dict(Key=x["Key"], Code="AccessDenied")
+                for x in objects
+                if x["Key"].endswith("0999.py")
+            ],
+        )
+
+    with monkeypatch.context() as m:
+        m.setattr(s3_service, "iter_objects", mockiterobjects)
+        m.setattr(s3_service._client, "delete_objects", mockdeleteobjects)
+        service_response: List[str] = s3_service.delete_prefix(
+            bucket="plugins", prefix="dioptra_custom/big/"
+        )
+
+    assert sorted(batch_sizes) == [500, 1000, 1000]
+    assert service_response == [x for x in keys if not x.endswith("0999.py")]
+
+
+def test_upload_archive_members(
+    s3_service: S3Service,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    uploaded: Dict[str, bytes] = {}
+
+    def mockuploadfileobj(*args, **kwargs) -> None:
+        LOGGER.info(
+            "Mocking client.upload_fileobj() function", args=args, kwargs=kwargs
+        )
+        uploaded[kwargs["Key"]] = kwargs["Fileobj"].read()
+
+    members = [
+        (PurePosixPath("pkg/__init__.py"), io.BytesIO(b"# init")),
+        (PurePosixPath("pkg/sub/module.py"), io.BytesIO(b"# module")),
+    ]
+
+    with monkeypatch.context() as m:
+        m.setattr(s3_service._client, "upload_fileobj", mockuploadfileobj)
+        service_response: UploadDirectoryResult = s3_service.upload_archive_members(
+            members=members, bucket="plugins", prefix="dioptra_custom"
+        )
+
+    assert service_response.ok
+    assert service_response.succeeded == [
+        "s3://plugins/dioptra_custom/pkg/__init__.py",
+        "s3://plugins/dioptra_custom/pkg/sub/module.py",
+    ]
+    assert uploaded == {
+        "dioptra_custom/pkg/__init__.py": b"# init",
+        "dioptra_custom/pkg/sub/module.py": b"# module",
+    }
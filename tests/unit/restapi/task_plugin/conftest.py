@@ -16,7 +16,7 @@
 # https://creativecommons.org/licenses/by/4.0/legalcode
 from __future__ import annotations
 
-from typing import Any, BinaryIO, Dict
+from typing import Any, BinaryIO, Dict, List
 
 import pytest
 from flask import Flask
@@ -179,3 +179,39 @@ def list_objects_v2_custom_new_plugin_two() -> Dict[str, Any]:
         "EncodingType": "url",
         "KeyCount": 2,
     }
+
+
+@pytest.fixture
+def list_objects_v2_plugins_pages(
+    list_objects_v2_builtins_artifacts: Dict[str, Any],
+    list_objects_v2_builtins_attacks: Dict[str, Any],
+    list_objects_v2_custom_new_plugin_one: Dict[str, Any],
+    list_objects_v2_custom_new_plugin_two: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    return [
+        {
+            "Contents": (
+                list_objects_v2_builtins_artifacts["Contents"]
+                + list_objects_v2_builtins_attacks["Contents"]
+            ),
+            "IsTruncated": True,
+            "Name": "plugins",
+            "Prefix": "",
+            "MaxKeys": 4,
+            "EncodingType": "url",
+            "KeyCount": 4,
+            "NextContinuationToken": "page-2",
+        },
+        {
+            "Contents": (
+                list_objects_v2_custom_new_plugin_one["Contents"]
+                + list_objects_v2_custom_new_plugin_two["Contents"]
+            ),
+            "IsTruncated": False,
+            "Name": "plugins",
+            "Prefix": "",
+            "MaxKeys": 4,
+            "EncodingType": "url",
+            "KeyCount": 4,
+        },
+    ]
@@ -16,19 +16,28 @@
 # https://creativecommons.org/licenses/by/4.0/legalcode
 from __future__ import annotations
 
-from pathlib import Path
+import io
+import tarfile
 from tempfile import TemporaryDirectory
-from typing import Any, Dict, List
+from typing import Any, BinaryIO, Dict, List
 
 import pytest
 import structlog
 from _pytest.monkeypatch import MonkeyPatch
 from botocore.stub import Stubber
 from structlog.stdlib import BoundLogger
+from werkzeug.datastructures import FileStorage
 
 from dioptra.restapi.models import TaskPlugin, TaskPluginUploadFormData
-from dioptra.restapi.shared.s3.service import S3Service
-from dioptra.restapi.task_plugin.service import TaskPluginService
+from dioptra.restapi.shared.s3.service import S3Service, UploadDirectoryResult
+from dioptra.restapi.task_plugin.errors import (
+    TaskPluginAlreadyExistsError,
+    TaskPluginStorageError,
+)
+from dioptra.restapi.task_plugin.service import (
+    TaskPluginCatalogCache,
+    TaskPluginService,
+)
 
 LOGGER: BoundLogger = structlog.stdlib.get_logger()
 
@@ -49,37 +58,27 @@ def test_create(
     task_plugin_upload_form_data: TaskPluginUploadFormData,
     new_task_plugin: TaskPlugin,
     monkeypatch: MonkeyPatch,
-    tmp_path: Path,
 ) -> None:
     list_objects_v2_expected_params: Dict[str, Any] = {
         "Bucket": "plugins",
-        "Prefix": "dioptra_custom/new_package/",
+        "Prefix": "",
     }
-    uri_list: List[str] = []
-    output_dir: Path = tmp_path / "tmpdir"
-    output_dir.mkdir()
+    uploaded: Dict[str, bytes] = {}
 
-    def mockenter(*args, **kwargs):
-        LOGGER.info("Mocking TemporaryDirectory.__enter__", args=args, kwargs=kwargs)
-        return str(output_dir)
-
-    def mockexit(*args, **kwargs):
-        LOGGER.info("Mocking TemporaryDirectory.__exit__", args=args, kwargs=kwargs)
-        return None
-
-    def mockuploadfile(*args, **kwargs) -> None:
-        LOGGER.info("Mocking client.upload_file() function", args=args, kwargs=kwargs)
-        uri_list.append(
-            S3Service.as_uri(bucket=kwargs.get("Bucket"), key=kwargs.get("Key"))
+    def mockuploadfileobj(*args, **kwargs) -> None:
+        LOGGER.info(
+            "Mocking client.upload_fileobj() function", args=args, kwargs=kwargs
         )
+        uploaded[
+            S3Service.as_uri(bucket=kwargs.get("Bucket"), key=kwargs.get("Key"))
+        ] = kwargs["Fileobj"].read()
 
     with Stubber(s3_service._client) as stubber, monkeypatch.context() as m:
-        m.setattr(TemporaryDirectory, "__enter__", mockenter)
-        m.setattr(TemporaryDirectory, "__exit__", mockexit)
-        m.setattr(s3_service._client, "upload_file", mockuploadfile)
+        m.setattr(TemporaryDirectory, "__enter__", None)
+        m.setattr(s3_service._client, "upload_fileobj", mockuploadfileobj)
         stubber.add_response(
             "list_objects_v2",
-            dict(Name="plugins", Prefix="dioptra_custom/new_package"),
+            dict(Name="plugins", Prefix=""),
             list_objects_v2_expected_params,
         )
         response_task_plugin: TaskPlugin = task_plugin_service.create(
@@ -87,8 +86,193 @@ def test_create(
         )
         stubber.assert_no_pending_responses()
 
+    # The archive's top-level directory is replaced by the plugin name.
     assert new_task_plugin == response_task_plugin
-    assert len(uri_list) == 2
+    assert uploaded == {
+        "s3://plugins/dioptra_custom/new_package/__init__.py": b"# init file",
+        "s3://plugins/dioptra_custom/new_package/plugin_module.py": b"# plugin module",
+    }
+
+
+def test_create_uploads_nested_packages(
+    s3_service: S3Service,
+    task_plugin_service: TaskPluginService,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    uploaded: Dict[str, bytes] = {}
+    archive_fileobj: BinaryIO = io.BytesIO()
+
+    with tarfile.open(fileobj=archive_fileobj, mode="w:gz") as f:
+        for name, data in [
+            ("pkg/__init__.py", b"# init"),
+            ("pkg/sub/__init__.py", b"# sub init"),
+            ("pkg/sub/module.py", b"# sub module"),
+            ("pkg/README.md", b"# readme"),
+        ]:
+            tarinfo = tarfile.TarInfo(name=name)
+            tarinfo.size = len(data)
+            f.addfile(tarinfo=tarinfo, fileobj=io.BytesIO(data))
+
+    archive_fileobj.seek(0)
+
+    def mockuploadfileobj(*args, **kwargs) -> None:
+        LOGGER.info(
+            "Mocking client.upload_fileobj() function", args=args, kwargs=kwargs
+        )
+        uploaded[kwargs["Key"]] = kwargs["Fileobj"].read()
+
+    with Stubber(s3_service._client) as stubber, monkeypatch.context() as m:
+        m.setattr(s3_service._client, "upload_fileobj", mockuploadfileobj)
+        stubber.add_response(
+            "list_objects_v2",
+            dict(Name="plugins", Prefix=""),
+            {"Bucket": "plugins", "Prefix": ""},
+        )
+        response_task_plugin: TaskPlugin = task_plugin_service.create(
+            task_plugin_upload_form_data=TaskPluginUploadFormData(
+                task_plugin_name="nested",
+                collection="dioptra_custom",
+                task_plugin_file=FileStorage(
+                    stream=archive_fileobj,
+                    filename="nested.tar.gz",
+                    name="task_plugin_file",
+                ),
+            ),
+            bucket="plugins",
+        )
+        stubber.assert_no_pending_responses()
+
+    assert uploaded == {
+        "dioptra_custom/nested/__init__.py": b"# init",
+        "dioptra_custom/nested/sub/__init__.py": b"# sub init",
+        "dioptra_custom/nested/sub/module.py": b"# sub module",
+    }
+    assert response_task_plugin == TaskPlugin(
+        "nested", "dioptra_custom", ["__init__.py", "sub/__init__.py", "sub/module.py"]
+    )
+
+    # The catalog lists the uploaded modules with the same relative paths.
+    with Stubber(s3_service._client) as stubber:
+        stubber.add_response(
+            "list_objects_v2",
+            {
+                "Contents": [{"Key": x} for x in uploaded],
+                "Name": "plugins",
+                "Prefix": "",
+                "KeyCount": len(uploaded),
+            },
+            {"Bucket": "plugins", "Prefix": ""},
+        )
+        response_catalog_plugin = task_plugin_service.get_by_name_in_collection(
+            collection="dioptra_custom", task_plugin_name="nested", bucket="plugins"
+        )
+
+    assert response_catalog_plugin == response_task_plugin
+
+
+def test_create_cleans_up_after_upload_failure(
+    s3_service: S3Service,
+    task_plugin_service: TaskPluginService,
+    task_plugin_upload_form_data: TaskPluginUploadFormData,
+    monkeypatch: MonkeyPatch,
+) -> None:
+    deleted_keys: List[str] = []
+    list_objects_v2_sibling_plugin: Dict[str, Any] = {
+        "Contents": [
+            {"Key": "dioptra_custom/new_package_v2/__init__.py"},
+            {"Key": "dioptra_custom/new_package_v2/plugin_module.py"},
+        ],
+        "Name": "plugins",
+        "Prefix": "",
+        "KeyCount": 2,
+    }
+
+    def mockuploadarchivemembers(*args, **kwargs) -> UploadDirectoryResult:
+        LOGGER.info(
+            "Mocking S3Service.upload_archive_members()", args=args, kwargs=kwargs
+        )
+        return UploadDirectoryResult(
+            succeeded=["s3://plugins/dioptra_custom/new_package/__init__.py"],
+            failed={"dioptra_custom/new_package/plugin_module.py": "SlowDown"},
+        )
+
+    def mockdeleteobjects(*args, **kwargs) -> Dict[str, Any]:
+        LOGGER.info(
+            "Mocking client.delete_objects() function", args=args, kwargs=kwargs
+        )
+        objects: List[Dict[str, str]] = kwargs["Delete"]["Objects"]
+        deleted_keys.extend(x["Key"] for x in objects)
+        return dict(Deleted=objects)
+
+    with Stubber(s3_service._client) as stubber, monkeypatch.context() as m:
+        m.setattr(S3Service, "upload_archive_members", mockuploadarchivemembers)
+        m.setattr(s3_service._client, "delete_objects", mockdeleteobjects)
+        stubber.add_response(
+            "list_objects_v2",
+            list_objects_v2_sibling_plugin,
+            {"Bucket": "plugins", "Prefix": ""},
+        )
+
+        with pytest.raises(TaskPluginStorageError):
+            task_plugin_service.create(
+                task_plugin_upload_form_data=task_plugin_upload_form_data,
+                bucket="plugins",
+            )
+
+        stubber.assert_no_pending_responses()
+
+    # The sibling plugin new_package_v2 shares the name prefix and is left intact.
+    assert deleted_keys == [
+        "dioptra_custom/new_package/__init__.py",
+        "dioptra_custom/new_package/plugin_module.py",
+    ]
+
+
+def test_create_rejects_plugin_missing_from_cached_catalog(
+    s3_service: S3Service,
+    task_plugin_service: TaskPluginService,
+    task_plugin_upload_form_data: TaskPluginUploadFormData,
+) -> None:
+    list_objects_v2_expected_params: Dict[str, Any] = {
+        "Bucket": "plugins",
+        "Prefix": "",
+    }
+    list_objects_v2_new_package: Dict[str, Any] = {
+        "Contents": [{"Key": "dioptra_custom/new_package/__init__.py"}],
+        "Name": "plugins",
+        "Prefix": "",
+        "KeyCount": 1,
+    }
+
+    with Stubber(s3_service._client) as stubber:
+        stubber.add_response(
+            "list_objects_v2",
+            dict(Name="plugins", Prefix=""),
+            list_objects_v2_expected_params,
+        )
+        stubber.add_response(
+            "list_objects_v2",
+            list_objects_v2_new_package,
+            list_objects_v2_expected_params,
+        )
+
+        # Warm the cached catalog before another process uploads the plugin.
+        assert (
+            task_plugin_service.get_by_name_in_collection(
+                collection="dioptra_custom",
+                task_plugin_name="new_package",
+                bucket="plugins",
+            )
+            is None
+        )
+
+        with pytest.raises(TaskPluginAlreadyExistsError):
+            task_plugin_service.create(
+                task_plugin_upload_form_data=task_plugin_upload_form_data,
+                bucket="plugins",
+            )
+
+        stubber.assert_no_pending_responses()
 
 
 def test_delete_prefix(
@@ -105,7 +289,7 @@ def test_delete_prefix(
 
     list_objects_v2_expected_params1: Dict[str, Any] = {
         "Bucket": "plugins",
-        "Prefix": "dioptra_custom/new_plugin_one/",
+        "Prefix": "",
     }
 
     list_objects_v2_expected_params2: Dict[str, Any] = {
@@ -141,76 +325,45 @@ def test_delete_prefix(
 def test_get_all(
     s3_service: S3Service,
     task_plugin_service: TaskPluginService,
-    list_objects_v2_builtins: Dict[str, Any],
-    list_objects_v2_custom: Dict[str, Any],
-    list_objects_v2_builtins_artifacts: Dict[str, Any],
-    list_objects_v2_builtins_attacks: Dict[str, Any],
-    list_objects_v2_custom_new_plugin_one: Dict[str, Any],
-    list_objects_v2_custom_new_plugin_two: Dict[str, Any],
+    list_objects_v2_plugins_pages: List[Dict[str, Any]],
 ) -> None:
     list_objects_v2_expected_params1: Dict[str, Any] = {
         "Bucket": "plugins",
-        "Delimiter": "/",
-        "Prefix": "dioptra_builtins/",
+        "Prefix": "",
     }
     list_objects_v2_expected_params2: Dict[str, Any] = {
         "Bucket": "plugins",
-        "Prefix": "dioptra_builtins/artifacts/",
-    }
-    list_objects_v2_expected_params3: Dict[str, Any] = {
-        "Bucket": "plugins",
-        "Prefix": "dioptra_builtins/attacks/",
-    }
-    list_objects_v2_expected_params4: Dict[str, Any] = {
-        "Bucket": "plugins",
-        "Delimiter": "/",
-        "Prefix": "dioptra_custom/",
-    }
-    list_objects_v2_expected_params5: Dict[str, Any] = {
-        "Bucket": "plugins",
-        "Prefix": "dioptra_custom/new_plugin_one/",
-    }
-    list_objects_v2_expected_params6: Dict[str, Any] = {
-        "Bucket": "plugins",
-        "Prefix": "dioptra_custom/new_plugin_two/",
+        "Prefix": "",
+        "ContinuationToken": "page-2",
     }
 
     with Stubber(s3_service._client) as stubber:
         stubber.add_response(
             "list_objects_v2",
-            list_objects_v2_builtins,
+            list_objects_v2_plugins_pages[0],
             list_objects_v2_expected_params1,
         )
         stubber.add_response(
             "list_objects_v2",
-            list_objects_v2_builtins_artifacts,
+            list_objects_v2_plugins_pages[1],
             list_objects_v2_expected_params2,
         )
-        stubber.add_response(
-            "list_objects_v2",
-            list_objects_v2_builtins_attacks,
-            list_objects_v2_expected_params3,
-        )
-        stubber.add_response(
-            "list_objects_v2",
-            list_objects_v2_custom,
-            list_objects_v2_expected_params4,
-        )
-        stubber.add_response(
-            "list_objects_v2",
-            list_objects_v2_custom_new_plugin_one,
-            list_objects_v2_expected_params5,
-        )
-        stubber.add_response(
-            "list_objects_v2",
-            list_objects_v2_custom_new_plugin_two,
-            list_objects_v2_expected_params6,
-        )
         response_task_plugin: List[TaskPlugin] = task_plugin_service.get_all(
             s3_collections_list=["dioptra_builtins", "dioptra_custom"], bucket="plugins"
         )
         stubber.assert_no_pending_responses()
 
+        # The catalog is cached, so these lookups do not call S3 again.
+        response_custom: List[TaskPlugin] = task_plugin_service.get_all_in_collection(
+            collection="dioptra_custom", bucket="plugins"
+        )
+        response_attacks = task_plugin_service.get_by_name_in_collection(
+            collection="dioptra_builtins", task_plugin_name="attacks", bucket="plugins"
+        )
+        response_missing = task_plugin_service.get_by_name_in_collection(
+            collection="dioptra_custom", task_plugin_name="missing", bucket="plugins"
+        )
+
     expected_response: List[TaskPlugin] = [
         TaskPlugin("artifacts", "dioptra_builtins", ["__init__.py", "mlflow.py"]),
         TaskPlugin("attacks", "dioptra_builtins", ["__init__.py", "fgm.py"]),
@@ -223,3 +376,34 @@ def test_get_all(
     ]
 
     assert response_task_plugin == expected_response
+    assert response_custom == expected_response[2:]
+    assert response_attacks == expected_response[1]
+    assert response_missing is None
+
+
+def test_task_plugin_catalog_cache(monkeypatch: MonkeyPatch) -> None:
+    import dioptra.restapi.task_plugin.service as task_plugin_service_module
+
+    now: List[float] = [100.0]
+    monkeypatch.setattr(task_plugin_service_module.time, "monotonic", lambda: now[0])
+    catalog = {
+        ("dioptra_custom", "plugin"): TaskPlugin(
+            "plugin", "dioptra_custom", ["__init__.py"]
+        )
+    }
+    cache = TaskPluginCatalogCache(ttl=30.0)
+    cache.set("plugins", catalog)
+
+    assert cache.get("plugins") is catalog
+    assert cache.get("other") is None
+
+    now[0] += 30.0
+    assert cache.get("plugins") is None
+
+    cache.set("plugins", catalog)
+    cache.invalidate("plugins")
+    assert cache.get("plugins") is None
+
+    disabled_cache = TaskPluginCatalogCache(ttl=0)
+    disabled_cache.set("plugins", catalog)
+    assert disabled_cache.get("plugins") is None
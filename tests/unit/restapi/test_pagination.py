@@ -0,0 +1,78 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import datetime
+
+import pytest
+
+from dioptra.restapi.job.schema import JobSchema
+from dioptra.restapi.pagination import (
+    MAX_PAGE_LIMIT,
+    ListQueryError,
+    decode_cursor,
+    encode_cursor,
+    parse_fields,
+    parse_limit,
+    parse_timestamp,
+)
+
+
+@pytest.mark.parametrize(
+    "record_id", [1, "4520511d-678b-4966-953e-af2d0edcea32"], ids=["int", "uuid"]
+)
+def test_cursor_round_trip(record_id) -> None:
+    created_on = datetime.datetime(2020, 8, 17, 18, 46, 28, 717559)
+
+    assert decode_cursor(encode_cursor(created_on, record_id)) == (
+        created_on,
+        record_id,
+    )
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", "W10=", "WyJub3ciLCAxXQ=="])
+def test_decode_cursor_rejects_malformed_cursors(cursor: str) -> None:
+    with pytest.raises(ListQueryError):
+        decode_cursor(cursor)
+
+
+def test_parse_fields() -> None:
+    assert parse_fields(None, JobSchema) is None
+    assert parse_fields("", JobSchema) is None
+    assert parse_fields("jobId, status", JobSchema) == ("jobId", "status")
+
+    with pytest.raises(ListQueryError):
+        parse_fields("jobId,password", JobSchema)
+
+
+def test_parse_limit() -> None:
+    assert parse_limit(None) is None
+    assert parse_limit(MAX_PAGE_LIMIT) == MAX_PAGE_LIMIT
+
+    for limit in (0, MAX_PAGE_LIMIT + 1):
+        with pytest.raises(ListQueryError):
+            parse_limit(limit)
+
+
+def test_parse_timestamp() -> None:
+    assert parse_timestamp(None) is None
+    assert parse_timestamp("2020-08-17T18:46:28") == datetime.datetime(
+        2020, 8, 17, 18, 46, 28
+    )
+
+    with pytest.raises(ListQueryError):
+        parse_timestamp("yesterday")
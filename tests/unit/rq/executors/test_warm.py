@@ -0,0 +1,92 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+from _pytest.monkeypatch import MonkeyPatch
+
+from dioptra.rq.executors import (
+    WarmExecutor,
+    get_warm_executor,
+    warm,
+    warm_executor_enabled,
+)
+
+
+@pytest.fixture
+def executor():
+    executor = WarmExecutor(processes=1, max_jobs_per_process=2, preload_modules=[])
+    yield executor
+    executor.terminate()
+
+
+def test_warm_executor_isolates_cwd_and_env(
+    executor: WarmExecutor, tmp_path: Path
+) -> None:
+    env = {"DIOPTRA_TEST_VAR": "testing"}
+
+    cwd = executor.run(os.getcwd, cwd=str(tmp_path), env=env)
+    value = executor.run(
+        os.getenv, cwd=str(tmp_path), env=env, kwargs={"key": "DIOPTRA_TEST_VAR"}
+    )
+    leaked = executor.run(
+        os.getenv, cwd=str(tmp_path), env={}, kwargs={"key": "DIOPTRA_TEST_VAR"}
+    )
+
+    assert Path(cwd) == tmp_path
+    assert value == "testing"
+    assert leaked is None
+
+
+def test_warm_executor_recycles_processes(
+    executor: WarmExecutor, tmp_path: Path
+) -> None:
+    pids = [executor.run(os.getpid, cwd=str(tmp_path), env={}) for _ in range(4)]
+
+    assert pids[0] == pids[1]
+    assert pids[2] == pids[3]
+    assert pids[1] != pids[2]
+
+
+def test_warm_executor_restarts_pool_after_failure(
+    executor: WarmExecutor, tmp_path: Path
+) -> None:
+    pid = executor.run(os.getpid, cwd=str(tmp_path), env={})
+
+    with pytest.raises(FileNotFoundError):
+        executor.run(os.getcwd, cwd=str(tmp_path / "missing"), env={})
+
+    assert executor.run(os.getpid, cwd=str(tmp_path), env={}) != pid
+
+
+def test_get_warm_executor_from_env(monkeypatch: MonkeyPatch) -> None:
+    monkeypatch.setattr(warm, "_WARM_EXECUTOR", None)
+    monkeypatch.setenv("DIOPTRA_RQ_WARM_EXECUTOR", "1")
+    monkeypatch.setenv("DIOPTRA_RQ_WARM_EXECUTOR_PROCESSES", "2")
+    monkeypatch.setenv("DIOPTRA_RQ_WARM_EXECUTOR_MAX_JOBS", "5")
+    monkeypatch.setenv("DIOPTRA_RQ_WARM_EXECUTOR_PRELOAD", "mlflow, tensorflow")
+
+    executor = get_warm_executor()
+
+    assert warm_executor_enabled()
+    assert get_warm_executor() is executor
+    assert executor._processes == 2
+    assert executor._max_jobs_per_process == 5
+    assert executor._preload_modules == ["mlflow", "tensorflow"]
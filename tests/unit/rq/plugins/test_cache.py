@@ -0,0 +1,237 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import hashlib
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterator, List
+
+import pytest
+import structlog
+from structlog.stdlib import BoundLogger
+
+from dioptra.rq.plugins import PluginCache
+
+LOGGER: BoundLogger = structlog.stdlib.get_logger()
+
+
+class MockPaginator(object):
+    def __init__(self, objects: Dict[str, bytes], page_size: int) -> None:
+        self._objects = objects
+        self._page_size = page_size
+
+    def paginate(self, Bucket: str, Prefix: str) -> Iterator[Dict[str, Any]]:
+        keys = sorted(x for x in self._objects if x.startswith(Prefix))
+
+        for start in range(0, len(keys), self._page_size):
+            yield {
+                "Contents": [
+                    {
+                        "Key": key,
+                        "ETag": f'"{hashlib.md5(self._objects[key]).hexdigest()}"',
+                        "Size": len(self._objects[key]),
+                    }
+                    for key in keys[start : start + self._page_size]
+                ]
+            }
+
+
+class MockS3Client(object):
+    def __init__(self, objects: Dict[str, bytes]) -> None:
+        self.objects = objects
+        self.downloads: List[str] = []
+        self._lock = threading.Lock()
+
+    def get_paginator(self, operation_name: str) -> MockPaginator:
+        LOGGER.info("Mocking client.get_paginator() function", name=operation_name)
+        return MockPaginator(self.objects, page_size=2)
+
+    def download_file(self, Bucket: str, Key: str, Filename: str) -> None:
+        LOGGER.info("Mocking client.download_file() function", key=Key)
+
+        with self._lock:
+            self.downloads.append(Key)
+
+        Path(Filename).write_bytes(self.objects[Key])
+
+
+@pytest.fixture
+def s3_client() -> MockS3Client:
+    return MockS3Client(
+        {
+            "dioptra_builtins/__init__.py": b"",
+            "dioptra_builtins/attacks/__init__.py": b"",
+            "dioptra_builtins/attacks/fgm.py": b"# fgm",
+            "dioptra_builtins/metrics/distance.py": b"# distance",
+            "dioptra_custom/evaluation/tensorflow.py": b"# evaluation",
+        }
+    )
+
+
+@pytest.fixture
+def cache(s3_client: MockS3Client, tmp_path: Path) -> PluginCache:
+    return PluginCache(cache_dir=tmp_path / ".plugin_cache", client=s3_client)
+
+
+def test_sync_downloads_plugins(
+    cache: PluginCache, s3_client: MockS3Client, tmp_path: Path
+) -> None:
+    dest = tmp_path / "dioptra_builtins"
+
+    version_dir = cache.sync("s3://plugins/dioptra_builtins", dest)
+
+    assert dest.is_symlink()
+    assert dest.resolve() == version_dir.resolve()
+    assert (dest / "attacks" / "fgm.py").read_text() == "# fgm"
+    assert (dest / "metrics" / "distance.py").read_text() == "# distance"
+    assert not (dest / "evaluation").exists()
+    # The two empty __init__.py files share one blob.
+    assert len(s3_client.downloads) == 3
+
+
+def test_sync_skips_unchanged_plugins(
+    cache: PluginCache, s3_client: MockS3Client, tmp_path: Path
+) -> None:
+    dest = tmp_path / "dioptra_builtins"
+
+    first = cache.sync("s3://plugins/dioptra_builtins", dest)
+    s3_client.downloads.clear()
+    second = cache.sync("s3://plugins/dioptra_builtins", dest)
+
+    assert first == second
+    assert s3_client.downloads == []
+
+
+def test_sync_fetches_only_changed_plugins(
+    cache: PluginCache, s3_client: MockS3Client, tmp_path: Path
+) -> None:
+    dest = tmp_path / "dioptra_builtins"
+
+    first = cache.sync("s3://plugins/dioptra_builtins", dest)
+    s3_client.downloads.clear()
+    s3_client.objects["dioptra_builtins/attacks/fgm.py"] = b"# fgm v2"
+    del s3_client.objects["dioptra_builtins/metrics/distance.py"]
+    second = cache.sync("s3://plugins/dioptra_builtins", dest)
+
+    assert first != second
+    assert s3_client.downloads == ["dioptra_builtins/attacks/fgm.py"]
+    assert (dest / "attacks" / "fgm.py").read_text() == "# fgm v2"
+    assert not (dest / "metrics" / "distance.py").exists()
+    assert (first / "attacks" / "fgm.py").read_text() == "# fgm"
+
+
+def test_sync_replaces_legacy_plugin_dir(cache: PluginCache, tmp_path: Path) -> None:
+    dest = tmp_path / "dioptra_builtins"
+    dest.mkdir()
+    (dest / "stale.py").touch()
+
+    cache.sync("s3://plugins/dioptra_builtins", dest)
+
+    assert dest.is_symlink()
+    assert not (dest / "stale.py").exists()
+
+
+def test_sync_prunes_old_versions(s3_client: MockS3Client, tmp_path: Path) -> None:
+    cache = PluginCache(
+        cache_dir=tmp_path / ".plugin_cache", client=s3_client, max_versions=2
+    )
+    dest = tmp_path / "dioptra_builtins"
+    version_dirs = []
+
+    for version in range(3):
+        s3_client.objects[
+            "dioptra_builtins/attacks/fgm.py"
+        ] = f"# fgm v{version}".encode()
+        version_dirs.append(cache.sync("s3://plugins/dioptra_builtins", dest))
+
+    assert not version_dirs[0].exists()
+    assert version_dirs[1].exists()
+    assert version_dirs[2].exists()
+    assert len(list(cache.blobs_dir.iterdir())) == 4
+
+
+def test_sync_keeps_previous_version_until_next_sync(
+    s3_client: MockS3Client, tmp_path: Path
+) -> None:
+    cache = PluginCache(
+        cache_dir=tmp_path / ".plugin_cache", client=s3_client, max_versions=1
+    )
+    dest = tmp_path / "dioptra_builtins"
+    version_dirs = []
+
+    for version in range(3):
+        s3_client.objects[
+            "dioptra_builtins/attacks/fgm.py"
+        ] = f"# fgm v{version}".encode()
+        version_dirs.append(cache.sync("s3://plugins/dioptra_builtins", dest))
+
+    assert not version_dirs[0].exists()
+    assert (version_dirs[1] / "attacks" / "fgm.py").read_text() == "# fgm v1"
+    assert (version_dirs[2] / "attacks" / "fgm.py").read_text() == "# fgm v2"
+
+
+def test_sync_blob_gc_waits_for_concurrent_build(
+    s3_client: MockS3Client, tmp_path: Path
+) -> None:
+    cache = PluginCache(
+        cache_dir=tmp_path / ".plugin_cache", client=s3_client, max_versions=1
+    )
+    custom_dest = tmp_path / "dioptra_custom"
+
+    for version in range(2):
+        s3_client.objects[
+            "dioptra_custom/evaluation/tensorflow.py"
+        ] = f"# evaluation v{version}".encode()
+        cache.sync("s3://plugins/dioptra_custom", custom_dest)
+
+    # While the first blob of the builtins collection is being downloaded, sync a
+    # new version of the custom collection, which prunes its oldest version and
+    # collects the unlinked blobs.
+    s3_client.objects["dioptra_custom/evaluation/tensorflow.py"] = b"# evaluation v2"
+    download_file = s3_client.download_file
+    threads: List[threading.Thread] = []
+
+    def download_file_and_sync(Bucket: str, Key: str, Filename: str) -> None:
+        download_file(Bucket=Bucket, Key=Key, Filename=Filename)
+
+        if not threads:
+            threads.append(
+                threading.Thread(
+                    target=cache.sync,
+                    args=("s3://plugins/dioptra_custom", custom_dest),
+                )
+            )
+            threads[0].start()
+            threads[0].join(timeout=0.5)
+
+    s3_client.download_file = download_file_and_sync  # type: ignore[assignment]
+    dest = tmp_path / "dioptra_builtins"
+
+    cache.sync("s3://plugins/dioptra_builtins", dest)
+    threads[0].join()
+
+    assert (dest / "attacks" / "fgm.py").read_text() == "# fgm"
+    assert (dest / "metrics" / "distance.py").read_text() == "# distance"
+    assert (custom_dest / "evaluation" / "tensorflow.py").read_text() == (
+        "# evaluation v2"
+    )
+
+
+def test_sync_invalid_uri(cache: PluginCache, tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        cache.sync("plugins/dioptra_builtins", tmp_path / "dioptra_builtins")
@@ -89,3 +89,47 @@ def test_run_mlflow_task(monkeypatch: MonkeyPatch, tmp_path: Path) -> None:
         "var1=testing",
     ]
     assert Path(p.cwd).parent == d
+
+
+class MockWarmExecutor(object):
+    def __init__(self) -> None:
+        self.calls = []
+
+    def run(self, func, cwd, env, kwargs=None) -> int:
+        LOGGER.info("Mocking WarmExecutor.run() function", func=func, kwargs=kwargs)
+        self.calls.append({"func": func, "cwd": cwd, "env": env, "kwargs": kwargs})
+        return 0
+
+
+@freeze_time("2020-08-17T19:46:28.717559")
+def test_run_mlflow_task_warm_executor(
+    monkeypatch: MonkeyPatch, tmp_path: Path
+) -> None:
+    import dioptra.rq.tasks.run_mlflow as run_mlflow
+
+    def mockgetcurrentjob(*args, **kwargs) -> MockRQJob:
+        LOGGER.info("Mocking rq.get_current_job() function", args=args, kwargs=kwargs)
+        return MockRQJob()
+
+    d: Path = tmp_path / "run_mlflow_task"
+    d.mkdir(parents=True)
+    executor = MockWarmExecutor()
+
+    monkeypatch.setenv("DIOPTRA_WORKDIR", str(d))
+    monkeypatch.setenv("DIOPTRA_RQ_WARM_EXECUTOR", "1")
+    monkeypatch.setattr(rq, "get_current_job", mockgetcurrentjob)
+    monkeypatch.setattr(run_mlflow, "get_warm_executor", lambda: executor)
+
+    p = run_mlflow_task(
+        workflow_uri="s3://workflow/workflows.tar.gz",
+        entry_point="main",
+        experiment_id="0",
+        conda_env="base",
+        entry_point_kwargs="-P var1=testing",
+    )
+
+    assert p.returncode == 0
+    assert len(executor.calls) == 1
+    assert executor.calls[0]["func"] is run_mlflow.run_mlflow_job_in_process
+    assert Path(executor.calls[0]["cwd"]).parent == d
+    assert executor.calls[0]["kwargs"]["entry_point_kwargs"] == "-P var1=testing"
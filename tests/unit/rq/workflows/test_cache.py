@@ -0,0 +1,153 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import hashlib
+import io
+import tarfile
+from pathlib import Path
+from typing import Dict, List
+
+import pytest
+import structlog
+from structlog.stdlib import BoundLogger
+
+from dioptra.rq.workflows import WorkflowCache
+from dioptra.rq.workflows.cache import unpack_workflow_archive
+
+LOGGER: BoundLogger = structlog.stdlib.get_logger()
+
+
+class MockS3Client(object):
+    def __init__(self, objects: Dict[str, bytes]) -> None:
+        self.objects = objects
+        self.downloads: List[str] = []
+
+    def download_file(self, Bucket: str, Key: str, Filename: str) -> None:
+        LOGGER.info("Mocking client.download_file() function", key=Key)
+        self.downloads.append(Key)
+        Path(Filename).write_bytes(self.objects[Key])
+
+
+def make_workflow_tar_gz(files: Dict[str, bytes]) -> bytes:
+    fileobj = io.BytesIO()
+
+    with tarfile.open(fileobj=fileobj, mode="w:gz") as f:
+        for name, data in files.items():
+            tarinfo = tarfile.TarInfo(name=name)
+            tarinfo.size = len(data)
+            f.addfile(tarinfo=tarinfo, fileobj=io.BytesIO(data))
+
+    return fileobj.getvalue()
+
+
+def add_workflow(client: MockS3Client, files: Dict[str, bytes]) -> str:
+    data = make_workflow_tar_gz(files)
+    key = f"{hashlib.sha256(data).hexdigest()}/workflows.tar.gz"
+    client.objects[key] = data
+    return f"s3://workflow/{key}"
+
+
+@pytest.fixture
+def s3_client() -> MockS3Client:
+    return MockS3Client({})
+
+
+@pytest.fixture
+def cache(s3_client: MockS3Client, tmp_path: Path) -> WorkflowCache:
+    return WorkflowCache(
+        cache_dir=tmp_path / ".workflow_cache", client=s3_client, max_entries=2
+    )
+
+
+def test_fetch_caches_unpacked_workflow(
+    cache: WorkflowCache, s3_client: MockS3Client, tmp_path: Path
+) -> None:
+    workflow_uri = add_workflow(
+        s3_client, {"MLproject": b"name: test", "src/fgm.py": b"# fgm"}
+    )
+
+    for job in ["job1", "job2"]:
+        archive = cache.fetch(workflow_uri, tmp_path / job)
+
+        assert archive == tmp_path / job / "workflows.tar.gz"
+        assert archive.is_file()
+        assert (tmp_path / job / "MLproject").read_text() == "name: test"
+        assert (tmp_path / job / "src" / "fgm.py").read_text() == "# fgm"
+
+    assert len(s3_client.downloads) == 1
+
+
+def test_fetch_cached_workflow_under_another_filename(
+    cache: WorkflowCache, s3_client: MockS3Client, tmp_path: Path
+) -> None:
+    workflow_uri = add_workflow(s3_client, {"MLproject": b"name: test"})
+    other_key = workflow_uri.replace("workflows.tar.gz", "other.tar.gz")
+    s3_client.objects[other_key[len("s3://workflow/") :]] = s3_client.objects[
+        workflow_uri[len("s3://workflow/") :]
+    ]
+
+    first = cache.fetch(workflow_uri, tmp_path / "job1")
+    second = cache.fetch(other_key, tmp_path / "job2")
+
+    assert second == tmp_path / "job2" / "other.tar.gz"
+    assert second.read_bytes() == first.read_bytes()
+    assert (tmp_path / "job2" / "MLproject").read_text() == "name: test"
+    assert len(s3_client.downloads) == 1
+
+
+def test_fetch_evicts_least_recently_used(
+    cache: WorkflowCache, s3_client: MockS3Client, tmp_path: Path
+) -> None:
+    workflow_uris = [
+        add_workflow(s3_client, {"MLproject": f"name: test{x}".encode()})
+        for x in range(3)
+    ]
+
+    for job, workflow_uri in enumerate(workflow_uris):
+        cache.fetch(workflow_uri, tmp_path / f"job{job}")
+
+    s3_client.downloads.clear()
+    cache.fetch(workflow_uris[2], tmp_path / "job3")
+    cache.fetch(workflow_uris[0], tmp_path / "job4")
+
+    assert s3_client.downloads == [workflow_uris[0].split("/", 3)[-1]]
+
+
+def test_fetch_uncached_prefix(
+    cache: WorkflowCache, s3_client: MockS3Client, tmp_path: Path
+) -> None:
+    data = make_workflow_tar_gz({"MLproject": b"name: test"})
+    s3_client.objects["3db4050001b145a4ae1864e7d1bc7e9a/workflows.tar.gz"] = data
+    workflow_uri = "s3://workflow/3db4050001b145a4ae1864e7d1bc7e9a/workflows.tar.gz"
+
+    cache.fetch(workflow_uri, tmp_path / "job1")
+    cache.fetch(workflow_uri, tmp_path / "job2")
+
+    assert len(s3_client.downloads) == 2
+    assert (tmp_path / "job2" / "MLproject").read_text() == "name: test"
+    assert not (tmp_path / ".workflow_cache").exists()
+
+
+def test_unpack_workflow_archive_rejects_path_traversal(tmp_path: Path) -> None:
+    archive = tmp_path / "workflows.tar.gz"
+    archive.write_bytes(make_workflow_tar_gz({"../escape.py": b""}))
+
+    with pytest.raises(ValueError):
+        unpack_workflow_archive(archive, tmp_path / "dest")
+
+    assert not (tmp_path / "escape.py").exists()
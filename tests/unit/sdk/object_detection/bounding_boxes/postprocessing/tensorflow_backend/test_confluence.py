@@ -0,0 +1,82 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+import numpy as np
+import pytest
+
+tf = pytest.importorskip("tensorflow")
+
+from dioptra.sdk.object_detection.bounding_boxes.postprocessing.tensorflow_backend.confluence import (  # noqa: B950,E402
+    TensorflowBoundingBoxesYOLOV1Confluence,
+)
+
+
+def make_detections(seed: int = 0):
+    rng = np.random.default_rng(seed)
+    num_boxes = 24
+    top_left = rng.uniform(0.0, 0.6, size=(3, num_boxes, 2))
+    size = rng.uniform(0.1, 0.4, size=(3, num_boxes, 2))
+    boxes = np.concatenate((top_left, top_left + size), axis=-1)
+    scores = np.stack(
+        [
+            rng.uniform(0.0, 1.0, size=num_boxes),
+            # No box passes the pre-algorithm threshold.
+            np.full(num_boxes, 0.01),
+            # Every box is below the minimum detection score.
+            rng.uniform(0.06, 0.4, size=num_boxes),
+        ]
+    )
+    labels = rng.integers(0, 3, size=(3, num_boxes))
+
+    return boxes.astype("float32"), scores.astype("float32"), labels.astype("int32")
+
+
+@pytest.mark.parametrize("force_prediction", [False, True])
+@pytest.mark.parametrize("gaussian", [False, True])
+def test_confluence_graph_matches_confluence(gaussian, force_prediction) -> None:
+    postprocessing = TensorflowBoundingBoxesYOLOV1Confluence.on_grid_shape(
+        (7, 7),
+        gaussian=gaussian,
+        force_prediction=force_prediction,
+        use_numpy_function=False,
+    )
+    boxes, scores, labels = make_detections()
+
+    (
+        expected_boxes,
+        expected_scores,
+        expected_labels,
+        expected_counts,
+    ) = postprocessing.confluence(boxes=boxes, scores=scores, labels=labels)
+    (
+        final_boxes,
+        final_scores,
+        final_labels,
+        final_counts,
+    ) = postprocessing.confluence_graph(
+        boxes=tf.constant(boxes),
+        scores=tf.constant(scores),
+        labels=tf.constant(labels),
+    )
+
+    assert np.array_equal(final_counts.numpy(), expected_counts)
+    assert np.array_equal(final_labels.numpy(), expected_labels)
+    assert np.allclose(final_boxes.numpy(), expected_boxes)
+    assert np.allclose(final_scores.numpy(), expected_scores, atol=1e-5)
+
+    # The image without boxes is padded with a single row of zeros.
+    assert final_counts.numpy()[1] == 1
+    assert not final_scores.numpy()[1].any()
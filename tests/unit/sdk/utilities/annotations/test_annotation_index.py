@@ -0,0 +1,186 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+import functools
+import os
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from dioptra.sdk.utilities.annotations import AnnotationIndex, read_pascal_voc_file
+
+LABELS = {"cat": 0, "dog": 1}
+
+
+def write_annotation(filepath: Path, objects: List[tuple]) -> None:
+    boxes = "".join(
+        f"<object><name>{name}</name><bndbox><xmin>{xmin}</xmin><ymin>{ymin}</ymin>"
+        f"<xmax>{xmax}</xmax><ymax>{ymax}</ymax></bndbox></object>"
+        for name, xmin, ymin, xmax, ymax in objects
+    )
+    filepath.write_text(
+        "<annotation><size><width>100</width><height>50</height></size>"
+        f"{boxes}</annotation>"
+    )
+
+
+@pytest.fixture
+def annotation_files(tmp_path: Path) -> List[str]:
+    filepaths = []
+
+    for index in range(6):
+        filepath = tmp_path / "annotations" / f"{index}.xml"
+        filepath.parent.mkdir(exist_ok=True)
+        write_annotation(
+            filepath,
+            [("cat", index, 0, 10 + index, 20), ("dog", 50, 10, 60, 40 + index)][
+                : index % 3
+            ],
+        )
+        filepaths.append(str(filepath))
+
+    return filepaths
+
+
+def counting_parser(calls: List[str], labels=LABELS):
+    def parse_file(filepath: str):
+        calls.append(filepath)
+        return read_pascal_voc_file(filepath, labels=labels)
+
+    return parse_file
+
+
+def assert_index_matches_files(index: AnnotationIndex, filepaths: List[str]) -> None:
+    assert len(index) == len(filepaths)
+    assert index.filepaths == filepaths
+
+    for filepath in filepaths:
+        boxes, labels = read_pascal_voc_file(filepath, labels=LABELS)
+        index_boxes, index_labels = index.lookup(filepath)
+
+        assert filepath in index
+        assert index_boxes.dtype == np.float32
+        assert index_labels.dtype == np.int32
+        assert np.allclose(index_boxes, np.reshape(boxes, (-1, 4)))
+        assert index_labels.tolist() == labels
+
+
+def test_read_pascal_voc_file(annotation_files: List[str]) -> None:
+    boxes, labels = read_pascal_voc_file(annotation_files[2].encode(), labels=LABELS)
+
+    assert np.allclose(boxes, [[0.02, 0.0, 0.12, 0.4], [0.5, 0.2, 0.6, 0.84]])
+    assert labels == [0, 1]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_annotation_index_build_and_load(
+    annotation_files: List[str], tmp_path: Path, max_workers: int
+) -> None:
+    index_filepath = tmp_path / "index" / "annotations.npz"
+    index = AnnotationIndex.build(
+        parse_file=functools.partial(read_pascal_voc_file, labels=LABELS),
+        label_names=list(LABELS),
+        filepaths=annotation_files,
+        index_filepath=index_filepath,
+        max_workers=max_workers,
+    )
+
+    assert_index_matches_files(index, annotation_files)
+    assert index.label_names == ["cat", "dog"]
+    assert index.lookup(tmp_path / "missing.xml") is None
+    assert index.lookup(Path(annotation_files[0]))[0].shape == (0, 4)
+
+    loaded = AnnotationIndex.load(index_filepath)
+
+    assert_index_matches_files(loaded, annotation_files)
+    assert loaded.label_names == ["cat", "dog"]
+
+
+def test_annotation_index_rebuild_parses_changed_files(
+    annotation_files: List[str], tmp_path: Path
+) -> None:
+    index_filepath = tmp_path / "annotations.npz"
+    calls: List[str] = []
+    AnnotationIndex.build(
+        parse_file=counting_parser(calls),
+        label_names=list(LABELS),
+        filepaths=annotation_files[:4],
+        index_filepath=index_filepath,
+        max_workers=1,
+    )
+    write_annotation(Path(annotation_files[1]), [("dog", 1, 2, 3, 4)] * 3)
+    calls.clear()
+
+    index = AnnotationIndex.build(
+        parse_file=counting_parser(calls),
+        label_names=list(LABELS),
+        filepaths=annotation_files,
+        index_filepath=index_filepath,
+        max_workers=1,
+    )
+
+    assert calls == [annotation_files[1], *annotation_files[4:]]
+    assert_index_matches_files(index, annotation_files)
+
+
+def test_annotation_index_rebuild_parses_all_files_for_new_labels(
+    annotation_files: List[str], tmp_path: Path
+) -> None:
+    index_filepath = tmp_path / "annotations.npz"
+    calls: List[str] = []
+    AnnotationIndex.build(
+        parse_file=counting_parser(calls),
+        label_names=list(LABELS),
+        filepaths=annotation_files,
+        index_filepath=index_filepath,
+        max_workers=1,
+    )
+    calls.clear()
+
+    index = AnnotationIndex.build(
+        parse_file=counting_parser(calls, labels={"dog": 0, "cat": 1}),
+        label_names=["dog", "cat"],
+        filepaths=annotation_files,
+        index_filepath=index_filepath,
+        max_workers=1,
+    )
+
+    assert calls == annotation_files
+    assert index.label_names == ["dog", "cat"]
+    assert index.lookup(annotation_files[1])[1].tolist() == [1]
+
+
+def test_annotation_index_rebuild_ignores_unreadable_index(
+    annotation_files: List[str], tmp_path: Path
+) -> None:
+    index_filepath = tmp_path / "annotations.npz"
+    index_filepath.write_bytes(b"not an index")
+    calls: List[str] = []
+
+    index = AnnotationIndex.build(
+        parse_file=counting_parser(calls),
+        label_names=list(LABELS),
+        filepaths=annotation_files,
+        index_filepath=index_filepath,
+        max_workers=1,
+    )
+
+    assert calls == annotation_files
+    assert_index_matches_files(AnnotationIndex.load(index_filepath), annotation_files)
+    assert not [x for x in os.listdir(tmp_path) if x.endswith(".tmp")]
+    assert len(index) == len(annotation_files)
@@ -0,0 +1,61 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+import itertools
+from typing import Iterator, List
+
+import pytest
+
+from dioptra.sdk.utilities.batching import iter_batches, num_batches
+
+
+def cycle_batches(samples: List[int], batch_size: int) -> Iterator[List[int]]:
+    """Mimics a Keras data iterator, which cycles through the dataset forever."""
+    for start in itertools.cycle(range(0, len(samples), batch_size)):
+        yield samples[start : start + batch_size]  # noqa: E203
+
+
+@pytest.mark.parametrize(
+    ("num_samples", "batch_size", "expected"),
+    [(0, 4, 0), (8, 4, 2), (9, 4, 3), (3, 4, 1), (5, 1, 5)],
+)
+def test_num_batches(num_samples: int, batch_size: int, expected: int) -> None:
+    assert num_batches(num_samples, batch_size) == expected
+
+
+def test_num_batches_rejects_non_positive_batch_size() -> None:
+    with pytest.raises(ValueError):
+        num_batches(10, 0)
+
+
+@pytest.mark.parametrize("num_samples", [1, 7, 8, 9, 31])
+@pytest.mark.parametrize("batch_size", [1, 4, 8, 32])
+def test_iter_batches_covers_every_sample_once(
+    num_samples: int, batch_size: int
+) -> None:
+    samples: List[int] = list(range(num_samples))
+    seen: List[int] = []
+
+    for batch_num, batch_slice, batch in iter_batches(
+        cycle_batches(samples, batch_size),
+        num_samples=num_samples,
+        batch_size=batch_size,
+    ):
+        assert samples[batch_slice] == batch
+        assert batch_slice.start == batch_num * batch_size
+        seen.extend(batch)
+
+    assert seen == samples
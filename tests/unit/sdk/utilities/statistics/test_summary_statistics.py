@@ -0,0 +1,103 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+import math
+
+import numpy as np
+import pytest
+import scipy.stats
+
+from dioptra.sdk.utilities.statistics import KLLSketch, SummaryStatistics
+
+
+@pytest.fixture
+def values() -> np.ndarray:
+    return np.random.default_rng(0).lognormal(size=20000)
+
+
+def expected_summary(values: np.ndarray) -> dict:
+    return {
+        "mean": values.mean(),
+        "median": np.median(values),
+        "stdev": values.std(),
+        "iqr": scipy.stats.iqr(values),
+        "min": values.min(),
+        "max": values.max(),
+    }
+
+
+def test_summary_statistics_exact(values: np.ndarray) -> None:
+    summary = SummaryStatistics(mode="exact")
+
+    for batch in np.array_split(values, 311):
+        summary.update(batch)
+
+    assert summary.is_exact
+    assert summary.count == values.size
+    assert summary.summary() == pytest.approx(expected_summary(values))
+
+
+@pytest.mark.parametrize("mode", ["auto", "sketch"])
+def test_summary_statistics_sketch(values: np.ndarray, mode: str) -> None:
+    summary = SummaryStatistics(mode=mode, exact_max_count=1000, seed=0)
+
+    for batch in np.array_split(values, 311):
+        summary.update(batch)
+
+    result = summary.summary()
+    expected = expected_summary(values)
+
+    assert not summary.is_exact
+    assert {k: result[k] for k in ("mean", "stdev", "min", "max")} == pytest.approx(
+        {k: expected[k] for k in ("mean", "stdev", "min", "max")}
+    )
+
+    for q in (0.25, 0.5, 0.75):
+        rank = scipy.stats.percentileofscore(values, summary.quantile(q)) / 100
+        assert abs(rank - q) < 0.02
+
+
+@pytest.mark.parametrize(("mode_a", "mode_b"), [("exact", "exact"), ("auto", "sketch")])
+def test_summary_statistics_merge(values: np.ndarray, mode_a: str, mode_b: str) -> None:
+    summary_a = SummaryStatistics(mode=mode_a, seed=0)
+    summary_b = SummaryStatistics(mode=mode_b, seed=1)
+    summary_a.update(values[:7000])
+    summary_b.update(values[7000:])
+    summary_a.merge(summary_b)
+
+    assert summary_a.count == values.size
+    assert summary_a.mean == pytest.approx(values.mean())
+    assert summary_a.stdev == pytest.approx(values.std())
+    assert summary_a.is_exact == (mode_b == "exact")
+
+
+def test_summary_statistics_empty() -> None:
+    summary = SummaryStatistics()
+
+    assert all(math.isnan(x) for x in summary.summary().values())
+
+    with pytest.raises(ValueError):
+        SummaryStatistics(mode="approximate")
+
+
+def test_kll_sketch_bounds_memory(values: np.ndarray) -> None:
+    sketch = KLLSketch(k=100, seed=0)
+
+    for batch in np.array_split(np.tile(values, 10), 1000):
+        sketch.update(batch)
+
+    assert sketch.count == values.size * 10
+    assert sketch.num_retained < 1000
@@ -0,0 +1,133 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import threading
+import time
+from typing import List
+
+import pytest
+from mlflow.entities import Metric, Param, RunTag
+
+from dioptra.sdk.utilities.tracking import (
+    MAX_ENTITIES_PER_BATCH,
+    MAX_METRICS_PER_BATCH,
+    MAX_PARAMS_TAGS_PER_BATCH,
+    MetricsBuffer,
+    iter_log_batches,
+    log_batch,
+)
+
+
+class RecordingClient(object):
+    def __init__(self, failures: int = 0) -> None:
+        self.batches: List[tuple] = []
+        self.failures = failures
+        self.called = threading.Event()
+
+    def log_batch(self, run_id, metrics, params, tags) -> None:
+        self.called.set()
+
+        if self.failures > 0:
+            self.failures -= 1
+            raise RuntimeError("tracking server unavailable")
+
+        self.batches.append((run_id, metrics, params, tags))
+
+    @property
+    def metrics(self) -> List[Metric]:
+        return [metric for _, metrics, _, _ in self.batches for metric in metrics]
+
+
+def test_iter_log_batches_respects_server_limits() -> None:
+    metrics = [Metric(f"m{i}", i, 0, 0) for i in range(2500)]
+    params = [Param(f"p{i}", str(i)) for i in range(150)]
+    tags = [RunTag(f"t{i}", str(i)) for i in range(30)]
+
+    batches = list(iter_log_batches(metrics, params, tags))
+
+    for batch_metrics, batch_params, batch_tags in batches:
+        assert len(batch_metrics) <= MAX_METRICS_PER_BATCH
+        assert len(batch_params) + len(batch_tags) <= MAX_PARAMS_TAGS_PER_BATCH
+        assert (
+            len(batch_metrics) + len(batch_params) + len(batch_tags)
+            <= MAX_ENTITIES_PER_BATCH
+        )
+
+    assert len(batches) == 3
+    assert [m for batch in batches for m in batch[0]] == metrics
+    assert [p for batch in batches for p in batch[1]] == params
+    assert [t for batch in batches for t in batch[2]] == tags
+
+
+def test_log_batch_converts_entities() -> None:
+    client = RecordingClient()
+
+    log_batch(
+        metrics={"accuracy": 0.5},
+        params={"batch_size": 32},
+        tags={"stage": "train"},
+        step=3,
+        run_id="run",
+        client=client,
+    )
+
+    [(run_id, metrics, params, tags)] = client.batches
+
+    assert run_id == "run"
+    assert [(m.key, m.value, m.step) for m in metrics] == [("accuracy", 0.5, 3)]
+    assert params == [Param("batch_size", "32")]
+    assert tags == [RunTag("stage", "train")]
+
+
+def test_metrics_buffer_flushes_in_background() -> None:
+    client = RecordingClient()
+
+    with MetricsBuffer(run_id="run", client=client, max_pending=10) as buffer:
+        for step in range(10):
+            buffer.log_metric("loss", 1.0 / (step + 1), step=step)
+
+        assert client.called.wait(timeout=5)
+
+        for _ in range(100):
+            if buffer.num_pending == 0:
+                break
+
+            time.sleep(0.01)
+
+        buffer.log_metrics({"loss": 0.0, "accuracy": 1.0}, step=10)
+
+    assert [m.step for m in client.metrics] == [*range(11), 10]
+    assert buffer.num_pending == 0
+
+    with pytest.raises(RuntimeError):
+        buffer.log_metric("loss", 0.0)
+
+
+def test_metrics_buffer_retries_failed_flush() -> None:
+    client = RecordingClient(failures=1)
+    buffer = MetricsBuffer(run_id="run", client=client, flush_interval=60)
+    buffer.log_metric("loss", 1.0)
+
+    with pytest.raises(RuntimeError):
+        buffer.flush()
+
+    assert buffer.num_pending == 1
+
+    buffer.close()
+
+    assert [m.key for m in client.metrics] == ["loss"]
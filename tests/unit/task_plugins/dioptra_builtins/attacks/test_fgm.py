@@ -0,0 +1,193 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import inspect
+import threading
+import time
+from pathlib import Path
+from typing import Iterator, List, Tuple
+
+import numpy as np
+import pytest
+
+
+def test_prefetch_preserves_order_and_bounds_read_ahead() -> None:
+    from dioptra_builtins.attacks.fgm import _prefetch
+
+    produced: list = []
+
+    def items() -> Iterator[int]:
+        for index in range(10):
+            produced.append(index)
+            yield index
+
+    prefetched = _prefetch(items(), maxsize=2)
+    assert next(prefetched) == 0
+    time.sleep(0.2)
+
+    # One item handed to the consumer, two buffered, and one blocked on the put.
+    assert len(produced) <= 4
+    assert list(prefetched) == list(range(1, 10))
+
+
+def test_prefetch_reraises_producer_errors() -> None:
+    from dioptra_builtins.attacks.fgm import _prefetch
+
+    def items() -> Iterator[int]:
+        yield 0
+        raise ValueError("decoding failed")
+
+    prefetched = _prefetch(items(), maxsize=2)
+    assert next(prefetched) == 0
+
+    with pytest.raises(ValueError, match="decoding failed"):
+        next(prefetched)
+
+
+def test_prefetch_stops_producer_when_closed_early() -> None:
+    from dioptra_builtins.attacks.fgm import _prefetch
+
+    def items() -> Iterator[int]:
+        index = 0
+
+        while True:
+            yield index
+            index += 1
+
+    num_threads: int = threading.active_count()
+    prefetched = _prefetch(items(), maxsize=1)
+    assert next(prefetched) == 0
+    assert threading.active_count() == num_threads + 1
+
+    prefetched.close()
+
+    assert threading.active_count() == num_threads
+
+
+def test_distance_metrics_recorder_streams_table(tmp_path) -> None:
+    import pandas as pd
+    from dioptra_builtins.attacks.fgm import _DistanceMetricsRecorder
+
+    recorder = _DistanceMetricsRecorder(
+        ["l2_norm"], summary_statistics_mode="exact", keep_table=False
+    )
+    filepath = tmp_path / "distance_metrics.csv.gz"
+    batches = [
+        pd.DataFrame(
+            {"image": [f"{i}a.png", f"{i}b.png"], "label": [0, 1], "l2_norm": [i, i]}
+        )
+        for i in range(3)
+    ]
+
+    with recorder.open(filepath):
+        for batch in batches:
+            recorder.record(batch)
+
+    written = pd.read_csv(filepath)
+
+    assert written.equals(pd.concat(batches, ignore_index=True))
+    assert recorder.table().empty
+    assert list(recorder.table().columns) == ["image", "label", "l2_norm"]
+    assert recorder.summaries["l2_norm"].summary()["mean"] == pytest.approx(1.0)
+
+
+class _StubAttack(object):
+    def generate(self, x: np.ndarray) -> np.ndarray:
+        return x + 0.5
+
+
+class _StubDataset(object):
+    def __init__(self, num_images: int, batch_size: int) -> None:
+        self.n = num_images
+        self.batch_size = batch_size
+        self.filenames = [f"class_{i % 2}/image_{i}.png" for i in range(num_images)]
+
+    def __iter__(self) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+        # Cycles forever like a Keras DirectoryIterator. Each image is filled with
+        # its index so that the distance metrics identify the image they belong to.
+        while True:
+            for start in range(0, self.n, self.batch_size):
+                indices = np.arange(start, min(start + self.batch_size, self.n))
+                x = np.broadcast_to(
+                    indices[:, None, None, None], (len(indices), 2, 2, 1)
+                ).astype(np.float32)
+                y = np.eye(2, dtype=np.float32)[indices % 2]
+                yield x, y
+
+
+def _image_index(clean_batch: np.ndarray, adv_batch: np.ndarray) -> np.ndarray:
+    return clean_batch.reshape(len(clean_batch), -1)[:, 0]
+
+
+def test_create_adversarial_fgm_dataset_saves_ragged_final_batch(
+    monkeypatch, tmp_path: Path
+) -> None:
+    import dioptra_builtins.attacks.fgm as fgm
+    from dioptra_builtins.metrics.distance import l_inf_norm
+
+    compute_calls: List[List[str]] = []
+    compute_distance_metrics = fgm.compute_distance_metrics
+
+    def counting_compute_distance_metrics(*args, **kwargs):
+        compute_calls.append(list(kwargs["names"]))
+        return compute_distance_metrics(*args, **kwargs)
+
+    saved: List[str] = []
+    lock = threading.Lock()
+
+    def mocksaveimg(path: str, x: np.ndarray) -> None:
+        Path(path).write_bytes(x.tobytes())
+
+        with lock:
+            saved.append(path)
+
+    monkeypatch.setattr(fgm, "_init_fgm", lambda **kwargs: _StubAttack())
+    monkeypatch.setattr(fgm, "save_img", mocksaveimg, raising=False)
+    monkeypatch.setattr(fgm, "log_batch", lambda **kwargs: None)
+    monkeypatch.setattr(
+        fgm, "compute_distance_metrics", counting_compute_distance_metrics
+    )
+
+    create_adversarial_fgm_dataset = inspect.unwrap(fgm.create_adversarial_fgm_dataset)
+    dataset = _StubDataset(num_images=7, batch_size=3)
+    distance_metrics = create_adversarial_fgm_dataset(
+        data_dir=str(tmp_path / "clean"),
+        adv_data_dir=tmp_path / "adv",
+        keras_classifier=None,
+        image_size=(2, 2, 1),
+        distance_metrics_list=[
+            ("image_index", _image_index),
+            ("linf", l_inf_norm),
+            ("linf_again", l_inf_norm),
+        ],
+        max_workers=1,
+        summary_statistics_mode="exact",
+        dataset=dataset,
+    )
+
+    expected_paths = [
+        tmp_path / "adv" / f"{i % 2}" / f"adv_image_{i}.png" for i in range(7)
+    ]
+
+    assert sorted(saved) == sorted(str(x) for x in expected_paths)
+    assert all(x.is_file() for x in expected_paths)
+    assert list(distance_metrics["image"]) == [f"image_{i}.png" for i in range(7)]
+    assert list(distance_metrics["image_index"]) == list(range(7))
+    assert np.allclose(distance_metrics["linf"], 0.5)
+    assert np.allclose(distance_metrics["linf_again"], 0.5)
+    assert compute_calls == [["l_inf_norm", "l_inf_norm"]] * 3
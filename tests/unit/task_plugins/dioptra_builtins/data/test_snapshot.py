@@ -0,0 +1,118 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+IMAGE_SIZE = (2, 3, 1)
+
+
+@pytest.fixture
+def image_dir(tmp_path) -> Path:
+    data_dir = tmp_path / "images"
+
+    for class_name, num_files in [("cat", 3), ("dog", 4)]:
+        (data_dir / class_name).mkdir(parents=True)
+
+        for index in range(num_files):
+            (data_dir / class_name / f"{index}.png").write_text(str(index))
+
+    return data_dir
+
+
+class FakeImageLoader(object):
+    """Loads each image file as an array filled with the number stored in the file."""
+
+    def __init__(self) -> None:
+        self.num_calls = 0
+
+    def __call__(self, filepath: str) -> np.ndarray:
+        self.num_calls += 1
+        value = int(Path(filepath).read_text()) + 10 * ("dog" in filepath)
+        return np.full(IMAGE_SIZE, value, dtype=np.float32)
+
+
+def create_snapshot(image_dir, snapshot_root, load_image, rescale=0.5) -> Path:
+    from dioptra_builtins.data.snapshot import _create_snapshot
+
+    return _create_snapshot(
+        data_dir=image_dir,
+        snapshot_root=snapshot_root,
+        image_size=IMAGE_SIZE,
+        rescale=rescale,
+        subset=None,
+        validation_split=None,
+        load_image=load_image,
+        params={"interpolation": "nearest"},
+        max_workers=2,
+    )
+
+
+def test_snapshot_is_reused_until_source_or_params_change(image_dir, tmp_path) -> None:
+    load_image = FakeImageLoader()
+    snapshot_root = tmp_path / "snapshots"
+
+    snapshot_dir = create_snapshot(image_dir, snapshot_root, load_image)
+    assert load_image.num_calls == 7
+    assert create_snapshot(image_dir, snapshot_root, load_image) == snapshot_dir
+    assert load_image.num_calls == 7
+    assert os.listdir(snapshot_root) == [snapshot_dir.name]
+
+    assert create_snapshot(image_dir, snapshot_root, load_image, 1.0) != snapshot_dir
+
+    (image_dir / "dog" / "0.png").write_text("100")
+    assert create_snapshot(image_dir, snapshot_root, load_image) != snapshot_dir
+
+
+def test_load_dataset_snapshot_returns_views(image_dir, tmp_path) -> None:
+    from dioptra_builtins.data.snapshot import load_dataset_snapshot
+
+    snapshot_dir = create_snapshot(image_dir, tmp_path, FakeImageLoader())
+    snapshot = load_dataset_snapshot(snapshot_dir, batch_size=2)
+    batches = list(snapshot)
+
+    assert len(snapshot) == len(batches) == 4
+    assert snapshot.n == 7
+    assert snapshot.class_indices == {"cat": 0, "dog": 1}
+    assert snapshot.filenames[3] == os.path.join("dog", "0.png")
+
+    x, y = batches[1]
+    assert isinstance(snapshot.images, np.memmap)
+    assert np.shares_memory(x, snapshot.images)
+    assert x[:, 0, 0, 0].tolist() == [1.0, 5.0]
+    assert y.tolist() == [[1, 0], [0, 1]]
+    assert batches[3][0].shape == (1, *IMAGE_SIZE)
+
+
+def test_load_dataset_snapshot_shuffles_each_pass(image_dir, tmp_path) -> None:
+    from dioptra_builtins.data.snapshot import load_dataset_snapshot
+
+    snapshot_dir = create_snapshot(image_dir, tmp_path, FakeImageLoader())
+    snapshot = load_dataset_snapshot(
+        snapshot_dir, batch_size=2, label_mode="sparse", shuffle=True, seed=0
+    )
+
+    for _ in range(2):
+        images = np.concatenate([x for x, _ in snapshot])[:, 0, 0, 0]
+        labels = np.concatenate([y for _, y in snapshot])
+
+        assert sorted(images.tolist()) == [0, 0.5, 1, 5, 5.5, 6, 6.5]
+        assert sorted(labels.tolist()) == [0, 0, 0, 1, 1, 1, 1]
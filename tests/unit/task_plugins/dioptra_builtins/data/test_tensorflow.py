@@ -0,0 +1,119 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import inspect
+import os
+
+import numpy as np
+import pytest
+
+
+@pytest.fixture
+def image_dir(tmp_path):
+    for class_name, num_files in [("dog", 5), ("cat", 3)]:
+        class_dir = tmp_path / class_name / "nested"
+        class_dir.mkdir(parents=True)
+
+        for index in range(num_files):
+            (class_dir / f"{index}.PNG").touch()
+
+        (tmp_path / class_name / "notes.txt").touch()
+
+    (tmp_path / "README.md").touch()
+
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    ("subset", "expected_cat", "expected_dog"),
+    [
+        (None, [0, 1, 2], [0, 1, 2, 3, 4]),
+        ("validation", [], [0]),
+        ("training", [0, 1, 2], [1, 2, 3, 4]),
+    ],
+)
+def test_list_image_files_matches_directory_iterator(
+    image_dir, subset, expected_cat, expected_dog
+) -> None:
+    from dioptra_builtins.data.tensorflow import _list_image_files
+
+    filenames, classes, class_indices = _list_image_files(
+        data_dir=image_dir, subset=subset, validation_split=0.25
+    )
+
+    assert class_indices == {"cat": 0, "dog": 1}
+    assert filenames == [
+        *(os.path.join("cat", "nested", f"{i}.PNG") for i in expected_cat),
+        *(os.path.join("dog", "nested", f"{i}.PNG") for i in expected_dog),
+    ]
+    assert classes == [0] * len(expected_cat) + [1] * len(expected_dog)
+
+
+def test_list_image_files_rejects_unknown_subset(image_dir) -> None:
+    from dioptra_builtins.data.tensorflow import _list_image_files
+
+    with pytest.raises(ValueError):
+        _list_image_files(data_dir=image_dir, subset="test", validation_split=0.2)
+
+
+@pytest.mark.parametrize("rescale", [1.0 / 255, None])
+def test_create_image_tf_dataset_matches_flow_from_directory(tmp_path, rescale) -> None:
+    tf = pytest.importorskip("tensorflow")
+    pytest.importorskip("PIL")
+
+    from dioptra_builtins.data.tensorflow import create_image_tf_dataset
+
+    rng = np.random.default_rng(0)
+
+    for class_name in ["cat", "dog"]:
+        (tmp_path / class_name).mkdir()
+
+        for index in range(3):
+            image = rng.integers(0, 256, size=(6, 5, 3), dtype=np.uint8)
+            tf.io.write_file(
+                str(tmp_path / class_name / f"{index}.png"), tf.io.encode_png(image)
+            )
+
+    dataset = inspect.unwrap(create_image_tf_dataset)(
+        data_dir=str(tmp_path),
+        subset=None,
+        image_size=(6, 5, 3),
+        seed=0,
+        rescale=rescale,
+        validation_split=None,
+        batch_size=4,
+        shuffle=False,
+    )
+    directory_iterator = tf.keras.preprocessing.image.ImageDataGenerator(
+        rescale=rescale
+    ).flow_from_directory(
+        directory=str(tmp_path),
+        target_size=(6, 5),
+        color_mode="rgb",
+        class_mode="categorical",
+        batch_size=4,
+        shuffle=False,
+    )
+
+    images, labels = next(dataset.as_numpy_iterator())
+    expected_images, expected_labels = next(directory_iterator)
+
+    assert images.dtype == np.float32
+    assert dataset.filenames == directory_iterator.filenames
+    assert np.allclose(images, expected_images)
+    assert np.array_equal(labels, expected_labels)
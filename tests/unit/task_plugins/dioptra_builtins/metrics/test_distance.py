@@ -16,6 +16,8 @@
 # https://creativecommons.org/licenses/by/4.0/legalcode
 from __future__ import annotations
 
+import pickle
+
 import numpy as np
 import pytest
 
@@ -60,6 +62,57 @@ def test_get_distance_metric_list(request_, y_true, y_pred) -> None:
         assert all([isinstance(dist, float) for dist in dists])
 
 
+def test_get_distance_metric_list_returns_registry_functions() -> None:
+    from dioptra_builtins.metrics.distance import (
+        DISTANCE_METRICS_REGISTRY,
+        get_distance_metric_list,
+    )
+
+    result: list = get_distance_metric_list(
+        [
+            {"name": "a", "func": "l_inf_norm"},
+            {"name": "b", "func": "missing"},
+            {"name": "c", "func": "paired_cosine_similarities"},
+        ]
+    )
+
+    assert result == [
+        ("a", DISTANCE_METRICS_REGISTRY["l_inf_norm"]),
+        ("c", DISTANCE_METRICS_REGISTRY["paired_cosine_similarities"]),
+    ]
+    assert pickle.loads(pickle.dumps(result)) == result
+
+
+@pytest.mark.parametrize("chunk_size", [None, 1, 3, 64])
+def test_compute_distance_metrics(chunk_size) -> None:
+    from dioptra_builtins.metrics.distance import (
+        DISTANCE_METRICS_REGISTRY,
+        compute_distance_metrics,
+    )
+
+    rng = np.random.default_rng(0)
+    y_true = rng.random((7, 4, 4, 3), dtype=np.float32)
+    y_pred = np.clip(y_true + rng.normal(0, 0.1, y_true.shape), 0, 1)
+
+    result = compute_distance_metrics(
+        y_true, y_pred, names=DISTANCE_METRICS_REGISTRY, chunk_size=chunk_size
+    )
+
+    assert list(result) == list(DISTANCE_METRICS_REGISTRY)
+
+    for name, metric in DISTANCE_METRICS_REGISTRY.items():
+        assert result[name].shape == (7,)
+        assert np.allclose(result[name], metric(y_true, y_pred), rtol=1e-5), name
+
+
+def test_compute_distance_metrics_unknown_name() -> None:
+    from dioptra_builtins.metrics.distance import compute_distance_metrics
+    from dioptra_builtins.metrics.exceptions import UnknownDistanceMetricError
+
+    with pytest.raises(UnknownDistanceMetricError):
+        compute_distance_metrics(np.ones((1, 2)), np.ones((1, 2)), names=["l_3_norm"])
+
+
 @pytest.mark.parametrize(
     "func",
     [
@@ -275,6 +328,40 @@ def test_paired_wasserstein_distances(y_true, y_pred, expected) -> None:
     assert np.allclose(expected, result)
 
 
+@pytest.mark.parametrize("chunk_size", [None, 1, 4])
+@pytest.mark.parametrize(
+    ("v_size", "weighted"), [(10, False), (7, False), (10, True), (7, True)]
+)
+def test_batched_wasserstein_distances(chunk_size, v_size, weighted) -> None:
+    from dioptra_builtins.metrics.distance import batched_wasserstein_distances
+    from scipy.stats import wasserstein_distance
+
+    rng = np.random.default_rng(0)
+    u_values = rng.integers(0, 5, size=(6, 10)).astype(float)
+    v_values = rng.random((6, v_size))
+    u_weights = rng.random(10) if weighted else None
+    v_weights = rng.random((6, v_size)) if weighted else None
+
+    expected = [
+        wasserstein_distance(
+            u_values=u_values[i],
+            v_values=v_values[i],
+            u_weights=u_weights,
+            v_weights=None if v_weights is None else v_weights[i],
+        )
+        for i in range(6)
+    ]
+    result: np.ndarray = batched_wasserstein_distances(
+        u_values,
+        v_values,
+        u_weights=u_weights,
+        v_weights=v_weights,
+        chunk_size=chunk_size,
+    )
+
+    assert np.allclose(expected, result)
+
+
 @pytest.mark.parametrize(
     "X",
     [
@@ -321,3 +321,83 @@ def test_recall(y_true, y_pred, weights, average, expected) -> None:
     kwargs = {"average": average, "sample_weight": weights}
     result: float = recall(y_true, y_pred, **kwargs)
     assert np.isclose(result, expected)
+
+
+@pytest.mark.parametrize(
+    ("num_classes", "average"),
+    [
+        (2, "binary"),
+        (2, "macro"),
+        (5, "micro"),
+        (5, "macro"),
+        (5, "weighted"),
+    ],
+)
+def test_compute_performance_metrics_matches_sklearn(num_classes, average) -> None:
+    from sklearn import metrics
+
+    from dioptra_builtins.metrics.performance import compute_performance_metrics
+
+    rng = np.random.default_rng(0)
+    y_true = rng.integers(0, num_classes, 1000)
+    y_pred = np.where(
+        rng.random(1000) < 0.7, y_true, rng.integers(0, num_classes, 1000)
+    )
+    weights = rng.random(1000)
+
+    result = compute_performance_metrics(
+        y_true,
+        y_pred,
+        ["accuracy", "categorical_accuracy", "mcc", "f1", "precision", "recall"],
+        average=average,
+        sample_weight=weights,
+    )
+    kwargs = {"y_true": y_true, "y_pred": y_pred, "sample_weight": weights}
+    expected = {
+        "accuracy": metrics.accuracy_score(**kwargs),
+        "categorical_accuracy": metrics.accuracy_score(**kwargs),
+        "mcc": metrics.matthews_corrcoef(**kwargs),
+        "f1": metrics.f1_score(average=average, **kwargs),
+        "precision": metrics.precision_score(average=average, **kwargs),
+        "recall": metrics.recall_score(average=average, **kwargs),
+    }
+
+    assert result == pytest.approx(expected)
+
+
+def test_compute_performance_metrics_streams_batches() -> None:
+    from sklearn import metrics
+
+    from dioptra_builtins.metrics.performance import (
+        ConfusionMatrix,
+        compute_performance_metrics,
+    )
+
+    rng = np.random.default_rng(1)
+    y_true = rng.integers(0, 4, 1000)
+    y_pred = rng.integers(0, 4, 1000)
+    confusion_matrix = ConfusionMatrix()
+
+    # One-hot encoded predictions, with labels that first appear in later batches.
+    for index in np.array_split(np.argsort(y_true, kind="stable"), 7):
+        result = compute_performance_metrics(
+            y_true[index],
+            np.eye(4)[y_pred[index]],
+            ["f1", "mcc"],
+            average="macro",
+            confusion_matrix=confusion_matrix,
+        )
+
+    assert confusion_matrix.labels.tolist() == [0, 1, 2, 3]
+    assert result["f1"] == pytest.approx(
+        metrics.f1_score(y_true, y_pred, average="macro")
+    )
+    assert result["mcc"] == pytest.approx(metrics.matthews_corrcoef(y_true, y_pred))
+
+
+def test_compute_performance_metrics_rejects_score_metrics() -> None:
+    from dioptra_builtins.metrics.exceptions import UnknownPerformanceMetricError
+    from dioptra_builtins.metrics.performance import compute_performance_metrics
+
+    with pytest.raises(UnknownPerformanceMetricError):
+        compute_performance_metrics([0, 1], [1, 1], ["roc_auc"])
@@ -0,0 +1,115 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import List
+
+import pytest
+
+
+class FakeDownloader(object):
+    def __init__(self, size: int = 100) -> None:
+        self.size = size
+        self.uris: List[str] = []
+
+    def __call__(self, uri: str, dest: Path) -> None:
+        self.uris.append(uri)
+        dest.mkdir(parents=True)
+        (dest / "MLmodel").write_text(uri)
+        (dest / "weights.bin").write_bytes(b"\0" * self.size)
+
+
+def make_cache(cache_dir, download, max_bytes=1000):
+    from dioptra_builtins.registry.cache import ModelCache
+
+    return ModelCache(cache_dir=cache_dir, max_bytes=max_bytes, download=download)
+
+
+def test_model_cache_downloads_each_version_once(tmp_path) -> None:
+    download = FakeDownloader()
+    cache = make_cache(tmp_path, download)
+
+    for _ in range(3):
+        with cache.open(name="model", version=1) as model_dir:
+            assert (model_dir / "MLmodel").read_text() == "models:/model/1"
+
+    with make_cache(tmp_path, download).open(name="model", version=2):
+        pass
+
+    assert download.uris == ["models:/model/1", "models:/model/2"]
+    assert (cache.stats.hits, cache.stats.misses) == (2, 1)
+    assert not [x for x in (tmp_path / "entries").iterdir() if x.name.startswith(".")]
+
+
+def test_model_cache_evicts_least_recently_used(tmp_path) -> None:
+    download = FakeDownloader(size=400)
+    cache = make_cache(tmp_path, download)
+
+    for version in (1, 2, 1, 3):
+        with cache.open(name="model", version=version):
+            pass
+
+        # Keep the modification times of the entries distinct.
+        time.sleep(0.01)
+
+    assert cache.stats.evictions == 1
+
+    with cache.open(name="model", version=1):
+        pass
+
+    assert download.uris == [f"models:/model/{v}" for v in (1, 2, 3)]
+
+
+def test_model_cache_skips_entries_in_use(tmp_path) -> None:
+    download = FakeDownloader(size=400)
+    cache = make_cache(tmp_path, download)
+
+    with cache.open(name="model", version=1) as model_dir:
+        for version in (2, 3):
+            with make_cache(tmp_path, download).open(name="model", version=version):
+                pass
+
+        assert (model_dir / "weights.bin").exists()
+
+    assert len(os.listdir(tmp_path / "entries")) == 2
+
+
+def test_model_cache_discards_failed_downloads(tmp_path) -> None:
+    def download(uri: str, dest: Path) -> None:
+        dest.mkdir(parents=True)
+        raise OSError("connection reset")
+
+    cache = make_cache(tmp_path, download)
+
+    with pytest.raises(OSError):
+        with cache.open(name="model", version=1):
+            pass
+
+    assert os.listdir(tmp_path / "entries") == []
+
+
+def test_get_model_cache_reads_environment(tmp_path, monkeypatch) -> None:
+    from dioptra_builtins.registry.cache import get_model_cache
+
+    monkeypatch.delenv("DIOPTRA_MODEL_CACHE_DIR", raising=False)
+    assert get_model_cache() is None
+
+    monkeypatch.setenv("DIOPTRA_MODEL_CACHE_DIR", str(tmp_path))
+    assert get_model_cache() is get_model_cache(cache_dir=tmp_path)
@@ -0,0 +1,56 @@
+# This Software (Dioptra) is being made available as a public service by the
+# National Institute of Standards and Technology (NIST), an Agency of the United
+# States Department of Commerce. This software was developed in part by employees of
+# NIST and in part by NIST contractors. Copyright in portions of this software that
+# were developed by NIST contractors has been licensed or assigned to NIST. Pursuant
+# to Title 17 United States Code Section 105, works of NIST employees are not
+# subject to copyright protection in the United States. However, NIST may hold
+# international copyright in software created by its employees and domestic
+# copyright (or licensing rights) in portions of software that were assigned or
+# licensed to NIST. To the extent that NIST holds copyright in this software, it is
+# being made available under the Creative Commons Attribution 4.0 International
+# license (CC BY 4.0). The disclaimers of the CC BY 4.0 license apply to all parts
+# of the software developed or licensed by NIST.
+#
+# ACCESS THE FULL CC BY 4.0 LICENSE HERE:
+# https://creativecommons.org/licenses/by/4.0/legalcode
+from __future__ import annotations
+
+import mlflow
+import pytest
+from mlflow.tracking import MlflowClient
+
+
+@pytest.fixture
+def tracking_uri(tmp_path, monkeypatch):
+    uri = (tmp_path / "mlruns").as_uri()
+    monkeypatch.setenv("MLFLOW_TRACKING_URI", uri)
+
+    yield uri
+
+    if mlflow.active_run() is not None:
+        mlflow.end_run()
+
+
+def test_log_metrics_and_parameters_in_batches(tracking_uri, monkeypatch) -> None:
+    from dioptra_builtins.tracking.mlflow import log_metrics, log_parameters
+
+    calls: list = []
+    log_batch = MlflowClient.log_batch
+    monkeypatch.setattr(
+        MlflowClient,
+        "log_batch",
+        lambda self, *args, **kwargs: calls.append(1)
+        or log_batch(self, *args, **kwargs),
+    )
+
+    with mlflow.start_run() as run:
+        log_metrics({f"metric_{i}": float(i) for i in range(1500)}, step=2)
+        log_parameters({f"param_{i}": i for i in range(150)})
+
+    data = MlflowClient(tracking_uri).get_run(run.info.run_id).data
+
+    assert len(calls) == 4
+    assert len(data.metrics) == 1500
+    assert data.metrics["metric_7"] == 7.0
+    assert data.params["param_149"] == "149"